@@ -60,7 +60,8 @@ class ZMQServer(object):
             DEBUG('obj=' + str(self.obj))
             ZmqCompWrapper.serve(self.obj,
                                  rep_url=self.options.rep_url,
-                                 pub_url=self.options.pub_url)
+                                 pub_url=self.options.pub_url,
+                                 pub_rate=self.options.pub_rate)
         except Exception:
             print >> self.sysout, \
                   '<<<%s>>> ZMQServer -- wrapper failed:' % os.getpid()
@@ -84,6 +85,10 @@ class ZMQServer(object):
         parser.add_option("-o", "--out_url",
                           dest="out_url",
                           help="the address of the output stream")
+        parser.add_option("--pub_rate",
+                          dest="pub_rate", type="float", default=20.,
+                          help="max published batches per second"
+                               " (0 sends immediately)")
         return parser
 
     @staticmethod
@@ -1,6 +1,10 @@
-from mdf import MDF
-from ego import EGO
-from bliss import BLISS
-from bliss2000 import BLISS2000
-from co import CO
-from idf import IDF
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.architectures.mdf': ('MDF',),
+    'openmdao.lib.architectures.ego': ('EGO',),
+    'openmdao.lib.architectures.bliss': ('BLISS',),
+    'openmdao.lib.architectures.bliss2000': ('BLISS2000',),
+    'openmdao.lib.architectures.co': ('CO',),
+    'openmdao.lib.architectures.idf': ('IDF',),
+})
@@ -6,19 +6,21 @@ A central place to access all of the OpenMDAO case recorders, case
 iterators, and case filters in the standard library.
 """
 
-from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, caseiter_to_caseset
-
-from openmdao.lib.casehandlers.csvcase import CSVCaseIterator, CSVCaseRecorder
-from openmdao.lib.casehandlers.dbcase import DBCaseIterator, DBCaseRecorder, \
-                                             case_db_to_dict
-from openmdao.lib.casehandlers.dumpcase import DumpCaseRecorder
-from openmdao.lib.casehandlers.listcase import ListCaseRecorder, \
-                                               ListCaseIterator
-
-from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, \
-                                              caseiter_to_caseset
-
-from openmdao.lib.casehandlers.filters import SequenceCaseFilter, \
-                                              SliceCaseFilter, ExprCaseFilter
-
-
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.casehandlers.asynccase': ('AsyncRecorder',),
+    'openmdao.lib.casehandlers.csvcase': ('CSVCaseIterator', 'CSVCaseRecorder'),
+    'openmdao.lib.casehandlers.dbcase': ('DBCaseIterator', 'DBCaseRecorder',
+                                         'case_db_to_dict'),
+    'openmdao.lib.casehandlers.dumpcase': ('DumpCaseRecorder',),
+    'openmdao.lib.casehandlers.npycase': ('NPYCaseIterator', 'NPYCaseRecorder'),
+    'openmdao.lib.casehandlers.listcase': ('ListCaseRecorder',
+                                           'ListCaseIterator'),
+
+    'openmdao.lib.casehandlers.caseset': ('CaseArray', 'CaseSet',
+                                          'caseiter_to_caseset'),
+
+    'openmdao.lib.casehandlers.filters': ('SequenceCaseFilter',
+                                          'SliceCaseFilter', 'ExprCaseFilter'),
+})
@@ -0,0 +1,217 @@
+"""
+A case recorder wrapper which records cases in a background thread, so that
+the driver loop does not wait on recorder I/O.
+"""
+
+import atexit
+import copy
+import logging
+import sys
+import threading
+import weakref
+
+from Queue import Queue, Full
+
+from numpy import ndarray
+
+from traits.trait_handlers import TraitListObject, TraitDictObject
+
+# pylint: disable-msg=E0611,F0401
+from openmdao.main.interfaces import implements, ICaseRecorder
+
+# Open recorders, flushed at exit.
+_RECORDERS = weakref.WeakKeyDictionary()
+
+_STOP = object()  # Tells the writer thread to exit.
+
+
+def _snapshot(case):
+    """ Copy mutable values in `case` so later changes to the model are not
+    seen by the writer thread.
+    """
+    for name, value in case.items():
+        if isinstance(value, ndarray):
+            case[name] = value.copy()
+        elif isinstance(value, (list, dict)):
+            if isinstance(value, TraitListObject):
+                value = list(value)
+            elif isinstance(value, TraitDictObject):
+                value = dict(value)
+            case[name] = copy.deepcopy(value)
+    case.uuid  # Ensure any lazy uuid is set in the caller's thread.
+    return case
+
+
+class AsyncRecorder(object):
+    """Wraps another case recorder and records cases from a background
+    thread. :meth:`record` just puts the case on a bounded queue, so the
+    caller doesn't wait for database commits or file writes.
+
+    recorder: ICaseRecorder
+        The recorder which actually records the cases. It is only
+        accessed from the writer thread until :meth:`flush` returns.
+
+    maxsize: int
+        Maximum number of cases waiting to be recorded. Zero implies no limit.
+
+    policy: string
+        What to do when the queue is full. 'block' waits for room,
+        'drop' discards the case (counted in `dropped`), and 'sync' records
+        the case in the caller's thread after waiting for the queue to drain.
+
+    timeout: float
+        If `policy` is 'block', the maximum seconds to wait for room before
+        raising :class:`RuntimeError`. None implies wait forever.
+
+    Errors raised by `recorder` are re-raised by the next call to
+    :meth:`record`, :meth:`flush`, or :meth:`close`. Once an error occurs,
+    subsequent cases are discarded. All queued cases are recorded before
+    :meth:`close` or :meth:`get_iterator` return, and at interpreter exit.
+    """
+
+    implements(ICaseRecorder)
+
+    def __init__(self, recorder, maxsize=1000, policy='block', timeout=None):
+        if policy not in ('block', 'drop', 'sync'):
+            raise ValueError("policy must be 'block', 'drop', or 'sync', not %r"
+                             % policy)
+        self.recorder = recorder
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+        self._closed = False
+        self._error = None
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        _RECORDERS[self] = True
+
+    def __getstate__(self):
+        """ Flush pending cases and omit the queue and thread. """
+        self.flush()
+        state = self.__dict__.copy()
+        state['_queue'] = None
+        state['_thread'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        _RECORDERS[self] = True
+
+    def _start(self):
+        """ Start the writer thread if necessary. """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._queue = Queue(self.maxsize)
+                self._thread = threading.Thread(target=self._writer,
+                                                args=(self._queue,),
+                                                name='AsyncRecorder')
+                self._thread.daemon = True
+                self._thread.start()
+        return self._queue
+
+    def _writer(self, queue):
+        """ Record cases from `queue` until told to stop. """
+        while True:
+            case = queue.get()
+            try:
+                if case is _STOP:
+                    return
+                if self._error is None:
+                    self.recorder.record(case)
+            except Exception:
+                self._error = sys.exc_info()
+                logging.exception('AsyncRecorder: %s failed',
+                                  type(self.recorder).__name__)
+            finally:
+                queue.task_done()
+
+    def _check_error(self):
+        """ Re-raise any error from the writer thread. """
+        if self._error is not None:
+            exc_info, self._error = self._error, None
+            raise exc_info[0], exc_info[1], exc_info[2]
+
+    def startup(self):
+        """ Start up the wrapped recorder and the writer thread. """
+        self.flush()
+        self.recorder.startup()
+        self._start()
+
+    def record(self, case):
+        """Queue `case` for recording."""
+        self._check_error()
+        if self._closed:
+            raise RuntimeError('Attempt to record on closed recorder')
+        queue = self._start()
+        _snapshot(case)
+        if self.policy == 'block':
+            try:
+                queue.put(case, timeout=self.timeout)
+            except Full:
+                raise RuntimeError('Timeout waiting for %s to record cases'
+                                   % type(self.recorder).__name__)
+        else:
+            try:
+                queue.put_nowait(case)
+            except Full:
+                if self.policy == 'drop':
+                    self.dropped += 1
+                else:
+                    self.flush()
+                    self.recorder.record(case)
+
+    def flush(self):
+        """Wait until all queued cases have been recorded."""
+        queue = self._queue
+        if queue is not None:
+            queue.join()
+        self._check_error()
+
+    def close(self):
+        """Record all queued cases, stop the writer thread, and close the
+        wrapped recorder."""
+        self._closed = True
+        try:
+            self._stop()
+            self._check_error()
+        finally:
+            self.recorder.close()
+        _RECORDERS.pop(self, None)
+
+    def _stop(self):
+        """ Drain the queue and stop the writer thread. """
+        with self._lock:
+            thread, queue = self._thread, self._queue
+            self._thread = self._queue = None
+        if thread is not None and thread.is_alive():
+            queue.put(_STOP)
+            thread.join()
+
+    def get_iterator(self):
+        """Return the wrapped recorder's iterator after recording all
+        queued cases."""
+        self.flush()
+        return self.recorder.get_iterator()
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = self.recorder.get_attributes(io_only)
+        attrs['type'] = '%s(%s)' % (type(self).__name__, attrs['type'])
+        return attrs
+
+
+@atexit.register
+def _flush_all():
+    """ Record any queued cases before the interpreter exits. """
+    for recorder in _RECORDERS.keys():
+        try:
+            recorder._stop()
+        except Exception:
+            pass
@@ -1,30 +1,121 @@
+"""
+Case containers that store their data by column. Each name/expression has
+a single NumPy array holding its values: bool, int64 or float64 for numeric
+data, and object arrays only where other types of values are recorded.
+"""
+
+import numpy
 
 from openmdao.main.case import Case
 from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
 
+_BOOL = numpy.dtype(bool)
+_INT = numpy.dtype(numpy.int64)
+_FLOAT = numpy.dtype(numpy.float64)
+_OBJECT = numpy.dtype(object)
+
+_MIN_CAPACITY = 16
+
+
+def _dtype_of(value):
+    """Return the column dtype needed to hold `value`."""
+    if isinstance(value, (bool, numpy.bool_)):
+        return _BOOL
+    if isinstance(value, (int, long, numpy.integer)):
+        if -2**63 <= value < 2**63:
+            return _INT
+        return _OBJECT
+    if isinstance(value, (float, numpy.floating)):
+        return _FLOAT
+    return _OBJECT
+
+
+def _promote(dtype, other):
+    """Return a column dtype able to hold values of `dtype` and `other`."""
+    if dtype == other:
+        return dtype
+    if dtype == _OBJECT or other == _OBJECT:
+        return _OBJECT
+    return numpy.promote_types(dtype, other)
+
+
+def _make_column(values):
+    """Return a column array containing `values`."""
+    try:
+        col = numpy.array(values)
+    except (TypeError, ValueError):  # Ragged sequences in newer NumPy.
+        col = None
+    if col is not None and col.ndim == 1 and col.dtype.kind in 'bif':
+        if col.dtype.kind == 'b':
+            return col
+        return col.astype(_INT if col.dtype.kind == 'i' else _FLOAT)
+    col = numpy.empty(len(values), _OBJECT)
+    for i, value in enumerate(values):
+        col[i] = value
+    return col
+
+
+def _column_equal(col, value):
+    """Return boolean array, True where `col` equals `value`."""
+    if col.dtype != _OBJECT:
+        if _dtype_of(value) == _OBJECT:
+            return numpy.zeros(len(col), bool)
+        return col == value
+    return numpy.fromiter((item == value for item in col), bool, len(col))
+
+
+def _columns_equal(col1, col2):
+    """Return boolean array, True where `col1` equals `col2`."""
+    if col1.dtype != _OBJECT and col2.dtype != _OBJECT:
+        return col1 == col2
+    return numpy.fromiter((item1 == item2 for item1, item2 in zip(col1, col2)),
+                          bool, len(col1))
+
+
+def _row_digests(columns, nrows):
+    """Return an array containing the hash of each row in `columns`."""
+    if not columns:
+        return numpy.array([hash(())] * nrows, _INT)
+    rows = zip(*[col.tolist() for col in columns])
+    return numpy.fromiter((hash(row) for row in rows), _INT, nrows)
+
+
+def _add_to_index(index, digest, row):
+    """Add `row` to the rows having `digest` in `index`."""
+    rows = index.setdefault(digest, row)
+    if rows != row:
+        if isinstance(rows, list):
+            rows.append(row)
+        else:
+            index[digest] = [rows, row]
+
+
 class CaseArray(object):
     """A CaseRecorder/CaseIterator containing Cases having the same set of
     input/output strings but different data. Cases are not necessarily unique.
+
+    Values are stored by column, one array per input/output, so accessing
+    all the values for a name via ``case_array[name]`` does not copy data.
     """
-    
+
     implements(ICaseIterator, ICaseRecorder)
-    
+
     def __init__(self, obj=None, parent_uuid=None, names=None):
         """
         obj: dict, Case, or None
             If obj is a dict, it is assumed to contain all var names/exprs as keys, with
             values that are lists.  All lists are assumed to have the same length.
-            
+
             If obj is a Case, the inputs and outputs of the Case will become those
             of the CaseSet, and any subsequent Cases that are added must have the
             same set of inputs and outputs.
-            
+
             If obj is None, the first Case that is recorded will be used to set
             the inputs and outputs for the CaseArray.
-        
+
         parent_uuid: UUID
             The id of the parent Case (if any).
-            
+
         names: iter of str
             Names/expressions that the Cases will contain. This is useful if you
             only want this container to keep track of some subset of the contents
@@ -35,7 +126,8 @@ class CaseArray(object):
             self._names = []
         else:
             self._names = names[:]
-        self._values = []
+        self._split_idx = 0
+        self.clear()
         if isinstance(obj, dict):
             self._add_dict_cases(obj)
         elif isinstance(obj, Case):
@@ -44,20 +136,36 @@ class CaseArray(object):
             pass
         else:
             raise TypeError("obj must be a dict, a Case, or None")
-    
+
+    def __getstate__(self):
+        """Return state without unused column capacity."""
+        state = self.__dict__.copy()
+        state['_columns'] = [col[:self._size].copy() for col in self._columns]
+        state['_capacity'] = self._size
+        return state
+
     def copy(self):
-        ca = CaseArray(parent_uuid=self._parent_uuid, names=self._names)
-        ca._values = self._values[:]
-        ca._split_idx = self._split_idx
-        return ca
-        
+        return self._new([col[:self._size].copy() for col in self._columns],
+                         self._size)
+
+    def _new(self, columns, size):
+        """Return a new container like this one, holding `columns`."""
+        obj = self.__class__(parent_uuid=self._parent_uuid, names=self._names)
+        obj._split_idx = self._split_idx
+        obj._columns = columns
+        obj._size = obj._capacity = size
+        return obj
+
     def remove(self, case):
         """Remove the given Case from this CaseArray."""
         try:
             values = self._get_case_data(case)
         except KeyError:
             raise KeyError("Case to be removed is not a member of this CaseArray")
-        self._values.remove(values)
+        row = self._find(values)
+        if row < 0:
+            raise ValueError("Case to be removed is not a member of this CaseArray")
+        self._delete(row)
 
     def _add_dict_cases(self, dct):
         length = -1
@@ -68,7 +176,7 @@ class CaseArray(object):
         else:
             self._names = dct.keys()
         self._split_idx = len(self._names) # treat all names as inputs
-        biglist = []
+        columns = []
         for key in self._names:
             val = dct[key]
             if not isinstance(key, basestring):
@@ -78,13 +186,10 @@ class CaseArray(object):
             if length != len(val):
                 raise ValueError("number of values at key '%s' (%d) differs " % (key,len(val)) +
                                  "from number of other values (%d) in CaseSet" % length)
-            biglist.append(val)
-        self._values = []
+            columns.append(_make_column(val))
+        self.clear()
         if length > 0:
-            idxs = range(len(self._names))
-            for i in range(length):
-                lst = [biglist[j][i] for j in idxs]
-                self._add_values(lst)
+            self._extend(columns, length)
 
     def _record_first_case(self, case):
         """Called the first time we record a Case"""
@@ -94,7 +199,7 @@ class CaseArray(object):
         else:
             names = case.keys(iotype='in')
             tmp = case.values(iotype='in')
-        self._split_idx = len(tmp)  # index where we switch from inputs to outputs
+        split_idx = len(tmp)  # index where we switch from inputs to outputs
         if self._names:
             outs = [t for t in case.items(iotype='out') if t[0] in self._names]
             names.extend([t[0] for t in outs])
@@ -106,15 +211,17 @@ class CaseArray(object):
             tmp.extend(case.values(iotype='out'))
 
         self._names = names
+        self._split_idx = split_idx
+        self.clear()
         self._add_values(tmp)
-        
+
     def record(self, case):
         """Record the given Case."""
-        if not self._values:
+        if not self._size:
             self._record_first_case(case)
         else:
             self._add_values(self._get_case_data(case))
-    
+
     def close(self):
         """Does nothing."""
         return
@@ -123,33 +230,42 @@ class CaseArray(object):
         return self._next_case()
 
     def _next_case(self):
-        for i in range(len(self._values)):
+        for i in xrange(self._size):
             yield self.__getitem__(i)
-    
+
     def __getitem__(self, key):
-        """If key is a varname or expression, returns a list of
-        all of the recorded values corresponding to that string. If key is an integer 
-        index 'i', returns a Case object containing the data for the i'th recorded 
-        case.
+        """If key is a varname or expression, returns a read-only array of
+        all of the recorded values corresponding to that string. The array
+        shares data with this container; it is not updated by subsequent
+        changes. If key is an integer index 'i', returns a Case object
+        containing the data for the i'th recorded case.
         """
         if isinstance(key, basestring): # return all of the values for the given name
-            try: 
+            try:
                 idx = self._names.index(key)
-            except ValueError as err: 
+            except ValueError as err:
                 raise KeyError("CaseSet has no input or outputs named %s"%key )
-            return [lst[idx] for lst in self._values]
-        else:  # key is the case numbe
-            return self._case_from_values(self._values[key])
-        
-    
-            
+            view = self._columns[idx][:self._size]
+            view.flags.writeable = False
+            return view
+        else:  # key is the case number
+            if key < 0:
+                key += self._size
+            if key < 0 or key >= self._size:
+                raise IndexError('case index out of range')
+            return self._case_from_values(self._row(key))
+
+    def _row(self, idx):
+        """Return tuple of values for the case at `idx`."""
+        return tuple([col.item(idx) for col in self._columns])
+
     def _case_from_values(self, values):
         return Case(inputs=[(n,v) for n,v in zip(self._names[0:self._split_idx],
                                                  values[0:self._split_idx])],
                     outputs=[(n,v) for n,v in zip(self._names[self._split_idx:],
                                                   values[self._split_idx:])],
                     parent_uuid=self._parent_uuid)
-        
+
     def _get_case_data(self, case):
         """Return a list of values for the case in the same order as our values.
         Raise a KeyError if any of our names are missing from the case.
@@ -158,13 +274,59 @@ class CaseArray(object):
             return [case[n] for n in self._names]
         except KeyError, err:
             raise KeyError("input or output is missing from case: %s" % str(err))
-        
+
+    def _find(self, values):
+        """Return the index of the first case matching `values`, or -1."""
+        mask = numpy.ones(self._size, bool)
+        for col, value in zip(self._columns, values):
+            mask &= _column_equal(col[:self._size], value)
+        rows = numpy.flatnonzero(mask)
+        return rows[0] if len(rows) else -1
+
+    def _reserve(self, nrows):
+        """Make room for a total of `nrows` cases."""
+        if nrows <= self._capacity:
+            return
+        capacity = max(nrows, 2*self._capacity, _MIN_CAPACITY)
+        for i, col in enumerate(self._columns):
+            new_col = numpy.empty(capacity, col.dtype)
+            new_col[:self._size] = col[:self._size]
+            self._columns[i] = new_col
+        self._capacity = capacity
+
+    def _set_dtype(self, idx, dtype):
+        """Convert column `idx` to `dtype` if necessary and return it."""
+        col = self._columns[idx]
+        dtype = _promote(col.dtype, dtype)
+        if dtype != col.dtype:
+            col = self._columns[idx] = col.astype(dtype)
+        return col
+
     def _add_values(self, vals):
-        self._values.append(vals)
+        row = self._size
+        self._reserve(row+1)
+        for i, value in enumerate(vals):
+            self._set_dtype(i, _dtype_of(value))[row] = value
+        self._size += 1
+
+    def _extend(self, columns, nrows):
+        """Add `nrows` cases whose values are in the arrays `columns`."""
+        start = self._size
+        self._reserve(start+nrows)
+        for i, values in enumerate(columns):
+            self._set_dtype(i, values.dtype)[start:start+nrows] = values
+        self._size += nrows
+
+    def _delete(self, row):
+        """Delete the case at `row`. Existing column views are unaffected."""
+        self._columns = [numpy.delete(col[:self._size], row)
+                         for col in self._columns]
+        self._size -= 1
+        self._capacity = self._size
 
     def __len__(self):
-        return len(self._values)
-    
+        return self._size
+
     def __contains__(self, case):
         if not isinstance(case, Case):
             return False
@@ -172,26 +334,40 @@ class CaseArray(object):
             values = self._get_case_data(case)
         except KeyError:
             return False
-        for val in self._values:
-            if val == values:
-                return True
-        return False
-    
+        return self._find(values) >= 0
+
     def clear(self):
         """Remove all case values from this container but leave list of
         variables intact.
         """
-        self._values = []
+        self._columns = [numpy.empty(0, _BOOL) for name in self._names]
+        self._size = self._capacity = 0
 
     def update(self, *case_containers):
         """Add Cases from other CaseSets or CaseArrays to this one."""
         for cset in case_containers:
+            if isinstance(cset, CaseArray) and cset._size:
+                if not self._size and not self._names:
+                    self._names = cset._names[:]
+                    self._split_idx = cset._split_idx
+                    self.clear()
+                if self._names == cset._names and \
+                   self._split_idx == cset._split_idx:
+                    self._extend([col[:cset._size] for col in cset._columns],
+                                 cset._size)
+                    continue
             for case in cset:
                 self.record(case)
-                
+
     def pop(self, idx=-1):
-        return self._case_from_values(self._values.pop(idx))
-                
+        if idx < 0:
+            idx += self._size
+        if idx < 0 or idx >= self._size:
+            raise IndexError('pop index out of range')
+        values = self._row(idx)
+        self._delete(idx)
+        return self._case_from_values(values)
+
     def _check_compatability(self, case_container):
         if self._names != case_container._names:
             raise ValueError("case containers have different sets of variables")
@@ -202,193 +378,311 @@ class CaseArray(object):
 class CaseSet(CaseArray):
     """A CaseRecorder/CaseIterator containing Cases having the same set of
     input/output strings but different data.  All Cases in the set are unique.
+
+    Uniqueness and set operations are based on a hash (digest) of each
+    case's values. Cases having equal digests are compared by value.
     """
-    
+
     def __init__(self, obj=None, parent_uuid=None, names=None):
         """
         obj: dict, Case, or None
             If obj is a dict, it is assumed to contain all var names as keys, with
             values that are lists.  All lists are assumed to have the same length.
-            
+
             If obj is a Case, the inputs and outputs of the Case will become those
             of the CaseSet, and any subsequent Cases that are added must have the
             same set of inputs and outputs.
-            
+
             If obj is None, the first Case that is recorded will be used to set
             the inputs and outputs for the CaseSet.
-        
+
         parent_uuid: UUID (optional)
             The id of the parent Case (if any).
-            
+
         names: iter of str (optional)
             Names/expressions that the Cases will contain. This is useful if you
             only want this container to keep track of some subset of the contents
             of Cases that are recorded in it.
         """
-        self._tupset = set()
         super(CaseSet, self).__init__(obj, parent_uuid, names)
 
+    def __getstate__(self):
+        """Return state without the (rebuildable) digest index."""
+        state = super(CaseSet, self).__getstate__()
+        state['_digests'] = self._digests[:self._size].copy()
+        state['_index'] = None
+        return state
+
     def copy(self):
-        cs = CaseSet(parent_uuid=self._parent_uuid, names=self._names)
-        cs._values = self._values[:]
-        cs._tupset = self._tupset.copy()
-        cs._split_idx = self._split_idx
+        return self._new([col[:self._size].copy() for col in self._columns],
+                         self._size, self._digests[:self._size].copy())
+
+    def _new(self, columns, size, digests=None):
+        """Return a new CaseSet holding `columns`."""
+        cs = super(CaseSet, self)._new(columns, size)
+        if digests is None:
+            digests = _row_digests(columns, size)
+        cs._digests = digests
+        cs._index = None
         return cs
-        
+
+    def _take(self, mask):
+        """Return a new CaseSet containing the cases selected by `mask`."""
+        return self._new([col[:self._size][mask] for col in self._columns],
+                         numpy.count_nonzero(mask),
+                         self._digests[:self._size][mask])
+
+    def _get_index(self):
+        """Return dictionary mapping digest to row(s), building if needed."""
+        if self._index is None:
+            self._index = index = {}
+            for row, digest in enumerate(self._digests[:self._size].tolist()):
+                _add_to_index(index, digest, row)
+        return self._index
+
+    def _find(self, values, digest=None):
+        """Return the index of the case matching `values`, or -1."""
+        values = tuple(values)
+        if digest is None:
+            digest = hash(values)
+        rows = self._get_index().get(digest)
+        if rows is None:
+            return -1
+        if not isinstance(rows, list):
+            rows = (rows,)
+        for row in rows:
+            if self._row(row) == values:
+                return row
+        return -1
+
+    def _in(self, case_set):
+        """Return boolean array, True where our case is in `case_set`."""
+        size = self._size
+        mask = numpy.zeros(size, bool)
+        if not size or not case_set._size:
+            return mask
+
+        # Match digests, then verify values for each candidate pair.
+        mine = self._digests[:size]
+        theirs = case_set._digests[:case_set._size]
+        order = numpy.argsort(theirs, kind='mergesort')
+        ordered = theirs[order]
+        pos = numpy.searchsorted(ordered, mine)
+        pos[pos == len(ordered)] = 0
+        rows = numpy.flatnonzero(ordered[pos] == mine)
+        partners = order[pos[rows]]
+        same = numpy.ones(len(rows), bool)
+        for col, other in zip(self._columns, case_set._columns):
+            same &= _columns_equal(col[rows], other[partners])
+        mask[rows[same]] = True
+
+        # Equal digests but different values, check other cases with digest.
+        for row in rows[~same]:
+            if case_set._find(self._row(row), int(mine[row])) >= 0:
+                mask[row] = True
+        return mask
+
     def _add_values(self, vals):
-        tup = tuple(vals)
-        if tup not in self._tupset:
-            self._tupset.add(tup)
-            self._values.append(tup)
+        vals = tuple(vals)
+        digest = hash(vals)
+        if self._find(vals, digest) < 0:
+            row = self._size
+            super(CaseSet, self)._add_values(vals)
+            self._digests[row] = digest
+            _add_to_index(self._index, digest, row)
+
+    def _extend(self, columns, nrows):
+        """Add the unique cases in `columns` that aren't already present."""
+        index = self._get_index()
+        start = self._size
+        super(CaseSet, self)._extend(columns, nrows)
+        digests = _row_digests([col[start:self._size] for col in self._columns],
+                               nrows)
+        self._digests[start:self._size] = digests
+
+        keep = numpy.ones(nrows, bool)
+        for i, digest in enumerate(digests.tolist()):
+            row = start + i
+            if digest in index and self._find(self._row(row), digest) >= 0:
+                keep[i] = False
+            else:
+                _add_to_index(index, digest, row)
+
+        if not keep.all():  # Compact the added cases.
+            end = start + numpy.count_nonzero(keep)
+            for col in self._columns:
+                col[start:end] = col[start:self._size][keep]
+            self._digests[start:end] = digests[keep]
+            self._size = end
+            self._index = None
+
+    def _union(self, case_set, mask):
+        """Add the cases in `case_set` selected by `mask`."""
+        start = self._size
+        nrows = numpy.count_nonzero(mask)
+        super(CaseSet, self)._extend([col[:case_set._size][mask]
+                                      for col in case_set._columns], nrows)
+        self._digests[start:self._size] = case_set._digests[:case_set._size][mask]
+        self._index = None
+
+    def _reserve(self, nrows):
+        if nrows > self._capacity:
+            super(CaseSet, self)._reserve(nrows)
+            digests = numpy.empty(self._capacity, _INT)
+            digests[:self._size] = self._digests[:self._size]
+            self._digests = digests
+
+    def _delete(self, row):
+        self._digests = numpy.delete(self._digests[:self._size], row)
+        self._index = None
+        super(CaseSet, self)._delete(row)
 
-    def __contains__(self, case):
-        if not isinstance(case, Case):
-            return False
-        try:
-            values = tuple(self._get_case_data(case))
-        except KeyError:
-            return False
-        return values in self._tupset
-    
-    def _make_case_set(self, tupset):
-        cs = CaseSet(parent_uuid=self._parent_uuid)
-        cs._names = self._names[:]
-        cs._values = list(tupset)
-        cs._tupset = tupset
-        cs._split_idx = self._split_idx
-        return cs
-    
     def isdisjoint(self, case_set):
         """Return True if this CaseSet has no Cases in common with the
         given CaseSet.
         """
         self._check_compatability(case_set)
-        return self._tupset.isdisjoint(case_set._tupset)
-    
+        return not self._in(case_set).any()
+
     def issubset(self, case_set):
         """Return True if every Case in this one is in the given CaseSet."""
         self._check_compatability(case_set)
-        return self._tupset.issubset(case_set._tupset)
-    
+        return bool(self._in(case_set).all())
+
     def issuperset(self, case_set):
         """Return True if every Case in the given CaseSet is in this one."""
         self._check_compatability(case_set)
-        return self._tupset.issuperset(case_set._tupset)
-    
+        return bool(case_set._in(self).all())
+
     def union(self, *case_sets):
         """Return a new CaseSet with Cases from this one
         and all others.
         """
-        tupsets = []
         for cset in case_sets:
             self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.union(*tupsets))
-    
+        result = self.copy()
+        for cset in case_sets:
+            result._union(cset, ~cset._in(result))
+        return result
+
     def intersection(self, *case_sets):
         """Return a new CaseSet with Cases that are common to this
         and all others.
         """
-        tupsets = []
+        mask = numpy.ones(self._size, bool)
         for cset in case_sets:
             self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.intersection(*tupsets))
-    
+            mask &= self._in(cset)
+        return self._take(mask)
+
     def difference(self, *case_sets):
         """Return a new CaseSet with Cases in this that are not in the
         others.
         """
-        tupsets = []
+        mask = numpy.ones(self._size, bool)
         for cset in case_sets:
             self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.difference(*tupsets))
-    
+            mask &= ~self._in(cset)
+        return self._take(mask)
+
     def symmetric_difference(self, case_set):
         """Return a new CaseSet with Cases in either this one or the other but
         not both.
         """
         self._check_compatability(case_set)
-        return self._make_case_set(self._tupset.symmetric_difference(case_set._tupset))
-    
+        result = self._take(~self._in(case_set))
+        result._union(case_set, ~case_set._in(self))
+        return result
+
     def clear(self):
         """Remove all case values from this CaseSet but leave list of
         variables intact.
         """
         super(CaseSet, self).clear()
-        self._tupset = set()
+        self._digests = numpy.empty(0, _INT)
+        self._index = {}
 
-    def pop(self, idx=-1):
-        vals = self._values.pop(idx)
-        self._tupset.remove(vals)
-        return self._case_from_values(vals)
-                
     def remove(self, case):
         try:
-            values = tuple(self._get_case_data(case))
+            values = self._get_case_data(case)
         except KeyError:
             raise KeyError("Case to be removed is not a member of this CaseSet")
-        self._tupset.remove(values)
-        self._values.remove(values)
+        row = self._find(values)
+        if row < 0:
+            raise KeyError("Case to be removed is not a member of this CaseSet")
+        self._delete(row)
 
     def __eq__(self, caseset):
         self._check_compatability(caseset)
-        return self._tupset == caseset._tupset
-    
+        return self._size == caseset._size and self.issubset(caseset)
+
     def __lt__(self, caseset):
         self._check_compatability(caseset)
-        return self._tupset < caseset._tupset
-        
+        return self._size < caseset._size and self.issubset(caseset)
+
     def __le__(self, caseset):
         self._check_compatability(caseset)
-        return self._tupset <= caseset._tupset
-        
+        return self.issubset(caseset)
+
     def __gt__(self, caseset):
         self._check_compatability(caseset)
-        return self._tupset > caseset._tupset
-        
+        return caseset < self
+
     def __ge__(self, caseset):
         self._check_compatability(caseset)
-        return self._tupset >= caseset._tupset
-        
+        return caseset <= self
+
     def __or__(self, caseset): return self.union(caseset)
-    
+
     def __and__(self, caseset): return self.intersection(caseset)
-    
+
     def __sub__(self, caseset): return self.difference(caseset)
-    
-    
+
+
 def caseiter_to_caseset(caseiter, varnames=None, include_errors=False):
     """
     Retrieve the values of specified variables from cases in a CaseIterator.
-    
+
     Returns a CaseSet containing cases with the specified varnames.
-    
-    Cases in the case iterator that do not have all of the specified 
+
+    Cases in the case iterator that do not have all of the specified
     varnames are ignored.
-    
+
     caseiter: CaseIterator
         A CaseIterator containing the cases of interest.
 
     varnames: iterator returning strs (optional) [None]
         Iterator of names of variables to be retrieved. If None, the list
-        of varnames in the first Case without errors returned from the case 
+        of varnames in the first Case without errors returned from the case
         iterator will be used.
-        
+
     include_errors: bool (optional) [False]
         If True, include data from cases that reported an error.
-        
+
     """
-    
+
     caseset = CaseSet()
+    rows = []
 
     for case in caseiter:
         if include_errors is False and case.msg:
             continue  # case reported an error, so don't use it
         if varnames is not None:
-            caseset.record(case.subcase(varnames))
-        else:
+            try:
+                case = case.subcase(varnames)
+            except KeyError:
+                continue
+        if not caseset._size:
             caseset.record(case)
+            continue
+        try:
+            rows.append(caseset._get_case_data(case))
+        except KeyError:
+            continue
+
+    # Data is collected by row, then added to the CaseSet by column.
+    if rows:
+        caseset._extend([_make_column(values) for values in zip(*rows)],
+                        len(rows))
     return caseset
-    
+
@@ -190,8 +190,9 @@ class DBCaseRecorder(object):
     def dbfile(self, value):
         """Set the DB file and connect to it."""
         self._dbfile = value
-        self._connection = sqlite3.connect(value)
-        self._iter_conn = sqlite3.connect(value)
+        # Recording may be done from another thread (see AsyncRecorder).
+        self._connection = sqlite3.connect(value, check_same_thread=False)
+        self._iter_conn = sqlite3.connect(value, check_same_thread=False)
     
     def startup(self):
         """ Opens the database for recordering."""
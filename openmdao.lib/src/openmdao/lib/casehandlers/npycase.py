@@ -0,0 +1,507 @@
+"""A CaseRecorder and CaseIterator that store cases in binary column files.
+
+Cases are grouped into *tables* by their variables. Cases with the same
+names, in the same order, and values of the same type (and array shape)
+share a table. Each variable of a table has its own column file, appended
+to in chunks. Numeric scalars and non-empty arrays are stored as raw
+fixed-size records, so columns may be memory-mapped when read back; other
+values are pickled to a separate data file with an (offset, size) record in
+the column file.
+
+Files in the recording directory:
+
+``tables.json``
+    Table definitions: for each table, its columns as
+    ``[name, iotype, dtype, shape]`` where `dtype` is null for pickled
+    values.
+
+``t<table>_c<column>.dat``
+    Column data. ``t<table>_c<column>.pkl`` holds pickled values.
+
+``index.dat``
+    One fixed-size record per case, in recording order, giving the table
+    and row of the case and an (offset, size) into ``text.dat``, which holds
+    the JSON-encoded uuids, label and message.
+
+Several recorders (in one or more processes) may append to the same
+directory. Appends are serialized by locking ``lock``. Column data is
+written before the index, so readers never see partially written cases.
+"""
+
+import json
+import os.path
+import re
+import threading
+
+from cPickle import dumps, loads, HIGHEST_PROTOCOL
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+import numpy
+
+from traits.trait_handlers import TraitListObject, TraitDictObject
+
+# pylint: disable-msg=E0611,F0401
+from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
+from openmdao.main.case import CaseSchema, CompactCase
+
+_TABLES = 'tables.json'
+_INDEX = 'index.dat'
+_TEXT = 'text.dat'
+_LOCK = 'lock'
+_COLUMN_FILE = re.compile(r't\d+_c\d+\.(dat|pkl)$')
+
+_INDEX_DTYPE = numpy.dtype([('table', '<i4'), ('row', '<i8'),
+                            ('retries', '<i4'), ('max_retries', '<i4'),
+                            ('text', '<i8'), ('text_size', '<i4')])
+
+_BLOB_DTYPE = numpy.dtype([('offset', '<i8'), ('size', '<i8')])
+
+
+def _value_format(value):
+    """Return (dtype string, shape) for fixed-size storage of `value`,
+    or (None, None) if it must be pickled.
+    """
+    if isinstance(value, numpy.ndarray):
+        # Empty arrays would have no data to count rows by.
+        if value.dtype.kind in 'biufc' and value.size:
+            return (value.dtype.str, value.shape)
+    elif isinstance(value, (bool, numpy.bool_)):
+        return ('|b1', ())
+    elif isinstance(value, (int, long, numpy.integer)):
+        if -2**63 <= value < 2**63:
+            return ('<i8', ())
+    elif isinstance(value, (float, numpy.floating)):
+        return ('<f8', ())
+    elif isinstance(value, (complex, numpy.complexfloating)):
+        return ('<c16', ())
+    return (None, None)
+
+
+def _map(path, dtype, shape=None):
+    """Return read-only memory map of `path`, or None if empty/missing."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    return numpy.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+
+class _FileLock(object):
+    """Exclusive lock of `path`, shared by processes and threads."""
+
+    def __init__(self, path):
+        self._file = open(path, 'a+b')
+
+    def __enter__(self):
+        if fcntl is None:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                except IOError:  # LK_LOCK gives up after 10 seconds.
+                    continue
+                break
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if fcntl is None:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        self._file.close()
+
+
+class _Table(object):
+    """Read access to a table's columns."""
+
+    def __init__(self, dirname, tid, columns):
+        self.names = [col[0] for col in columns]
+        inputs = [col[0] for col in columns if col[1] == 'in']
+        outputs = [col[0] for col in columns if col[1] != 'in']
+        self.schema = CaseSchema.get(inputs, outputs)
+        # Case values are ordered inputs first.
+        self.order = [i for i, col in enumerate(columns) if col[1] == 'in'] \
+                   + [i for i, col in enumerate(columns) if col[1] != 'in']
+        self.formats = [(col[2], tuple(col[3] or ())) for col in columns]
+        self.paths = [os.path.join(dirname, 't%d_c%d' % (tid, cid))
+                      for cid in range(len(columns))]
+        self.nrows = 0
+        self._columns = None
+
+    def columns(self, nrows):
+        """Return column maps for the first `nrows` rows."""
+        if self._columns is None or nrows > self.nrows:
+            self.nrows = nrows
+            self._columns = []
+            for path, (dtype, shape) in zip(self.paths, self.formats):
+                if dtype is None:
+                    self._columns.append((_map(path+'.dat', _BLOB_DTYPE,
+                                               (nrows,)),
+                                          _map(path+'.pkl', numpy.uint8)))
+                else:
+                    data = _map(path+'.dat', dtype, (nrows,)+shape)
+                    if data is None:  # No rows, or zero-size values.
+                        data = numpy.zeros((nrows,)+shape, dtype)
+                    self._columns.append(data)
+        return self._columns
+
+    def get(self, col, row, nrows):
+        """Return value in column `col` at `row`."""
+        data = self.columns(nrows)[col]
+        if isinstance(data, tuple):
+            offset, size = data[0][row]
+            return loads(data[1][offset:offset+size].tostring())
+        if data.ndim == 1:
+            return data[row].item()
+        return numpy.asarray(data[row])
+
+
+class NPYCaseIterator(object):
+    """Iterates over cases recorded by a :class:`NPYCaseRecorder` in the
+    directory `dirname`. Numeric array values are returned as read-only
+    arrays mapped from the column files rather than copies.
+    """
+
+    implements(ICaseIterator)
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        self._tables = []
+
+    def __iter__(self):
+        return self._next_case()
+
+    def __len__(self):
+        path = os.path.join(self.dirname, _INDEX)
+        if os.path.exists(path):
+            return os.path.getsize(path) // _INDEX_DTYPE.itemsize
+        return 0
+
+    def _load(self):
+        """Return (index, text) maps, updating table information."""
+        nrecs = len(self)
+        index = _map(os.path.join(self.dirname, _INDEX), _INDEX_DTYPE, (nrecs,))
+        if index is None:
+            return (numpy.zeros(0, _INDEX_DTYPE), None)
+        with open(os.path.join(self.dirname, _TABLES), 'r') as inp:
+            tables = json.load(inp)['tables']
+        for tid in range(len(self._tables), len(tables)):
+            self._tables.append(_Table(self.dirname, tid, tables[tid]))
+        return (index, _map(os.path.join(self.dirname, _TEXT), numpy.uint8))
+
+    def _table_rows(self, index):
+        """Return number of rows of each table referenced by `index`."""
+        nrows = numpy.zeros(len(self._tables), numpy.int64)
+        if len(index):
+            numpy.maximum.at(nrows, index['table'], index['row']+1)
+        return nrows
+
+    def _next_case(self):
+        """ Generator which returns Cases one at a time. """
+        index, text = self._load()
+        nrows = self._table_rows(index)
+        for rec in index:
+            tid, row = int(rec['table']), int(rec['row'])
+            table = self._tables[tid]
+            values = [table.get(col, row, nrows[tid]) for col in table.order]
+            start = rec['text']
+            info = json.loads(text[start:start+rec['text_size']].tostring())
+            retries = int(rec['retries'])
+            max_retries = int(rec['max_retries'])
+            yield CompactCase(schema=table.schema, values=values,
+                              label=info['label'], msg=info['msg'],
+                              case_uuid=info['uuid'],
+                              parent_uuid=info['parent_uuid'],
+                              retries=None if retries < 0 else retries,
+                              max_retries=None if max_retries < 0
+                                                else max_retries)
+
+    def get_column(self, name):
+        """Return the values of `name` from all cases containing it, in
+        recording order. If all values are numeric of the same type and
+        shape, an array is returned. If those values are all from one
+        table and are in the order recorded, the array is a memory map of
+        the column file. Otherwise a list of values is returned.
+
+        name: string
+            Name of variable.
+        """
+        index, text = self._load()
+        nrows = self._table_rows(index)
+        tids = [tid for tid, table in enumerate(self._tables)
+                if name in table.names]
+        mask = numpy.in1d(index['table'], tids)
+        recs = index[mask]
+        formats = set([self._tables[tid].formats[self._tables[tid].names.index(name)]
+                       for tid in set(recs['table'].tolist())])
+
+        if len(formats) == 1 and list(formats)[0][0] is not None:
+            dtype, shape = list(formats)[0]
+            if len(tids) == 1 and \
+               numpy.array_equal(recs['row'], numpy.arange(len(recs))):
+                table = self._tables[tids[0]]
+                return table.columns(nrows[tids[0]])[table.names.index(name)]
+            result = numpy.empty((len(recs),)+shape, dtype)
+            for tid in tids:
+                select = recs['table'] == tid
+                if select.any():
+                    table = self._tables[tid]
+                    col = table.columns(nrows[tid])[table.names.index(name)]
+                    result[select] = col[recs['row'][select]]
+            return result
+
+        values = []
+        for rec in recs:
+            table = self._tables[int(rec['table'])]
+            values.append(table.get(table.names.index(name), int(rec['row']),
+                                    nrows[int(rec['table'])]))
+        return values
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dirname"
+        attr['type'] = type(self.dirname).__name__
+        attr['value'] = str(self.dirname)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the directory containing the recorded cases.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
+
+
+class NPYCaseRecorder(object):
+    """Records Cases to binary column files in the directory `dirname`.
+    Cases are buffered and written `chunk_size` at a time, and when
+    :meth:`close` or :meth:`get_iterator` is called.
+
+    dirname: string
+        Directory for recorded data. Created if necessary.
+
+    chunk_size: int
+        Number of cases buffered before writing.
+
+    append: bool
+        If True, add to any existing cases in `dirname`, otherwise existing
+        cases are removed. Use True when several recorders share `dirname`.
+    """
+
+    implements(ICaseRecorder)
+
+    def __init__(self, dirname='cases', chunk_size=1000, append=False):
+        self.dirname = dirname
+        self.chunk_size = chunk_size
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self._file_lock = _FileLock(os.path.join(dirname, _LOCK))
+        self._lock = threading.Lock()
+        self._signatures = {}  # Maps signature to table id.
+        self._pending = []     # (signature, values, case info) per case.
+        self._closed = False
+        if not append:
+            with self._file_lock:
+                for name in os.listdir(dirname):
+                    if name in (_TABLES, _INDEX, _TEXT) or \
+                       _COLUMN_FILE.match(name):
+                        os.remove(os.path.join(dirname, name))
+
+    def startup(self):
+        """ Nothing needed for a NPY recorder."""
+        pass
+
+    def record(self, case):
+        """Record the given Case."""
+        if self._closed:
+            raise RuntimeError('Attempt to record on closed recorder')
+
+        signature = []
+        values = []
+        for iotype in ('in', 'out'):
+            for name, value in case.items(iotype=iotype):
+                dtype, shape = _value_format(value)
+                if dtype is None:
+                    if isinstance(value, TraitDictObject):
+                        value = dict(value)
+                    elif isinstance(value, TraitListObject):
+                        value = list(value)
+                signature.append((name, iotype, dtype, shape))
+                values.append(value)
+
+        info = dict(uuid=case.uuid, parent_uuid=case.parent_uuid,
+                    label=case.label, msg=case.msg)
+        retries = -1 if case.retries is None else case.retries
+        max_retries = -1 if case.max_retries is None else case.max_retries
+
+        with self._lock:
+            self._pending.append((tuple(signature), values,
+                                  (retries, max_retries, json.dumps(info))))
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+
+    def flush(self):
+        """Write any buffered cases."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Write buffered cases. Called with our lock held."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+
+        with self._file_lock:
+            # Group cases by table.
+            groups = {}
+            for signature, values, info in pending:
+                groups.setdefault(signature, []).append(values)
+            starts = {}
+            for signature, rows in groups.items():
+                tid = self._get_table(signature)
+                starts[signature] = self._write_rows(tid, signature, rows)
+
+            # Now append to index.
+            index = numpy.zeros(len(pending), _INDEX_DTYPE)
+            text_path = os.path.join(self.dirname, _TEXT)
+            with open(text_path, 'ab') as out:
+                out.seek(0, os.SEEK_END)
+                offset = out.tell()
+                for i, (signature, values, info) in enumerate(pending):
+                    rec = index[i]
+                    rec['table'] = self._signatures[signature]
+                    rec['row'] = starts[signature]
+                    starts[signature] += 1
+                    rec['retries'], rec['max_retries'], text = info
+                    rec['text'] = offset
+                    rec['text_size'] = len(text)
+                    out.write(text)
+                    offset += len(text)
+            with open(os.path.join(self.dirname, _INDEX), 'ab') as out:
+                index.tofile(out)
+
+    def _get_table(self, signature):
+        """Return table id for `signature`, creating the table if necessary.
+        Called with the file lock held.
+        """
+        tid = self._signatures.get(signature)
+        if tid is not None:
+            return tid
+
+        path = os.path.join(self.dirname, _TABLES)
+        if os.path.exists(path):
+            with open(path, 'r') as inp:
+                tables = json.load(inp)['tables']
+        else:
+            tables = []
+        columns = [[name, iotype, dtype, list(shape) if shape is not None else None]
+                   for name, iotype, dtype, shape in signature]
+        if columns in tables:
+            tid = tables.index(columns)
+        else:
+            tid = len(tables)
+            tables.append(columns)
+            tmp = path+'.tmp'
+            with open(tmp, 'w') as out:
+                json.dump({'tables': tables}, out)
+            if os.path.exists(path) and os.name == 'nt':
+                os.remove(path)  # Windows rename won't replace.
+            os.rename(tmp, path)
+        self._signatures[signature] = tid
+        return tid
+
+    def _write_rows(self, tid, signature, rows):
+        """Append `rows` to table `tid`, returning the first row number.
+        Called with the file lock held.
+        """
+        paths = [os.path.join(self.dirname, 't%d_c%d.dat' % (tid, cid))
+                 for cid in range(len(signature))]
+        itemsizes = []
+        for name, iotype, dtype, shape in signature:
+            if dtype is None:
+                itemsizes.append(_BLOB_DTYPE.itemsize)
+            else:
+                itemsizes.append(numpy.dtype(dtype).itemsize
+                                 * int(numpy.prod(shape)))
+
+        # Discard any partial rows left by an interrupted writer.
+        # Zero-size columns (from older recordings) can't be counted.
+        start = None
+        for path, itemsize in zip(paths, itemsizes):
+            if itemsize:
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                nrows = size // itemsize
+                start = nrows if start is None else min(start, nrows)
+        start = start or 0
+        for path, itemsize in zip(paths, itemsizes):
+            with open(path, 'ab') as out:
+                out.truncate(start*itemsize)
+
+        for cid, (path, (name, iotype, dtype, shape)) in \
+                enumerate(zip(paths, signature)):
+            data = [row[cid] for row in rows]
+            if dtype is None:
+                blobs = [dumps(value, HIGHEST_PROTOCOL) for value in data]
+                with open(path[:-4]+'.pkl', 'ab') as out:
+                    out.seek(0, os.SEEK_END)
+                    offset = out.tell()
+                    out.write(''.join(blobs))
+                sizes = numpy.array([len(blob) for blob in blobs], numpy.int64)
+                records = numpy.empty(len(blobs), _BLOB_DTYPE)
+                records['size'] = sizes
+                records['offset'] = offset + numpy.cumsum(sizes) - sizes
+                data = records
+            else:
+                data = numpy.asarray(data, dtype=dtype)
+            with open(path, 'ab') as out:
+                data.tofile(out)
+        return start
+
+    def close(self):
+        """Write any buffered cases and close."""
+        if not self._closed:
+            self.flush()
+            self._file_lock.close()
+            self._closed = True
+
+    def get_iterator(self):
+        """Return a NPYCaseIterator for our directory."""
+        if not self._closed:
+            self.flush()
+        return NPYCaseIterator(self.dirname)
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dirname"
+        attr['id'] = attr['name']
+        attr['type'] = type(self.dirname).__name__
+        attr['value'] = str(self.dirname)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the directory for recorded cases.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
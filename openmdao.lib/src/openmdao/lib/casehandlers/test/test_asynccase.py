@@ -0,0 +1,146 @@
+"""
+Test AsyncRecorder.
+"""
+
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import nose
+
+import numpy
+
+from openmdao.main.api import Assembly, Case, set_as_top
+from openmdao.lib.casehandlers.api import AsyncRecorder, DBCaseRecorder, \
+                                          ListCaseIterator, ListCaseRecorder
+from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
+from openmdao.test.execcomp import ExecComp
+
+
+class SlowRecorder(ListCaseRecorder):
+    """ Waits for `event` before recording, optionally fails. """
+
+    def __init__(self, fail_at=None):
+        super(SlowRecorder, self).__init__()
+        self.event = threading.Event()
+        self.event.set()
+        self.fail_at = fail_at
+        self.threads = set()
+
+    def record(self, case):
+        self.event.wait()
+        self.threads.add(threading.current_thread().name)
+        if len(self.cases) == self.fail_at:
+            raise IOError('disk full')
+        super(SlowRecorder, self).record(case)
+
+
+class TestCase(unittest.TestCase):
+    """ Test AsyncRecorder. """
+
+    def test_record(self):
+        logging.debug('')
+        logging.debug('test_record')
+
+        wrapped = SlowRecorder()
+        recorder = AsyncRecorder(wrapped, maxsize=10)
+        arr = numpy.zeros(3)
+        for i in range(100):
+            arr[0] = i
+            recorder.record(Case(inputs=[('x', i)], outputs=[('y', arr)]))
+        cases = list(recorder.get_iterator())
+        self.assertEqual([case['x'] for case in cases], range(100))
+        # Arrays are copied when queued.
+        self.assertEqual([case['y'][0] for case in cases], range(100))
+        self.assertEqual(wrapped.threads, set(['AsyncRecorder']))
+        self.assertEqual(recorder.get_attributes()['type'],
+                         'AsyncRecorder(SlowRecorder)')
+        recorder.close()
+        self.assertRaises(RuntimeError, recorder.record, Case())
+
+    def test_policy(self):
+        logging.debug('')
+        logging.debug('test_policy')
+
+        self.assertRaises(ValueError, AsyncRecorder, None, policy='wait')
+
+        # Drop cases when full.
+        wrapped = SlowRecorder()
+        wrapped.event.clear()
+        recorder = AsyncRecorder(wrapped, maxsize=2, policy='drop')
+        for i in range(10):
+            recorder.record(Case(inputs=[('x', i)]))
+        self.assertTrue(recorder.dropped >= 7)
+        wrapped.event.set()
+        recorder.close()
+        self.assertEqual(len(wrapped.cases) + recorder.dropped, 10)
+
+        # Timeout when full.
+        wrapped = SlowRecorder()
+        wrapped.event.clear()
+        recorder = AsyncRecorder(wrapped, maxsize=1, timeout=0.1)
+        try:
+            for i in range(3):
+                recorder.record(Case(inputs=[('x', i)]))
+        except RuntimeError as exc:
+            self.assertEqual(str(exc),
+                             'Timeout waiting for SlowRecorder to record cases')
+        else:
+            self.fail('Expected RuntimeError')
+        wrapped.event.set()
+        recorder.close()
+
+        # Record synchronously when full.
+        wrapped = SlowRecorder()
+        recorder = AsyncRecorder(wrapped, maxsize=1, policy='sync')
+        for i in range(20):
+            recorder.record(Case(inputs=[('x', i)]))
+        recorder.close()
+        self.assertEqual([case['x'] for case in wrapped.cases], range(20))
+
+    def test_error(self):
+        logging.debug('')
+        logging.debug('test_error')
+
+        wrapped = SlowRecorder(fail_at=5)
+        wrapped.event.clear()
+        recorder = AsyncRecorder(wrapped)
+        for i in range(10):
+            recorder.record(Case(inputs=[('x', i)]))
+        wrapped.event.set()
+        self.assertRaises(IOError, recorder.flush)
+        self.assertEqual(len(wrapped.cases), 5)
+        recorder.flush()  # Error is only reported once.
+        recorder.close()
+
+    def test_driver(self):
+        logging.debug('')
+        logging.debug('test_driver')
+
+        directory = tempfile.mkdtemp(prefix='test_asynccase_')
+        try:
+            dbfile = os.path.join(directory, 'cases.db')
+            top = set_as_top(Assembly())
+            top.add('comp', ExecComp(exprs=['z=x*2']))
+            driver = top.add('driver', SimpleCaseIterDriver())
+            driver.workflow.add('comp')
+            driver.iterator = ListCaseIterator(
+                [Case(inputs=[('comp.x', float(i))], outputs=['comp.z'])
+                 for i in range(5)])
+            driver.recorders = [AsyncRecorder(DBCaseRecorder(dbfile))]
+            top.run()
+            cases = list(driver.recorders[0].get_iterator())
+            self.assertEqual(sorted([case['comp.z'] for case in cases]),
+                             [0., 2., 4., 6., 8.])
+            driver.recorders[0].close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.lib.casehandlers')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
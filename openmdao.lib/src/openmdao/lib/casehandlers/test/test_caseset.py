@@ -1,5 +1,8 @@
+import cPickle
 import unittest
 
+import numpy
+
 from openmdao.main.api import Case
 from openmdao.lib.casehandlers.api import CaseSet, CaseArray, ListCaseIterator, \
                                           caseiter_to_caseset
@@ -23,7 +26,7 @@ class CaseArrayTestCase(unittest.TestCase):
         self.assertEqual(3, len(cs))
         self.assertEqual(set(['comp1.a','comp1.b','comp2.b']),
                          set(cs._names))
-        self.assertEqual(cs['comp1.a'], [2,4,6])
+        self.assertEqual(list(cs['comp1.a']), [2,4,6])
         case = cs[1]
         expected = Case(inputs=[('comp1.a',4),('comp1.b',8),('comp2.b',2)])
         self.assertEqual(case._inputs, expected._inputs)
@@ -76,6 +79,35 @@ class CaseArrayTestCase(unittest.TestCase):
         self.assertTrue(self.case1_dup in ca)
         self.assertFalse(self.case2 in ca)
         self.assertFalse(None in ca)
+
+    def test_columns(self):
+        ca = CaseArray()
+        ca.record(Case(inputs=[('x', 1), ('flag', True), ('s', 'a')]))
+        col = ca['x']
+        self.assertEqual(col.dtype, numpy.int64)
+        self.assertEqual(ca['flag'].dtype, bool)
+        self.assertEqual(ca['s'].dtype, object)
+        self.assertRaises(ValueError, col.__setitem__, 0, 2)
+
+        # Column is promoted as needed, existing views are unchanged.
+        ca.record(Case(inputs=[('x', 2.5), ('flag', 2), ('s', 'b')]))
+        self.assertEqual(ca['x'].dtype, numpy.float64)
+        self.assertEqual(list(ca['x']), [1., 2.5])
+        self.assertEqual(list(ca['flag']), [1, 2])
+        self.assertEqual(list(col), [1])
+        self.assertEqual(ca[-1]['s'], 'b')
+        self.assertRaises(IndexError, ca.__getitem__, 2)
+
+        # Column access doesn't copy.
+        self.assertTrue(numpy.may_share_memory(ca['x'], ca['x']))
+
+        ca.remove(Case(inputs=[('x', 1.), ('flag', 1), ('s', 'a')]))
+        self.assertEqual(len(ca), 1)
+        self.assertEqual(ca.pop()['x'], 2.5)
+
+        ca = CaseArray({'x': range(100)})
+        ca2 = cPickle.loads(cPickle.dumps(ca, -1))
+        self.assertEqual(list(ca2['x']), range(100))
         
 
 class CaseSetTestCase(unittest.TestCase):
@@ -102,7 +134,7 @@ class CaseSetTestCase(unittest.TestCase):
         self.assertEqual(3, len(cs))
         self.assertEqual(set(['comp1.a','comp1.b','comp2.b']),
                          set(cs._names))
-        self.assertEqual(cs['comp1.a'], [2,4,6])
+        self.assertEqual(list(cs['comp1.a']), [2,4,6])
         case = cs[1]
         expected = Case(inputs=[('comp1.a',4),('comp1.b',8),('comp2.b',2)])
         self.assertEqual(case._inputs, expected._inputs)
@@ -116,7 +148,7 @@ class CaseSetTestCase(unittest.TestCase):
         self.assertEqual(3, len(cs))
         self.assertEqual(set(['comp1.a','comp2.b']),
                          set(cs._names))
-        self.assertEqual(cs['comp1.a'], [2,4,6])
+        self.assertEqual(list(cs['comp1.a']), [2,4,6])
         case = cs[1]
         expected = Case(inputs=[('comp1.a',4),('comp2.b',2)])
         self.assertEqual(case._inputs, expected._inputs)
@@ -222,6 +254,43 @@ class CaseSetTestCase(unittest.TestCase):
         self.assertEqual(len(cs_intersect), 1)
         self.assertEqual(cs_intersect[0], self.case1)
         
+    def test_digests(self):
+        # hash(-1) == hash(-2), so these cases have equal digests.
+        cs = CaseSet()
+        cs.record(Case(inputs=[('x', -1)]))
+        cs.record(Case(inputs=[('x', -2)]))
+        cs.record(Case(inputs=[('x', -1.)]))
+        self.assertEqual(len(cs), 2)
+        self.assertTrue(Case(inputs=[('x', -2)]) in cs)
+        self.assertFalse(Case(inputs=[('x', -3)]) in cs)
+
+        cs2 = CaseSet({'x': [-2, 3]})
+        self.assertEqual(list((cs & cs2)['x']), [-2])
+        self.assertEqual(list((cs - cs2)['x']), [-1])
+        self.assertEqual(sorted((cs | cs2)['x']), [-2, -1, 3])
+        self.assertEqual(sorted(cs.symmetric_difference(cs2)['x']), [-1, 3])
+
+        cs.remove(Case(inputs=[('x', -1)]))
+        self.assertEqual(list(cs['x']), [-2])
+        self.assertRaises(KeyError, cs.remove, Case(inputs=[('x', -1)]))
+
+    def test_bulk(self):
+        n = 10000
+        cs1 = CaseSet({'x': numpy.arange(n), 'y': numpy.arange(n) * 0.5})
+        cs2 = CaseSet({'x': numpy.arange(n/2, n+n/2),
+                       'y': numpy.arange(n/2, n+n/2) * 0.5})
+        cs2.update(cs1)
+        self.assertEqual(len(cs2), n+n/2)
+        self.assertTrue(cs1 < cs2)
+        self.assertEqual(len(cs1 & cs2), n)
+        self.assertEqual(len(cs2 - cs1), n/2)
+        self.assertTrue((cs2 - cs1).isdisjoint(cs1))
+        self.assertTrue(cs2.issuperset(cs2.copy()))
+
+        cs = caseiter_to_caseset(list(cs2) + list(cs1))
+        self.assertTrue(cs == cs2)
+        self.assertEqual(cs['x'].dtype, numpy.int64)
+
     def test_caseiter_to_caseset(self):
         cases = ListCaseIterator(self.caselist[3:])
         cs = caseiter_to_caseset(cases)
@@ -0,0 +1,172 @@
+"""
+Test NPYCaseRecorder and NPYCaseIterator.
+"""
+
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import nose
+
+import numpy
+
+from openmdao.main.api import Assembly, Case, set_as_top
+from openmdao.lib.casehandlers.api import ListCaseIterator, \
+                                          NPYCaseIterator, NPYCaseRecorder
+from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
+from openmdao.test.execcomp import ExecComp
+
+
+class TestCase(unittest.TestCase):
+    """ Test NPYCaseRecorder and NPYCaseIterator. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test_npycase_')
+        self.dirname = os.path.join(self.directory, 'cases')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_record(self):
+        logging.debug('')
+        logging.debug('test_record')
+
+        recorder = NPYCaseRecorder(self.dirname, chunk_size=3)
+        cases = []
+        for i in range(10):
+            case = Case(inputs=[('x', float(i)), ('n', i), ('flag', i > 4)],
+                        outputs=[('arr', numpy.arange(5.) * i),
+                                 ('name', 'case%d' % i)],
+                        label='label%d' % i, parent_uuid='parent')
+            if i == 7:
+                case.msg = 'failed'
+                case.retries = 2
+            recorder.record(case)
+            cases.append(case)
+        # A case with a different array shape uses another table.
+        case = Case(inputs=[('x', 10.)], outputs=[('arr', numpy.zeros(2))])
+        recorder.record(case)
+        cases.append(case)
+
+        iterator = recorder.get_iterator()
+        self.assertEqual(len(iterator), 11)
+        for expected, case in zip(cases, iterator):
+            self.assertEqual(case.uuid, expected.uuid)
+            self.assertEqual(case.parent_uuid, expected.parent_uuid)
+            self.assertEqual(case.label, expected.label)
+            self.assertEqual(case.msg, expected.msg)
+            self.assertEqual(case.retries, expected.retries)
+            self.assertEqual(sorted(case.keys('in')),
+                             sorted(expected.keys('in')))
+            for name, value in expected.items():
+                if isinstance(value, numpy.ndarray):
+                    self.assertTrue(numpy.all(case[name] == value))
+                else:
+                    self.assertEqual(case[name], value)
+                    self.assertEqual(type(case[name]), type(value))
+
+        # Single table column is mapped.
+        n = iterator.get_column('n')
+        self.assertTrue(isinstance(n, numpy.memmap))
+        self.assertEqual(list(n), range(10))
+        names = iterator.get_column('name')
+        self.assertEqual(names, ['case%d' % i for i in range(10)])
+        arr = iterator.get_column('arr')
+        self.assertEqual(len(arr), 11)
+        self.assertEqual(arr[9].shape, (5,))
+        self.assertEqual(arr[9][4], 36.)
+        self.assertEqual(arr[10].shape, (2,))
+        x = iterator.get_column('x')
+        self.assertEqual(list(x), range(11))
+        recorder.close()
+        self.assertRaises(RuntimeError, recorder.record, case)
+
+        # Re-open without append. Only recorder files are removed.
+        for name in ('test.dat', 'table.pkl', 't1_c0.dat.bak'):
+            with open(os.path.join(self.dirname, name), 'w') as out:
+                out.write('keep')
+        recorder = NPYCaseRecorder(self.dirname)
+        self.assertEqual(len(recorder.get_iterator()), 0)
+        recorder.close()
+        self.assertEqual(sorted(os.listdir(self.dirname)),
+                         ['lock', 't1_c0.dat.bak', 'table.pkl', 'test.dat'])
+
+    def test_empty_array(self):
+        logging.debug('')
+        logging.debug('test_empty_array')
+
+        # Several chunks with an empty array value.
+        recorder = NPYCaseRecorder(self.dirname, chunk_size=2)
+        for i in range(6):
+            recorder.record(Case(inputs=[('x', i)],
+                                 outputs=[('empty', numpy.zeros(0)),
+                                          ('arr', numpy.ones(2) * i)]))
+        recorder.close()
+
+        iterator = NPYCaseIterator(self.dirname)
+        self.assertEqual(len(iterator), 6)
+        for i, case in enumerate(iterator):
+            self.assertEqual(case['x'], i)
+            self.assertEqual(case['empty'].shape, (0,))
+            self.assertEqual(list(case['arr']), [i, i])
+        self.assertEqual(list(iterator.get_column('x')), range(6))
+        self.assertEqual([value.shape
+                          for value in iterator.get_column('empty')],
+                         [(0,)] * 6)
+
+    def test_concurrent(self):
+        logging.debug('')
+        logging.debug('test_concurrent')
+
+        def record(tag):
+            recorder = NPYCaseRecorder(self.dirname, chunk_size=7, append=True)
+            for i in range(100):
+                recorder.record(Case(inputs=[('%s.x' % tag, i)],
+                                     outputs=[('y', numpy.ones(3) * i)]))
+            recorder.close()
+
+        threads = [threading.Thread(target=record, args=(tag,))
+                   for tag in ('a', 'b', 'c')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        iterator = NPYCaseIterator(self.dirname)
+        self.assertEqual(len(iterator), 300)
+        counts = {}
+        for case in iterator:
+            name = case.keys('in')[0]
+            i = case[name]
+            self.assertEqual(i, counts.get(name, 0))
+            self.assertEqual(list(case['y']), [i, i, i])
+            counts[name] = i + 1
+        self.assertEqual(sorted(counts.values()), [100, 100, 100])
+        self.assertEqual(len(iterator.get_column('y')), 300)
+
+    def test_driver(self):
+        logging.debug('')
+        logging.debug('test_driver')
+
+        top = set_as_top(Assembly())
+        top.add('comp', ExecComp(exprs=['z=x*2']))
+        driver = top.add('driver', SimpleCaseIterDriver())
+        driver.workflow.add('comp')
+        driver.iterator = ListCaseIterator([Case(inputs=[('comp.x', float(i))],
+                                                 outputs=['comp.z'])
+                                            for i in range(5)])
+        driver.recorders = [NPYCaseRecorder(self.dirname)]
+        top.run()
+        driver.recorders[0].close()
+
+        z = NPYCaseIterator(self.dirname).get_column('comp.z')
+        self.assertEqual(list(z), [0., 2., 4., 6., 8.])
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.lib.casehandlers')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -1,14 +1,18 @@
 """Pseudo package providing a central place to access all of the
 OpenMDAO components in the standard library."""
 
-from openmdao.lib.components.external_code import ExternalCode
-from openmdao.lib.components.metamodel import MetaModel
-from openmdao.lib.components.pareto_filter import ParetoFilter
-from openmdao.lib.components.expected_improvement import ExpectedImprovement
-from openmdao.lib.components.expected_improvement_multiobj import MultiObjExpectedImprovement
-from openmdao.lib.components.mux import Mux, DeMux
-from openmdao.lib.components.broadcaster import Broadcaster
-from openmdao.lib.components.linear_distribution import LinearDistribution
-from openmdao.test.execcomp import ExecComp, ExecCompWithDerivatives
-from openmdao.lib.components.lazy_comp import LazyComponent
-from openmdao.lib.components.geomcomp import GeomComponent
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.components.external_code': ('ExternalCode',),
+    'openmdao.lib.components.metamodel': ('MetaModel',),
+    'openmdao.lib.components.pareto_filter': ('ParetoFilter',),
+    'openmdao.lib.components.expected_improvement': ('ExpectedImprovement',),
+    'openmdao.lib.components.expected_improvement_multiobj': ('MultiObjExpectedImprovement',),
+    'openmdao.lib.components.mux': ('Mux', 'DeMux'),
+    'openmdao.lib.components.broadcaster': ('Broadcaster',),
+    'openmdao.lib.components.linear_distribution': ('LinearDistribution',),
+    'openmdao.test.execcomp': ('ExecComp', 'ExecCompWithDerivatives'),
+    'openmdao.lib.components.lazy_comp': ('LazyComponent',),
+    'openmdao.lib.components.geomcomp': ('GeomComponent',),
+})
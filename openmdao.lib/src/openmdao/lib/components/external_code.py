@@ -19,6 +19,8 @@ from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
 from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.procpool import ProcessPool
+from openmdao.util.resultcache import ResultCache
 from openmdao.util import shellproc
 
 
@@ -48,6 +50,17 @@ class ExternalCode(Component):
     timeout = Float(0., low=0., iotype='in', units='s',
                     desc='Maximum time to wait for command completion.'
                          ' A value of zero implies an infinite wait.')
+    local_pool = Bool(False, iotype='in',
+                      desc='If True (and no resources are specified), run'
+                           ' the command in a scratch directory via the'
+                           ' shared local process pool.')
+    cache_dir = Str('', iotype='in',
+                    desc='If set, directory of an on-disk cache of results.'
+                         ' A run whose command, environment, and input files'
+                         ' match a cached run is skipped and the cached'
+                         ' output files are used instead.')
+    cache_size = Float(1024., low=0., iotype='in',
+                       desc='Maximum size of the result cache in MB.')
     timed_out = Bool(False, iotype='out', desc='True if the command timed-out.')
     return_code = Int(0, iotype='out', desc='Return code from the command.')
 
@@ -61,6 +74,7 @@ class ExternalCode(Component):
 
         self._process = None
         self._server = None
+        self.run_stats = None
 
     # This gets used by remote server.
     def get_access_controller(self):  #pragma no cover
@@ -72,7 +86,8 @@ class ExternalCode(Component):
         """
         Don't allow setting of 'command' or 'resources' by a remote client.
         """
-        if path in ('command', 'resources', 'get_access_controller') \
+        if path in ('command', 'resources', 'cache_dir',
+                    'get_access_controller') \
            and remote_access():
             self.raise_exception('%r may not be set() remotely' % path,
                                  RuntimeError)
@@ -92,7 +107,21 @@ class ExternalCode(Component):
 
         If `resources` have been specified, an appropriate server
         is allocated and the command is run on that server.
-        Otherwise the command is run locally.
+        Otherwise the command is run locally. If `local_pool` is True, the
+        local run happens in a scratch directory populated with the input
+        files, and is limited by the number of slots in the shared
+        :class:`ProcessPool`. This allows several instances executing in
+        different threads to run concurrently without interfering with
+        each other's files. The CPU time, wall time, and peak memory of the
+        run are saved in `run_stats`.
+
+        If `cache_dir` is set, a key is computed from the command,
+        `env_vars`, and the contents of the input files. If the cache holds
+        results for that key, the cached output files are copied into place
+        and the command is not run. Otherwise results of a successful run
+        are added to the cache. Hit and miss counts and the bytes and time
+        saved are available from the cache object returned by
+        :meth:`get_result_cache`.
 
         When running remotely, the following resources are set:
 
@@ -137,17 +166,33 @@ class ExternalCode(Component):
         """
         self.return_code = -12345678
         self.timed_out = False
+        self.run_stats = None
 
         if not self.command:
             self.raise_exception('Empty command list', ValueError)
 
         self.check_files(inputs=True)
 
+        cache = self.get_result_cache()
+        if cache is not None:
+            directory = self.get_abs_directory()
+            inputs, outputs = self._cache_patterns()
+            key = cache.compute_key(self.command, self.env_vars,
+                                    inputs, outputs, directory)
+            return_code = cache.lookup(key, directory)
+            if return_code is not None:
+                self._logger.info('using cached results for %s', self.command)
+                self.return_code = return_code
+                return
+
         return_code = None
         error_msg = ''
+        start_time = time.time()
         try:
             if self.resources:
                 return_code, error_msg = self._execute_remote()
+            elif self.local_pool:
+                return_code, error_msg = self._execute_pooled()
             else:
                 return_code, error_msg = self._execute_local()
 
@@ -160,8 +205,9 @@ class ExternalCode(Component):
 
             elif return_code:
                 if isinstance(self.stderr, str):
-                    if os.path.exists(self.stderr):
-                        stderrfile = open(self.stderr, 'r')
+                    path = os.path.join(self.get_abs_directory(), self.stderr)
+                    if os.path.exists(path):
+                        stderrfile = open(path, 'r')
                         error_desc = stderrfile.read()
                         stderrfile.close()
                         err_fragment = "\nError Output:\n%s" % error_desc
@@ -175,9 +221,64 @@ class ExternalCode(Component):
 
             if self.check_external_outputs:
                 self.check_files(inputs=False)
+
+            if cache is not None:
+                cache.store(key, outputs, return_code,
+                            time.time() - start_time, directory)
         finally:
             self.return_code = -999999 if return_code is None else return_code
 
+    def get_result_cache(self):
+        """
+        Return the :class:`ResultCache` for `cache_dir`, or None if
+        caching is not enabled.
+        """
+        if not self.cache_dir:
+            return None
+        with self.dir_context:
+            return ResultCache.get_instance(self.cache_dir,
+                                            int(self.cache_size * 1024 * 1024))
+
+    def _file_patterns(self):
+        """
+        Return ``(inputs, outputs)`` for the external files and file
+        variables. `inputs` is a list of ``(pattern, link)``, where `link`
+        is False if the file may be rewritten by the command. `outputs` is
+        a list of patterns.
+        """
+        inputs = []
+        outputs = []
+        for metadata in self.external_files:
+            is_output = metadata.get('output', False)
+            if metadata.get('input', False):
+                # Files which may be rewritten can't share the original inode.
+                inputs.append((metadata.path, not is_output))
+            if is_output:
+                outputs.append(metadata.path)
+        for pathname, obj in self.items(iotype='in', recurse=True):
+            if isinstance(obj, FileRef):
+                local_path = self.get_metadata(pathname, 'local_path')
+                if local_path:
+                    inputs.append((local_path, True))
+        for pathname, obj in self.items(iotype='out', recurse=True):
+            if isinstance(obj, FileRef):
+                outputs.append(obj.path)
+        return (inputs, outputs)
+
+    def _cache_patterns(self):
+        """
+        Return ``(inputs, outputs)`` lists of file patterns which determine
+        and are saved with a cached run.
+        """
+        inputs, outputs = self._file_patterns()
+        inputs = [pattern for pattern, link in inputs]
+        if isinstance(self.stdin, basestring) and self.stdin != self.DEV_NULL:
+            inputs.append(self.stdin)
+        for stream in (self.stdout, self.stderr):
+            if isinstance(stream, basestring) and stream != self.DEV_NULL:
+                outputs.append(stream)
+        return (inputs, outputs)
+
     def check_files(self, inputs):
         """
         Check that all 'specific' input or output external files exist.
@@ -186,6 +287,10 @@ class ExternalCode(Component):
         inputs: bool
             If True, check inputs; otherwise outputs.
         """
+        # Relative to our directory, which may not be the current directory
+        # if running in a thread.
+        directory = self.get_abs_directory()
+
         # External files.
         for metadata in self.external_files:
             path = metadata.path
@@ -199,18 +304,18 @@ class ExternalCode(Component):
                 else:
                     if not metadata.get('output', False):
                         continue
-                if not os.path.exists(path):
+                if not os.path.exists(os.path.join(directory, path)):
                     iotype = 'input' if inputs else 'output'
                     self.raise_exception('missing %s file %r' % (iotype, path),
                                          RuntimeError)
         # Stdin, stdout, stderr.
         if inputs and self.stdin and self.stdin != self.DEV_NULL:
-            if not os.path.exists(self.stdin):
+            if not os.path.exists(os.path.join(directory, self.stdin)):
                 self.raise_exception('missing stdin file %r' % self.stdin,
                                      RuntimeError)
 
         if not inputs and self.stdout and self.stdout != self.DEV_NULL:
-            if not os.path.exists(self.stdout):
+            if not os.path.exists(os.path.join(directory, self.stdout)):
                 self.raise_exception('missing stdout file %r' % self.stdout,
                                      RuntimeError)
 
@@ -219,7 +324,7 @@ class ExternalCode(Component):
                       and self.stderr != self.STDOUT \
                       and (not self.resources or \
                            not self.resources.get('join_files')):
-            if not os.path.exists(self.stderr):
+            if not os.path.exists(os.path.join(directory, self.stderr)):
                 self.raise_exception('missing stderr file %r' % self.stderr,
                                      RuntimeError)
         # File variables.
@@ -227,13 +332,13 @@ class ExternalCode(Component):
             for pathname, obj in self.items(iotype='in', recurse=True):
                 if isinstance(obj, FileRef):
                     path = self.get_metadata(pathname, 'local_path')
-                    if path and not os.path.exists(path):
+                    if path and not os.path.exists(os.path.join(directory, path)):
                         self.raise_exception("missing 'in' file %r" % path,
                                              RuntimeError)
         else:
             for pathname, obj in self.items(iotype='out', recurse=True):
                 if isinstance(obj, FileRef):
-                    if not os.path.exists(obj.path):
+                    if not os.path.exists(os.path.join(directory, obj.path)):
                         self.raise_exception("missing 'out' file %r" % obj.path,
                                              RuntimeError)
 
@@ -260,6 +365,23 @@ class ExternalCode(Component):
 
         return (return_code, error_msg)
 
+    def _execute_pooled(self):
+        """ Run command in a scratch directory via the local process pool. """
+        inputs, outputs = self._file_patterns()
+        self._process = ProcessPool.get_instance().submit(
+                            self.command, inputs, outputs, self.stdin,
+                            self.stdout, self.stderr, self.env_vars,
+                            self.poll_delay, self.timeout,
+                            directory=self.get_abs_directory(),
+                            logger=self._logger)
+        try:
+            return_code, error_msg = self._process.wait()
+        finally:
+            self.run_stats = self._process.stats
+            self._process = None
+
+        return (return_code, error_msg)
+
     def _execute_remote(self):
         """
         Allocate a server based on required resources, send inputs,
@@ -524,7 +646,7 @@ class _AccessController(AccessController):  #pragma no cover
 
     def check_access(self, role, methodname, obj, attr):
         """ Raise :class:`RoleError` if invalid access. """
-        if attr in ('command', 'get_access_controller') and \
+        if attr in ('command', 'cache_dir', 'get_access_controller') and \
            methodname == '__setattr__':
             raise RoleError('No %s access to %r' % (methodname, attr))
 
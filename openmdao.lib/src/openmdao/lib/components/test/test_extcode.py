@@ -2,6 +2,7 @@
 Test the ExternalCode component.
 """
 
+import glob
 import logging
 import os.path
 import pkg_resources
@@ -192,6 +193,101 @@ class TestCase(unittest.TestCase):
                       globals(), locals(), RuntimeError,
                       ": missing input file 'missing-input'")
 
+    def test_local_pool(self):
+        logging.debug('')
+        logging.debug('test_local_pool')
+
+        sleeper = set_as_top(Sleeper())
+        sleeper.local_pool = True
+        sleeper.env_filename = ENV_FILE
+        sleeper.env_vars = {'SLEEP_DATA': 'Hello world!'}
+        sleeper.external_files.append(
+            FileMetadata(path=ENV_FILE, output=True))
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        sleeper.stderr = None
+
+        sleeper.run()
+
+        self.assertEqual(sleeper.return_code, 0)
+        self.assertEqual(sleeper.timed_out, False)
+        self.assertEqual(os.path.exists(ENV_FILE), True)
+        self.assertTrue(sleeper.run_stats.wall_time >= 1)
+
+        with open(ENV_FILE, 'rU') as inp:
+            data = inp.readline().rstrip()
+        self.assertEqual(data, sleeper.env_vars['SLEEP_DATA'])
+
+        with sleeper.outfile.open() as inp:
+            result = inp.read()
+        self.assertEqual(result, INP_DATA)
+
+        # Scratch directories are removed.
+        self.assertEqual(glob.glob(os.path.join(DIRECTORY, 'sandbox_*')), [])
+
+    def test_cache(self):
+        logging.debug('')
+        logging.debug('test_cache')
+
+        sleeper = set_as_top(Sleeper())
+        sleeper.cache_dir = 'result-cache'
+        sleeper.local_pool = True
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        try:
+            sleeper.run()
+            cache = sleeper.get_result_cache()
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertTrue(sleeper.run_stats.wall_time >= 1)
+
+            os.remove('output')
+            start = time.time()
+            sleeper.run()
+            self.assertTrue(time.time() - start < 1)
+            self.assertEqual(sleeper.return_code, 0)
+            self.assertEqual(sleeper.timed_out, False)
+            self.assertEqual(sleeper.run_stats, None)  # Nothing was run.
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(cache.bytes_saved, len(INP_DATA))
+            with sleeper.outfile.open() as inp:
+                self.assertEqual(inp.read(), INP_DATA)
+
+            # Changed input data requires a new run.
+            with open(INP_FILE, 'w') as out:
+                out.write('Changed')
+            sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+            sleeper.run()
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+        finally:
+            shutil.rmtree('result-cache', onerror=onerror)
+
+    def test_cache_cwd(self):
+        logging.debug('')
+        logging.debug('test_cache_cwd')
+
+        # Files are hashed and restored relative to the component's
+        # directory even if the current directory has been changed
+        # (for instance by another thread).
+        sleeper = set_as_top(Sleeper())
+        sleeper.cache_dir = 'result-cache-cwd'
+        sleeper.local_pool = True
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        try:
+            sleeper.run()
+            cache = sleeper.get_result_cache()
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+            os.remove('output')
+            os.chdir(ORIG_DIR)
+            try:
+                sleeper.execute()
+            finally:
+                os.chdir(DIRECTORY)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(cache.bytes_saved, len(INP_DATA))
+            with open('output', 'r') as inp:
+                self.assertEqual(inp.read(), INP_DATA)
+        finally:
+            shutil.rmtree('result-cache-cwd', onerror=onerror)
+
     def test_remote(self):
         logging.debug('')
         logging.debug('test_remote')
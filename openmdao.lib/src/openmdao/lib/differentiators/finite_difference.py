@@ -378,40 +378,10 @@ class FiniteDifference(Container):
     
     def _run_point(self, data_param):
         """Runs the model at a single point and captures the results. Note that 
-        some differences require the baseline point."""
+        some differences require the baseline point. Points cached by
+        the driver are not rerun."""
 
-        dvals = [float(val) for val in data_param.values()]
-        
-        self._parent.set_parameters(dvals)
-
-        # Run the model
-        super(type(self._parent), self._parent).run_iteration()
-        
-        data = {}
-
-        # Get Objectives
-        for key, item in self._parent.get_objectives().iteritems():
-            data[key] = item.evaluate(self._parent.parent)
-
-        # Get Inequality Constraints
-        if self.ineqconst_names:
-            for key, item in self._parent.get_ineq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
-        
-        # Get Equality Constraints
-        if self.eqconst_names:
-            for key, item in self._parent.get_eq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
-        
-        return data
+        return self._parent.run_point(data_param.values())
                     
 
     def reset_state(self):
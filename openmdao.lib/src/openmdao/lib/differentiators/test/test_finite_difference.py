@@ -31,6 +31,9 @@ class Comp(Component):
         
         self.y = (self.x)**2 + 3.0*self.u**3 + 4*self.u*self.x
         self.v = (self.x)**3 * (self.u)**2
+        self.count += 1
+
+    count = 0
 
         
 @add_delegate(HasParameters, HasObjectives, HasConstraints)
@@ -42,6 +45,20 @@ class Driv(DriverUsesDerivatives):
         
         self.run_iteration()
     
+
+@add_delegate(HasParameters, HasObjectives, HasConstraints)
+class MemoDriv(DriverUsesDerivatives):
+    """ Revisits points like a line search would. """
+    
+    def execute(self):
+        """ Evaluate function and gradient at several points. """
+        
+        self.gradients = []
+        for x in ([1., 1.], [2., 1.], [1., 1.]):
+            self.run_point(x)
+            self.calc_gradient()
+            self.gradients.append(self.get_gradient('comp.y').copy())
+    
     
 class Assy(Assembly):
     """ Assembly with driver and comp"""
@@ -183,6 +200,49 @@ class FiniteDifferenceTestCase(unittest.TestCase):
         #assert_rel_error(self, hess[0][1], 4.0, .001)
         #assert_rel_error(self, hess[1][0], 4.0, .001)
         
+    def test_memo(self):
+        
+        self.model.replace('driver', MemoDriv())
+        self.model.driver.differentiator = FiniteDifference()
+        
+        expected = {}
+        for size in (0, 1, 10):
+            self.model.comp.count = 0
+            self.model.driver.memo_size = size
+            self.model.run()
+            driver = self.model.driver
+            expected[size] = (self.model.comp.count, driver.memo_hits, 
+                              driver.saved_runs)
+            assert_rel_error(self, driver.gradients[0][0], 6.0, .001)
+            assert_rel_error(self, driver.gradients[1][0], 8.0, .001)
+            self.assertEqual(driver.gradients[2][0], driver.gradients[0][0])
+            assert_rel_error(self, driver.get_derivative('Con1', 'comp.u'), 
+                             15.0, .001)
+
+        # Each gradient needs 4 runs plus a baseline, which is cached after
+        # run_point (the baseline run doesn't execute comp anyway since its
+        # inputs haven't changed). The last point and gradient are cached
+        # unless evicted.
+        self.assertEqual(expected[0], (15, 0, 0))
+        self.assertEqual(expected[1], (15, 3, 3))
+        self.assertEqual(expected[10], (10, 4, 7))
+        
+    def test_sync(self):
+        
+        self.model.replace('driver', MemoDriv())
+        self.model.driver.differentiator = FiniteDifference()
+        self.model.driver.memo_size = 10
+        self.model.run()
+        
+        # The final point came from the cache, so the model was left at the
+        # last finite difference step.
+        self.assertEqual((self.model.comp.x, self.model.comp.u), (1., 1.))
+        self.model.driver.sync_model()
+        self.assertEqual(self.model.comp.y, 8.0)
+        count = self.model.comp.count
+        self.model.driver.sync_model()
+        self.assertEqual(self.model.comp.count, count)
+        
     def test_reset_state(self):
         
         self.model.driver.form = 'central'
@@ -4,8 +4,12 @@
 Pseudo package providing a central place to access all of the
 OpenMDAO doegenerators in the standard library."""
 
-from openmdao.lib.doegenerators.full_factorial import FullFactorial
-from openmdao.lib.doegenerators.optlh import OptLatinHypercube, LatinHypercube
-from openmdao.lib.doegenerators.uniform import Uniform
-from openmdao.lib.doegenerators.central_composite import CentralComposite
-from openmdao.lib.doegenerators.csvfile import CSVFile
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.doegenerators.full_factorial': ('FullFactorial',),
+    'openmdao.lib.doegenerators.optlh': ('OptLatinHypercube', 'LatinHypercube'),
+    'openmdao.lib.doegenerators.uniform': ('Uniform',),
+    'openmdao.lib.doegenerators.central_composite': ('CentralComposite',),
+    'openmdao.lib.doegenerators.csvfile': ('CSVFile',),
+})
@@ -3,29 +3,35 @@
 
 """
 
+import cStringIO
 import logging
 import os.path
 import Queue
+import shutil
 import sys
+import tempfile
 import thread
 import threading
+import time
 import traceback
 
 from openmdao.main.datatypes.api import Bool, Dict, Enum, Int, Slot
+from openmdao.main.datatypes.file import FileRef
 
-from openmdao.main.api import Driver
+from openmdao.main.api import Component, Container, Driver
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
-from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import ICaseIterator, ICaseRecorder, ICaseFilter
 from openmdao.main.rbac import get_credentials, set_credentials
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
-from openmdao.util.filexfer import filexfer
+from openmdao.util.filexfer import file_hashes, filexfer
+from openmdao.util.procpool import ProcessPool, cwd_lock, populate
 
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasparameters import HasParameters
 
 from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.components.external_code import ExternalCode
 
 _EMPTY     = 'empty'
 _LOADING   = 'loading'
@@ -36,12 +42,79 @@ class _ServerError(Exception):
     pass
 
 
+class _LocalServer(object):
+    """
+    Stands in for a server when cases are evaluated on copies of the model
+    in this process. Each copy runs in its own scratch directory, populated
+    with copies of the input `external_files` of the model's components, and
+    its :class:`ExternalCode` components run through the shared
+    :class:`ProcessPool`. Since the current directory is process-wide,
+    requests to a copy are run while holding :data:`cwd_lock`, which is only
+    released while waiting for a pooled command to complete.
+
+    name: string
+        Used as a prefix for the scratch directory.
+
+    root: string
+        Directory of the original model.
+    """
+
+    def __init__(self, name, root):
+        self.root = root
+        self.directory = tempfile.mkdtemp(prefix=name+'_', dir=root)
+        self.tlo = None
+
+    def load_model(self, state):
+        """
+        Return a new copy of the model from pickled `state`.
+
+        state: string
+            Model state saved by :meth:`Container.save`.
+        """
+        if self.tlo is not None:
+            self.tlo.pre_delete()
+            self.tlo = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.mkdir(self.directory)
+
+        tlo = Container.load(cStringIO.StringIO(state))
+        tlo_dir = tlo.get_abs_directory()
+        components = [tlo]
+        components.extend([obj for name, obj in tlo.items(recurse=True)
+                                               if isinstance(obj, Component)])
+        for comp in components:
+            rel_dir = os.path.relpath(comp.get_abs_directory(), tlo_dir)
+            for metadata in comp.external_files:
+                if metadata.get('input', False):
+                    # Copied rather than linked since components often
+                    # rewrite their input files before running.
+                    populate(os.path.join(self.root, rel_dir),
+                             os.path.join(self.directory, rel_dir),
+                             metadata.path, False)
+            if isinstance(comp, ExternalCode):
+                comp.local_pool = True
+        tlo.directory = self.directory
+        self.tlo = tlo
+        return tlo
+
+    def release(self):
+        """ Release model and remove scratch directory. """
+        if self.tlo is not None:
+            self.tlo.pre_delete()
+            self.tlo = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
 class CaseIterDriverBase(Driver):
     """
     A base class for Drivers that run sets of cases in a manner similar
     to the ROSE framework. Concurrent evaluation is supported, with the various
     evaluations executed across servers obtained from the
-    :class:`ResourceAllocationManager`.
+    :class:`ResourceAllocationManager`, or if `local_pool` is set, across
+    copies of the model in this process. Local copies run in threads, but
+    take turns since they depend on the (process-wide) current directory.
+    Only the commands of their :class:`ExternalCode` components, run via
+    the shared :class:`ProcessPool`, execute concurrently.
     """
 
     sequential = Bool(True, iotype='in',
@@ -60,11 +133,22 @@ class CaseIterDriverBase(Driver):
     extra_resources = Dict(iotype='in',
                            desc='Extra resource requirements (unusual).')
 
+    speculative = Bool(False, iotype='in',
+                       desc='If True, once all cases have been started,'
+                            ' idle servers re-run the slowest running cases'
+                            ' and the first result is used.')
+
     ignore_egg_requirements = Bool(False, iotype='in',
                                    desc='If True, no distribution or orphan'
                                         ' requirements will be included in the'
                                         ' generated egg.')
 
+    local_pool = Bool(False, iotype='in',
+                      desc='If True, concurrent evaluation uses copies of'
+                           ' the model in this process, one per slot of the'
+                           ' shared ProcessPool, rather than servers from'
+                           ' the ResourceAllocationManager.')
+
     def __init__(self, *args, **kwargs):
         super(CaseIterDriverBase, self).__init__(*args, **kwargs)
         self._iter = None  # Set to None when iterator is empty.
@@ -75,6 +159,7 @@ class CaseIterDriverBase(Driver):
         self._egg_file = None
         self._egg_required_distributions = None
         self._egg_orphan_modules = None
+        self._model_state = None  # Pickled model for local_pool copies.
 
         self._reply_q = None  # Replies from server threads.
         self._server_lock = None  # Lock for server data.
@@ -87,6 +172,7 @@ class CaseIterDriverBase(Driver):
         self._in_use = {}
         self._server_states = {}
         self._server_cases = {}
+        self._server_results = {}
         self._exceptions = {}
         self._load_failures = {}
  
@@ -94,6 +180,14 @@ class CaseIterDriverBase(Driver):
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
 
+        # Runtime data for speculative execution and resource hints.
+        self._case_start = {}  # Start time keyed by server name.
+        self._copies = {}      # Running copies keyed by case seqno.
+        self._finished = set() # Seqnos of successfully completed cases.
+        self._case_times = {}  # Runtime keyed by case seqno.
+        self._server_times = {}  # [count, total] keyed by server name.
+        self._speculations = 0
+
     def execute(self):
         """
         Runs all cases and records results in `recorder`.
@@ -176,7 +270,20 @@ class CaseIterDriverBase(Driver):
         """
         self._cleanup(remove_egg=replicate)
 
-        if not self.sequential:
+        if not self.sequential and self.local_pool:
+            if replicate or self._model_state is None:
+                # Save model state for local copies.
+                driver = self.parent.driver
+                self.parent.add('driver', Driver()) # this driver will execute the workflow once
+                self.parent.driver.workflow = self.workflow
+                try:
+                    stream = cStringIO.StringIO()
+                    self.parent.save(stream)
+                    self._model_state = stream.getvalue()
+                finally:
+                    self.parent.driver = driver
+
+        elif not self.sequential:
             if replicate or self._egg_file is None:
                 # Save model to egg.
                 # Must do this before creating any locks or queues.
@@ -227,7 +334,17 @@ class CaseIterDriverBase(Driver):
             'python_version':sys.version[:3]}
         if self.extra_resources:
             resources.update(self.extra_resources)
-        max_servers = RAM.max_servers(resources)
+        if self._case_times and 'runtime_hint' not in resources:
+            # Let allocators know what to expect based on the previous run.
+            times = self._case_times.values()
+            resources['runtime_hint'] = sum(times) / len(times)
+        self._case_times = {}
+        self._server_times = {}
+        self._speculations = 0
+        if self.local_pool:
+            max_servers = ProcessPool.get_instance().max_workers
+        else:
+            max_servers = RAM.max_servers(resources)
         self._logger.debug('max_servers %d', max_servers)
         if max_servers <= 0:
             msg = 'No servers supporting required resources %s' % resources
@@ -237,26 +354,35 @@ class CaseIterDriverBase(Driver):
         self._server_lock = threading.Lock()
         self._reply_q = Queue.Queue()
         self._generation += 1
-        n_servers = 0
-        while n_servers < max_servers:
-            if not self._more_to_go():
-                break
 
-            # Get next case. Limits servers started if max_servers > cases.
+        # Get initial cases. Limits servers started if max_servers > cases.
+        while len(self._todo) + len(self._rerun) < max_servers \
+              and self._iter is not None and not self._stop:
             try:
                 case = self._iter.next()
             except StopIteration:
-                if not self._rerun:
-                    self._iter = None
-                    self._seqno = 0
-                    break
-
+                self._iter = None
+                self._seqno = 0
+                break
             self._seqno += 1
             self._todo.append((case, self._seqno))
+        n_servers = min(max_servers, len(self._todo) + len(self._rerun))
+
+        # Allocate servers in one batch so they're deployed concurrently.
+        if self.local_pool:
+            servers = [(None, None)] * n_servers
+        elif n_servers:
+            servers = RAM.allocate_many(resources, n_servers)
+            if not servers:
+                msg = 'No servers allocated for required resources %s' \
+                      % resources
+                self.raise_exception(msg, RuntimeError)
+        else:
+            servers = []
 
+        for i, (server, server_info) in enumerate(servers):
             # Start server worker thread.
-            n_servers += 1
-            name = '%s_%d_%d' % (self.name, self._generation, n_servers)
+            name = '%s_%d_%d' % (self.name, self._generation, i+1)
             self._logger.debug('starting worker for %r', name)
             self._servers[name] = None
             self._in_use[name] = True
@@ -264,7 +390,7 @@ class CaseIterDriverBase(Driver):
             self._server_states[name] = _EMPTY
             self._load_failures[name] = 0
             server_thread = threading.Thread(target=self._service_loop,
-                                             args=(name, resources,
+                                             args=(name, server, server_info,
                                                    credentials, self._reply_q))
             server_thread.daemon = True
             try:
@@ -273,6 +399,9 @@ class CaseIterDriverBase(Driver):
                 self._logger.warning('worker thread startup failed for %r',
                                      name)
                 self._in_use[name] = False
+                for server, server_info in servers[i:]:
+                    if server is not None:
+                        RAM.release(server)
                 break
 
             if sys.platform != 'win32':
@@ -378,15 +507,21 @@ class CaseIterDriverBase(Driver):
         self._in_use = {}
         self._server_states = {}
         self._server_cases = {}
+        self._server_results = {}
         self._exceptions = {}
         self._load_failures = {}
 
         self._todo = []
         self._rerun = []
+        self._case_start = {}
+        self._copies = {}
+        self._finished = set()
 
         if self._egg_file and os.path.exists(self._egg_file):
             os.remove(self._egg_file)
             self._egg_file = None
+        if remove_egg:
+            self._model_state = None
 
     def _server_ready(self, server, stepping=False):
         """
@@ -395,6 +530,15 @@ class CaseIterDriverBase(Driver):
         If `stepping`, then we don't grab any new cases.
         Returns True if this server is still in use.
         """
+        if self.local_pool and server is not None:
+            # Don't process results (including recording) while a local copy
+            # has changed the current directory.
+            with cwd_lock:
+                return self._process_ready(server, stepping)
+        return self._process_ready(server, stepping)
+
+    def _process_ready(self, server, stepping):
+        """ :meth:`_server_ready` processing. """
         state = self._server_states[server]
         self._logger.debug('server %r state %s', server, state)
         in_use = True
@@ -436,12 +580,31 @@ class CaseIterDriverBase(Driver):
         elif state == _EXECUTING:
             case, seqno = self._server_cases[server]
             self._server_cases[server] = None
+            self._copies[seqno] -= 1
+            runtime = time.time() - self._case_start.pop(server)
+            if seqno in self._finished:
+                self._logger.debug('    discarding duplicate result')
+                self._server_results.pop(server, None)
+                return self._start_processing(server, stepping, reload=True)
+            counts = self._server_times.setdefault(server, [0, 0.])
+            counts[0] += 1
+            counts[1] += runtime
+
             exc = self._model_status(server)
             if exc is None:
                 # Grab the data from the model.
                 scope = self.parent if server is None else self._top_levels[server]
                 try:
-                    case.update_outputs(scope)
+                    if server is None:
+                        case.update_outputs(scope)
+                    else:
+                        # Outputs were returned by apply_case_and_run().
+                        names, values, errors = self._server_results.pop(server)
+                        for i, value in enumerate(values):
+                            if isinstance(value, FileRef):
+                                # Need a proxy to access the remote file.
+                                values[i] = scope.get(names[i])
+                        case.set_outputs(names, values, errors)
                 except Exception as exc:
                     msg = 'Exception getting case outputs: %s' % exc
                     self._logger.debug('    %s', msg)
@@ -450,6 +613,16 @@ class CaseIterDriverBase(Driver):
                 self._logger.debug('    exception while executing: %r', exc)
                 case.msg = str(exc)
 
+            if case.msg is None:
+                self._finished.add(seqno)
+                self._case_times[seqno] = runtime
+                if self._copies.get(seqno):
+                    self._stop_copies(seqno)
+            elif self._copies.get(seqno):
+                self._logger.debug('    failed, waiting for other copy')
+                case.msg = None
+                return self._start_processing(server, stepping, reload=True)
+
             if case.msg is not None and self.error_policy == 'ABORT':
                 if self._abort_exc is None:
                     self._abort_exc = exc
@@ -488,7 +661,8 @@ class CaseIterDriverBase(Driver):
         If there's something to do, start processing by either loading
         the model, or going straight to running it.
         """
-        if self._more_to_go(stepping):
+        if self._more_to_go(stepping) or \
+           (not stepping and self._can_speculate(server)):
             if reload:
                 if self.reload_model:
                     self._logger.debug('    reload')
@@ -520,18 +694,16 @@ class CaseIterDriverBase(Driver):
             case, seqno = self._rerun.pop(0)
             in_use = self._run_case(case, seqno, server, rerun=True)
         elif self._iter is None:
-            self._logger.debug('    no more cases')
-            in_use = False
+            in_use = False if stepping else self._speculate(server)
         elif stepping:
             in_use = False
         else:
             try:
                 case = self._iter.next()
             except StopIteration:
-                self._logger.debug('    no more cases')
                 self._iter = None
                 self._seqno = 0
-                in_use = False
+                in_use = self._speculate(server)
             else:
                 self._logger.debug('    run next case')
                 self._seqno += 1
@@ -551,33 +723,29 @@ class CaseIterDriverBase(Driver):
         # Additional user-requested variables
         # These must be added here so that the outputs are in the cases
         # before they are in the server list.
-        for printvar in self.printvars:
-
-            if  '*' in printvar:
-                printvars = self._get_all_varpaths(printvar)
-            else:
-                printvars = [printvar]
-
-            for var in printvars:
-                val = ExprEvaluator(var, scope=self.parent).evaluate()
-                case.add_output(var, val)
+        for var, expr, iotype in self._get_recording_plan(itername=False):
+            case.add_output(var, expr.evaluate())
 
         try:
-            for event in self.get_events(): 
-                try: 
-                    self._model_set(server, event, None, True)
+            # Remote events and inputs are set by _remote_model_execute()
+            # in the same request which runs the model.
+            if server is None:
+                for event in self.get_events(): 
+                    try: 
+                        self._model_set(server, event, None, True)
+                    except Exception as exc:
+                        msg = 'Exception setting %r: %s' % (event, exc)
+                        self._logger.debug('    %s', msg)
+                        self.raise_exception(msg, _ServerError)
+                try:
+                    case.apply_inputs(self.parent)
                 except Exception as exc:
-                    msg = 'Exception setting %r: %s' % (event, exc)
+                    msg = 'Exception setting case inputs: %s' % exc
                     self._logger.debug('    %s', msg)
                     self.raise_exception(msg, _ServerError)
-            try:
-                scope = self.parent if server is None else self._top_levels[server]
-                case.apply_inputs(scope)
-            except Exception as exc:
-                msg = 'Exception setting case inputs: %s' % exc
-                self._logger.debug('    %s', msg)
-                self.raise_exception(msg, _ServerError)
             self._server_cases[server] = (case, seqno)
+            self._case_start[server] = time.time()
+            self._copies[seqno] = self._copies.get(seqno, 0) + 1
             self._model_execute(server)
             self._server_states[server] = _EXECUTING
         except _ServerError as exc:
@@ -587,6 +755,90 @@ class CaseIterDriverBase(Driver):
         else:
             return True
 
+    def _mean_runtime(self, server):
+        """ Return mean case runtime on `server`, or overall, or None. """
+        if server in self._server_times:
+            count, total = self._server_times[server]
+            return total / count
+        if self._case_times:
+            return sum(self._case_times.values()) / len(self._case_times)
+        return None
+
+    def _candidates(self, server):
+        """
+        Return list of ``(other_server, case, seqno)`` for cases running
+        on other servers which could be copied to `server`.
+        """
+        if not self.speculative or self._stop or server is None \
+           or self._iter is not None or self._todo or self._rerun:
+            return []
+        candidates = []
+        for other, entry in self._server_cases.items():
+            if other != server and entry is not None:
+                case, seqno = entry
+                if self._copies.get(seqno) == 1 \
+                   and seqno not in self._finished:
+                    candidates.append((other, case, seqno))
+        return candidates
+
+    def _can_speculate(self, server):
+        """ Return True if a running case could be copied to `server`. """
+        return bool(self._candidates(server))
+
+    def _speculate(self, server):
+        """
+        Speculatively re-run the case expected to finish last on `server`.
+        Cases are ranked by how far they have run past the typical runtime
+        of their server. A case isn't copied if it's expected to finish
+        before the copy would. Returns True if a case was started.
+        """
+        now = time.time()
+        own_time = self._mean_runtime(server)
+        best = None
+        for other, case, seqno in self._candidates(server):
+            elapsed = now - self._case_start[other]
+            typical = self._mean_runtime(other) or 0.
+            if own_time is not None and typical - elapsed > own_time:
+                continue  # Copy wouldn't finish first.
+            lateness = elapsed - typical
+            if best is None or lateness > best[0]:
+                best = (lateness, case, seqno)
+
+        if best is None:
+            self._logger.debug('    no more cases')
+            return False
+
+        lateness, case, seqno = best
+        self._logger.debug('    speculatively rerun case %d', seqno)
+        self._speculations += 1
+        return self._run_case(case, seqno, server, rerun=True)
+
+    def _stop_copies(self, seqno):
+        """ Stop other servers running case `seqno`, it's done. """
+        for server, entry in self._server_cases.items():
+            if server is not None and entry is not None and entry[1] == seqno:
+                self._logger.debug('    stopping copy on %r', server)
+                try:
+                    self._top_levels[server].stop_evaluation()
+                except Exception as exc:
+                    self._logger.warning("Can't stop case on %r: %r",
+                                         server, exc)
+
+    def get_runtime_stats(self):
+        """
+        Returns a dictionary of runtime statistics from the latest concurrent
+        evaluation. ``case_times`` maps case sequence number to runtime,
+        ``server_times`` maps server name to ``(count, mean_runtime)``
+        (discarded speculative results are not included), and
+        ``speculations`` is the number of speculative case copies started.
+        """
+        server_times = {}
+        for server, (count, total) in self._server_times.items():
+            server_times[server] = (count, total / count)
+        return dict(case_times=self._case_times.copy(),
+                    server_times=server_times,
+                    speculations=self._speculations)
+
     def _record_case(self, case, seqno):
         """ If successful, record the case. Otherwise possibly retry. """
         if case.msg and case.retries < case.max_retries:
@@ -598,16 +850,23 @@ class CaseIterDriverBase(Driver):
             for recorder in self.recorders:
                 recorder.record(case)
 
-    def _service_loop(self, name, resource_desc, credentials, reply_q):
-        """ Each server has an associated thread executing this. """
+    def _service_loop(self, name, server, server_info, credentials, reply_q):
+        """
+        Each server has an associated thread executing this.
+        `server` and `server_info` are from :meth:`RAM.allocate_many`,
+        or None if using `local_pool`.
+        """
         set_credentials(credentials)
 
-        server, server_info = RAM.allocate(resource_desc)
-        # Just being defensive, this should never happen.
-        if server is None:  #pragma no cover
-            self._logger.error('Server allocation for %r failed :-(', name)
-            reply_q.put((name, False, None))
-            return
+        if self.local_pool:
+            try:
+                server = _LocalServer(name, self.parent.get_abs_directory())
+            # Difficult to force scratch directory creation failure.
+            except Exception as exc:  #pragma no cover
+                self._logger.error('Local server for %r failed: %r', name, exc)
+                reply_q.put((name, False, None))
+                return
+            server_info = dict(name=name, host='localhost', pid=os.getpid())
         else:
             # Clear egg re-use indicator.
             server_info['egg_file'] = None
@@ -633,7 +892,11 @@ class CaseIterDriverBase(Driver):
                 if request is None:
                     break
                 try:
-                    result = request[0](request[1])
+                    if self.local_pool:
+                        with cwd_lock:
+                            result = request[0](request[1])
+                    else:
+                        result = request[0](request[1])
                 except Exception as req_exc:
                     self._logger.error('%r: %s caused %r', name,
                                        request[0], req_exc)
@@ -648,7 +911,10 @@ class CaseIterDriverBase(Driver):
                 self._logger.error('%r: %r', name, exc)
         finally:
             self._logger.debug('%r releasing server', name)
-            RAM.release(server)
+            if self.local_pool:
+                server.release()
+            else:
+                RAM.release(server)
             reply_q.put((name, True, None))  # ACK shutdown.
 
     def _load_model(self, server):
@@ -658,7 +924,33 @@ class CaseIterDriverBase(Driver):
             self._queues[server].put((self._remote_load_model, server))
 
     def _remote_load_model(self, server):
-        """ Load model into remote server. """
+        """ Load model into remote (or local) server. """
+        if self.local_pool:
+            try:
+                tlo = self._servers[server].load_model(self._model_state)
+            except Exception as exc:
+                self._logger.error('local load_model for %r failed: %r',
+                                   server, exc)
+                self._top_levels[server] = None
+                self._exceptions[server] = TracedError(exc, traceback.format_exc())
+            else:
+                self._top_levels[server] = tlo
+            return
+
+        # If the server has already loaded this egg, just restore the model.
+        egg_hash = file_hashes(self._egg_file)[0]
+        if self._server_info[server].get('egg_hash') == egg_hash:
+            try:
+                tlo = self._servers[server].restore_model(egg_hash)
+            # Difficult to force restore error.
+            except Exception as exc:  #pragma nocover
+                self._logger.error('server.restore_model of %r failed: %r',
+                                   self._egg_file, exc)
+                tlo = None
+            if tlo is not None:
+                self._top_levels[server] = tlo
+                return
+
         egg_file = self._server_info[server].get('egg_file', None)
         if egg_file is None or egg_file is not self._egg_file:
             # Only transfer if changed.
@@ -684,6 +976,7 @@ class CaseIterDriverBase(Driver):
             self._exceptions[server] = TracedError(exc, traceback.format_exc())
         else:
             self._top_levels[server] = tlo
+            self._server_info[server]['egg_hash'] = egg_hash
 
     def _model_set(self, server, name, index, value):
         """ Set value in server's model. """
@@ -705,17 +998,25 @@ class CaseIterDriverBase(Driver):
             self._queues[server].put((self._remote_model_execute, server))
 
     def _remote_model_execute(self, server):
-        """ Execute model in remote server. """
+        """
+        Set case inputs, execute model, and get case outputs in remote server.
+        This is done with a single request to avoid a round-trip per variable.
+        """
         case, seqno = self._server_cases[server]
+        names = case.keys(iotype='out')
         try:
-            self._top_levels[server].set_itername(self.get_itername(), seqno)
-            self._top_levels[server].run(case_id=case.uuid)
+            values, errors = self._top_levels[server].apply_case_and_run(
+                                 case.items(iotype='in'), names,
+                                 self.get_events(), case.uuid,
+                                 self.get_itername(), seqno)
         except Exception as exc:
             self._exceptions[server] = TracedError(exc, traceback.format_exc())
             self._logger.error('Caught exception from server %r, PID %d on %s: %r',
                                self._server_info[server]['name'],
                                self._server_info[server]['pid'],
                                self._server_info[server]['host'], exc)
+        else:
+            self._server_results[server] = (names, values, errors)
 
     def _model_status(self, server):
         """ Return execute status from model. """
@@ -368,6 +368,7 @@ class CONMINdriver(DriverUsesDerivatives):
             if self.cnmn1.igoto == 3:
                 # Save baseline states and calculate derivatives
                 if self.baseline_point:
+                    self.sync_model()
                     self.calc_derivatives(first=True, savebase=True)
                 self.baseline_point = False
                 
@@ -379,25 +380,28 @@ class CONMINdriver(DriverUsesDerivatives):
                 self.ffd_order = 1
                 super(CONMINdriver, self).run_iteration()
                 self.ffd_order = 0
+                
+                # calculate objective
+                self.cnmn1.obj = self.eval_objective()
+
+                # update constraint value array
+                for i, v in enumerate(self.get_ineq_constraints().values()):
+                    val = v.evaluate(self.parent)
+                    if '>' in val[2]:
+                        self.constraint_vals[i] = val[1]-val[0]
+                    else:
+                        self.constraint_vals[i] = val[0]-val[1]
             else:
-                # update the parameters in the model
-                dvals = [float(val) for val in self.design_vals[:-2]]
-                self.set_parameters(dvals)
-        
-                # Run the model for this step
-                super(CONMINdriver, self).run_iteration()
+                # Run the model for this step (unless cached)
+                data = self.run_point(self.design_vals[:-2])
                 self.baseline_point = True
         
-            # calculate objective
-            self.cnmn1.obj = self.eval_objective()
+                # calculate objective
+                self.cnmn1.obj = data[self.get_objectives().keys()[0]]
 
-            # update constraint value array
-            for i, v in enumerate(self.get_ineq_constraints().values()):
-                val = v.evaluate(self.parent)
-                if '>' in val[2]:
-                    self.constraint_vals[i] = val[1]-val[0]
-                else:
-                    self.constraint_vals[i] = val[0]-val[1]
+                # update constraint value array
+                for i, name in enumerate(self.get_ineq_constraints().keys()):
+                    self.constraint_vals[i] = data[name]
                 
             #self._logger.debug('constraints = %s'%self.constraint_vals)
                 
@@ -406,11 +410,9 @@ class CONMINdriver(DriverUsesDerivatives):
         # only return gradients of active/violated constraints.
         elif self.cnmn1.info == 2 and self.cnmn1.nfdg == 1:
             
-            self.ffd_order = 1
-            self.differentiator.calc_gradient()
-            self.ffd_order = 0
+            self.calc_gradient()
                 
-            self.d_obj[:-2] = self.differentiator.get_gradient(self.get_objectives().keys()[0])
+            self.d_obj[:-2] = self.get_gradient(self.get_objectives().keys()[0])
             
             for i in range(len(self.cons_active_or_violated)):
                 self.cons_active_or_violated[i] = 0
@@ -420,7 +422,7 @@ class CONMINdriver(DriverUsesDerivatives):
                 if self.constraint_vals[i] >= self.cnmn1.ct:
                     self.cons_active_or_violated[self.cnmn1.nac] = i+1
                     self.d_const[:-2, self.cnmn1.nac] = \
-                        self.differentiator.get_gradient(name)
+                        self.get_gradient(name)
                     self.cnmn1.nac += 1
                     
         else:
@@ -441,6 +443,8 @@ class CONMINdriver(DriverUsesDerivatives):
             
             self.iter_count = self.cnmn1.iter 
             
+            # The current point may have come from the cache.
+            self.sync_model()
             self.record_case()
 
 
@@ -16,7 +16,7 @@ from openmdao.main.numpy_fallback import zeros
 from openmdao.lib.datatypes.api import List, Str, Slot, Int, Enum, Bool
 from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 from openmdao.main.api import Container
-from openmdao.main.case import Case
+from openmdao.main.case import CompactCase
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.interfaces import implements, IHasParameters
@@ -135,7 +135,7 @@ class DistributionCaseDriver(CaseIterDriverBase):
         self.distribution_generator.num_parameters = len(params)
 
         for row in self.distribution_generator:
-            case = self.set_parameters(row, Case(parent_uuid=self._case_id))
+            case = self.set_parameters(row, CompactCase(parent_uuid=self._case_id))
             case.add_outputs(self.case_outputs)
 
             yield case
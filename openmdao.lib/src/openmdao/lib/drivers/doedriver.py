@@ -10,7 +10,7 @@ import csv
 # pylint: disable-msg=E0611,F0401
 from openmdao.lib.datatypes.api import Bool, List, Slot, Float, Str
 
-from openmdao.main.case import Case
+from openmdao.main.case import CompactCase
 from openmdao.main.interfaces import IDOEgenerator, ICaseFilter, implements, \
                                      IHasParameters
 from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
@@ -75,7 +75,7 @@ class DOEdriver(CaseIterDriverBase):
             if record_doe:
                 csv_writer.writerow(['%.16g' % val for val in row])
             vals = [p.low+(p.high-p.low)*val for p,val in zip(params,row)]
-            case = self.set_parameters(vals, Case(parent_uuid=self._case_id))
+            case = self.set_parameters(vals, CompactCase(parent_uuid=self._case_id))
             # now add events
             for varname in events: 
                 case.add_input(varname, True)
@@ -137,7 +137,7 @@ class NeighborhoodDOEdriver(CaseIterDriverBase):
 
                 vals.append(newval)
                 
-            case = self.set_parameters(vals, Case(parent_uuid=self._case_id))
+            case = self.set_parameters(vals, CompactCase(parent_uuid=self._case_id))
             # now add events
             for varname in self.get_events(): 
 
@@ -1,5 +1,7 @@
 """A simple Pyevolve-based driver for OpenMDAO."""
 
+import functools
+import random
 import re
 
 #pyevolve calls multiprocessing.cpu_count(), which can raise NotImplementedError
@@ -12,13 +14,15 @@ except ImportError:
 except NotImplementedError:
     multiprocessing.cpu_count = lambda: 1
     
-from pyevolve import G1DList, GAllele, GenomeBase, Scaling
+from pyevolve import G1DList, GAllele, GenomeBase, GPopulation, Scaling
 from pyevolve import GSimpleGA, Selectors, Initializators, Mutators, Consts
+from pyevolve import Util
 
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Python, Enum, Float, Int, Bool, Slot
 
 from openmdao.main.api import Driver 
+from openmdao.main.case import CompactCase
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
@@ -26,13 +30,163 @@ from openmdao.main.interfaces import IHasParameters, IHasObjective, \
                                      implements, IOptimizer
 from openmdao.util.decorators import add_delegate
 from openmdao.util.typegroups import real_types, int_types, iterable_types
+from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 
 array_test = re.compile("(\[[0-9]+\])+$")
 
+
+class _Population(GPopulation.GPopulation):
+    """ Population which passes all its individuals to the
+    'batch_evaluator' parameter (if set) rather than evaluating each in turn.
+    """
+
+    def evaluate(self, **args):
+        """ Evaluate all individuals in population. """
+        evaluator = self.getParam('batch_evaluator')
+        if evaluator is None:
+            GPopulation.GPopulation.evaluate(self, **args)
+        else:
+            evaluator(self.internalPop)
+            self.clearFlags()
+
+
+class _BatchGA(GSimpleGA.GSimpleGA):
+    """ GSimpleGA whose populations are :class:`_Population` instances
+    which pass their individuals to `evaluator`. """
+
+    def __init__(self, genome, evaluator, **kwargs):
+        GSimpleGA.GSimpleGA.__init__(self, genome, **kwargs)
+        self.internalPop = _Population(self.internalPop)
+        self.internalPop.setParams(batch_evaluator=evaluator)
+
+    def step(self):
+        """ Create and evaluate the next generation.
+        Same as :meth:`GSimpleGA.step`, except that the new population is
+        a :class:`_Population` (GSimpleGA has no hook for this).
+        """
+        new_pop = _Population(self.internalPop)
+
+        size_iterate = len(self.internalPop)
+        if size_iterate % 2 != 0:  # Odd population size.
+            size_iterate -= 1
+
+        crossover_empty = \
+            self.select(popID=self.currentGeneration).crossover.isEmpty()
+
+        for i in xrange(0, size_iterate, 2):
+            mom = self.select(popID=self.currentGeneration)
+            dad = self.select(popID=self.currentGeneration)
+
+            if not crossover_empty and (self.pCrossover >= 1.0 or
+                                        Util.randomFlipCoin(self.pCrossover)):
+                for sister, brother in mom.crossover.applyFunctions(mom=mom,
+                                                                    dad=dad,
+                                                                    count=2):
+                    pass
+            else:
+                sister = mom.clone()
+                brother = dad.clone()
+
+            sister.mutate(pmut=self.pMutation, ga_engine=self)
+            brother.mutate(pmut=self.pMutation, ga_engine=self)
+
+            new_pop.internalPop.append(sister)
+            new_pop.internalPop.append(brother)
+
+        if len(self.internalPop) % 2 != 0:
+            mom = self.select(popID=self.currentGeneration)
+            dad = self.select(popID=self.currentGeneration)
+
+            if Util.randomFlipCoin(self.pCrossover):
+                for sister, brother in mom.crossover.applyFunctions(mom=mom,
+                                                                    dad=dad,
+                                                                    count=1):
+                    pass
+            else:
+                sister = random.choice([mom, dad]).clone()
+                sister.mutate(pmut=self.pMutation, ga_engine=self)
+
+            new_pop.internalPop.append(sister)
+
+        new_pop.evaluate()
+
+        # Niching methods - Petrowski's clearing.
+        self.clear()
+
+        if self.elitism:
+            if self.getMinimax() == Consts.minimaxType["maximize"]:
+                for i in xrange(self.nElitismReplacement):
+                    if self.internalPop.bestRaw(i).score > \
+                       new_pop.bestRaw(i).score:
+                        new_pop[len(new_pop)-1-i] = self.internalPop.bestRaw(i)
+            elif self.getMinimax() == Consts.minimaxType["minimize"]:
+                for i in xrange(self.nElitismReplacement):
+                    if self.internalPop.bestRaw(i).score < \
+                       new_pop.bestRaw(i).score:
+                        new_pop[len(new_pop)-1-i] = self.internalPop.bestRaw(i)
+
+        self.internalPop = new_pop
+        self.internalPop.sort()
+
+        self.currentGeneration += 1
+        return self.currentGeneration == self.nGenerations
+
+
+class _PopulationRunner(CaseIterDriverBase):
+    """ Evaluates lists of cases for `driver` using its parent, workflow
+    components, options, and recorders. This reuses the concurrent evaluation
+    of :class:`CaseIterDriverBase`, but is only a helper for `driver` and is
+    not part of the model (so it isn't registered as a plugin).
+    """
+
+    def __init__(self, driver):
+        super(_PopulationRunner, self).__init__()
+        self._driver = driver
+        self.name = driver.name
+        self.parent = driver.parent
+        self.workflow = driver.workflow.__class__(
+                            self, members=driver.workflow.get_names())
+        self.sequential = driver.sequential
+        self.local_pool = driver.local_pool
+        self.printvars = driver.printvars
+        self.recorders = driver.recorders
+        self.cases = []
+
+    def get_case_iterator(self):
+        """Returns a new iterator over `cases`."""
+        return iter(self.cases)
+
+    def get_events(self):
+        """ Return the driver's events. """
+        return self._driver.get_events()
+
+    def evaluate(self, cases, replicate):
+        """ Evaluate `cases`, which are updated with the results.
+
+        cases: list of :class:`Case`
+            Cases to evaluate.
+
+        replicate: bool
+            If True, replicate the model first (otherwise the model
+            replicated by a previous call is reused).
+        """
+        self.cases = cases
+        self._case_id = self._driver._case_id
+        self.setup(replicate=replicate)
+        self.resume(remove_egg=False)
+
+    def release(self):
+        """ Release servers and any replicated model. """
+        self._cleanup()
+
+
 @add_delegate(HasParameters, HasObjective, HasEvents)
 class Genetic(Driver):
     """Genetic algorithm for the OpenMDAO framework, based on the Pyevolve
     Genetic algorithm module. 
+    
+    If `batch_evaluation` is True, each generation's population is evaluated
+    as one set of cases, concurrently if `sequential` is False.
     """
     
     implements(IHasParameters, IHasObjective, IOptimizer)    
@@ -82,6 +236,24 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
     
+    batch_evaluation = Bool(False, iotype="in",
+                            desc="If True, evaluate each generation as a set "
+                                 "of cases (concurrently if 'sequential' is "
+                                 "False). Each distinct individual is "
+                                 "evaluated once.")
+    
+    sequential = Bool(True, iotype='in',
+                      desc='If True, batches are evaluated sequentially.')
+    
+    local_pool = Bool(False, iotype='in',
+                      desc='If True, concurrent batch evaluation uses copies'
+                           ' of the model in this process rather than servers'
+                           ' from the ResourceAllocationManager.')
+    
+    def __init__(self):
+        super(Genetic, self).__init__()
+        self._scores = {}
+    
     def _make_alleles(self): 
         """ Returns a GAllelle.Galleles instance with alleles corresponding to 
         the parameters specified by the user"""
@@ -135,9 +307,32 @@ class Genetic(Driver):
         # Genetic Algorithm Instance
         #print self.seed
         
+        if self.batch_evaluation:
+            runner = _PopulationRunner(self)
+            self._scores = {}
+            evaluator = functools.partial(self._evaluate_population, runner)
+            try:
+                self._evolve(_BatchGA(genome, evaluator, interactiveMode=False,
+                                      seed=self.seed))
+            finally:
+                self._scores = {}
+                runner.release()
+        else:
+            self._evolve(GSimpleGA.GSimpleGA(genome, interactiveMode=False, 
+                                             seed=self.seed))
+        
+        #run it once to get the model into the optimal state
+        self._run_model(self.best_individual) 
+        
+        # TODO - We really need to be able to record the best candidate from each
+        # generation, but that will only be possible if we let OpenMDAO drive
+        # the optimization. For now, just print out the final best individual state.
+        self.record_case()
+
+    def _evolve(self, ga):
+        """ Run the genetic algorithm `ga`. """
+        
         #configuring the options
-        ga = GSimpleGA.GSimpleGA(genome, interactiveMode = False, 
-                                 seed=self.seed)
         pop = ga.getPopulation()
         pop = pop.scaleMethod.set(Scaling.SigmaTruncScaling)
         ga.setMinimax(Consts.minimaxType[self.opt_type])
@@ -158,17 +353,48 @@ class Genetic(Driver):
 
         self.best_individual = ga.bestIndividual()
         
-        #run it once to get the model into the optimal state
-        self._run_model(self.best_individual) 
-        
-        # TODO - We really need to be able to record the best candidate from each
-        # generation, but that will only be possible if we let OpenMDAO drive
-        # the optimization. For now, just print out the final best individual state.
-        self.record_case()
-        
     def _run_model(self, chromosome):
         self.set_parameters([val for val in chromosome])
         self.run_iteration()
         return self.eval_objective()
-    
-    
+
+    def _evaluate_population(self, runner, population):
+        """ Evaluate all individuals in `population` not previously
+        evaluated as one set of cases run by `runner` and set their scores.
+        Individuals whose score came from the cache are recorded here.
+        """
+        objective = self.get_objectives().keys()[0]
+        batch = []
+        for individual in population:
+            key = tuple(individual)
+            if key not in self._scores and key not in batch:
+                batch.append(key)
+
+        if batch:
+            cases = []
+            for key in batch:
+                case = self.set_parameters(list(key), CompactCase())
+                case.add_output(objective)
+                cases.append(case)
+            # Only replicate the model for the first batch.
+            runner.evaluate(cases, replicate=not self._scores)
+            for key, case in zip(batch, cases):
+                if case.msg:
+                    self.raise_exception('Evaluation of %s failed: %s'
+                                         % (list(key), case.msg),
+                                         RuntimeError)
+                self._scores[key] = case[objective]
+
+        evaluated = set(batch)
+        for individual in population:
+            key = tuple(individual)
+            if key in evaluated:
+                evaluated.remove(key)  # Recorded by runner.
+            else:
+                case = self.set_parameters(list(key), CompactCase(
+                                               parent_uuid=self._case_id))
+                case.add_output(objective, self._scores[key])
+                for recorder in self.recorders:
+                    recorder.record(case)
+            individual.resetStats()
+            individual.score = self._scores[key]
@@ -7,8 +7,8 @@ are used as termination criteria.
 import logging
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import zeros
-    from numpy.linalg import norm
+    from numpy import array, diff, dot, zeros
+    from numpy.linalg import lstsq, norm
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -28,7 +28,10 @@ class FixedPointIterator(Driver):
     """ A simple fixed point iteration driver, which runs a workflow and passes
     the value from the output to the input for the next iteration. Relative
     change and number of iterations are used as termination criterea. This type
-    of iteration is also known as Gauss-Seidel."""
+    of iteration is also known as Gauss-Seidel.
+
+    The update may be accelerated using Aitken's dynamic relaxation or
+    Anderson mixing over the last `anderson_depth` iterations."""
     
     implements(IHasParameters, IHasEqConstraints, ISolver)
 
@@ -43,33 +46,42 @@ class FixedPointIterator(Driver):
                        desc='For multivariable iteration, type of norm '
                                    'to use to test convergence.')
 
+    accelerator = Enum('None', ['None', 'Aitken', 'Anderson'], iotype='in',
+                       desc='Acceleration applied to the fixed point update.')
+
+    anderson_depth = Int(5, iotype='in', low=1, desc='Number of previous '
+                                  'iterations used by Anderson acceleration.')
 
     def __init__(self):
         super(FixedPointIterator, self).__init__()
         
         self.history = zeros(0)
         self.current_iteration = 0
+        self._inputs = self._residuals = None
+        self._omega = 1.0
         
     def execute(self):
         """Perform the iteration."""
         
         nvar = len(self.get_parameters().values())
-        history = zeros([self.max_iteration, nvar])
-        delta = zeros(nvar)
+
+        # Ring buffers of recent inputs and their residuals.
+        if self.accelerator == 'Anderson':
+            depth = self.anderson_depth + 1
+        else:
+            depth = 2
+        self._inputs = zeros([depth, nvar])
+        self._residuals = zeros([depth, nvar])
+        self._omega = 1.0
         
         # Get and save the intial value of the input parameters
-        val0 = zeros(nvar)
-        for i, val in enumerate(self.get_parameters().values()):
-            val0[i] = val.evaluate(self.parent)
+        val0 = array([val.evaluate(self.parent)
+                      for val in self.get_parameters().values()])
             
         # perform an initial run
         self.run_iteration()
         self.current_iteration = 0
-        
-        for i, val in enumerate(self.get_eq_constraints().values()):
-            
-            term = val.evaluate(self.parent)
-            history[0, i] = term[0] - term[1]
+        delta = self._store(val0)
 
         if self.norm_order == 'Infinity':
             order = float('inf')
@@ -84,14 +96,14 @@ class FixedPointIterator(Driver):
 
             # check max iteration
             if self.current_iteration >= self.max_iteration-1:
-                self.history = history[:self.current_iteration+1, :]
+                self.history = self._get_history()
                 
                 self._logger.warning('Max iterations exceeded without ' +
                                      'convergence.')
                 return
                 
             # Pass output to input
-            val0 += history[self.current_iteration, :]
+            val0 = self._update(val0, delta)
             self.set_parameters(val0)
 
             # run the workflow
@@ -102,18 +114,55 @@ class FixedPointIterator(Driver):
             self.current_iteration += 1
         
             # check convergence
-            for i, val in enumerate(self.get_eq_constraints().values()):
-            
-                term = val.evaluate(self.parent)
-                delta[i] = term[0] - term[1]
-            history[self.current_iteration] = delta
+            delta = self._store(val0)
             
             if norm(delta, order) < self.tolerance:
                 break
             # relative tolerance -- problematic around 0
             #if abs( (val1-val0)/val0 ) < self.tolerance:
             #    break
-        self.history = history[:self.current_iteration+1, :]
+        self.history = self._get_history()
+
+    def _store(self, val0):
+        """Evaluate the residuals of the constraints, save them along with
+        the inputs `val0` in the ring buffers, and return them."""
+        delta = array([term[0] - term[1]
+                       for term in self.eval_eq_constraints(self.parent)])
+        slot = self.current_iteration % len(self._residuals)
+        self._inputs[slot] = val0
+        self._residuals[slot] = delta
+        return delta
+
+    def _get_history(self):
+        """Return the saved residuals, oldest first."""
+        depth = len(self._residuals)
+        start = max(0, self.current_iteration + 1 - depth)
+        return self._residuals[[i % depth for i in
+                                range(start, self.current_iteration + 1)]]
+
+    def _update(self, val0, delta):
+        """Return the next inputs given inputs `val0` and their
+        residuals `delta`."""
+        k = self.current_iteration
+        if k == 0 or self.accelerator == 'None':
+            return val0 + delta
+
+        depth = len(self._residuals)
+        if self.accelerator == 'Aitken':
+            # Aitken's delta-squared dynamic relaxation (Irons & Tuck).
+            prev = self._residuals[(k-1) % depth]
+            change = delta - prev
+            denom = dot(change, change)
+            if denom > 0.:
+                self._omega = -self._omega * dot(prev, change) / denom
+            return val0 + self._omega * delta
+
+        # Anderson mixing over the buffered iterations.
+        slots = [i % depth for i in range(max(0, k+1-depth), k+1)]
+        residuals = self._residuals[slots]
+        mapped = self._inputs[slots] + residuals
+        gamma = lstsq(diff(residuals, axis=0).T, delta, rcond=None)[0]
+        return val0 + delta - dot(diff(mapped, axis=0).T, gamma)
         
     def check_config(self):
         """Make sure the problem is set up right."""
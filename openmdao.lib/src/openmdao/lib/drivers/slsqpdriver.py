@@ -163,6 +163,9 @@ class SLSQPdriver(DriverUsesDerivatives):
         if self.iprint > 0 :
             closeunit(self.iout)
 
+        # The last point may have come from the cache.
+        self.sync_model()
+
         # Log any errors
         if self.error_code != 0 :
             self._logger.warning(self.error_messages[self.error_code])
@@ -175,33 +178,22 @@ class SLSQPdriver(DriverUsesDerivatives):
         evaluations.
         
         Note: m, me, la, n, f, and g are unused inputs."""
-        self.set_parameters(xnew)
-        super(SLSQPdriver, self).run_iteration()      
-        f = self.eval_objective()
+        
+        # Write out some relevant information to the recorder
+        data = self.run_point(xnew, record=True)
+        f = data[self.get_objectives().keys()[0]]
 
         if isnan(f):
             msg = "Numerical overflow in the objective."
             self.raise_exception(msg, RuntimeError)
             
-        # Constraints
+        # Constraints (SLSQP wants them positive when satisfied)
         if self.ncon > 0 :
-            con_list = []
-            for v in self.get_constraints().values():
-                val = v.evaluate(self.parent)
-                if '>' in val[2]:
-                    con_list.append(val[0]-val[1])
-                else:
-                    con_list.append(val[1]-val[0])
-                
-            g = array(con_list)
-            
+            g = array([-data[name] for name in self.get_constraints().keys()])
             
         if self.iprint > 0:
             pyflush(self.iout)
             
-        # Write out some relevant information to the recorder
-        self.record_case()
-
         return f, g
     
     def _grad(self, m, me, la, n, f, g, df, dg, xnew):
@@ -210,17 +202,14 @@ class SLSQPdriver(DriverUsesDerivatives):
         
         Note: m, me, la, n, f, g, df, and dg are unused inputs."""
         
-        self.ffd_order = 1
-        self.differentiator.calc_gradient()
-        self.ffd_order = 0
+        self.calc_gradient()
             
         df[0:self.nparam] = \
-            self.differentiator.get_gradient(self.get_objectives().keys()[0])
+            self.get_gradient(self.get_objectives().keys()[0])
 
         if self.ncon > 0 :
             for i, con in enumerate(self.get_constraints().keys()):
-                dg[i][0:self.nparam] = \
-                    -self.differentiator.get_gradient(con)
+                dg[i][0:self.nparam] = -self.get_gradient(con)
         
         return df, dg
     
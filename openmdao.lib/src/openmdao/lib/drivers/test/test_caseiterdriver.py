@@ -2,6 +2,7 @@
 Test CaseIteratorDriver.
 """
 
+import glob
 import logging
 import os
 import pkg_resources
@@ -14,12 +15,14 @@ import nose
 import random
 import numpy.random as numpy_random
 
-from openmdao.main.api import Assembly, Component, Case, set_as_top
+from openmdao.main.api import Assembly, Component, Case, FileMetadata, \
+                             set_as_top
 from openmdao.main.interfaces import ICaseIterator
 from openmdao.main.eggchecker import check_save_load
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.resource import ResourceAllocationManager, ClusterAllocator
 
+from openmdao.lib.components.external_code import ExternalCode
 from openmdao.lib.datatypes.api import Float, Bool, Array, Int, Slot, Str
 from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver
 from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
@@ -28,6 +31,7 @@ from openmdao.lib.casehandlers.api import ListCaseRecorder, ListCaseIterator, \
 
 from openmdao.test.cluster import init_cluster
 
+from openmdao.util.procpool import ProcessPool
 from openmdao.util.testutil import assert_raises
 
 # Capture original working directory so we can restore in tearDown().
@@ -137,6 +141,78 @@ class TracedComponent(Component):
         self.itername = self.get_itername()
 
 
+class Sleeper(ExternalCode):
+    """
+    Copies its input file after a delay. If `text` is set, it's written to
+    the input file first. Files are accessed relative to the current
+    directory, as in typical wrappers.
+    """
+
+    delay = Float(0., iotype='in')
+    text = Str(iotype='in')
+    data = Str(iotype='out')
+
+    def __init__(self):
+        super(Sleeper, self).__init__()
+        self.external_files = [FileMetadata(path='sleeper.in', input=True),
+                               FileMetadata(path='sleeper.out', output=True)]
+
+    def execute(self):
+        """ Run command, then read result. """
+        self.command = [sys.executable, '-c',
+                        'import shutil, time; time.sleep(%g);'
+                        ' shutil.copy("sleeper.in", "sleeper.out")'
+                        % self.delay]
+        if self.text:
+            with open('sleeper.in', 'w') as out:
+                out.write(self.text)
+        super(Sleeper, self).execute()
+        with open('sleeper.out', 'r') as inp:
+            self.data = inp.read()
+
+
+class Straggler(Component):
+    """
+    The first run with x == `slow` takes a long time (unless stopped).
+    `copy` reports which run of that x this was. The long run is a command
+    in the :class:`ProcessPool`, as with :class:`ExternalCode`, so other
+    copies in this process can run meanwhile.
+    """
+
+    x = Int(iotype='in')
+    y = Int(iotype='out')
+    copy = Int(iotype='out')
+
+    slow = 0
+    starts = {}  # Shared by all copies of the model in this process.
+
+    def __init__(self):
+        super(Straggler, self).__init__()
+        self._job = None
+
+    def execute(self):
+        """ Count this run of `x`, sleep if the first slow one. """
+        self.copy = Straggler.starts.get(self.x, 0) + 1
+        Straggler.starts[self.x] = self.copy
+        if self.x == self.slow and self.copy == 1:
+            self._job = ProcessPool.get_instance().submit(
+                            [sys.executable, '-c', 'import time; time.sleep(30)'])
+            try:
+                self._job.wait()
+            finally:
+                self._job = None
+            if self._stop:
+                raise RunStopped('Stop requested')
+        self.y = self.x * 2
+
+    def stop(self):
+        """ Stop the long run. """
+        super(Straggler, self).stop()
+        job = self._job
+        if job is not None:
+            job.terminate()
+
+
 class TestCase(unittest.TestCase):
     """ Test CaseIteratorDriver. """
 
@@ -254,6 +330,105 @@ class TestCase(unittest.TestCase):
         self.run_cases(sequential=False, forced_errors=True, retry=False)
         self.run_cases(sequential=False, forced_errors=True, retry=True)
 
+    def test_speculative(self):
+        logging.debug('')
+        logging.debug('test_speculative')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.speculative = True
+        self.run_cases(sequential=False)
+
+        # Each case recorded once, regardless of speculative copies.
+        labels = sorted(int(case.label)
+                        for case in self.model.driver.recorders[0].cases)
+        self.assertEqual(labels, range(len(self.cases)))
+        stats = self.model.driver.get_runtime_stats()
+        self.assertEqual(sorted(stats['case_times'].keys()),
+                         range(1, len(self.cases)+1))
+        count = sum([count for count, mean
+                            in stats['server_times'].values()])
+        self.assertEqual(count, len(self.cases))
+
+    def test_speculative_straggler(self):
+        logging.debug('')
+        logging.debug('test_speculative_straggler')
+
+        # First case is slow, an idle server copies it and wins.
+        Straggler.starts = {}
+        ProcessPool.configure(max_workers=2)
+        top = set_as_top(Assembly())
+        try:
+            top.add('driver', CaseIteratorDriver())
+            top.add('straggler', Straggler())
+            top.driver.workflow.add('straggler')
+            top.driver.sequential = False
+            top.driver.local_pool = True
+            top.driver.speculative = True
+            top.driver.iterator = ListCaseIterator(
+                [Case([('straggler.x', i)], ['straggler.y', 'straggler.copy'],
+                      label=str(i)) for i in range(4)])
+            start = time.time()
+            top.run()
+            et = time.time() - start
+            self.assertTrue(et < 20, et)
+
+            cases = sorted(top.driver.evaluated, key=lambda case: case.label)
+            self.assertEqual([case.label for case in cases],
+                             ['0', '1', '2', '3'])
+            for case in cases:
+                self.assertEqual(case.msg, None)
+                self.assertEqual(case['straggler.y'], int(case.label) * 2)
+            self.assertEqual(cases[0]['straggler.copy'], 2)
+            self.assertEqual(Straggler.starts[0], 2)
+            stats = top.driver.get_runtime_stats()
+            self.assertTrue(stats['speculations'] > 0)
+            self.assertTrue(stats['case_times'][1] < 20)
+        finally:
+            top.pre_delete()
+            ProcessPool.configure()
+
+    def test_local_pool(self):
+        logging.debug('')
+        logging.debug('test_local_pool')
+        self.model.driver.local_pool = True
+        self.run_cases(sequential=False)
+        self.assertEqual(glob.glob('driver_*'), [])
+
+        # ExternalCode in the local copies runs concurrently via the pool,
+        # each copy in its own directory. Other processing is serialized, so
+        # relative file accesses by each copy use its directory.
+        with open('sleeper.in', 'w') as out:
+            out.write('Froboz rulz!')
+        ProcessPool.configure(max_workers=3)
+        top = set_as_top(Assembly())
+        try:
+            top.add('driver', CaseIteratorDriver())
+            top.add('sleeper', Sleeper())
+            top.driver.workflow.add('sleeper')
+            top.driver.sequential = False
+            top.driver.local_pool = True
+            top.driver.iterator = ListCaseIterator(
+                [Case([('sleeper.delay', 1.), ('sleeper.text', 'case %d' % i)],
+                      ['sleeper.data'], label=str(i))
+                 for i in range(3)])
+            start = time.time()
+            top.run()
+            et = time.time() - start
+            self.assertTrue(et < 2.5, et)
+            cases = list(top.driver.evaluated)
+            self.assertEqual(len(cases), 3)
+            for case in cases:
+                self.assertEqual(case.msg, None)
+                self.assertEqual(case['sleeper.data'], 'case %s' % case.label)
+            self.assertFalse(os.path.exists('sleeper.out'))
+            with open('sleeper.in', 'r') as inp:
+                self.assertEqual(inp.read(), 'Froboz rulz!')
+            self.assertEqual(os.getcwd(), self.directory)
+            self.assertEqual(glob.glob('driver_*'), [])
+        finally:
+            top.pre_delete()
+            ProcessPool.configure()
+            os.remove('sleeper.in')
+
     def test_unencrypted(self):
         logging.debug('')
         logging.debug('test_unencrypted')
@@ -71,6 +71,17 @@ class Multi(Component):
         self.out1 = self.in1/10.0
         self.out2 = self.in2/10.0
 
+class Coupled(Component):
+    """Slowly converging linear fixed point problem."""
+    in1 = Float(0.0, iotype="in")
+    in2 = Float(0.0, iotype="in")
+    out1 = Float(0, iotype="out")
+    out2 = Float(0, iotype="out")
+
+    def execute(self):
+        self.out1 = 0.9*self.in1 + 0.05*self.in2 + 1.0
+        self.out2 = 0.05*self.in1 + 0.9*self.in2 - 1.0
+
 class FixedPointIteratorTestCase(unittest.TestCase):
     """test FixedPointIterator component"""
 
@@ -120,6 +131,33 @@ class FixedPointIteratorTestCase(unittest.TestCase):
         self.top.run()
         self.assertEqual(self.top.driver.current_iteration, 2)
         
+    def test_accelerator(self):
+        self.top.add("driver", FixedPointIterator())
+        self.top.add("simple", Coupled())
+        self.top.driver.workflow.add('simple')
+        
+        self.top.driver.add_constraint('simple.out1 = simple.in1')
+        self.top.driver.add_constraint('simple.out2 = simple.in2')
+        self.top.driver.add_parameter('simple.in1', -9e99, 9e99)
+        self.top.driver.add_parameter('simple.in2', -9e99, 9e99)
+        self.top.driver.tolerance = 1e-8
+        self.top.driver.max_iteration = 500
+
+        iterations = {}
+        for accelerator in ('None', 'Aitken', 'Anderson'):
+            self.top.simple.in1 = self.top.simple.in2 = 0.0
+            self.top.driver.accelerator = accelerator
+            self.top.run()
+            assert_rel_error(self, self.top.simple.in1, 20.0/3.0, 1e-6)
+            assert_rel_error(self, self.top.simple.in2, -20.0/3.0, 1e-6)
+            iterations[accelerator] = self.top.driver.current_iteration
+            self.assertTrue(len(self.top.driver.history) <= 
+                            self.top.driver.anderson_depth + 1)
+
+        self.assertTrue(iterations['None'] > 100)
+        self.assertTrue(iterations['Aitken'] < 20)
+        self.assertTrue(iterations['Anderson'] < 10)
+        
     def test_check_config(self):
         self.top.add("driver", FixedPointIterator())
         self.top.add("simple", Multi())
@@ -10,10 +10,12 @@ import unittest
 import random
 
 from openmdao.lib.datatypes.api import Float, Array, Enum, Int, Str
-from pyevolve import Selectors
+from pyevolve import G1DList, GAllele, GPopulation, GSimpleGA, Selectors
+from pyevolve import Initializators, Mutators
 
 from openmdao.main.api import Assembly, Component, set_as_top
-from openmdao.lib.drivers.genetic import Genetic
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.drivers.genetic import Genetic, _BatchGA, _PopulationRunner
 from openmdao.main.eggchecker import check_save_load
 
 # pylint: disable-msg=E1101
@@ -31,6 +33,9 @@ class SphereFunction(Component):
     def execute(self):
         """ calculate the sume of the squares for the list of numbers """
         self.total = self.x**2+self.y**2+self.z**2
+        self.count += 1
+
+    count = 0
         
 
 class Asmb(Assembly): 
@@ -120,6 +125,109 @@ class TestCase(unittest.TestCase):
         self.assertEqual(y, 0)
         self.assertEqual(z, 0)
 
+    def test_batch_evaluation(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.mutation_rate = .02
+        self.top.driver.generations = 5
+        self.top.driver.opt_type = "minimize"
+
+        results = []
+        for batch in (False, True):
+            random.seed(10)
+            Selectors.GRouletteWheel.cachePopID = None
+            Selectors.GRouletteWheel.cacheWheel = None
+            self.top.comp.count = 0
+            self.top.driver.batch_evaluation = batch
+            self.top.driver.recorders = [ListCaseRecorder()]
+            self.top.run()
+            results.append(([x for x in self.top.driver.best_individual],
+                            self.top.driver.best_individual.score,
+                            self.top.comp.count,
+                            self.top.driver.recorders[0].get_iterator()))
+
+        # Same optimization, but each distinct individual is run once (plus
+        # the final run of the best individual). Every individual in every
+        # generation is recorded.
+        self.assertEqual(results[1][:2], results[0][:2])
+        self.assertTrue(results[1][2] < results[0][2])
+        cases = results[1][3]
+        self.assertEqual(len(cases), 
+                         self.top.driver.population_size*6 + 1)
+        individuals = set([(case['comp.x'], case['comp.y'], case['comp.z'])
+                           for case in cases])
+        self.assertEqual(len(individuals), results[1][2]-1)
+        best = min([case['comp.total'] for case in cases
+                    if 'comp.total' in case])
+        self.assertEqual(best, results[1][1])
+
+    def test_batch_ga(self):
+        populations = []
+        def evaluator(population):
+            populations.append(len(population))
+            for individual in population:
+                individual.score = sum(individual)
+
+        alleles = GAllele.GAlleles()
+        alleles.add(GAllele.GAlleleRange(begin=0, end=10, real=False))
+        alleles.add(GAllele.GAlleleRange(begin=0, end=10, real=False))
+        genome = G1DList.G1DList(2)
+        genome.setParams(allele=alleles)
+        genome.evaluator.set(lambda chromosome: self.fail('Not batched'))
+        genome.mutator.set(Mutators.G1DListMutatorAllele)
+        genome.initializator.set(Initializators.G1DListInitializatorAllele)
+
+        ga = _BatchGA(genome, evaluator, interactiveMode=False, seed=10)
+        ga.setGenerations(3)
+        ga.setPopulationSize(20)
+        ga.evolve(freq_stats=0)
+
+        # Each generation is evaluated as a whole, without replacing
+        # GSimpleGA's population class.
+        self.assertEqual(populations, [20]*4)
+        self.assertTrue(GSimpleGA.GPopulation is GPopulation.GPopulation)
+        self.assertEqual(ga.bestIndividual().score,
+                         sum(ga.bestIndividual()))
+
+    def test_evaluate_population(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.z')
+        self.top.driver.recorders = [ListCaseRecorder()]
+        self.top.comp.y = 0
+
+        class Individual(list):
+            def resetStats(self):
+                self.score = None
+
+        driver = self.top.driver
+        runner = _PopulationRunner(driver)
+        populations = [[Individual([1., 2]), Individual([3., 0]),
+                        Individual([1., 2])],
+                       [Individual([3., 0]), Individual([0., 1])]]
+        for population in populations:
+            driver._evaluate_population(runner, population)
+        runner.release()
+
+        # Repeats come from the cache, but all individuals are recorded.
+        self.assertEqual([[individual.score for individual in population]
+                          for population in populations],
+                         [[5., 9., 5.], [9., 1.]])
+        self.assertEqual(self.top.comp.count, 3)
+        cases = driver.recorders[0].get_iterator()
+        self.assertEqual(sorted([(case['comp.x'], case['comp.z'],
+                                  case['comp.total']) for case in cases]),
+                         [(0., 1, 1.), (1., 2, 5.), (1., 2, 5.),
+                          (3., 0, 9.), (3., 0, 9.)])
+
     def test_optimizeSpherearray_nolowhigh(self):
         self.top.add('comp', SphereFunctionArray())
         self.top.driver.workflow.add('comp')
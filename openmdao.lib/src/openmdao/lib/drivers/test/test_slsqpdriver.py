@@ -109,6 +109,30 @@ class SLSPQdriverTestCase(unittest.TestCase):
         self.assertEqual(self.top.comp.opt_objective,
                          end_case.get_output('comp.opt_objective'))
         
+    def test_memo(self):
+        self.top.driver.add_objective('comp.result')
+        map(self.top.driver.add_parameter, 
+            ['comp.x[0]', 'comp.x[1]','comp.x[2]', 'comp.x[3]'])
+        
+        # pylint: disable-msg=C0301
+        map(self.top.driver.add_constraint, [
+            'comp.x[0]**2+comp.x[0]+comp.x[1]**2-comp.x[1]+comp.x[2]**2+comp.x[2]+comp.x[3]**2-comp.x[3] < 8',
+            'comp.x[0]**2-comp.x[0]+2*comp.x[1]**2+comp.x[2]**2+2*comp.x[3]**2-comp.x[3] < 10',
+            '2*comp.x[0]**2+2*comp.x[0]+comp.x[1]**2-comp.x[1]+comp.x[2]**2-comp.x[3] < 5'])
+        self.top.driver.recorders = [ListCaseRecorder()]
+        self.top.driver.printvars = ['comp.result']
+        self.top.driver.memo_size = 20
+        self.top.run()
+        self.assertAlmostEqual(self.top.comp.opt_objective, 
+                               self.top.driver.eval_objective(), places=2)
+
+        # Model outputs correspond to the final design point, even if the
+        # optimizer's last evaluation there came from the cache.
+        check = OptRosenSuzukiComponent()
+        check.x = self.top.comp.x.copy()
+        check.run()
+        self.assertEqual(self.top.comp.result, check.result)
+
     def test_max_iter(self):
         self.top.driver.add_objective('comp.result')
         map(self.top.driver.add_parameter, 
@@ -1,3 +1,8 @@
-from sellar import SellarProblem, SellarProblemWithDeriv
-from branin import BraninProblem
-from scalable import UnitScalableProblem
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.optproblems.sellar': ('SellarProblem',
+                                        'SellarProblemWithDeriv'),
+    'openmdao.lib.optproblems.branin': ('BraninProblem',),
+    'openmdao.lib.optproblems.scalable': ('UnitScalableProblem',),
+})
@@ -1,6 +1,11 @@
 """Pseudo package providing a central place to access all of the
 OpenMDAO surrogatemodels in the standard library."""
 
-from openmdao.lib.surrogatemodels.kriging_surrogate import FloatKrigingSurrogate,KrigingSurrogate
-from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
-from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.lib.surrogatemodels.kriging_surrogate': ('FloatKrigingSurrogate',
+                                                       'KrigingSurrogate'),
+    'openmdao.lib.surrogatemodels.logistic_regression': ('LogisticRegression',),
+    'openmdao.lib.surrogatemodels.response_surface': ('ResponseSurface',),
+})
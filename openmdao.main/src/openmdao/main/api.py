@@ -1,44 +1,49 @@
-""" 
-Pseudo package containing all of the main classes/objects in the 
+"""
+Pseudo package containing all of the main classes/objects in the
 openmdao.main API.
 
+Attributes are imported on first access, so importing this module is cheap.
 """
 
-from openmdao.util.log import logger, enable_console
-from openmdao.main.expreval import ExprEvaluator
+from openmdao.util.lazyimport import lazy_import
+
+lazy_import(__name__, {
+    'openmdao.util.log': ('logger', 'enable_console'),
+    'openmdao.main.expreval': ('ExprEvaluator',),
 
-from openmdao.main.factory import Factory
-from openmdao.main.factorymanager import create, get_available_types
+    'openmdao.main.factory': ('Factory',),
+    'openmdao.main.factorymanager': ('create', 'get_available_types'),
 
-from openmdao.main.container import Container, get_default_name, \
-                                    create_io_traits
-from openmdao.main.vartree import VariableTree
-from openmdao.main.component import Component, SimulationRoot
-from openmdao.main.component_with_derivatives import ComponentWithDerivatives
-from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
-from openmdao.main.assembly import Assembly, set_as_top, dump_iteration_tree
-from openmdao.main.driver import Driver, Run_Once
-from openmdao.main.workflow import Workflow
-from openmdao.main.dataflow import Dataflow
-from openmdao.main.sequentialflow import SequentialWorkflow
-from openmdao.main.cyclicflow import CyclicWorkflow
-from openmdao.main.variable import Variable
+    'openmdao.main.container': ('Container', 'get_default_name',
+                                'create_io_traits'),
+    'openmdao.main.vartree': ('VariableTree',),
+    'openmdao.main.component': ('Component', 'SimulationRoot'),
+    'openmdao.main.component_with_derivatives': ('ComponentWithDerivatives',),
+    'openmdao.main.driver_uses_derivatives': ('DriverUsesDerivatives',),
+    'openmdao.main.assembly': ('Assembly', 'set_as_top', 'dump_iteration_tree'),
+    'openmdao.main.driver': ('Driver', 'Run_Once'),
+    'openmdao.main.workflow': ('Workflow',),
+    'openmdao.main.dataflow': ('Dataflow',),
+    'openmdao.main.sequentialflow': ('SequentialWorkflow',),
+    'openmdao.main.cyclicflow': ('CyclicWorkflow',),
+    'openmdao.main.variable': ('Variable',),
 
-from openmdao.main.exceptions import ConstraintError
+    'openmdao.main.exceptions': ('ConstraintError',),
 
-from openmdao.main.interfaces import implements, Attribute, Interface
+    'openmdao.main.interfaces': ('implements', 'Attribute', 'Interface'),
 
-from openmdao.main.file_supp import FileMetadata
+    'openmdao.main.file_supp': ('FileMetadata',),
 
-from openmdao.main.case import Case
+    'openmdao.main.case': ('Case', 'CompactCase'),
 
-from openmdao.main.arch import Architecture
-from openmdao.main.problem_formulation import ArchitectureAssembly, OptProblem
+    'openmdao.main.arch': ('Architecture',),
+    'openmdao.main.problem_formulation': ('ArchitectureAssembly', 'OptProblem'),
 
-from openmdao.util.eggsaver import SAVE_PICKLE, SAVE_CPICKLE #, SAVE_YAML, SAVE_LIBYAML
+    'openmdao.util.eggsaver': ('SAVE_PICKLE', 'SAVE_CPICKLE'), #, 'SAVE_YAML', 'SAVE_LIBYAML'
 
-from openmdao.units import convert_units
+    'openmdao.units': ('convert_units',),
 
-# TODO: This probably shouldn't be here. Removing it will require edits to some
-# of our plugins
-from openmdao.main.datatypes.slot import Slot
+    # TODO: This probably shouldn't be here. Removing it will require edits
+    # to some of our plugins
+    'openmdao.main.datatypes.slot': ('Slot',),
+})
@@ -294,6 +294,68 @@ class Assembly(Component):
         if seqno:
             self.driver.workflow.set_initial_count(seqno)
 
+    @rbac(('owner', 'user'))
+    def apply_case_and_run(self, inputs, outputs, events=(), case_id='',
+                           itername=None, seqno=0):
+        """
+        Set `events` and `inputs`, run, and return values for `outputs`.
+        Typically called by :class:`CaseIterDriverBase` on a remote top level
+        assembly so that evaluating a case requires a single request and
+        reply rather than one per variable.
+
+        Returns ``(values, errors)``, where `errors` contains an error
+        message for each output which could not be evaluated, or None.
+
+        inputs: list of (name, value)
+            Inputs to be set. Names may be expressions, as in :class:`Case`.
+
+        outputs: list of string
+            Outputs to be returned. Names may be expressions.
+
+        events: list of string
+            Events to be set before setting `inputs`.
+
+        case_id: string
+            Identifier for the case, passed to :meth:`run`.
+
+        itername: string
+            If not None, passed to :meth:`set_itername` along with `seqno`.
+
+        seqno: int
+            Initial execution count for driver's workflow.
+        """
+        for event in events:
+            try:
+                self.set(event, True)
+            except Exception as exc:
+                self.raise_exception('Exception setting %r: %s'
+                                     % (event, exc), RuntimeError)
+        try:
+            self.set_many(inputs)
+        except Exception as exc:
+            self.raise_exception('Exception setting case inputs: %s' % exc,
+                                 RuntimeError)
+
+        if itername is not None:
+            self.set_itername(itername, seqno)
+        self._evaluating = self  # Allow stop_evaluation().
+        try:
+            self.run(case_id=case_id)
+        finally:
+            self._evaluating = None
+
+        values = []
+        errors = []
+        for name in outputs:
+            try:
+                values.append(self._get_expr(name))
+            except Exception as exc:
+                values.append(None)
+                errors.append(str(exc))
+            else:
+                errors.append(None)
+        return (values, errors)
+
     def add(self, name, obj):
         """Call the base class *add*.  Then,
         if obj is a Component, add it to the component graph.
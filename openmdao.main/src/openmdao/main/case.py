@@ -2,7 +2,9 @@
 from uuid import uuid1
 import re
 from array import array
+import threading
 import traceback
+import weakref
 from StringIO import StringIO
 from inspect import getmro
 
@@ -10,7 +12,7 @@ from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.exceptions import TracedError
 from openmdao.main.variable import is_legal_name
 
-__all__ = ["Case"]
+__all__ = ["Case", "CaseSchema", "CompactCase"]
 
 class _Missing(object):
     pass
@@ -95,12 +97,9 @@ class Case(object):
             self.add_outputs(outputs)
 
     def __str__(self):
-        if self._outputs:
-            outs = self._outputs.items()
-            outs.sort()
-        else:
-            outs = []
-        ins = self._inputs.items()
+        outs = self.items(iotype='out')
+        outs.sort()
+        ins = self.items(iotype='in')
         ins.sort()
         stream = StringIO()
         stream.write("Case: %s\n" % self.label)
@@ -131,9 +130,12 @@ class Case(object):
                 return False
             if len(self) != len(other):
                 return False
-            for selftup, othertup in zip(self.items(), other.items()):
-                if selftup[0] != othertup[0] or selftup[1] != othertup[1]:
-                    return False
+            # Compare by name, order may differ between Case types.
+            for iotype in ('in', 'out'):
+                others = dict(other.items(iotype))
+                for name, value in self.items(iotype):
+                    if name not in others or value != others[name]:
+                        return False
         except:
             return False
         return True
@@ -298,7 +300,39 @@ class Case(object):
                             self.msg = self.msg + " %s" % err
         if last_excpt:
             raise last_excpt
-            
+
+    def set_outputs(self, names, values, errors=None, msg=None):
+        """Update outputs from values which have already been evaluated,
+        for example by :meth:`Assembly.apply_case_and_run` on a remote
+        server. Outputs having an error are set to missing and the error is
+        added to `msg`. If any errors, :class:`RuntimeError` is raised.
+
+        names: list of string
+            Output names, in the order used to obtain `values`.
+
+        values: list
+            Output values.
+
+        errors: list of string
+            Error message (or None) for each output.
+        """
+        self.msg = msg
+        last_err = None
+        if errors is None:
+            errors = [None] * len(names)
+        for name, value, err in zip(names, values, errors):
+            if err is None:
+                self._outputs[name] = value
+            else:
+                last_err = err
+                self._outputs[name] = _Missing
+                if self.msg is None:
+                    self.msg = err
+                else:
+                    self.msg = self.msg + " %s" % err
+        if last_err is not None:
+            raise RuntimeError(last_err)
+
     def add_input(self, name, value):
         """Adds an input and its value to this case.
         
@@ -373,3 +407,296 @@ class Case(object):
                 self._exprs = {}
             self._exprs[s] = expr
 
+
+
+_schema_lock = threading.Lock()
+
+
+class CaseSchema(object):
+    """The names of the inputs and outputs of a :class:`CompactCase`.
+    A schema is shared by all cases having the same names, in the same order,
+    along with any :class:`ExprEvaluator` needed for expression names.
+    Schemas are interned, so use :meth:`get` rather than creating them
+    directly.
+    """
+
+    __slots__ = ('inputs', 'outputs', 'index', 'out_index', 'exprs',
+                 '_extended', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __init__(self, inputs, outputs):
+        self.inputs = inputs
+        self.outputs = outputs
+        nin = len(inputs)
+        self.out_index = dict([(name, nin+i) for i, name in enumerate(outputs)])
+        self.index = self.out_index.copy()
+        self.index.update([(name, i) for i, name in enumerate(inputs)])
+        self.exprs = {}
+        for name in self.index:
+            if not is_legal_name(name):
+                self.exprs[name] = ExprEvaluator(name)
+        self._extended = {}
+
+    def __reduce__(self):
+        return (_get_schema, (self.inputs, self.outputs))
+
+    @staticmethod
+    def get(inputs=(), outputs=()):
+        """Return the schema for the given names.
+
+        inputs: iter of str
+            Names of inputs.
+
+        outputs: iter of str
+            Names/expressions of outputs.
+        """
+        key = (tuple(inputs), tuple(outputs))
+        with _schema_lock:
+            schema = CaseSchema._interned.get(key)
+            if schema is None:
+                schema = CaseSchema(*key)
+                CaseSchema._interned[key] = schema
+        return schema
+
+    def extend(self, name, iotype):
+        """Return the schema having `name` appended to our inputs
+        (`iotype` 'in') or outputs (`iotype` 'out').
+        """
+        schema = self._extended.get((name, iotype))
+        if schema is None:
+            if iotype == 'in':
+                schema = CaseSchema.get(self.inputs+(name,), self.outputs)
+            else:
+                schema = CaseSchema.get(self.inputs, self.outputs+(name,))
+            self._extended[(name, iotype)] = schema
+        return schema
+
+
+def _get_schema(inputs, outputs):
+    """Unpickle support, returns interned schema."""
+    return CaseSchema.get(inputs, outputs)
+
+
+class CompactCase(Case):
+    """A :class:`Case` intended for large numbers of cases. Names are kept
+    in a :class:`CaseSchema` shared with other cases, values are kept in a
+    single list (inputs followed by outputs), and attributes are stored in
+    slots. The uuid is generated when first accessed. Inputs and outputs
+    are kept in the order they were added.
+
+    Since :class:`Case` doesn't define ``__slots__``, instances still support
+    a ``__dict__``, but it isn't allocated unless an attribute not in
+    ``__slots__`` is set.
+    """
+
+    __slots__ = ('_schema', '_values', '_uuid', 'max_retries', 'retries',
+                 'msg', 'label', 'parent_uuid')
+
+    def __init__(self, inputs=None, outputs=None, max_retries=None,
+                 retries=None, label='', case_uuid=None, parent_uuid='',
+                 msg=None, schema=None, values=None):
+        """Arguments are as for :class:`Case`, plus:
+
+        schema: :class:`CaseSchema`
+            If supplied, the initial schema for the case.
+
+        values: list
+            Values corresponding to the names in `schema`.
+            If None, inputs are None and outputs are missing.
+        """
+        if schema is None:
+            schema = CaseSchema.get()
+        self._schema = schema
+        if values is None:
+            values = [None] * len(schema.inputs) \
+                   + [_Missing] * len(schema.outputs)
+        self._values = values
+
+        self.max_retries = max_retries
+        self.retries = retries
+        self.msg = msg
+        self.label = label
+        self._uuid = str(case_uuid) if case_uuid else None
+        self.parent_uuid = str(parent_uuid)
+
+        if inputs:
+            self.add_inputs(inputs)
+        if outputs:
+            self.add_outputs(outputs)
+
+    def __getstate__(self):
+        return dict([(name, getattr(self, name)) for name in self.__slots__])
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def schema(self):
+        """The :class:`CaseSchema` for this case."""
+        return self._schema
+
+    @property
+    def uuid(self):
+        """Unique identifier."""
+        if self._uuid is None:
+            self._uuid = str(uuid1())
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, value):
+        self._uuid = str(value)
+
+    def __getitem__(self, name):
+        idx = self._schema.index.get(name)
+        if idx is None:
+            raise KeyError("'%s' not found" % name)
+        return self._values[idx]
+
+    def __setitem__(self, name, value):
+        idx = self._schema.index.get(name)
+        if idx is None:
+            raise KeyError("'%s' not found" % name)
+        self._values[idx] = value
+
+    def __contains__(self, name):
+        return name in self._schema.index
+
+    def __len__(self):
+        return len(self._values)
+
+    def get_input(self, name):
+        idx = self._schema.index.get(name)
+        if idx is None or idx >= len(self._schema.inputs):
+            raise KeyError(name)
+        return self._values[idx]
+
+    def get_output(self, name):
+        idx = self._schema.out_index.get(name)
+        if idx is None:
+            raise KeyError("'%s' not found" % name)
+        return self._values[idx]
+
+    def get_inputs(self, flatten=False):
+        items = zip(self._schema.inputs, self._values)
+        if flatten:
+            ret = []
+            for k, v in items:
+                ret.extend(flatten_obj(k, v))
+            return ret
+        return items
+
+    def get_outputs(self, flatten=False):
+        items = zip(self._schema.outputs,
+                    self._values[len(self._schema.inputs):])
+        if flatten:
+            ret = []
+            for k, v in items:
+                ret.extend(flatten_obj(k, v))
+            return ret
+        return items
+
+    def items(self, iotype=None, flatten=False):
+        if iotype is None:
+            return self.get_inputs(flatten) + self.get_outputs(flatten)
+        elif iotype == 'in':
+            return self.get_inputs(flatten)
+        elif iotype == 'out':
+            return self.get_outputs(flatten)
+        else:
+            raise NameError("invalid iotype arg (%s). Must be 'in','out',or None" % str(iotype))
+
+    def reset(self):
+        self.parent_uuid = ''
+        self._uuid = None
+        self.retries = None
+        for i in range(len(self._schema.inputs), len(self._values)):
+            self._values[i] = _Missing
+
+    def apply_inputs(self, scope):
+        scope._case_id = self.uuid
+        exprs = self._schema.exprs
+        for name, value in zip(self._schema.inputs, self._values):
+            expr = exprs.get(name)
+            if expr:
+                expr.set(value, scope)
+            else:
+                scope.set(name, value)
+
+    def update_outputs(self, scope, msg=None):
+        self.msg = msg
+        last_excpt = None
+        exprs = self._schema.exprs
+        values = self._values
+        for i, name in enumerate(self._schema.outputs,
+                                 len(self._schema.inputs)):
+            expr = exprs.get(name)
+            try:
+                if expr:
+                    values[i] = expr.evaluate(scope)
+                else:
+                    values[i] = scope.get(name)
+            except Exception as err:
+                last_excpt = TracedError(err, traceback.format_exc())
+                values[i] = _Missing
+                if self.msg is None:
+                    self.msg = str(err)
+                else:
+                    self.msg = self.msg + " %s" % err
+        if last_excpt:
+            raise last_excpt
+
+    def set_outputs(self, names, values, errors=None, msg=None):
+        self.msg = msg
+        last_err = None
+        if errors is None:
+            errors = [None] * len(names)
+        out_index = self._schema.out_index
+        for name, value, err in zip(names, values, errors):
+            if err is None:
+                self._values[out_index[name]] = value
+            else:
+                last_err = err
+                self._values[out_index[name]] = _Missing
+                if self.msg is None:
+                    self.msg = err
+                else:
+                    self.msg = self.msg + " %s" % err
+        if last_err is not None:
+            raise RuntimeError(last_err)
+
+    def add_input(self, name, value):
+        schema = self._schema
+        idx = schema.index.get(name)
+        if idx is not None and idx < len(schema.inputs):
+            self._values[idx] = value
+        else:
+            self._schema = schema.extend(name, 'in')
+            self._values.insert(len(schema.inputs), value)
+
+    def add_output(self, name, value=_Missing):
+        idx = self._schema.out_index.get(name)
+        if idx is not None:
+            self._values[idx] = value
+        else:
+            self._schema = self._schema.extend(name, 'out')
+            self._values.append(value)
+
+    def subcase(self, names):
+        """Return a new CompactCase having a specified subset of this Case's
+        inputs and outputs.
+        """
+        ins = []
+        outs = []
+        for name in names:
+            idx = self._schema.index.get(name)
+            if idx is None:
+                raise KeyError("'%s' is not part of this Case" % name)
+            if idx < len(self._schema.inputs):
+                ins.append((name, self._values[idx]))
+            else:
+                outs.append((name, self._values[idx]))
+        return CompactCase(inputs=ins, outputs=outs,
+                           parent_uuid=self.parent_uuid,
+                           max_retries=self.max_retries)
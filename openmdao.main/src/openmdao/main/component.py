@@ -4,6 +4,7 @@
 __all__ = ['Component', 'SimulationRoot']
 
 
+import cPickle
 import fnmatch
 import glob
 import logging
@@ -24,6 +25,7 @@ except ImportError as err:
 
 # pylint: disable-msg=E0611,F0401
 from traits.trait_base import not_event
+from traits.trait_handlers import TraitListObject, TraitDictObject
 from traits.api import Property
 
 from openmdao.main.container import Container
@@ -186,6 +188,7 @@ class Component(Container):
                 self._num_input_caseiters += 1
 
         self._stop = False
+        self._evaluating = None  # Component being run by evaluate().
         self._call_check_config = True
         self._call_execute = True
 
@@ -196,6 +199,7 @@ class Component(Container):
         self._expr_sources = None
         self._connected_inputs = None
         self._connected_outputs = None
+        self._snapshot_names = None
 
         self._dir_stack = []
         self._dir_context = None
@@ -220,7 +224,8 @@ class Component(Container):
             self._exec_state = state
             pub = Publisher.get_instance()
             if pub:
-                pub.publish('.'.join([self.get_pathname(), 'exec_state']), state)
+                pub.publish('.'.join([self.get_pathname(), 'exec_state']), state,
+                            coalesce=True)
 
     @rbac(('owner', 'user'))
     def get_itername(self):
@@ -277,6 +282,8 @@ class Component(Container):
         state['_expr_sources'] = None
         state['_connected_inputs'] = None
         state['_connected_outputs'] = None
+        state['_snapshot_names'] = None
+        state['_evaluating'] = None
 
         return state
 
@@ -751,6 +758,7 @@ class Component(Container):
         self._connected_outputs = None
         self._container_names = None
         self._expr_sources = None
+        self._snapshot_names = None
         self._call_check_config = True
         self._call_execute = True
 
@@ -1054,6 +1062,97 @@ class Component(Container):
         """
         self.load(instream)
 
+    def snapshot(self):
+        """Return a compact string containing the values and validity of
+        the variables of this component and all child components. Nothing
+        else is saved, so this is much faster than :meth:`checkpoint` and is
+        intended for quick in-memory rollback (via :meth:`restore`) or for
+        copying values to an identically configured replica.
+        """
+        states = []
+        self._get_snapshot('', states)
+        return cPickle.dumps(states, cPickle.HIGHEST_PROTOCOL)
+
+    def restore(self, snapshot):
+        """Restore variable values and validity from `snapshot`, as returned
+        by :meth:`snapshot`. Arrays are updated in place if their shape and
+        type are unchanged. Trait callbacks are not triggered, so the model
+        configuration must be the same as when the snapshot was taken.
+        If a component's class or variables differ from the snapshot's,
+        ValueError is raised and nothing is restored.
+
+        snapshot: string
+            Data returned by :meth:`snapshot`.
+        """
+        states = []
+        for path, classname, names, values, valids, call_execute, exec_state \
+                in cPickle.loads(snapshot):
+            comp = self
+            if path:
+                for name in path.split('.'):
+                    comp = getattr(comp, name, None)
+                if not isinstance(comp, Component):
+                    self.raise_exception("snapshot component '%s' not found"
+                                         % path, ValueError)
+            comp._check_snapshot(classname, names)
+            states.append((comp, names, values, valids, call_execute,
+                           exec_state))
+
+        for comp, names, values, valids, call_execute, exec_state in states:
+            comp._set_snapshot(names, values, valids, call_execute,
+                               exec_state)
+
+    def _get_snapshot_names(self):
+        """Return sorted names of variables saved by :meth:`snapshot`."""
+        if self._snapshot_names is None:
+            # Slots are part of the configuration rather than values.
+            self._snapshot_names = \
+                sorted([name for name in self._valid_dict
+                        if '.' not in name and
+                           not self.trait(name).is_trait_type(Slot)])
+        return self._snapshot_names
+
+    def _get_snapshot(self, path, states):
+        """Append our snapshot state to `states`, then our children's."""
+        names = self._get_snapshot_names()
+        values = [_snapshot_value(getattr(self, name)) for name in names]
+        states.append((path, type(self).__name__, names, values,
+                       self._valid_dict.items(), self._call_execute,
+                       self._exec_state))
+
+        for name in self.list_containers():
+            obj = getattr(self, name)
+            if isinstance(obj, Component):
+                obj._get_snapshot('.'.join([path, name]) if path else name,
+                                  states)
+
+    def _check_snapshot(self, classname, names):
+        """Raise ValueError if :meth:`_get_snapshot` data for class
+        `classname` with variables `names` doesn't match us."""
+        if classname != type(self).__name__:
+            self.raise_exception("snapshot of class %s can't be restored"
+                                 " into %s" % (classname, type(self).__name__),
+                                 ValueError)
+        expected = self._get_snapshot_names()
+        if names != expected:
+            errors = []
+            extra = sorted(set(names) - set(expected))
+            if extra:
+                errors.append('%s not found' % extra)
+            missing = sorted(set(expected) - set(names))
+            if missing:
+                errors.append('%s not in snapshot' % missing)
+            self.raise_exception("snapshot variables don't match: %s"
+                                 % ', '.join(errors), ValueError)
+
+    def _set_snapshot(self, names, values, valids, call_execute, exec_state):
+        """Restore our state from :meth:`_get_snapshot` data."""
+        _restore_values(self, names, values)
+        self._valid_dict.clear()
+        self._valid_dict.update(valids)
+        self._call_execute = call_execute
+        self._set_exec_state(exec_state)
+
     def save_to_egg(self, name, version, py_dir=None, require_relpaths=True,
                     child_objs=None, dst_dir=None, observer=None,
                     need_requirements=True):
@@ -1519,6 +1618,42 @@ class Component(Container):
         """Stop this component."""
         self._stop = True
 
+    @rbac(('owner', 'user'))
+    def evaluate(self, path, inputs, outputs, case_id=''):
+        """Set `inputs` of the component at `path`, run it, and return a list
+        of values for `outputs`. This allows a proxy to evaluate a component
+        with a single request. Used by :func:`mp_futures.submit`.
+
+        path: string
+            Path of the component to run, relative to this one.
+            If null, this component is run.
+
+        inputs: list of (name, value)
+            Inputs to be set. Names may be expressions, as in :class:`Case`.
+
+        outputs: list of string
+            Outputs to be returned. Names may be expressions.
+
+        case_id: string
+            Identifier passed to :meth:`run`.
+        """
+        comp = self.get(path) if path else self
+        comp.set_many(inputs)
+        self._evaluating = comp
+        try:
+            comp.run(case_id=case_id)
+        finally:
+            self._evaluating = None
+        return comp.get_many(outputs)
+
+    @rbac(('owner', 'user'))
+    def stop_evaluation(self):
+        """Stop the component being run by :meth:`evaluate` (or
+        :meth:`Assembly.apply_case_and_run`), if any."""
+        comp = self._evaluating
+        if comp is not None:
+            comp.stop()
+
     @rbac(('owner', 'user'))
     def get_valid(self, names):
         """Get the value of the validity flag for the specified variables.
@@ -2030,6 +2165,36 @@ class Component(Container):
                             result[okey] += tmp.reshape(result[okey].shape)
 
 
+def _snapshot_value(value):
+    """Return a picklable form of `value` for :meth:`Component.snapshot`."""
+    if isinstance(value, VariableTree):
+        return dict([(name, _snapshot_value(getattr(value, name)))
+                     for name in value.list_vars()])
+    elif isinstance(value, TraitListObject):
+        return list(value)
+    elif isinstance(value, TraitDictObject):
+        return dict(value)
+    return value
+
+
+def _restore_values(obj, names, values):
+    """Set variables `names` of `obj` to snapshot `values` without triggering
+    trait callbacks.
+    """
+    quiet = {}
+    for name, value in zip(names, values):
+        current = getattr(obj, name, None)
+        if isinstance(current, ndarray) and isinstance(value, ndarray) and \
+           current.shape == value.shape and current.dtype == value.dtype:
+            current[...] = value
+        elif isinstance(current, VariableTree) and isinstance(value, dict):
+            _restore_values(current, value.keys(), value.values())
+        else:
+            quiet[name] = value
+    if quiet:
+        obj.trait_setq(**quiet)
+
+
 def _show_validity(comp, recurse=True, exclude=None, valid=None):  # pragma no cover
     """Prints out validity status of all input and output traits
     for the given object, optionally recursing down to all of its
@@ -1144,6 +1144,43 @@ class Container(SafeHasTraits):
             else:
                 setattr(self, path, value)
 
+    @rbac(('owner', 'user'))
+    def get_many(self, paths):
+        """Return a list of values for `paths`. Each path may be a simple
+        name or an expression, as in :class:`Case` outputs. This allows
+        a proxy to retrieve many values in a single request.
+
+        paths: list of string
+            Names or expressions to be evaluated.
+        """
+        return [self._get_expr(path) for path in paths]
+
+    @rbac(('owner', 'user'))
+    def set_many(self, items):
+        """Set several values. Each path may be a simple name or an
+        expression which is valid on the left-hand side of an assignment,
+        as in :class:`Case` inputs. This allows a proxy to set many values
+        in a single request. Items are set in order.
+
+        items: list of (path, value)
+            Paths and their new values.
+        """
+        for path, value in items:
+            self._set_expr(path, value)
+
+    def _get_expr(self, path):
+        """Return value of name or expression `path`."""
+        if is_legal_name(path):
+            return self.get(path)
+        return ExprEvaluator(path, scope=self).evaluate()
+
+    def _set_expr(self, path, value):
+        """Set value of name or expression `path`."""
+        if is_legal_name(path):
+            self.set(path, value)
+        else:
+            ExprEvaluator(path, scope=self).set(value)
+
     def _index_set(self, name, value, index):
         obj = self.get_wrapped_attr(name, index[:-1])
         idx = index[-1]
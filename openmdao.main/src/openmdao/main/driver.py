@@ -13,7 +13,7 @@ from openmdao.main.exceptions import RunStopped
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.component import Component
 from openmdao.main.workflow import Workflow
-from openmdao.main.case import Case
+from openmdao.main.case import CompactCase
 from openmdao.main.dataflow import Dataflow
 from openmdao.main.hasevents import HasEvents
 from openmdao.main.hasparameters import HasParameters
@@ -55,6 +55,9 @@ class Driver(Component):
         # constraints, or objectives.
         self._invalidated = False
 
+        # Compiled printvars, see _get_recording_plan().
+        self._recording_plan = None
+
     def _workflow_changed(self, oldwf, newwf):
         if newwf is not None:
             newwf._parent = self
@@ -346,6 +349,7 @@ class Driver(Component):
         super(Driver, self).config_changed(update_parent)
         if self.workflow is not None:
             self.workflow.config_changed()
+        self._recording_plan = None
 
     def record_case(self):
         """ A driver can call this function to record the current state of the
@@ -392,38 +396,51 @@ class Driver(Component):
                 val = con.evaluate(self.parent)
                 case_output.append(["Constraint ( %s )" % name, val[1] - val[0]])
 
-        tmp_printvars = self.printvars[:]
-        tmp_printvars.append('%s.workflow.itername' % self.name)
-        iotypes[tmp_printvars[-1]] = 'out'
-
         # Additional user-requested variables
-        for printvar in tmp_printvars:
-
-            if '*' in printvar:
-                printvars = self._get_all_varpaths(printvar)
+        for entry in self._get_recording_plan():
+            var, expr, iotype = entry
+            iotype = iotypes.get(var, iotype)
+            if iotype is None:
+                iotype = self.parent.get_metadata(var, 'iotype')
+                entry[2] = iotype
+            if iotype == 'in':
+                case_input.append([var, expr.evaluate()])
+            elif iotype == 'out':
+                case_output.append([var, expr.evaluate()])
             else:
-                printvars = [printvar]
-
-            for var in printvars:
-                iotype = iotypes.get(var)
-                if iotype is None:
-                    iotype = self.parent.get_metadata(var, 'iotype')
-                    iotypes[var] = iotype
-                if iotype == 'in':
-                    val = ExprEvaluator(var, scope=self.parent).evaluate()
-                    case_input.append([var, val])
-                elif iotype == 'out':
-                    val = ExprEvaluator(var, scope=self.parent).evaluate()
-                    case_output.append([var, val])
-                else:
-                    msg = "%s is not an input or output" % var
-                    self.raise_exception(msg, ValueError)
+                msg = "%s is not an input or output" % var
+                self.raise_exception(msg, ValueError)
 
-        case = Case(case_input, case_output, parent_uuid=self._case_id)
+        case = CompactCase(case_input, case_output, parent_uuid=self._case_id)
 
         for recorder in self.recorders:
             recorder.record(case)
 
+    def _get_recording_plan(self, itername=True):
+        """ Return list of ``[path, expr, iotype]`` for `printvars`, with
+        wildcards expanded. `expr` is an :class:`ExprEvaluator` for `path`
+        and `iotype` is filled-in by :meth:`record_case` when first needed.
+        If `itername`, the workflow iteration name is the last entry.
+        The plan is rebuilt if the configuration, `printvars`, or the
+        workflow changes.
+        """
+        key = (tuple(self.printvars), tuple(self.workflow.get_names()))
+        if self._recording_plan is None or self._recording_plan[0] != key:
+            plan = []
+            for printvar in self.printvars:
+                if '*' in printvar:
+                    paths = self._get_all_varpaths(printvar)
+                else:
+                    paths = [printvar]
+                for path in paths:
+                    plan.append([path, ExprEvaluator(path, scope=self.parent),
+                                 None])
+            path = '%s.workflow.itername' % self.name
+            plan.append([path, ExprEvaluator(path, scope=self.parent), 'out'])
+            self._recording_plan = (key, plan)
+        plan = self._recording_plan[1]
+        return plan if itername else plan[:-1]
+
     def _get_all_varpaths(self, pattern, header=''):
         ''' Return a list of all varpaths in the driver's workflow that
         match the specified pattern.
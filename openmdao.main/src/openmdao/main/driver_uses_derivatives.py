@@ -3,12 +3,21 @@
     
     From a driver's perspective, derivatives are needed from its parameters
     to its objective(s) and constraints.
+    
+    Objective and constraint values and gradients may be cached by parameter
+    vector, so that points revisited by line searches, restarts, or finite
+    difference baselines don't rerun the workflow.
 """
 
+from struct import pack
+
+from ordereddict import OrderedDict
+
 # pylint: disable-msg=E0611,F0401
-from openmdao.main.datatypes.api import Slot
+from openmdao.main.datatypes.api import Int, Slot
 from openmdao.main.interfaces import IDifferentiator
 from openmdao.main.driver import Driver
+from openmdao.main.rbac import rbac
 
 class DriverUsesDerivatives(Driver): 
     """This class provides an implementation of the derivatives delegates."""
@@ -16,6 +25,16 @@ class DriverUsesDerivatives(Driver):
     differentiator = Slot(IDifferentiator, 
                           desc = "Slot for a differentiator")
     
+    memo_size = Int(0, iotype='in', low=0, desc='Number of parameter '
+                    'vectors whose objective, constraint, and gradient '
+                    'values are cached during a run. 0 disables caching.')
+    
+    memo_hits = Int(0, iotype='out', desc='Number of requests during the '
+                    'last run that were satisfied from the cache.')
+    
+    saved_runs = Int(0, iotype='out', desc='Number of workflow runs saved '
+                     'by the cache during the last run.')
+    
     def __init__(self):
         
         super(DriverUsesDerivatives, self).__init__()
@@ -25,6 +44,184 @@ class DriverUsesDerivatives(Driver):
         self.uses_gradients = True
         self.uses_Hessians = False
         
+        self._memo = OrderedDict()
+        self._gradient = {}
+        self._nruns = 0
+        self._last_run = None
+        
+    @rbac('*', 'owner')
+    def run(self, force=False, ffd_order=0, case_id=''):
+        """Run this object after clearing the cache, since inputs other
+        than our parameters may have changed.
+
+        force: bool
+            If True, force component to execute even if inputs have not
+            changed. (Default is False)
+
+        ffd_order: int
+            Order of the derivatives to be used when finite differencing (1 for first
+            derivatives, 2 for second derivativse). During regular execution,
+            ffd_order should be 0. (Default is 0)
+
+        case_id: str
+            Identifier for the Case that is associated with this run. (Default is '')
+        """
+        self._memo.clear()
+        self._last_run = None
+        self.memo_hits = 0
+        self.saved_runs = 0
+        super(DriverUsesDerivatives, self).run(force, ffd_order, case_id)
+
+    def _memo_get(self, key, kind):
+        """Return cached `kind` values for `key`, or None."""
+        entry = self._memo.get(key)
+        if entry is None or kind not in entry:
+            return None
+        # Move to the most recently used position.
+        del self._memo[key]
+        self._memo[key] = entry
+        value, runs = entry[kind]
+        self.memo_hits += 1
+        self.saved_runs += runs
+        return value
+
+    def _memo_put(self, key, kind, value, runs):
+        """Cache `kind` values for `key`, which cost `runs` workflow runs."""
+        if self.memo_size <= 0:
+            return
+        entry = self._memo.pop(key, None)
+        if entry is None:
+            entry = {}
+            while len(self._memo) >= self.memo_size:
+                self._memo.popitem(last=False)
+        entry[kind] = (value, runs)
+        self._memo[key] = entry
+
+    def _param_key(self, vals=None):
+        """Return cache key for parameter values `vals`, default current
+        values."""
+        if vals is None:
+            vals = [param.evaluate(self.parent)
+                    for param in self.get_parameters().values()]
+        vals = [float(val) for val in vals]
+        return pack('%dd' % len(vals), *vals)
+
+    def _response_names(self):
+        """Return names of objectives and constraints."""
+        names = self.get_objectives().keys()
+        for getter in ('get_eq_constraints', 'get_ineq_constraints'):
+            if hasattr(self, getter):
+                names.extend(getattr(self, getter)().keys())
+        return names
+
+    def run_point(self, vals, record=False):
+        """Set the parameters to `vals` and return a dictionary of objective
+        and constraint values after running the workflow. Constraints are
+        returned as ``lhs-rhs`` (``rhs-lhs`` for '>'), so a constraint is
+        satisfied if its value is not positive. If values for `vals` are
+        cached, the workflow is not run.
+
+        vals: list of float
+            Parameter values.
+
+        record: bool
+            If True, record a case if the workflow is run.
+        """
+        vals = [float(val) for val in vals]
+        key = self._param_key(vals)
+        self.set_parameters(vals)
+
+        data = self._memo_get(key, 'data')
+        if data is not None:
+            return data
+
+        self._run_model(key)
+
+        data = {}
+        scope = self.parent
+        for name, obj in self.get_objectives().iteritems():
+            data[name] = obj.evaluate(scope)
+        for getter in ('get_ineq_constraints', 'get_eq_constraints'):
+            if hasattr(self, getter):
+                for name, con in getattr(self, getter)().iteritems():
+                    val = con.evaluate(scope)
+                    if '>' in val[2]:
+                        data[name] = val[1]-val[0]
+                    else:
+                        data[name] = val[0]-val[1]
+
+        # Fake finite difference values are only approximate.
+        if self.ffd_order == 0:
+            self._memo_put(key, 'data', data, 1)
+        if record:
+            self.record_case()
+        return data
+
+    def _run_model(self, key):
+        """Run the workflow at the parameter values for `key`."""
+        self._nruns += 1
+        super(DriverUsesDerivatives, self).run_iteration()
+        self._last_run = key
+
+    def run_iteration(self):
+        """Run the workflow directly, the model is no longer known to be at
+        a point evaluated by :meth:`run_point`."""
+        self._last_run = None
+        super(DriverUsesDerivatives, self).run_iteration()
+
+    def sync_model(self):
+        """Run the workflow if its state may not correspond to the current
+        parameter values because a cached point was returned by
+        :meth:`run_point`. This should be called before saving baseline
+        states for derivative calculations, before recording a case, and
+        before returning from :meth:`execute`."""
+        if self.memo_size > 0:
+            key = self._param_key()
+            if key != self._last_run:
+                self._run_model(key)
+
+    def calc_gradient(self):
+        """Calculate the gradient of the objectives and constraints at the
+        current parameter values using our differentiator, unless it is
+        cached. Results are available via :meth:`get_gradient` and
+        :meth:`get_derivative`."""
+        key = self._param_key()
+        gradient = self._memo_get(key, 'gradient')
+        if gradient is None:
+            start = self._nruns
+            self.sync_model()
+            self.ffd_order = 1
+            try:
+                self.differentiator.calc_gradient()
+            finally:
+                self.ffd_order = 0
+            gradient = dict([(name, self.differentiator.get_gradient(name))
+                             for name in self._response_names()])
+            self._memo_put(key, 'gradient', gradient, self._nruns - start)
+        self._gradient = gradient
+
+    def get_gradient(self, output_name):
+        """Returns the gradient of the given objective or constraint with
+        respect to all parameters from the last :meth:`calc_gradient`.
+        
+        output_name: string
+            Name of the objective or constraint.
+        """
+        return self._gradient[output_name]
+
+    def get_derivative(self, output_name, wrt):
+        """Returns the derivative of the given objective or constraint with
+        respect to parameter `wrt` from the last :meth:`calc_gradient`.
+        
+        output_name: string
+            Name of the objective or constraint.
+            
+        wrt: string
+            Name of the parameter.
+        """
+        index = self.get_parameters().keys().index(wrt)
+        return self._gradient[output_name][index]
+        
                                                          
     def _differentiator_changed(self, old, new):
         """When a new differentiator is slotted, give it a handle to the
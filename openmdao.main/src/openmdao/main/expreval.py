@@ -3,6 +3,7 @@
 #public symbols
 __all__ = ["ExprEvaluator"]
 
+import imp
 import weakref
 import math
 import ast
@@ -40,13 +41,24 @@ else:
     _expr_dict['numpy'] = numpy
     #_import_functs(numpy, _expr_dict, names=[])
     
-# if scipy is available, add some functions
+# if scipy is available, add some functions. scipy is slow to import, so
+# scipy.special isn't imported until one of these is called.
+def _scipy_special(name):
+    def wrapper(*args, **kwargs):
+        import scipy.special
+        func = getattr(scipy.special, name)
+        _expr_dict[name] = func
+        return func(*args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
 try:
-    import scipy.special
+    imp.find_module('scipy')
 except ImportError:
     pass
 else:
-    _import_functs(scipy.special, _expr_dict, names=['gamma', 'polygamma'])
+    for _name in ('gamma', 'polygamma'):
+        _expr_dict[_name] = _scipy_special(_name)
 
 _Missing = object()
 
@@ -57,12 +57,18 @@ class GridEngineAllocator(FactoryAllocator):
         pattern: *
         authkey: PublicKey
         allow_shell: True
+        runtime_margin: 0
         MPICH2: mpich
         OpenMPI: ompi
 
     The last two entries provide a mapping between DRMAA job category names
     and the configured GridEngine parallel environment names.  Additional
     categories may be configured, and the above configuration is site-specific.
+
+    If `runtime_margin` is greater than zero, a ``runtime_hint`` in the
+    deployment request is multiplied by it and used as the ``wallclock_time``
+    limit for submitted jobs which don't specify one. This allows the
+    scheduler to backfill short jobs.
     """
 
     _QHOST = ['qhost']  # Replaced with path to fake for testing.
@@ -75,6 +81,7 @@ class GridEngineAllocator(FactoryAllocator):
             'grid_engine_grid_engine_GridEngineServer'
         self.pattern = pattern
         self.category_map = {}
+        self.runtime_margin = 0.
 
     def configure(self, cfg):
         """
@@ -85,13 +92,16 @@ class GridEngineAllocator(FactoryAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying factory options, `pattern` and the job
-        category map.
+        Allows modifying factory options, `pattern`, `runtime_margin`,
+        and the job category map.
         """
         super(GridEngineAllocator, self).configure(cfg)
         if cfg.has_option(self.name, 'pattern'):
             self.pattern = cfg.get(self.name, 'pattern')
             self._logger.debug('    pattern: %s', self.pattern)
+        if cfg.has_option(self.name, 'runtime_margin'):
+            self.runtime_margin = cfg.getfloat(self.name, 'runtime_margin')
+            self._logger.debug('    runtime_margin: %s', self.runtime_margin)
         for category in JOB_CATEGORIES:
             if cfg.has_option(self.name, category):
                 parallel_environment = cfg.get(self.name, category)
@@ -229,7 +239,8 @@ class GridEngineAllocator(FactoryAllocator):
         """
         Deploy a server suitable for `resource_desc`.
         Returns a proxy to the deployed server.
-        Overrides superclass to pass `category_map` to server.
+        Overrides superclass to pass `category_map` and the wallclock
+        limit derived from ``runtime_hint`` to server.
 
         name: string
             Name for server.
@@ -243,7 +254,12 @@ class GridEngineAllocator(FactoryAllocator):
         server = super(GridEngineAllocator, self).deploy(name, resource_desc,
                                                          criteria)
         if server is not None:
-            server.configure(self.category_map)
+            hint = resource_desc.get('runtime_hint')
+            if hint and self.runtime_margin > 0:
+                server.configure(self.category_map,
+                                 int(hint * self.runtime_margin) + 1)
+            else:
+                server.configure(self.category_map)
         return server
 
 
@@ -252,15 +268,21 @@ class GridEngineServer(ObjServer):
 
     _QSUB = ['qsub']  # Replaced with path to fake for testing.
 
+    wallclock_time = None  # Default limit, set by configure().
+
     @rbac('owner')
-    def configure(self, category_map):
+    def configure(self, category_map, wallclock_time=None):
         """
         Configure parallel environment category map.
 
         category_map: dict
             Maps from 'job_category' to parallel environment name.
+
+        wallclock_time: int (seconds)
+            If not None, default ``wallclock_time`` resource limit.
         """
         self.category_map = category_map
+        self.wallclock_time = wallclock_time
 
     @rbac('owner')
     def execute_command(self, resource_desc):
@@ -461,14 +483,13 @@ class GridEngineServer(ObjServer):
                         '%d-%d' % (min_cpus, max_cpus)))
 
         # Set resource limits.
-        if 'resource_limits' in resource_desc:
-            limits = resource_desc['resource_limits']
-            if 'cpu_time' in limits:
-                cpu_time = limits['cpu_time']
-                cmd.extend(('-l', 'h_cpu=%s' % self._timelimit(cpu_time)))
-            if 'wallclock_time' in limits:
-                wall_time = limits['wallclock_time']
-                cmd.extend(('-l', 'h_rt=%s' % self._timelimit(wall_time)))
+        limits = resource_desc.get('resource_limits', {})
+        if 'cpu_time' in limits:
+            cpu_time = limits['cpu_time']
+            cmd.extend(('-l', 'h_cpu=%s' % self._timelimit(cpu_time)))
+        wall_time = limits.get('wallclock_time', self.wallclock_time)
+        if wall_time:
+            cmd.extend(('-l', 'h_rt=%s' % self._timelimit(wall_time)))
 
         # Set default command configuration.
         if not self.work_dir:
@@ -0,0 +1,272 @@
+"""
+Asynchronous evaluation of components, typically within remote servers.
+
+:func:`submit` starts an evaluation and returns an :class:`EvaluationFuture`
+for its results. Completion may be detected by waiting on the future,
+by a callback, or via :func:`as_completed`. Evaluations may be submitted to
+a single model or to a :class:`ModelPool`, in which case they are run
+concurrently on whichever models are free::
+
+    pool = ModelPool([server.load_model(egg) for server in servers])
+    futures = [submit(pool, 'comp', [('x', x)], ['y']) for x in points]
+    for future in as_completed(futures):
+        y = future.result()[0]
+
+The future interface follows :class:`concurrent.futures.Future`.
+"""
+
+import collections
+import logging
+import Queue
+import threading
+import time
+import traceback
+
+from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.util.wrkpool import Future, TimeoutError, WorkerPool
+
+__all__ = ['EvaluationFuture', 'ModelPool', 'as_completed', 'submit']
+
+
+class ModelPool(object):
+    """
+    A collection of equivalent models, typically proxies returned by
+    :meth:`ObjServer.load_model`. Each model is used by only one evaluation
+    at a time. Evaluations submitted while all models are busy are queued
+    without occupying a worker thread.
+
+    models: list
+        Models to be used.
+    """
+
+    def __init__(self, models):
+        self._models = list(models)
+        self._free = Queue.Queue()
+        for model in self._models:
+            self._free.put(model)
+        self._pending = collections.deque()  # (fn, args) awaiting a model.
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __iter__(self):
+        return iter(self._models)
+
+    def acquire(self):
+        """ Return a free model, waiting if necessary. """
+        while True:
+            # Queue.get() without a timeout isn't interruptible.
+            try:
+                return self._free.get(timeout=1)
+            except Queue.Empty:
+                pass
+
+    def release(self, model):
+        """
+        Return `model` to the pool.
+
+        model: object
+            Model previously returned by :meth:`acquire`.
+        """
+        with self._lock:
+            if not self._pending:
+                self._free.put(model)
+                return
+            fn, args = self._pending.popleft()
+        WorkerPool.submit(fn, model, *args)
+
+    def _submit(self, fn, *args):
+        """
+        Call ``fn(model, *args)`` on a worker thread once a model is free.
+        `fn` must :meth:`release` the model when done.
+        """
+        with self._lock:
+            try:
+                model = self._free.get_nowait()
+            except Queue.Empty:
+                self._pending.append((fn, args))
+                return
+        WorkerPool.submit(fn, model, *args)
+
+
+class EvaluationFuture(Future):
+    """
+    Result of :func:`submit`. In addition to the :class:`Future` behavior,
+    a running evaluation may be cancelled, in which case the component is
+    told to stop via :meth:`Component.stop_evaluation`.
+    """
+
+    def __init__(self):
+        super(EvaluationFuture, self).__init__()
+        self._model = None
+
+    def cancel(self):
+        """
+        Attempt to cancel the evaluation. Returns True if the evaluation
+        was cancelled, False if it already finished.
+        """
+        if super(EvaluationFuture, self).cancel():
+            return True
+        return self._abort(None)
+
+    def set_result(self, result):
+        """ Set the result unless cancelled or timed-out. """
+        with self._condition:
+            if self.done():
+                return
+            self._result = result
+            self._state = self.FINISHED
+            self._condition.notify_all()
+        self._invoke_callbacks()
+
+    def set_exception(self, exc, trace=None):
+        """ Set the exception unless cancelled or timed-out. """
+        with self._condition:
+            if self.done():
+                return
+            self._exception = exc
+            self._traceback = trace
+            self._state = self.FINISHED
+            self._condition.notify_all()
+        self._invoke_callbacks()
+
+    def _expire(self, credentials, timeout):
+        """ Timer callback, abort evaluation which took too long. """
+        caller_creds = get_credentials()
+        set_credentials(credentials)
+        try:
+            self._abort(TimeoutError('Evaluation not done after %s seconds'
+                                     % timeout))
+        finally:
+            set_credentials(caller_creds)
+
+    def _abort(self, exc):
+        """
+        Stop a running evaluation. If `exc` is None the future is marked
+        cancelled, otherwise `exc` is its exception.
+        """
+        with self._condition:
+            if self._state != self.RUNNING:
+                return False
+            if exc is None:
+                self._state = self.CANCELLED
+            else:
+                self._exception = exc
+                self._state = self.FINISHED
+            self._condition.notify_all()
+            model = self._model
+        try:
+            model.stop_evaluation()
+        except Exception as err:
+            logging.warning("EvaluationFuture: can't stop evaluation: %r", err)
+        self._invoke_callbacks()
+        return True
+
+
+def submit(target, component_path, inputs=(), outputs=(), timeout=None,
+           callback=None):
+    """
+    Evaluate a component asynchronously via :meth:`Component.evaluate`.
+    Returns an :class:`EvaluationFuture` whose result is a list of values
+    for `outputs`.
+
+    target: :class:`ModelPool` or model
+        Where to run the evaluation. Typically a proxy to a remote model,
+        but any :class:`Component` may be used.
+
+    component_path: string
+        Path of the component to run, relative to the model.
+        If null, the model itself is run.
+
+    inputs: list of (name, value)
+        Inputs to be set. Names are relative to the component.
+
+    outputs: list of string
+        Outputs to be returned. Names are relative to the component.
+
+    timeout: float (seconds)
+        If not None, a running evaluation is stopped after this time and
+        the future's exception is set to :class:`TimeoutError`.
+
+    callback: callable
+        If not None, called with the future when it completes or is
+        cancelled.
+    """
+    future = EvaluationFuture()
+    if callback is not None:
+        future.add_done_callback(callback)
+    args = (future, get_credentials(), component_path, list(inputs),
+            list(outputs), timeout)
+    if isinstance(target, ModelPool):
+        target._submit(_evaluate, target, *args)
+    else:
+        WorkerPool.submit(_evaluate, target, None, *args)
+    return future
+
+
+def _evaluate(model, pool, future, credentials, path, inputs, outputs,
+              timeout):
+    """
+    Run an evaluation for `future` on a worker thread.
+    If `pool` is not None, `model` is released to it when done.
+    """
+    caller_creds = get_credentials()
+    set_credentials(credentials)
+    try:
+        future._model = model
+        if not future.set_running():
+            return  # Cancelled while waiting.
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, future._expire,
+                                    (credentials, timeout))
+            timer.daemon = True
+            timer.start()
+        try:
+            result = model.evaluate(path, inputs, outputs)
+        except Exception as exc:
+            future.set_exception(exc, traceback.format_exc())
+        else:
+            future.set_result(result)
+        finally:
+            if timer is not None:
+                timer.cancel()
+    finally:
+        set_credentials(caller_creds)
+        if pool is not None:
+            pool.release(model)
+
+
+def as_completed(futures, timeout=None):
+    """
+    Returns an iterator over `futures` yielding each as it completes
+    (or is cancelled). Raises :class:`TimeoutError` if all have not
+    completed within `timeout` seconds.
+
+    futures: list of :class:`Future`
+        Futures to wait for.
+
+    timeout: float (seconds)
+        Maximum time to wait. None implies an infinite wait.
+    """
+    futures = list(futures)
+    done_q = Queue.Queue()
+    for future in futures:
+        future.add_done_callback(done_q.put)
+
+    end = None if timeout is None else time.time() + timeout
+    for i in range(len(futures)):
+        while True:
+            # Queue.get() without a timeout isn't interruptible.
+            wait = 1 if end is None else min(1, end - time.time())
+            if wait <= 0:
+                raise TimeoutError('%d of %d futures not done after %s seconds'
+                                   % (len(futures)-i, len(futures), timeout))
+            try:
+                future = done_q.get(timeout=wait)
+            except Queue.Empty:
+                continue
+            yield future
+            break
@@ -17,6 +17,12 @@ is used between the Proxy and Server:
 If `authkey` is not 'PublicKey', then the above session protocol is not used,
 and channel data is in the clear.
 
+Requests and replies are sent using :meth:`mp_util.send_message`. Large
+:mod:`numpy` arrays are not pickled, their data is sent directly from the
+array buffer following the rest of the message (and received directly into
+a new buffer). Encryption is done in chunks rather than on a complete copy of
+the message.
+
 Public methods of an object are determined by a role-based access control
 attribute associated with the method. The server will verify that the current
 role is allowed access. The current role is determined by an
@@ -60,8 +66,9 @@ if sys.platform == 'win32':  #pragma no cover
 from traits.trait_handlers import TraitDictObject
 
 from openmdao.main.interfaces import obj_has_interface
-from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
-                                  keytype, make_typeid, public_methods, \
+from openmdao.main.mp_util import is_legal_connection, keytype, \
+                                  make_typeid, public_methods, \
+                                  recv_message, send_message, \
                                   tunnel_address, SPECIALS
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
@@ -381,8 +388,6 @@ class OpenMDAO_Server(Server):
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
-        send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
 
@@ -397,9 +402,10 @@ class OpenMDAO_Server(Server):
             try:
                 ident = methodname = args = kwds = credentials = None
                 obj = exposed = gettypeid = None
-                data = recv()
                 try:
-                    request = decrypt(data, session_key)
+                    request = recv_message(conn, session_key)
+                except EOFError:
+                    raise
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
@@ -518,9 +524,10 @@ class OpenMDAO_Server(Server):
 
             try:
                 try:
-                    send(encrypt(msg, session_key))
+                    send_message(conn, msg, session_key)
                 except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                    send_message(conn, ('#UNSERIALIZABLE', repr(msg)),
+                                 session_key)
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -540,8 +547,8 @@ class OpenMDAO_Server(Server):
             raise
 
         client_version = client_data[0]
-        if client_version != 1:  #pragma no cover
-            msg = 'Expected client protocol version 1, got %r' % client_version
+        if client_version != 2:  #pragma no cover
+            msg = 'Expected client protocol version 2, got %r' % client_version
             self._logger.error(msg)
             raise RuntimeError(msg)
 
@@ -558,7 +565,7 @@ class OpenMDAO_Server(Server):
             self._logger.error("Can't recreate client key: %r", exc)
             raise
 
-        server_version = 1
+        server_version = 2
         try:
             session_key = hashlib.sha1(str(id(conn))).hexdigest()
             data = client_key.encrypt(session_key, '')
@@ -1269,15 +1276,15 @@ class OpenMDAO_Proxy(BaseProxy):
                 new_args.append(arg)
 
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
+            send_message(conn, (self._id, methodname, new_args, kwds,
+                                get_credentials().encode()), session_key)
         except IOError as exc:
             msg = "Can't send to server at %r for %r: %r" \
                   % (self._token.address, methodname, exc)
             logging.error(msg)
             raise RuntimeError(msg)
 
-        kind, result = decrypt(conn.recv(), session_key)
+        kind, result = recv_message(conn, session_key)
 
         if kind == '#RETURN':
             return result
@@ -1322,14 +1329,14 @@ class OpenMDAO_Proxy(BaseProxy):
 
         server_key = self._pubkey
         encrypted = pk_encrypt(text, server_key)
-        client_version = 1
+        client_version = 2
         conn.send((client_version, server_key.n, server_key.e, encrypted))
 
         server_data = conn.recv()
         server_version = server_data[0]
         # Just being defensive, this should never happen.
-        if server_version != 1:  #pragma no cover
-            msg = 'Expecting server protocol version 1, got %r' % server_version
+        if server_version != 2:  #pragma no cover
+            msg = 'Expecting server protocol version 2, got %r' % server_version
             logging.error(msg)
             if server_version == '#TRACEBACK':
                 try:
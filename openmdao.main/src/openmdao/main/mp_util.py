@@ -5,6 +5,7 @@ Multiprocessing support utilities.
 import ConfigParser
 import copy
 import cPickle
+import cStringIO
 import errno
 import getpass
 import inspect
@@ -12,9 +13,12 @@ import logging
 import os.path
 import re
 import socket
+import struct
 import sys
 import time
 
+import numpy
+
 from Crypto.Cipher import AES
 
 from multiprocessing import current_process, connection
@@ -35,6 +39,11 @@ _TUNNEL_MAP = {}
 # Log files that haven't been cleaned up yet due to Windows issue.
 _TUNNEL_PENDING = []
 
+# Arrays at least this large are sent as raw buffers by send_message().
+OOB_THRESHOLD = 1 << 16
+# Size of chunks when encrypting/decrypting raw buffers.
+CRYPT_CHUNK = 1 << 20
+
 
 def keytype(authkey):
     """
@@ -422,6 +431,148 @@ def decrypt(msg, session_key):
         return msg
 
 
+def send_message(conn, obj, session_key=''):
+    """
+    Send `obj` on `conn`, encrypted if `session_key` is specified.
+    Large contiguous :class:`numpy.ndarray` objects within `obj` are not
+    pickled. Instead their data is sent directly from the array's buffer
+    following the pickled remainder of `obj`. Encryption is done in chunks,
+    so no complete encrypted copy of the message is created.
+    Must be received by :meth:`recv_message`.
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to send on.
+
+    obj: object
+        Object to be sent.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+    """
+    buffers = []
+    text = _pickle(obj, buffers)
+    header = struct.pack('<I%dQ' % len(buffers), len(buffers),
+                         *[len(buf) for buf in buffers])
+    if session_key:
+        cipher = _new_cipher(session_key)
+        header += struct.pack('<Q', len(text))
+        conn.send_bytes(cipher.encrypt(_pad(header + text)))
+        for buf in buffers:
+            for start in range(0, len(buf), CRYPT_CHUNK):
+                chunk = buffer(buf, start, CRYPT_CHUNK)
+                if len(chunk) % AES.block_size:
+                    chunk = _pad(str(chunk))
+                conn.send_bytes(cipher.encrypt(chunk))
+    else:
+        conn.send_bytes(header + text)
+        for buf in buffers:
+            conn.send_bytes(buf)
+
+
+def recv_message(conn, session_key=''):
+    """
+    Return object received on `conn` which was sent by :meth:`send_message`.
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to receive from.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+    """
+    cipher = _new_cipher(session_key) if session_key else None
+    data = conn.recv_bytes()
+    if cipher is not None:
+        data = cipher.decrypt(data)
+    count = struct.unpack('<I', data[:4])[0]
+    offset = 4 + 8*count
+    sizes = struct.unpack('<%dQ' % count, data[4:offset])
+    if cipher is None:
+        text = buffer(data, offset)
+    else:
+        length = struct.unpack('<Q', data[offset:offset+8])[0]
+        text = buffer(data, offset+8, length)
+
+    # Receive all buffers before unpickling so the connection stays in sync
+    # even if unpickling fails.
+    raw = []
+    for size in sizes:
+        buf = numpy.empty(size, dtype=numpy.uint8)
+        if cipher is None:
+            conn.recv_bytes_into(buf)
+        else:
+            for start in range(0, size, CRYPT_CHUNK):
+                chunk = cipher.decrypt(conn.recv_bytes())
+                end = min(start + CRYPT_CHUNK, size)
+                buf[start:end] = numpy.frombuffer(chunk, numpy.uint8,
+                                                  end - start)
+        raw.append(buf)
+
+    arrays = {}
+
+    def persistent_load(pid):
+        """ Return array view of raw buffer. """
+        index, dtype, shape, fortran = pid
+        arr = arrays.get(index)
+        if arr is None:
+            arr = raw[index].view(dtype).reshape(shape,
+                                                 order='F' if fortran else 'C')
+            arrays[index] = arr
+        return arr
+
+    unpickler = cPickle.Unpickler(cStringIO.StringIO(text))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
+def _pickle(obj, buffers):
+    """
+    Returns pickled `obj`. Large contiguous arrays are replaced by
+    references to buffers appended to `buffers`.
+    """
+    ids = {}
+
+    def persistent_id(obj):
+        """ Return reference to out-of-band buffer for suitable arrays. """
+        if type(obj) not in (numpy.ndarray, numpy.memmap) or \
+           obj.nbytes < OOB_THRESHOLD or obj.dtype.hasobject:
+            return None
+        if obj.flags.c_contiguous:
+            fortran = False
+        elif obj.flags.f_contiguous:
+            fortran = True
+        else:
+            return None
+        index = ids.get(id(obj))
+        if index is None:
+            index = len(buffers)
+            ids[id(obj)] = index
+            buffers.append(buffer(obj))  # Keeps `obj` (and its id) alive.
+        return (index, obj.dtype, obj.shape, fortran)
+
+    out = cStringIO.StringIO()
+    pickler = cPickle.Pickler(out, cPickle.HIGHEST_PROTOCOL)
+    # Only called for types not directly handled by cPickle.
+    pickler.inst_persistent_id = persistent_id
+    pickler.dump(obj)
+    return out.getvalue()
+
+
+def _new_cipher(session_key):
+    """ Returns AES cipher for `session_key`. """
+    # Just being defensive, this should never happen.
+    if len(session_key) < 16:  #pragma no cover
+        session_key += '!'*16
+    return AES.new(session_key[:16], AES.MODE_CBC, '?'*AES.block_size)
+
+
+def _pad(text):
+    """ Returns `text` padded to a multiple of the AES block size. """
+    pad = len(text) % AES.block_size
+    if pad:
+        text += '-' * (AES.block_size - pad)
+    return text
+
+
 def public_methods(obj):
     """
     Returns a list of names of the methods of `obj` to be exposed.
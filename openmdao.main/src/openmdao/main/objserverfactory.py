@@ -16,6 +16,8 @@ import socket
 import sys
 import time
 
+from collections import OrderedDict
+from cStringIO import StringIO
 from multiprocessing import current_process
 
 from openmdao.main.component import SimulationRoot
@@ -31,6 +33,9 @@ from openmdao.main.rbac import get_credentials, set_credentials, \
                                rbac, RoleError
 from openmdao.main.releaseinfo import __version__
 
+from openmdao.util import filexfer
+from openmdao.util.eggloader import extract_eggfile
+from openmdao.util.eggsaver import SAVE_CPICKLE
 from openmdao.util.filexfer import pack_zipfile, unpack_zipfile
 from openmdao.util.log import install_remote_handler, remove_remote_handlers, \
                               logging_port, LOG_DEBUG2
@@ -339,8 +344,15 @@ class ObjServer(object):
         Names of types which may be created. If None, then allow types listed
         by :meth:`factorymanager.get_available_types`. If empty, no types are
         allowed.
+
+    The initial state of models loaded by :meth:`load_model` is kept in
+    memory (for up to `max_models` eggs), keyed by egg content hash.
+    Loading the same egg again re-extracts its files and restores that state
+    rather than loading the egg's modules and entry point again.
     """
 
+    max_models = 4  # Number of model states cached.
+
     def __init__(self, name='', allow_shell=False, allowed_types=None):
         self._allow_shell = allow_shell
         if allowed_types is None:
@@ -364,6 +376,7 @@ class ObjServer(object):
 
         SimulationRoot.chroot(self._root_dir)
         self.tlo = None
+        self._models = OrderedDict()  # Egg hash -> (egg path, pickled state).
 
         # Ensure Traits Array support is initialized. The code contains
         # globals for numpy symbols that are initialized within
@@ -508,9 +521,67 @@ class ObjServer(object):
                                get_credentials().user)
             raise RuntimeError('shell access is not allowed by this server')
         self._check_path(egg_filename, 'load_model')
+
+        hashes = filexfer.file_hashes(egg_filename, filexfer.CHUNK_SIZE)
+        egg_hash = hashes[0] if hashes else None
+        if egg_hash in self._models:
+            return self._restore_model(egg_hash, egg_filename)
+
         if self.tlo:
             self.tlo.pre_delete()
         self.tlo = Container.load_from_eggfile(egg_filename, log=self._logger)
+        if egg_hash is not None:
+            stream = StringIO()
+            try:
+                self.tlo.save(stream, SAVE_CPICKLE)
+            except Exception as exc:
+                self._logger.warning("can't cache model state: %s", exc)
+            else:
+                self._models[egg_hash] = (os.path.abspath(egg_filename),
+                                          stream.getvalue())
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+        return self.tlo
+
+    @rbac('owner', proxy_types=[Container])
+    def restore_model(self, egg_hash):
+        """
+        If the model from an egg with SHA1 digest `egg_hash` has been loaded
+        by :meth:`load_model` and that egg file is still present, re-extract
+        its files, restore the model to its initial state, and return
+        the top-level object. Otherwise return None.
+        This avoids both transferring and loading the egg again.
+
+        egg_hash: string
+            Hex SHA1 digest of the egg file.
+        """
+        self._logger.debug('restore_model %r', egg_hash)
+        if not self._allow_shell:
+            self._logger.error('attempt to restore %r by %r', egg_hash,
+                               get_credentials().user)
+            raise RuntimeError('shell access is not allowed by this server')
+        if egg_hash not in self._models:
+            return None
+        egg_filename = self._models[egg_hash][0]
+        hashes = filexfer.file_hashes(egg_filename, filexfer.CHUNK_SIZE) \
+                 if os.path.exists(egg_filename) else None
+        if not hashes or hashes[0] != egg_hash:
+            del self._models[egg_hash]  # Egg removed or replaced.
+            return None
+        return self._restore_model(egg_hash, egg_filename)
+
+    def _restore_model(self, egg_hash, egg_filename):
+        """
+        Extract files from `egg_filename` and replace current model with
+        cached state for `egg_hash`.
+        """
+        state = self._models.pop(egg_hash)[1]
+        # Now most recently used.
+        self._models[egg_hash] = (os.path.abspath(egg_filename), state)
+        extract_eggfile(egg_filename, self._logger)
+        if self.tlo:
+            self.tlo.pre_delete()
+        self.tlo = Container.load(StringIO(state), SAVE_CPICKLE)
         return self.tlo
 
     @rbac('owner')
@@ -657,6 +728,106 @@ class ObjServer(object):
                                path, os.getcwd(), exc)
             raise
 
+    @rbac('owner')
+    def file_hashes(self, path, chunk_size):
+        """
+        Returns ``(digest, chunk_digests)`` for `path` if `path` is legal.
+        See :func:`filexfer.file_hashes`.
+
+        path: string
+            Path to file to hash.
+
+        chunk_size: int
+            Size of chunks.
+        """
+        self._logger.debug('file_hashes %r %d', path, chunk_size)
+        self._check_path(path, 'file_hashes')
+        return filexfer.file_hashes(path, chunk_size)
+
+    @rbac('owner')
+    def read_chunk(self, path, offset, size, compress=False):
+        """
+        Returns data from `path` if `path` is legal.
+        See :func:`filexfer.read_chunk`.
+
+        path: string
+            Path to file to read.
+
+        offset: int
+            Offset of data in file.
+
+        size: int
+            Number of bytes to read.
+
+        compress: bool
+            If True, data is returned compressed.
+        """
+        self._logger.log(LOG_DEBUG2, 'read_chunk %r %d %d', path, offset, size)
+        self._check_path(path, 'read_chunk')
+        return filexfer.read_chunk(path, offset, size, compress)
+
+    @rbac('owner')
+    def write_chunk(self, path, offset, data, compress=False, digest=None):
+        """
+        Writes `data` to `path` if `path` is legal.
+        See :func:`filexfer.write_chunk`.
+
+        path: string
+            Path to file to write.
+
+        offset: int
+            Offset of data in file.
+
+        data: string
+            Data to write.
+
+        compress: bool
+            If True, `data` is compressed.
+
+        digest: string
+            If specified, SHA1 hex digest which `data` must match.
+        """
+        self._logger.log(LOG_DEBUG2, 'write_chunk %r %d', path, offset)
+        self._check_path(path, 'write_chunk')
+        return filexfer.write_chunk(path, offset, data, compress, digest)
+
+    @rbac('owner')
+    def truncate(self, path, size):
+        """
+        Truncates `path` to `size`, creating it if necessary,
+        if `path` is legal.
+
+        path: string
+            Path to file to truncate.
+
+        size: int
+            New size of file.
+        """
+        self._logger.debug('truncate %r %d', path, size)
+        self._check_path(path, 'truncate')
+        return filexfer.truncate(path, size)
+
+    @rbac('owner')
+    def rename(self, src_path, dst_path):
+        """
+        Renames `src_path` to `dst_path` if both are legal.
+
+        src_path: string
+            Path to existing file.
+
+        dst_path: string
+            New path.
+        """
+        self._logger.debug('rename %r %r', src_path, dst_path)
+        self._check_path(src_path, 'rename')
+        self._check_path(dst_path, 'rename')
+        try:
+            return filexfer.rename(src_path, dst_path)
+        except Exception as exc:
+            self._logger.error('rename %r %r in %s failed %s',
+                               src_path, dst_path, os.getcwd(), exc)
+            raise
+
     def _check_path(self, path, operation):
         """ Check if path is allowed to be used. """
         abspath = os.path.abspath(path)
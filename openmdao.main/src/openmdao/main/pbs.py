@@ -54,15 +54,21 @@ class PBS_Allocator(FactoryAllocator):
         [PBS]
         classname: openmdao.main.pbs.PBS_Allocator
         accounting_id: no-default-set
+        runtime_margin: 0
         authkey: PublicKey
         allow_shell: True
 
+    If `runtime_margin` is greater than zero, a ``runtime_hint`` in the
+    deployment request is multiplied by it and used as the ``wallclock_time``
+    limit for submitted jobs which don't specify one. This allows the
+    scheduler to backfill short jobs.
     """
 
     def __init__(self, name='PBS', accounting_id='no-default-set',
                  authkey=None, allow_shell=True):
         super(PBS_Allocator, self).__init__(name, authkey, allow_shell)
         self.accounting_id = accounting_id
+        self.runtime_margin = 0.
         self.factory.manager_class = _ServerManager
         self.factory.server_classname = 'pbs_pbs_PBS_Server'
 #FIXME: need to somehow determine available cpus.
@@ -77,12 +83,16 @@ class PBS_Allocator(FactoryAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying `accounting_id` and factory options.
+        Allows modifying `accounting_id`, `runtime_margin`, and factory
+        options.
         """
         super(PBS_Allocator, self).configure(cfg)
         if cfg.has_option(self.name, 'accounting_id'):
             self.accounting_id = cfg.get(self.name, 'accounting_id')
             self._logger.debug('    accounting_id: %s', self.accounting_id)
+        if cfg.has_option(self.name, 'runtime_margin'):
+            self.runtime_margin = cfg.getfloat(self.name, 'runtime_margin')
+            self._logger.debug('    runtime_margin: %s', self.runtime_margin)
 
     @rbac('*')
     def max_servers(self, resource_desc):
@@ -167,7 +177,8 @@ class PBS_Allocator(FactoryAllocator):
         """
         Deploy a server suitable for `resource_desc`.
         Returns a proxy to the deployed server.
-        Overrides superclass to pass `accounting_id` to server.
+        Overrides superclass to pass `accounting_id` and the wallclock
+        limit derived from ``runtime_hint`` to server.
 
         name: string
             Name for server.
@@ -181,7 +192,12 @@ class PBS_Allocator(FactoryAllocator):
         server = super(PBS_Allocator, self).deploy(name, resource_desc,
                                                    criteria)
         if server is not None:
-            server.configure(self.accounting_id)
+            hint = resource_desc.get('runtime_hint')
+            if hint and self.runtime_margin > 0:
+                server.configure(self.accounting_id,
+                                 int(hint * self.runtime_margin) + 1)
+            else:
+                server.configure(self.accounting_id)
         return server
 
 
@@ -190,15 +206,21 @@ class PBS_Server(ObjServer):
 
     _QSUB = ['qsub']  # Replaced with fake command for testing.
 
+    wallclock_time = None  # Default limit, set by configure().
+
     @rbac('owner')
-    def configure(self, accounting_id):
+    def configure(self, accounting_id, wallclock_time=None):
         """
         Configure default accounting id.
 
         accounting_id: string
             Used as default ``accounting_id`` value.
+
+        wallclock_time: int (seconds)
+            If not None, default ``wallclock_time`` resource limit.
         """
         self.accounting_id = accounting_id
+        self.wallclock_time = wallclock_time
 
     @rbac('owner')
     def execute_command(self, resource_desc):
@@ -422,12 +444,11 @@ class PBS_Server(ObjServer):
                 script.write('%s -m %s\n' % (prefix, email_events))
 
             # Set resource limits.
-            if 'resource_limits' in resource_desc:
-                limits = resource_desc['resource_limits']
-                if 'wallclock_time' in limits:
-                    wall_time = limits['wallclock_time']
-                    script.write('%s -l walltime=%s\n'
-                                 % (prefix, self._timelimit(wall_time)))
+            limits = resource_desc.get('resource_limits', {})
+            wall_time = limits.get('wallclock_time', self.wallclock_time)
+            if wall_time:
+                script.write('%s -l walltime=%s\n'
+                             % (prefix, self._timelimit(wall_time)))
 
             # Have script move to work directory relative to
             # home directory on execution host.
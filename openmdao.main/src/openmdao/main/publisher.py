@@ -1,6 +1,8 @@
+import time
 import traceback
 
-from threading import RLock
+from collections import OrderedDict
+from threading import Event, Lock, RLock, Thread, current_thread
 
 try:
     import simplejson as json
@@ -56,43 +58,101 @@ class Pub_WV_Wrapper(WV_Wrapper):
 
 
 class Publisher(object):
+    """Publishes messages on a ZeroMQ PUB socket bound to `url`.
+
+    If `max_rate` is greater than zero, messages are queued and sent in
+    batches by a background thread, at most `max_rate` batches per second.
+    Publishing then never waits for the socket. Updates published with
+    `coalesce` set (variable values and execution state) keep only the
+    latest value per topic until sent, so a slow subscriber sees fewer
+    updates rather than slowing the model. Messages are sent in the order
+    published, a coalesced update taking the place of the one it replaced.
+    At most `max_pending` other messages are queued; beyond that the oldest
+    are dropped (and counted in `dropped`).
+
+    The background thread sends on the socket directly, so batches go out
+    even while the IOLoop thread is busy (for instance running a model).
+    `use_stream` only applies to immediate sending, and a
+    :class:`ZMQStream` isn't created if starting with `max_rate` > 0.
+    """
 
     __publisher = None
     __enabled = True
     silent = False
 
-    def __init__(self, context, url, use_stream=True):
+    def __init__(self, context, url, use_stream=True, max_rate=0,
+                 max_pending=10000):
         # Socket to talk to pub socket
-        sock = context.socket(zmq.PUB)
-        sock.bind(url)
-        if use_stream:
-            self._sender = zmqstream.ZMQStream(sock)
+        self._socket = context.socket(zmq.PUB)
+        self._socket.bind(url)
+        if use_stream and max_rate <= 0:
+            self._sender = zmqstream.ZMQStream(self._socket)
         else:
-            self._sender = sock
-
-    def publish(self, topic, value, lock=True, binary=False):
-        global _binpubs
+            self._sender = self._socket
+
+        self._max_rate = 0
+        self.max_pending = max_pending
+        self._pending_lock = Lock()
+        self._ready = Event()      # Set when something is pending.
+        # (topic, value, binary) in send order, keyed by topic if coalesced,
+        # otherwise by sequence number.
+        self._pending = OrderedDict()
+        self._seqno = 0
+        self._queued = 0           # Number of non-coalesced entries.
+        self._thread = None
+        self.coalesced = 0         # Number of updates replaced before sent.
+        self.dropped = 0           # Number of messages dropped unsent.
+        self.set_max_rate(max_rate)
+
+    @property
+    def max_rate(self):
+        """Maximum batches per second, zero if sending immediately."""
+        return self._max_rate
+
+    def set_max_rate(self, max_rate):
+        """Set the maximum rate (batches per second) for sending messages.
+        If zero, each message is sent immediately by the publishing thread,
+        after the background thread has sent anything still queued.
+
+        max_rate: float
+            Maximum batches per second.
+        """
+        with self._pending_lock:
+            self._max_rate = max_rate
+            thread = self._thread
+            if max_rate > 0 and thread is None:
+                if self._sender is not self._socket:
+                    self._sender.flush()  # Socket is now the thread's.
+                self._thread = Thread(target=self._run, name='Publisher')
+                self._thread.daemon = True
+                self._thread.start()
+        self._ready.set()  # Get thread to notice.
+        if max_rate <= 0 and thread is not None \
+           and thread is not current_thread():
+            thread.join()
+
+    def publish(self, topic, value, lock=True, binary=False, coalesce=False):
         if Publisher.__enabled:
+            if self._max_rate > 0:
+                with self._pending_lock:
+                    if coalesce and not binary:
+                        key = (True, topic)
+                        if key in self._pending:
+                            self.coalesced += 1
+                            del self._pending[key]  # Send at new position.
+                    else:
+                        if self._queued >= self.max_pending:
+                            self._drop_oldest()
+                        self._seqno += 1
+                        self._queued += 1
+                        key = (False, self._seqno)
+                    self._pending[key] = (topic, value, binary)
+                    self._ready.set()
+                return
             try:
                 if lock:
                     _lock.acquire()
-                if binary:
-                    if not isinstance(value, bytes):
-                        raise TypeError("published binary value must be of type 'bytes'")
-                    logger.debug("sending binary value for topic %s" % topic)
-                    self._sender.send_multipart([topic.encode('utf-8'), value])
-                elif topic in _binpubs:
-                    # if a binary publisher exists for this topic, use that to
-                    # publish the value. It will call publish again (possibly multiple times)
-                    # with binary=True
-                    logger.debug("sending value via binpub for topic %s" % topic)
-                    try:
-                        _binpubs[topic][1].send(value)
-                    except Exception:
-                        logger.error("ERROR: %s" % traceback.format_exc())
-                else:
-                    msg = json.dumps([topic.encode('utf-8'), value], default=json_default)
-                    self._sender.send_multipart([msg])
+                self._send(topic, value, binary)
                 if hasattr(self._sender, 'flush'):
                     self._sender.flush()
             except Exception:
@@ -104,19 +164,90 @@ class Publisher(object):
 
     def publish_list(self, items):
         if Publisher.__enabled:
-            with _lock:
+            if self._max_rate > 0:
                 for topic, value in items:
-                    self.publish(topic, value, lock=False)
+                    self.publish(topic, value, coalesce=True)
+            else:
+                with _lock:
+                    for topic, value in items:
+                        self.publish(topic, value, lock=False)
+
+    def _drop_oldest(self):
+        """Drop the oldest non-coalesced message.
+        Must be called with `_pending_lock` held.
+        """
+        for key in self._pending:
+            if not key[0]:
+                del self._pending[key]
+                self._queued -= 1
+                self.dropped += 1
+                return
+
+    def _send(self, topic, value, binary, sender=None):
+        """Send one message via `sender` (default `_sender`)."""
+        if sender is None:
+            sender = self._sender
+        if binary:
+            if not isinstance(value, bytes):
+                raise TypeError("published binary value must be of type 'bytes'")
+            logger.debug("sending binary value for topic %s" % topic)
+            sender.send_multipart([topic.encode('utf-8'), value])
+        elif topic in _binpubs:
+            # if a binary publisher exists for this topic, use that to
+            # publish the value. It will call publish again (possibly multiple times)
+            # with binary=True
+            logger.debug("sending value via binpub for topic %s" % topic)
+            try:
+                _binpubs[topic][1].send(value)
+            except Exception:
+                logger.error("ERROR: %s" % traceback.format_exc())
+        else:
+            msg = json.dumps([topic.encode('utf-8'), value], default=json_default)
+            sender.send_multipart([msg])
+
+    def _run(self):
+        """Background thread, sends batches at up to `max_rate`.
+        While running, it is the only user of the socket.
+        """
+        while True:
+            max_rate = self._max_rate
+            if max_rate <= 0:
+                self._flush()  # Anything left.
+                with self._pending_lock:
+                    if self._max_rate <= 0:
+                        self._thread = None
+                        return
+                continue
+            self._ready.wait(1)
+            if self._ready.is_set():
+                self._flush()
+                time.sleep(1. / max_rate)
+
+    def _flush(self):
+        """Send all pending messages. While sending, updates continue
+        to be queued (and coalesced) for the next batch.
+        """
+        with self._pending_lock:
+            self._ready.clear()
+            pending, self._pending = self._pending, OrderedDict()
+            self._queued = 0
+        for topic, value, binary in pending.itervalues():
+            try:
+                self._send(topic, value, binary, self._socket)
+            except Exception:
+                print 'Publisher - Error publishing message %s: %s, %s' % \
+                      (topic, value, traceback.format_exc())
 
     @staticmethod
     def get_instance():
         return Publisher.__publisher
 
     @staticmethod
-    def init(context, url, use_stream=True):
+    def init(context, url, use_stream=True, max_rate=0, max_pending=10000):
         if Publisher.__publisher is not None:
             raise RuntimeError("publisher already exists")
-        Publisher.__publisher = Publisher(context, url, use_stream)
+        Publisher.__publisher = Publisher(context, url, use_stream, max_rate,
+                                          max_pending)
         return Publisher.__publisher
 
     @staticmethod
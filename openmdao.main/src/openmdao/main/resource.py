@@ -105,9 +105,19 @@ class ResourceAllocationManager(object):
     any other allocation routines, or set the ``OPENMDAO_RAMFILE`` environment
     variable to the path to be used (a null path is legal and avoids any
     additional configuration).
+
+    Allocators are polled for estimates when a request is made rather than
+    publishing them in the background (:class:`LocalAllocator` and
+    :class:`ClusterAllocator` cache results for a short time). Since
+    estimates don't reflect servers still being deployed, capacity is
+    reserved on the selected allocator until its deploy completes, and
+    allocators whose deployed and reserved servers reach their
+    :meth:`max_servers` are avoided. Deploys proceed without holding any
+    lock, so concurrent requests overlap.
     """
 
     _lock = threading.Lock()
+    _allocate_lock = threading.Lock()  # Serializes estimate and reservation.
     _RAM = None  # Singleton.
 
     def __init__(self, config_filename=None):
@@ -116,6 +126,7 @@ class ResourceAllocationManager(object):
         self._allocations = 0
         self._allocators = []
         self._deployed_servers = {}
+        self._reserved = {}  # Allocator id -> servers being deployed.
         self._allocators.append(LocalAllocator('LocalHost',
                                                authkey='PublicKey',
                                                allow_shell=True))
@@ -322,33 +333,24 @@ class ResourceAllocationManager(object):
         """
         ResourceAllocationManager.validate_resources(resource_desc)
         ram = ResourceAllocationManager._get_instance()
-        with ResourceAllocationManager._lock:
-            return ram._allocate(resource_desc)
+        return ram._allocate(resource_desc)
 
     def _allocate(self, resource_desc):
         """ Do the allocation. """
         deployment_retries = 0
         best_estimate = -1
         while best_estimate == -1:
-            best_estimate, best_criteria, best_allocator = \
-                self._get_estimates(resource_desc)
+            with ResourceAllocationManager._allocate_lock:
+                best_estimate, best_criteria, best_allocator = \
+                    self._get_estimates(resource_desc, check_capacity=True)
+                if best_estimate >= 0:
+                    name = self._next_name()
+                    with ResourceAllocationManager._lock:
+                        self._reserve(best_allocator, 1)
             if best_estimate >= 0:
-                self._allocations += 1
-                name = 'Sim-%d' % self._allocations
-                self._logger.debug('deploying on %r', best_allocator._name)
-                server = best_allocator.deploy(name, resource_desc,
-                                               best_criteria)
+                server, server_info = self._deploy(best_allocator, name,
+                                                   resource_desc, best_criteria)
                 if server is not None:
-                    server_info = {
-                        'name': name,
-                        'pid':  server.pid,
-                        'host': server.host
-                    }
-                    self._logger.info('allocated %r pid %d on %s',
-                                      name, server_info['pid'],
-                                      server_info['host'])
-                    self._deployed_servers[id(server)] = \
-                        (best_allocator, server, server_info)
                     return (server, server_info)
                 # Difficult to generate deployable request that won't deploy...
                 else:  #pragma no cover
@@ -364,6 +366,158 @@ class ResourceAllocationManager(object):
             else:  #pragma no cover
                 time.sleep(1)  # Wait a bit between retries.
 
+    @staticmethod
+    def allocate_many(resource_desc, count):
+        """
+        Determine resources for `count` servers satisfying `resource_desc`
+        and deploy them concurrently. Each allocator is polled once, then
+        servers are assigned to allocators in order of their estimates, up to
+        each allocator's remaining :meth:`max_servers` capacity (including
+        servers still being deployed by other requests).
+        Returns a list of ``(proxy-object, server-dict)`` for the servers
+        successfully deployed, which may be fewer than `count` (or empty
+        if all compatible allocators are at capacity).
+
+        resource_desc: dict
+            Description of required resources.
+
+        count: int
+            Number of servers requested.
+        """
+        ResourceAllocationManager.validate_resources(resource_desc)
+        ram = ResourceAllocationManager._get_instance()
+        return ram._allocate_many(resource_desc, count)
+
+    def _allocate_many(self, resource_desc, count):
+        """ Do the allocations. """
+        with ResourceAllocationManager._allocate_lock:
+            plan = [(allocator, criteria, self._next_name())
+                    for allocator, criteria in self._plan(resource_desc, count)]
+            with ResourceAllocationManager._lock:
+                for allocator, criteria, name in plan:
+                    self._reserve(allocator, 1)
+
+        credentials = get_credentials()
+        futures = []
+        for allocator, criteria, name in plan:
+            futures.append(WorkerPool.submit(self._deploy_as, credentials,
+                                             allocator, name,
+                                             resource_desc, criteria))
+        servers = []
+        for future in futures:
+            try:
+                server, server_info = future.result()
+            # Just being defensive.
+            except Exception as exc:  #pragma no cover
+                self._logger.error('deployment failed: %r', exc)
+                continue
+            if server is not None:
+                servers.append((server, server_info))
+        return servers
+
+    def _plan(self, resource_desc, count):
+        """ Return list of ``(allocator, criteria)`` for up to `count` servers. """
+        while True:
+            polled = self._poll(resource_desc)
+            ranked = [(i, estimate, criteria, allocator)
+                      for i, (estimate, criteria, allocator)
+                      in enumerate(polled) if estimate >= 0]
+            if ranked:
+                break
+            if -1 not in [estimate for estimate, criteria, allocator in polled]:
+                return []
+            # Difficult to generate deployable request that won't deploy...
+            time.sleep(1)  #pragma no cover
+
+        # Prefer actual estimates (shortest first) over no estimate.
+        ranked.sort(key=lambda item: (item[1] <= 0, item[1], item[0]))
+
+        with ResourceAllocationManager._lock:
+            in_use = self._in_use()
+
+        plan = []
+        for i, estimate, criteria, allocator in ranked:
+            if len(plan) >= count:
+                break
+            limit, info = allocator.max_servers(resource_desc)
+            available = limit - in_use.get(id(allocator), 0)
+            while available > 0 and len(plan) < count:
+                if criteria is None:
+                    # Criteria may name a specific host, so get fresh
+                    # criteria for each additional server.
+                    estimate, criteria = allocator.time_estimate(resource_desc)
+                    if estimate < 0:
+                        break
+                plan.append((allocator, criteria))
+                criteria = None
+                available -= 1
+
+        self._logger.debug('planned %d of %d servers', len(plan), count)
+        return plan
+
+    def _in_use(self):
+        """
+        Return count of servers deployed or being deployed, keyed by
+        allocator id. Must be called with the global lock held.
+        """
+        in_use = self._reserved.copy()
+        for allocator, server, server_info in self._deployed_servers.values():
+            in_use[id(allocator)] = in_use.get(id(allocator), 0) + 1
+        return in_use
+
+    def _reserve(self, allocator, count):
+        """
+        Adjust count of servers being deployed by `allocator`.
+        Must be called with the global lock held.
+        """
+        count += self._reserved.get(id(allocator), 0)
+        if count > 0:
+            self._reserved[id(allocator)] = count
+        else:
+            del self._reserved[id(allocator)]
+
+    def _next_name(self):
+        """ Return name for next server. """
+        with ResourceAllocationManager._lock:
+            self._allocations += 1
+            return 'Sim-%d' % self._allocations
+
+    def _deploy_as(self, credentials, allocator, name, resource_desc, criteria):
+        """ Deploy from a worker thread using `credentials`. """
+        caller_creds = get_credentials()
+        set_credentials(credentials)
+        try:
+            return self._deploy(allocator, name, resource_desc, criteria)
+        finally:
+            set_credentials(caller_creds)
+
+    def _deploy(self, allocator, name, resource_desc, criteria):
+        """
+        Deploy server `name` on `allocator` and record it, then release
+        the capacity reserved for it.
+        Returns ``(proxy-object, server-dict)`` or ``(None, None)``.
+        """
+        try:
+            self._logger.debug('deploying on %r', allocator._name)
+            server = allocator.deploy(name, resource_desc, criteria)
+            if server is None:  #pragma no cover
+                return (None, None)
+
+            server_info = {
+                'name': name,
+                'pid':  server.pid,
+                'host': server.host
+            }
+            self._logger.info('allocated %r pid %d on %s',
+                              name, server_info['pid'], server_info['host'])
+            with ResourceAllocationManager._lock:
+                self._deployed_servers[id(server)] = \
+                    (allocator, server, server_info)
+            return (server, server_info)
+        finally:
+            with ResourceAllocationManager._lock:
+                self._reserve(allocator, -1)
+
     @staticmethod
     def get_hostnames(resource_desc):
         """
@@ -377,8 +531,7 @@ class ResourceAllocationManager(object):
         """
         ResourceAllocationManager.validate_resources(resource_desc)
         ram = ResourceAllocationManager._get_instance()
-        with ResourceAllocationManager._lock:
-            return ram._get_hostnames(resource_desc)
+        return ram._get_hostnames(resource_desc)
 
     def _get_hostnames(self, resource_desc):
         """ Get the hostnames. """
@@ -395,13 +548,17 @@ class ResourceAllocationManager(object):
             else:  #pragma no cover
                 time.sleep(1)  # Wait a bit between retries.
 
-    def _get_estimates(self, resource_desc, need_hostnames=False):
-        """ Return best (estimate, criteria, allocator). """
-        best_estimate = -2
-        best_criteria = None
-        best_allocator = None
+    def _poll(self, resource_desc):
+        """
+        Return list of ``(estimate, criteria, allocator)`` for each allocator.
+        The global lock is only held while copying the allocators list so
+        that slow allocators don't block other requests.
+        """
+        with ResourceAllocationManager._lock:
+            allocators = list(self._allocators)
 
-        for allocator in self._allocators:
+        polled = []
+        for allocator in allocators:
             estimate, criteria = allocator.time_estimate(resource_desc)
             if estimate == -2:
                 key = criteria.keys()[0]
@@ -411,7 +568,25 @@ class ResourceAllocationManager(object):
             else:
                 msg = 'OK' if estimate == 0 else 'returned %g' % estimate
                 self._logger.debug('%r %s', allocator.name, msg)
+            polled.append((estimate, criteria, allocator))
+        return polled
 
+    def _get_estimates(self, resource_desc, need_hostnames=False,
+                       check_capacity=False):
+        """
+        Return best (estimate, criteria, allocator).
+        If `check_capacity`, allocators at capacity are avoided
+        (see :meth:`_check_capacity`).
+        """
+        best_estimate = -2
+        best_criteria = None
+        best_allocator = None
+
+        polled = self._poll(resource_desc)
+        if check_capacity:
+            polled = self._check_capacity(resource_desc, polled)
+
+        for estimate, criteria, allocator in polled:
             if (best_estimate == -2 and estimate >= -1) or \
                (best_estimate == 0  and estimate >  0) or \
                (best_estimate >  0  and estimate < best_estimate):
@@ -427,6 +602,39 @@ class ResourceAllocationManager(object):
 
         return (best_estimate, best_criteria, best_allocator)
 
+    def _check_capacity(self, resource_desc, polled):
+        """
+        Return `polled` without allocators whose deployed and reserved
+        servers have reached their :meth:`max_servers` limit.
+        If no other allocator can be used, allocators still deploying are
+        reported as busy, so the request is retried after those deploys
+        complete. Otherwise `polled` is returned unchanged (estimates take
+        precedence over limits, as they do without concurrent requests).
+        """
+        with ResourceAllocationManager._lock:
+            in_use = self._in_use()
+            reserved = set(self._reserved)
+
+        available = []
+        full = []
+        for estimate, criteria, allocator in polled:
+            if estimate >= 0 and in_use.get(id(allocator)):
+                limit, info = allocator.max_servers(resource_desc)
+                if in_use[id(allocator)] >= limit:
+                    self._logger.debug('%r at capacity', allocator.name)
+                    full.append((estimate, criteria, allocator))
+                    continue
+            available.append((estimate, criteria, allocator))
+
+        if [item for item in available if item[0] >= 0]:
+            return available
+        deploying = [(-1, criteria, allocator)
+                     for estimate, criteria, allocator in full
+                     if id(allocator) in reserved]
+        if deploying:
+            return available + deploying
+        return polled
+
     @staticmethod
     def release(server):
         """
@@ -658,6 +866,10 @@ def _positive(value):
     """ Validate positive key value. """
     return isinstance(value, int) and value > 0
 
+def _positive_number(value):
+    """ Validate positive int or float key value. """
+    return isinstance(value, (int, float)) and value > 0
+
 def _string(value):
     """ Validate string key value. """
     return isinstance(value, basestring)
@@ -722,6 +934,7 @@ _VALIDATORS = {'allocator': _allocator,
                'min_cpus': _positive,
                'max_cpus': _positive,
                'min_phys_memory': _positive,
+               'runtime_hint': _positive_number,
 
                'remote_command': _no_whitespace,
                'args': _stringlist,
@@ -843,6 +1056,8 @@ class ResourceAllocator(object):
         for key, value in resource_desc.items():
             if key in QUEUING_SYSTEM_KEYS:
                 pass
+            elif key == 'runtime_hint':
+                pass  # Advisory, used by allocators which care.
             elif key == 'required_distributions':
                 missing = self.check_required_distributions(value)
                 if missing:
@@ -945,6 +1160,12 @@ class FactoryAllocator(ResourceAllocator):
     allow_shell: bool
         If True, :meth:`execute_command` and :meth:`load_model` are allowed
         in created servers. Use with caution!
+
+    Servers are only accessible by the user they were created for, so
+    spare servers are kept per user. Once a user has deployed a server,
+    up to `spares` idle servers are started for that user in the
+    background and handed out by subsequent :meth:`deploy` requests.
+    Spares idle for more than `spare_timeout` seconds are shut down.
     """
     def __init__(self, name, authkey=None, allow_shell=False):
         super(FactoryAllocator, self).__init__(name)
@@ -957,6 +1178,17 @@ class FactoryAllocator(ResourceAllocator):
                 multiprocessing.current_process().authkey = authkey
         self.factory = ObjServerFactory(name, authkey, allow_shell)
 
+        self.spares = 0
+        self.spare_timeout = 600.
+        self._spare_lock = threading.Lock()
+        self._spares = {}    # credentials.data -> [(server, credentials, time)]
+        self._starting = {}  # credentials.data -> number of spares starting.
+        self._spare_count = 0
+        self._expiry_timer = None
+        self._pool_hits = 0
+        self._cold_starts = 0
+        self._expired = 0
+
     def configure(self, cfg):
         """
         Configure allocator from :class:`ConfigParser` instance.
@@ -966,7 +1198,8 @@ class FactoryAllocator(ResourceAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying `auth_key` and `allow_shell`.
+        Allows modifying `auth_key`, `allow_shell`, `spares`, and
+        `spare_timeout`.
         """
         if cfg.has_option(self.name, 'authkey'):
             value = cfg.get(self.name, 'authkey')
@@ -978,11 +1211,61 @@ class FactoryAllocator(ResourceAllocator):
             self._logger.debug('    allow_shell: %s', value)
             self.factory._allow_shell = value
 
+        if cfg.has_option(self.name, 'spares'):
+            value = cfg.getint(self.name, 'spares')
+            self._logger.debug('    spares: %s', value)
+            self.spares = value
+
+        if cfg.has_option(self.name, 'spare_timeout'):
+            value = cfg.getfloat(self.name, 'spare_timeout')
+            self._logger.debug('    spare_timeout: %s', value)
+            self.spare_timeout = value
+
+    def invalidate(self):
+        """
+        Forget about spare servers, they belong to the original process.
+        """
+        self._spares = {}
+        self._starting = {}
+        self._expiry_timer = None
+
+    @rbac('owner')
+    def configure_spares(self, count, timeout=None):
+        """
+        Set the number of spare servers to keep per user.
+        Used by :class:`ClusterAllocator` to configure its hosts.
+
+        count: int
+            Number of idle servers to keep.
+
+        timeout: float
+            If not None, seconds a spare may be idle before being shut down.
+        """
+        self.spares = count
+        if timeout is not None:
+            self.spare_timeout = timeout
+
+    @rbac('*')
+    def get_pool_stats(self):
+        """
+        Returns a dictionary with the number of idle spare servers (`spares`),
+        deploys satisfied by a spare (`hits`), deploys requiring a new server
+        (`cold_starts`), and spares shut down due to being idle (`expired`).
+        """
+        with self._spare_lock:
+            return {
+                'spares': sum([len(pool) for pool in self._spares.values()]),
+                'hits': self._pool_hits,
+                'cold_starts': self._cold_starts,
+                'expired': self._expired,
+            }
+
     @rbac('*')
     def deploy(self, name, resource_desc, criteria):
         """
         Deploy a server suitable for `resource_desc`.
         Returns a proxy to the deployed server.
+        A spare server is used if available.
 
         name: string
             Name for server.
@@ -994,17 +1277,129 @@ class FactoryAllocator(ResourceAllocator):
             The dictionary returned by :meth:`time_estimate`.
         """
         credentials = get_credentials()
+        self._expire_spares()
+
+        with self._spare_lock:
+            pool = self._spares.get(credentials.data)
+            if pool:
+                server = pool.pop()[0]  # Most recent, so idle ones expire.
+                self._pool_hits += 1
+            else:
+                server = None
+                self._cold_starts += 1
+
+        if server is None:
+            allowed_users = {credentials.user: credentials.public_key}
+            try:
+                server = self.factory.create(typname='', name=name,
+                                             allowed_users=allowed_users)
+            # Shouldn't happen...
+            except Exception:  #pragma no cover
+                self._logger.exception('create failed:')
+                return None
+        else:
+            self._logger.debug('deploying spare %r as %r', server.name, name)
+
+        self._deployed_servers.append(server)
+        self._refill_spares(credentials)
+        return server
+
+    def _refill_spares(self, credentials):
+        """ Start spare servers for `credentials` in the background. """
+        with self._spare_lock:
+            key = credentials.data
+            count = self.spares - len(self._spares.get(key, ())) \
+                                - self._starting.get(key, 0)
+            if count <= 0:
+                return
+            self._starting[key] = self._starting.get(key, 0) + count
+            names = []
+            for i in range(count):
+                self._spare_count += 1
+                names.append('%s_spare_%d' % (self.name, self._spare_count))
+
+        for name in names:
+            WorkerPool.submit(self._start_spare, credentials, name)
+
+    def _start_spare(self, credentials, name):
+        """ Start spare server `name` for `credentials`. """
+        caller_creds = get_credentials()
+        set_credentials(credentials)
         allowed_users = {credentials.user: credentials.public_key}
         try:
             server = self.factory.create(typname='', name=name,
                                          allowed_users=allowed_users)
         # Shouldn't happen...
         except Exception:  #pragma no cover
-            self._logger.exception('create failed:')
-            return None
+            self._logger.exception('spare create failed:')
+            server = None
+        finally:
+            set_credentials(caller_creds)
+
+        with self._spare_lock:
+            key = credentials.data
+            self._starting[key] -= 1
+            if server is not None:
+                self._spares.setdefault(key, []).append((server, credentials,
+                                                         time.time()))
+                if self._expiry_timer is None:
+                    self._expiry_timer = threading.Timer(self.spare_timeout,
+                                                         self._expiry_check)
+                    self._expiry_timer.daemon = True
+                    self._expiry_timer.start()
+
+    def _expiry_check(self):
+        """ Timer callback, expire idle spares and reschedule if necessary. """
+        with self._spare_lock:
+            self._expiry_timer = None
+        self._expire_spares()
+        with self._spare_lock:
+            if self._expiry_timer is None and \
+               [pool for pool in self._spares.values() if pool]:
+                self._expiry_timer = threading.Timer(self.spare_timeout,
+                                                     self._expiry_check)
+                self._expiry_timer.daemon = True
+                self._expiry_timer.start()
+
+    def _expire_spares(self, force=False):
+        """ Shut down spares idle for more than `spare_timeout` seconds. """
+        expired = []
+        with self._spare_lock:
+            now = time.time()
+            for key, pool in self._spares.items():
+                keep = []
+                for entry in pool:
+                    if force or now - entry[2] > self.spare_timeout:
+                        expired.append(entry)
+                    else:
+                        keep.append(entry)
+                self._spares[key] = keep
+            if not force:
+                self._expired += len(expired)
 
-        self._deployed_servers.append(server)
-        return server
+        if expired:
+            caller_creds = get_credentials()
+            try:
+                for server, credentials, start_time in expired:
+                    self._logger.debug('releasing spare %r', server.name)
+                    set_credentials(credentials)  # Only owner may release.
+                    try:
+                        self.factory.release(server)
+                    # Just being defensive.
+                    except Exception as exc:  #pragma no cover
+                        self._logger.error("Can't release spare: %r", exc)
+            finally:
+                set_credentials(caller_creds)
+
+    @rbac('owner')
+    def release_spares(self):
+        """ Shut down all idle spare servers. """
+        with self._spare_lock:
+            timer = self._expiry_timer
+            self._expiry_timer = None
+        if timer is not None:
+            timer.cancel()
+        self._expire_spares(force=True)
 
     @rbac(('owner', 'user'))
     def release(self, server):
@@ -1052,11 +1447,18 @@ class LocalAllocator(FactoryAllocator):
         authkey: PublicKey
         allow_shell: True
 
+    Load averages are sampled at most once every `load_ttl` seconds, so
+    frequent :meth:`time_estimate` requests don't each query the system.
     """
 
+    load_ttl = 1.  # Seconds a load average sample remains valid.
+
     def __init__(self, name='LocalAllocator', total_cpus=0, max_load=1.0,
                  authkey=None, allow_shell=False):
         super(LocalAllocator, self).__init__(name, authkey, allow_shell)
+        self._load_lock = threading.Lock()
+        self._loadavgs = None
+        self._load_time = 0.
         if total_cpus > 0:
             self.total_cpus = total_cpus
         else:
@@ -1158,7 +1560,7 @@ class LocalAllocator(FactoryAllocator):
 
         # Check system load.
         try:
-            loadavgs = os.getloadavg()
+            loadavgs = self._get_loadavgs()
         # Not available on Windows.
         except AttributeError:  #pragma no cover
             criteria = {
@@ -1185,6 +1587,18 @@ class LocalAllocator(FactoryAllocator):
         else:  #pragma no cover
             return (-1, criteria)  # Try again later.
 
+    def _get_loadavgs(self):
+        """
+        Return system load averages, reusing the last sample if it is less
+        than `load_ttl` seconds old.
+        """
+        with self._load_lock:
+            now = time.time()
+            if self._loadavgs is None or now - self._load_time >= self.load_ttl:
+                self._loadavgs = os.getloadavg()
+                self._load_time = now
+            return self._loadavgs
+
     def check_compatibility(self, resource_desc):
         """
         Check compatibility with resource attributes.
@@ -1299,8 +1713,13 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
 
     We assume that machines in the cluster are similar enough that ranking
     by load average is reasonable.
+
+    Host estimates are cached for `estimate_ttl` seconds, so only hosts
+    without a recent estimate are polled by :meth:`time_estimate`.
     """
 
+    estimate_ttl = 2.  # Seconds a host estimate remains valid.
+
     def __init__(self, name, machines=None, authkey=None, allow_shell=False):
         super(ClusterAllocator, self).__init__(name)
 
@@ -1317,6 +1736,9 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
         self._last_deployed = None
         self._reply_q = Queue.Queue()
         self._deployed_servers = {}
+        self._estimates = {}  # Host allocator id -> (key, time, est, crit)
+        self.spares = 0
+        self.spare_timeout = 600.
 
         if machines is not None:
             self._initialize(machines)
@@ -1358,6 +1780,8 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
                                                   allow_shell=self._allow_shell)
                 self._allocators[la_name] = allocator
                 self._logger.debug('allocator %r pid %s', la_name, allocator.pid)
+                if self.spares:
+                    allocator.configure_spares(self.spares, self.spare_timeout)
 
     def __getitem__(self, i):
         return self._allocators[i]
@@ -1388,6 +1812,8 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
             authkey: PublicKey
             allow_shell: True
 
+        The optional `spares` and `spare_timeout` options are passed to each
+        host's :class:`LocalAllocator`.
         """
         nhosts = cfg.getint(self.name, 'nhosts')
         self._logger.debug('    nhosts: %s', nhosts)
@@ -1415,12 +1841,39 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
             self._allow_shell = cfg.getboolean(self.name, 'allow_shell')
             self._logger.debug('    allow_shell: %s', self._allow_shell)
 
+        if cfg.has_option(self.name, 'spares'):
+            self.spares = cfg.getint(self.name, 'spares')
+            self._logger.debug('    spares: %s', self.spares)
+
+        if cfg.has_option(self.name, 'spare_timeout'):
+            self.spare_timeout = cfg.getfloat(self.name, 'spare_timeout')
+            self._logger.debug('    spare_timeout: %s', self.spare_timeout)
+
         machines = []
         for i in range(origin, nhosts+origin):
             hostname = pattern % i
             machines.append(ClusterHost(hostname=hostname, python=python))
         self._initialize(machines)
 
+    def get_pool_stats(self):
+        """
+        Returns the totals of :meth:`get_pool_stats` across all
+        :class:`LocalAllocator` in the cluster.
+        """
+        totals = dict(spares=0, hits=0, cold_starts=0, expired=0)
+        with self._lock:
+            allocators = self._allocators.values()
+        for allocator in allocators:
+            try:
+                stats = allocator.get_pool_stats()
+            except Exception as exc:
+                self._logger.error('%r get_pool_stats() failed: %r',
+                                   allocator.name, exc)
+            else:
+                for key in totals:
+                    totals[key] += stats[key]
+        return totals
+
     def max_servers(self, resource_desc):
         """
         Returns the total of :meth:`max_servers` across all
@@ -1552,21 +2005,29 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
                 except Queue.Empty:
                     break
 
-            # Get estimates via worker threads.
-            todo = []
-            max_workers = 10
-            for i, allocator in enumerate(self._allocators.values()):
-                if i < max_workers:
-                    worker_q = WorkerPool.get()
-                    worker_q.put((self._get_estimate,
-                                  (allocator, rdesc, credentials),
-                                  {}, self._reply_q))
+            # Use recent estimates, poll the rest.
+            key = repr(sorted(rdesc.items()))
+            now = time.time()
+            results = []
+            stale = []
+            for allocator in self._allocators.values():
+                cached = self._estimates.get(id(allocator))
+                if cached is not None and cached[0] == key and \
+                   now - cached[1] < self.estimate_ttl:
+                    results.append((allocator, cached[2], cached[3].copy()))
                 else:
-                    todo.append(allocator)
+                    stale.append(allocator)
 
-            # Process estimates.
-            host_loads = []  # Sorted list of (load, criteria)
-            for i in range(len(self._allocators)):
+            # Get estimates via worker threads.
+            max_workers = 10
+            todo = stale[max_workers:]
+            for allocator in stale[:max_workers]:
+                worker_q = WorkerPool.get()
+                worker_q.put((self._get_estimate,
+                              (allocator, rdesc, credentials),
+                              {}, self._reply_q))
+
+            for i in range(len(stale)):
                 worker_q, retval, exc, trace = self._reply_q.get()
                 if exc:
                     self._logger.error(trace)
@@ -1581,9 +2042,16 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
                                   (next_allocator, rdesc, credentials),
                                   {}, self._reply_q))
 
-                if retval is None:
-                    continue
-                allocator, estimate, criteria = retval
+                if retval is not None:
+                    allocator, estimate, criteria = retval
+                    if estimate is not None:
+                        self._estimates[id(allocator)] = \
+                            (key, now, estimate, criteria.copy())
+                    results.append(retval)
+
+            # Process estimates.
+            host_loads = []  # Sorted list of (load, criteria)
+            for allocator, estimate, criteria in results:
                 if estimate is None or estimate < -1:
                     continue
 
@@ -1643,6 +2111,13 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
 
             # Save best allocator in criteria in case we're asked to deploy.
             if best_allocator is not None:
+                # Account for the expected server in the cached load so
+                # repeated requests before it's deployed spread across hosts.
+                cached = self._estimates.get(id(best_allocator))
+                if cached is not None and 'loadavgs' in cached[3]:
+                    loadavgs = list(cached[3]['loadavgs'])
+                    loadavgs[0] += 1
+                    cached[3]['loadavgs'] = tuple(loadavgs)
                 best_criteria['allocator'] = best_allocator
                 if min_cpus:
                     # Save min_cpus hostnames in criteria.
@@ -1728,6 +2203,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
             allocator = criteria['allocator']
             self._last_deployed = allocator
             del criteria['allocator']  # Don't pass a proxy without a server!
+            self._estimates.pop(id(allocator), None)
         self._logger.debug('deploying on %r as %r', allocator.name, name)
         try:
             server = allocator.deploy(name, resource_desc, criteria)
@@ -1757,6 +2233,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
                 self._logger.error('server %r not found', server)
                 return
             del self._deployed_servers[id(server)]
+            self._estimates.pop(id(allocator), None)
 
         try:
             allocator.release(server)
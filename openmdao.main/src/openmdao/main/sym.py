@@ -1,7 +1,18 @@
 
-from sympy import Symbol, diff
-from sympy.core.function import Derivative
-from sympy.functions import *
+# sympy is slow to import, so it's imported on first use.
+_sympy = None
+
+def _import_sympy():
+    """Return namespace for evaluating expressions with sympy functions,
+    importing sympy on first call."""
+    global _sympy
+    if _sympy is None:
+        from sympy import Symbol, diff
+        from sympy.core.function import Derivative
+        namespace = {}
+        exec 'from sympy.functions import *' in namespace
+        _sympy = (namespace, Symbol, diff, Derivative)
+    return _sympy
 
 class SymbolicDerivativeError(Exception):
     def __init__(self, value):
@@ -12,6 +23,7 @@ class SymbolicDerivativeError(Exception):
 
 def SymGrad(ex,vars):
     """Symbolic gradient."""
+    namespace, Symbol, diff, Derivative = _import_sympy()
     s=[]
     for var in vars:
         s.append(Symbol(var))
@@ -19,7 +31,7 @@ def SymGrad(ex,vars):
     newex=ex
     for i in xrange(len(vars)):
         newex = newex.replace(vars[i],"s["+str(i)+"]") 
-    exec "newex="+newex
+    newex = eval(newex, dict(namespace, s=s))
     grad=[]
     for i in xrange(len(vars)):
         d = diff(newex,s[i]).evalf()
@@ -31,12 +43,13 @@ def SymGrad(ex,vars):
     
 def SymHess(ex, vars):
     """ Symbolic Hessian."""
+    namespace, Symbol, diff, Derivative = _import_sympy()
     s = [Symbol(v) for v in vars]
 
     newex=ex
     for i,v in enumerate(vars):
         newex = newex.replace(v, "s["+str(i)+"]") 
-    exec "newex="+newex
+    newex = eval(newex, dict(namespace, s=s))
 
     hess=[]
     for i in xrange(len(vars)):
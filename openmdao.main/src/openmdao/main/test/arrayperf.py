@@ -0,0 +1,100 @@
+"""
+Measure array transfer throughput of :meth:`mp_util.send_message` versus
+pickling via :meth:`mp_util.encrypt` and :meth:`Connection.send`.
+
+Usage: python arrayperf.py [max_megabytes]
+
+Array sizes from 1 MB to `max_megabytes` (default 1024) are sent to a
+receiving process, both in the clear and encrypted.
+Results are written to ``arrayperf.csv``.
+"""
+
+import sys
+import time
+
+from multiprocessing import Pipe, Process
+
+import numpy
+
+from openmdao.main.mp_util import decrypt, encrypt, recv_message, \
+                                  send_message
+
+SESSION_KEY = 'Froboz rulz! Really!'
+
+
+def receiver(conn):
+    """ Receive messages and acknowledge until told to stop. """
+    while True:
+        method, session_key = conn.recv()
+        if method is None:
+            break
+        elif method == 'legacy':
+            decrypt(conn.recv(), session_key)
+        else:
+            recv_message(conn, session_key)
+        conn.send(True)
+
+
+def run_test(conn, method, session_key, arr, reps):
+    """ Return seconds per transfer of `arr`. """
+    start = time.time()
+    for i in range(reps):
+        conn.send((method, session_key))
+        if method == 'legacy':
+            conn.send(encrypt(arr, session_key))
+        else:
+            send_message(conn, arr, session_key)
+        conn.recv()
+    return (time.time() - start) / reps
+
+
+def main():
+    """ Run throughput tests for various array sizes. """
+    max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+
+    conn, child_conn = Pipe()
+    proc = Process(target=receiver, args=(child_conn,))
+    proc.start()
+
+    configs = [('legacy', ''), ('message', ''),
+               ('legacy', SESSION_KEY), ('message', SESSION_KEY)]
+    results = []
+    nbytes = 1 << 20
+    try:
+        while nbytes <= (max_mb << 20):
+            arr = numpy.ones(nbytes / 8)
+            reps = max(1, min(20, (64 << 20) / nbytes))
+            row = [nbytes]
+            for method, session_key in configs:
+                try:
+                    et = run_test(conn, method, session_key, arr, reps)
+                except MemoryError:
+                    print '%s %s: %d bytes, out of memory' \
+                          % (method, 'encrypted' if session_key else 'clear',
+                             nbytes)
+                    row.append(0.)
+                    continue
+                thruput = nbytes / et
+                print '%s %s: %d bytes, %g sec, thruput %g MB/s' \
+                      % (method, 'encrypted' if session_key else 'clear',
+                         nbytes, et, thruput / (1 << 20))
+                row.append(thruput)
+            results.append(row)
+            nbytes *= 4
+    finally:
+        conn.send((None, None))
+        proc.join()
+
+    # Write out results in X, Y1, Y2, ... format.
+    with open('arrayperf.csv', 'w') as out:
+        out.write('Bytes,Legacy-Clear,Message-Clear,'
+                  'Legacy-Encrypted,Message-Encrypted\n')
+        for row in results:
+            out.write('%d' % row[0])
+            for value in row[1:]:
+                out.write(', %g' % value)
+            out.write('\n')
+
+
+if __name__ == '__main__':
+    main()
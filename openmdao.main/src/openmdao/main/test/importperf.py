@@ -0,0 +1,89 @@
+"""
+Measure the time to import the OpenMDAO api modules, to track startup
+time across releases.
+
+Usage: python importperf.py [reps]
+
+Each import is timed in a fresh interpreter `reps` times (default 5) and the
+minimum is reported, along with whether sympy or scipy got imported.
+A row of results is appended to ``importperf.csv``, tagged with the
+OpenMDAO version and date.
+"""
+
+import os.path
+import subprocess
+import sys
+import time
+
+from openmdao.main.releaseinfo import __version__
+
+IMPORTS = (
+    'import openmdao.main.api',
+    'from openmdao.main.api import Component',
+    'from openmdao.main.api import Assembly, set_as_top',
+    'import openmdao.lib.datatypes.api',
+    'import openmdao.lib.casehandlers.api',
+    'import openmdao.lib.components.api',
+    'import openmdao.lib.drivers.api',
+    'from openmdao.lib.drivers.api import SLSQPdriver',
+)
+
+HEAVY = ('sympy', 'scipy')
+
+_CHILD = """
+import sys, time
+start = time.time()
+%s
+et = time.time() - start
+print et, ' '.join([name for name in %r if name in sys.modules])
+"""
+
+
+def run_import(stmt):
+    """ Return (seconds, heavy modules imported) for `stmt` in a new
+    interpreter, or None if the import failed. """
+    proc = subprocess.Popen([sys.executable, '-c', _CHILD % (stmt, HEAVY)],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        print '%s: failed\n%s' % (stmt, stderr.strip().split('\n')[-1])
+        return None
+    fields = stdout.split()
+    return (float(fields[0]), fields[1:])
+
+
+def main():
+    """ Time each import and append results to importperf.csv. """
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    results = []
+    for stmt in IMPORTS:
+        best = None
+        for i in range(reps):
+            result = run_import(stmt)
+            if result is None:
+                break
+            if best is None or result[0] < best[0]:
+                best = result
+        if best is None:
+            results.append(None)
+        else:
+            print '%s: %g sec %s' % (stmt, best[0],
+                                     ' '.join(best[1]) if best[1] else '')
+            results.append(best[0])
+
+    # Append results in Version, Date, Y1, Y2, ... format.
+    filename = 'importperf.csv'
+    exists = os.path.exists(filename)
+    with open(filename, 'a') as out:
+        if not exists:
+            out.write('Version,Date,%s\n' % ','.join(['"%s"' % stmt
+                                                     for stmt in IMPORTS]))
+        out.write('%s,%s' % (__version__, time.strftime('%Y-%m-%d')))
+        for value in results:
+            out.write(', %s' % ('' if value is None else '%g' % value))
+        out.write('\n')
+
+
+if __name__ == '__main__':
+    main()
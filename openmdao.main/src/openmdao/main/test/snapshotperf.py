@@ -0,0 +1,89 @@
+"""
+Compare the time for :meth:`Component.snapshot` and :meth:`Component.restore`
+with :meth:`Container.save` and :meth:`Container.load` for assemblies
+containing a chain of components.
+
+Usage: python snapshotperf.py [max_components]
+
+Results are written to ``snapshotperf.csv``.
+"""
+
+import cStringIO
+import sys
+import time
+
+import numpy
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Array, Float
+
+
+class Comp(Component):
+    """ Has a few scalars and arrays. """
+
+    x = Float(1., iotype='in')
+    arr = Array(numpy.zeros(10), iotype='in')
+    y = Float(iotype='out')
+    out = Array(numpy.zeros(10), iotype='out')
+
+    def execute(self):
+        self.y = self.x * 2.
+        self.out = self.arr * 2.
+
+
+def build(ncomps):
+    """ Return assembly containing a chain of `ncomps` components. """
+    top = set_as_top(Assembly())
+    for i in range(ncomps):
+        name = 'c%d' % i
+        top.add(name, Comp())
+        top.driver.workflow.add(name)
+        if i:
+            top.connect('c%d.y' % (i-1), '%s.x' % name)
+    top.run()
+    return top
+
+
+def run_snapshot(top, reps):
+    """ Return seconds per snapshot and restore. """
+    start = time.time()
+    for i in range(reps):
+        top.restore(top.snapshot())
+    return (time.time() - start) / reps
+
+
+def run_save(top, reps):
+    """ Return seconds per save and load. """
+    start = time.time()
+    for i in range(reps):
+        stream = cStringIO.StringIO()
+        top.save(stream)
+        stream.seek(0)
+        Assembly.load(stream)
+    return (time.time() - start) / reps
+
+
+def main():
+    """ Time snapshot/restore and save/load for increasing model sizes. """
+    max_comps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    results = []
+    ncomps = 1
+    while ncomps <= max_comps:
+        top = build(ncomps)
+        snap = run_snapshot(top, 20)
+        save = run_save(top, 5)
+        print '%d components: snapshot %g sec, save %g sec, ratio %g' \
+              % (ncomps, snap, save, save / snap)
+        results.append((ncomps, snap, save))
+        ncomps *= 4
+
+    # Write out results in X, Y1, Y2 format.
+    with open('snapshotperf.csv', 'w') as out:
+        out.write('Components,Snapshot,Save\n')
+        for row in results:
+            out.write('%d, %g, %g\n' % row)
+
+
+if __name__ == '__main__':
+    main()
@@ -257,6 +257,29 @@ class AssemblyTestCase(unittest.TestCase):
         self.assertEqual(top.comp1.exec_count, 1)
         self.assertEqual(top.comp2.exec_count, 2)
 
+    def test_apply_case_and_run(self):
+        top = set_as_top(Assembly())
+        top.add('comp1', Multiplier())
+        top.driver.workflow.add('comp1')
+
+        values, errors = top.apply_case_and_run(
+                             [('comp1.rval_in', 3.), ('comp1.mult', 2.)],
+                             ['comp1.rval_out', 'comp1.rval_out+1',
+                              'comp1.bogus'],
+                             case_id='case1')
+        self.assertEqual(values[:2], [6., 7.])
+        self.assertEqual(errors[:2], [None, None])
+        self.assertEqual(values[2], None)
+        self.assertTrue('bogus' in errors[2])
+        self.assertEqual(top.comp1.exec_count, 1)
+
+        try:
+            top.apply_case_and_run([('comp1.bogus', 3.)], [])
+        except RuntimeError as exc:
+            self.assertTrue('Exception setting case inputs:' in str(exc))
+        else:
+            self.fail('Expected RuntimeError')
+
     def test_data_passing(self):
         comp1 = self.asm.comp1
         comp2 = self.asm.comp2
@@ -1,8 +1,11 @@
 import unittest
 import copy
 import array
+import cPickle
 
-from openmdao.main.api import Component, Assembly, Case, set_as_top
+from openmdao.main.api import Component, Assembly, Case, CompactCase, \
+                              set_as_top
+from openmdao.main.case import CaseSchema
 from openmdao.lib.datatypes.api import Int, List
 from openmdao.main.numpy_fallback import array as nparray
 
@@ -158,6 +161,70 @@ class CaseTestCase(unittest.TestCase):
                                                              ('comp1.vt.v2',2.)
                                                              ]))
 
+
+class CompactCaseTestCase(CaseTestCase):
+    """ Run the Case tests using CompactCase. """
+
+    def setUp(self):
+        super(CompactCaseTestCase, self).setUp()
+        self.case = case = CompactCase(inputs=self.inputs,
+                                       outputs=self.outputs,
+                                       label='blah blah')
+        case.apply_inputs(self.top)
+        self.top.run()
+        case.update_outputs(self.top)
+
+    def test_schema(self):
+        cases = []
+        for i in range(3):
+            case = CompactCase(parent_uuid='abc')
+            case.add_input('x', i)
+            case.add_output('y')
+            case.add_input('z', -i)
+            cases.append(case)
+        schema = cases[0].schema
+        self.assertTrue(all([case.schema is schema for case in cases]))
+        self.assertTrue(schema is CaseSchema.get(['x', 'z'], ['y']))
+        self.assertEqual(cases[2].items(), [('x', 2), ('z', -2),
+                                            ('y', cases[2]['y'])])
+
+        case = cases[2]
+        case.add_input('x', 5)
+        case.set_outputs(['y'], [10])
+        self.assertEqual(case.schema, schema)
+        self.assertEqual(case.values(), [5, -2, 10])
+        self.assertEqual(case.get_output('y'), 10)
+        self.assertRaises(KeyError, case.get_input, 'y')
+
+        sub = case.subcase(['y', 'x'])
+        self.assertEqual(sub.items('in'), [('x', 5)])
+        self.assertEqual(sub.items('out'), [('y', 10)])
+
+        uuid = case.uuid
+        self.assertEqual(case.uuid, uuid)
+        for protocol in (0, -1):
+            restored = cPickle.loads(cPickle.dumps(case, protocol))
+            self.assertTrue(restored.schema is schema)
+            self.assertEqual(restored.uuid, uuid)
+            self.assertEqual(restored, case)
+
+        # Equal to a Case with the same contents, regardless of order.
+        other = Case(inputs=[('z', -2), ('x', 5)], outputs=[('y', 10)],
+                     parent_uuid='abc')
+        self.assertTrue(case == other)
+        self.assertTrue(other == case)
+        other['y'] = 11
+        self.assertFalse(case == other)
+        self.assertFalse(other == case)
+        other = Case(inputs=[('z', -2), ('x', 5), ('y', 10)])
+        self.assertFalse(case == other)
+
+        case.reset()
+        self.assertNotEqual(case.uuid, uuid)
+        self.assertEqual(case.parent_uuid, '')
+        self.assertFalse(case.values('out')[0] == 10)
+
+
 if __name__ == "__main__":
     unittest.main()
 
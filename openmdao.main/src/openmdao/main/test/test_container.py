@@ -263,6 +263,15 @@ class ContainerTestCase(unittest.TestCase):
         num = self.root.get('c2.c22.c221.number')
         self.assertEqual(num, 3.14)
 
+    def test_get_set_many(self):
+        self.root.c2.c22.c221.add('lst', List([1, 2, 3], iotype='in'))
+        self.root.set_many([('c2.c22.c221.number', 2.5),
+                            ('c2.c22.c221.lst[1]', 42)])
+        self.assertEqual(self.root.get_many(['c2.c22.c221.number',
+                                             'c2.c22.c221.lst[1]',
+                                             'c2.c22.c221.number*2']),
+                         [2.5, 42, 5.0])
+
     def test_add_trait_w_subtrait(self):
         obj = Container()
         obj.add('lst', List([1, 2, 3], iotype='in'))
@@ -5,6 +5,8 @@ import unittest
 from traits.api import Event
 from openmdao.main.api import Assembly, Component, Driver, set_as_top
 from openmdao.main.container import _get_entry_group
+from openmdao.main.datatypes.api import Float
+from openmdao.main.interfaces import implements, ICaseRecorder
 
 
 class EventComp(Component):
@@ -20,6 +22,25 @@ class EventComp(Component):
     def execute(self):
         pass
 
+class PlanComp(Component):
+    x = Float(1., iotype='in')
+    y = Float(2., iotype='out')
+
+class Recorder(object):
+    implements(ICaseRecorder)
+
+    def __init__(self):
+        self.cases = []
+
+    def record(self, case):
+        self.cases.append(case)
+
+    def close(self):
+        pass
+
+    def get_iterator(self):
+        return self.cases
+
 class DriverTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -48,6 +69,42 @@ class DriverTestCase(unittest.TestCase):
     def test_default_value_force(self):
         #driver default value should be True
         self.assertTrue(self.asm.driver.force_execute)
+
+    def test_recording_plan(self):
+        top = self.asm
+        top.add('comp', PlanComp())
+        top.driver.workflow.add('comp')
+        top.driver.printvars = ['comp.*']
+        recorder = Recorder()
+        top.driver.recorders = [recorder]
+
+        calls = []
+        expand = top.driver._get_all_varpaths
+        def counter(*args, **kwargs):
+            calls.append(args)
+            return expand(*args, **kwargs)
+        top.driver._get_all_varpaths = counter
+
+        top.driver.record_case()
+        top.driver.record_case()
+        self.assertEqual(len(calls), 1)  # Plan is reused.
+        case = recorder.cases[-1]
+        self.assertEqual(case['comp.x'], 1.)
+        self.assertEqual(case['comp.y'], 2.)
+        self.assertTrue('driver.workflow.itername' in case.keys())
+
+        # Values are current.
+        top.comp.x = 3.
+        top.driver.record_case()
+        self.assertEqual(recorder.cases[-1]['comp.x'], 3.)
+
+        # Workflow and printvars changes rebuild the plan.
+        top.add('comp2', PlanComp())
+        top.driver.workflow.add('comp2')
+        top.driver.printvars.append('comp2.y')
+        top.driver.record_case()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(recorder.cases[-1]['comp2.y'], 2.)
         
 if __name__ == "__main__":
     unittest.main()
@@ -68,6 +68,13 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_instance(server, GridEngineServer))
         allocator.release(server)
 
+        # Runtime hint is advisory.
+        estimate, criteria = allocator.time_estimate({'runtime_hint': 12.5})
+        self.assertEqual(estimate, 0)
+        cfg.set('GridEngine', 'runtime_margin', '2')
+        allocator.configure(cfg)
+        self.assertEqual(allocator.runtime_margin, 2.)
+
         # Too many CPUs.
         nhosts, criteria = allocator.max_servers({'min_cpus': 1000})
         self.assertEqual(nhosts, 0)
@@ -193,6 +200,19 @@ echo hello world
                                     output_path='echo.out',
                                     error_path='echo.err'))
 
+        # Default wallclock limit from runtime hint.
+        server.configure(dict(MPI='ompi'), 30)
+        server.execute_command(dict(remote_command='echo',
+                                    output_path='echo.out'))
+        with open('qsub.out', 'r') as inp:
+            self.assertTrue('-l h_rt=0:0:30 ' in inp.readline())
+        server.execute_command(dict(remote_command='echo',
+                                    output_path='echo.out',
+                                    resource_limits=dict(wallclock_time=2)))
+        with open('qsub.out', 'r') as inp:
+            self.assertTrue('-l h_rt=0:0:2 ' in inp.readline())
+        server.configure(dict(MPI='ompi'))
+
         # HOME_DIRECTORY, WORKING_DIRECTORY.
         home_dir = os.path.expanduser('~')
         work_dir = os.getcwd()
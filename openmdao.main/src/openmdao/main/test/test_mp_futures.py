@@ -0,0 +1,140 @@
+"""
+Test asynchronous component evaluation.
+"""
+
+import logging
+import sys
+import threading
+import time
+import unittest
+import nose
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+from openmdao.main.exceptions import RunStopped
+from openmdao.main.mp_futures import ModelPool, as_completed, submit
+from openmdao.main.rbac import get_credentials
+from openmdao.util.wrkpool import CancelledError, TimeoutError, WorkerPool
+
+
+class Sleeper(Component):
+    """ Sleeps for `delay` seconds (unless stopped), then sets y = 2x. """
+
+    x = Float(0., iotype='in')
+    delay = Float(0., iotype='in')
+    y = Float(0., iotype='out')
+
+    def __init__(self):
+        super(Sleeper, self).__init__()
+        self.running = threading.Event()
+
+    def execute(self):
+        self.running.set()
+        end = time.time() + self.delay
+        while time.time() < end:
+            if self._stop:
+                raise RunStopped('Stop requested')
+            time.sleep(0.01)
+        self.y = 2 * self.x
+
+
+class Model(Assembly):
+    """ Just a container for a Sleeper. """
+
+    def configure(self):
+        self.add('sleeper', Sleeper())
+        self.driver.workflow.add('sleeper')
+
+
+class TestCase(unittest.TestCase):
+    """ Test asynchronous component evaluation. """
+
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        pool = ModelPool([set_as_top(Model()) for i in range(3)])
+        self.assertEqual(len(pool), 3)
+
+        done = []
+        futures = [submit(pool, 'sleeper', [('x', i), ('delay', 0.1)], ['y'],
+                          callback=done.append) for i in range(6)]
+        results = [future.result(10) for future in futures]
+        self.assertEqual(results, [[2.*i] for i in range(6)])
+        self.assertEqual(len(done), 6)
+
+        futures = [submit(pool, '', [('sleeper.x', i)], ['sleeper.y'])
+                   for i in range(3)]
+        results = sorted([future.result()[0]
+                          for future in as_completed(futures, 10)])
+        self.assertEqual(results, [0., 2., 4.])
+
+    def test_busy_pool(self):
+        logging.debug('')
+        logging.debug('test_busy_pool')
+
+        # Evaluations waiting for a model don't tie up worker threads.
+        WorkerPool.configure(max_workers=2)
+        try:
+            pool = ModelPool([set_as_top(Model())])
+            futures = [submit(pool, 'sleeper', [('x', i), ('delay', 0.5)],
+                              ['y']) for i in range(4)]
+            model = set_as_top(Model())
+            future = submit(model, 'sleeper', [('x', 5)], ['y'])
+            self.assertEqual(future.result(10), [10.])
+            self.assertFalse(all([f.done() for f in futures]))
+            results = [future.result(10) for future in futures]
+            self.assertEqual(results, [[2.*i] for i in range(4)])
+        finally:
+            WorkerPool.configure()
+
+        # Worker threads don't keep our credentials.
+        credentials = get_credentials()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                self.assertFalse(getattr(thread, 'credentials', None)
+                                 is credentials)
+
+    def test_errors(self):
+        logging.debug('')
+        logging.debug('test_errors')
+
+        model = set_as_top(Model())
+
+        future = submit(model, 'sleeper', [('no_such_var', 1)], ['y'])
+        exc = future.exception(10)
+        self.assertTrue('no_such_var' in str(exc))
+        self.assertTrue(future.traceback)
+
+        # Cancel a running evaluation.
+        sleeper = model.sleeper
+        sleeper.running.clear()
+        future = submit(model, 'sleeper', [('delay', 60)], ['y'])
+        sleeper.running.wait(10)
+        self.assertTrue(future.running())
+        self.assertTrue(future.cancel())
+        self.assertTrue(future.cancelled())
+        self.assertRaises(CancelledError, future.result)
+
+        # Running evaluation times out.
+        future = submit(sleeper, '', [('delay', 60)], ['y'], timeout=0.2)
+        self.assertTrue(isinstance(future.exception(10), TimeoutError))
+        self.assertFalse(future.cancel())
+        time.sleep(0.1)  # Let timer thread exit.
+        credentials = get_credentials()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                self.assertFalse(getattr(thread, 'credentials', None)
+                                 is credentials)
+
+        # Waiting for completion times out.
+        future = submit(sleeper, '', [('delay', 0.5)], ['y'])
+        futures = as_completed([future], 0.1)
+        self.assertRaises(TimeoutError, futures.next)
+        self.assertEqual(future.result(10), [0.])
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -6,11 +6,17 @@ import logging
 import os.path
 import socket
 import sys
+import threading
 import unittest
 import nose
 
+from multiprocessing import Pipe
+
+import numpy
+
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, send_message, \
+                                  recv_message
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -125,6 +131,58 @@ class TestCase(unittest.TestCase):
             finally:
                 os.remove('hosts.allow')
 
+    def test_messages(self):
+        logging.debug('')
+        logging.debug('test_messages')
+
+        arr = numpy.arange(100000.).reshape((500, 200))
+        farr = numpy.asfortranarray(arr)
+        iarr = numpy.arange(100000, dtype='>i4')
+        obj = ('#RETURN', [arr, arr, farr, arr[::2], numpy.arange(5),
+                           'froboz', {'iarr': iarr}])
+
+        reader, writer = Pipe(duplex=False)
+        for session_key in ('', 'Froboz rulz! Really!'):
+            sender = threading.Thread(target=send_message,
+                                      args=(writer, obj, session_key))
+            sender.start()
+            kind, result = recv_message(reader, session_key)
+            sender.join()
+
+            self.assertEqual(kind, '#RETURN')
+            # Shared references are preserved.
+            self.assertTrue(result[0] is result[1])
+            numpy.testing.assert_array_equal(result[0], arr)
+            numpy.testing.assert_array_equal(result[2], farr)
+            self.assertTrue(result[2].flags.f_contiguous)
+            numpy.testing.assert_array_equal(result[3], arr[::2])
+            numpy.testing.assert_array_equal(result[4], numpy.arange(5))
+            self.assertEqual(result[5], 'froboz')
+            numpy.testing.assert_array_equal(result[6]['iarr'], iarr)
+            self.assertEqual(result[6]['iarr'].dtype, iarr.dtype)
+
+        # Connection stays in sync after a failed unpickle.
+        sender = threading.Thread(target=send_message,
+                                  args=(writer, [arr, _Unloadable()]))
+        sender.start()
+        self.assertRaises(Exception, recv_message, reader)
+        sender.join()
+        sender = threading.Thread(target=send_message, args=(writer, 'ok'))
+        sender.start()
+        self.assertEqual(recv_message(reader), 'ok')
+        sender.join()
+
+
+class _Unloadable(object):
+    """ Can be pickled, but not unpickled. """
+
+    def __reduce__(self):
+        return (_fail, ())
+
+
+def _fail():
+    raise RuntimeError('Unloadable')
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
@@ -18,6 +18,7 @@ from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server, stop_server, \
                                            connect_to_server, _PROXIES
 from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.util.filexfer import file_hashes
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
 
@@ -268,6 +269,24 @@ class TestCase(unittest.TestCase):
             obj = server.load_model(egg_info[0])
             obj.run()
 
+            # Loaded state is cached by egg hash, egg files are re-extracted.
+            egg_hash = file_hashes(egg_info[0])[0]
+            shutil.rmtree('exec_comp', onerror=onerror)
+            restored = server.restore_model(egg_hash)
+            self.assertFalse(restored is obj)
+            self.assertTrue(os.path.isdir('exec_comp'))
+            restored.run()
+            shutil.rmtree('exec_comp', onerror=onerror)
+            reloaded = server.load_model(egg_info[0])
+            self.assertFalse(reloaded is restored)
+            self.assertTrue(os.path.isdir('exec_comp'))
+            self.assertEqual(server.restore_model('no-such-hash'), None)
+
+            # Not restored if the egg is gone.
+            os.rename(egg_info[0], egg_info[0]+'.bak')
+            self.assertEqual(server.restore_model(egg_hash), None)
+            os.rename(egg_info[0]+'.bak', egg_info[0])
+
             assert_raises(self, "server.load_model('no-such-egg')",
                           globals(), locals(), ValueError,
                           "'no-such-egg' not found.")
@@ -66,6 +66,13 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_instance(server, PBS_Server))
         allocator.release(server)
 
+        # Runtime hint is advisory.
+        estimate, criteria = allocator.time_estimate({'runtime_hint': 12.5})
+        self.assertEqual(estimate, 0)
+        cfg.set('PBS', 'runtime_margin', '2')
+        allocator.configure(cfg)
+        self.assertEqual(allocator.runtime_margin, 2.)
+
         # Too many CPUs.
         nhosts, criteria = allocator.max_servers({'min_cpus': 1000000})
         self.assertEqual(nhosts, 0)
@@ -199,6 +206,17 @@ python %s hello world <echo.in >echo.out 2>&1
 python %s hello world <%s >echo.out 2>echo.err
 """ % (generated_echo, DEV_NULL)))
 
+        # Default wallclock limit from runtime hint.
+        server.configure('test-account', 30)
+        server.execute_command(dict(remote_command='python',
+                                    args=[echo, 'hello', 'world'],
+                                    job_name='TestJob',
+                                    output_path='echo.out'))
+        with open('TestJob%s' % suffix, 'r') as inp:
+            script = ''.join(inp.readlines())
+        self.assertTrue('%s -l walltime=0:00:30\n' % prefix in script)
+        server.configure('test-account')
+
         # HOME_DIRECTORY, WORKING_DIRECTORY.
         home_dir = os.path.expanduser('~')
         work_dir = os.getcwd()
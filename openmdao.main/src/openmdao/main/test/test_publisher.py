@@ -0,0 +1,158 @@
+"""
+Test Publisher.
+"""
+
+import logging
+import sys
+import threading
+import time
+import unittest
+import nose
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from openmdao.main.publisher import Publisher, zmq
+
+if zmq is not None:
+    from zmq.eventloop import ioloop
+
+
+class TestCase(unittest.TestCase):
+    """ Test Publisher. """
+
+    def setUp(self):
+        if zmq is None:
+            raise nose.SkipTest('zmq not available')
+        self.context = zmq.Context()
+        self.connect('inproc://test_publisher', use_stream=False, max_rate=5)
+
+    def tearDown(self):
+        self.publisher.set_max_rate(0)
+        self.subscriber.close()
+
+    def connect(self, url, **kwargs):
+        """ Create publisher on `url` and subscribe to it. """
+        self.publisher = Publisher(self.context, url, **kwargs)
+        self.subscriber = self.context.socket(zmq.SUB)
+        self.subscriber.setsockopt(zmq.SUBSCRIBE, '')
+        self.subscriber.connect(url)
+        time.sleep(0.2)  # Let subscription get to publisher.
+
+    def receive(self, topic, value, timeout=5):
+        """ Return messages received up to [`topic`, `value`]. """
+        messages = []
+        poller = zmq.Poller()
+        poller.register(self.subscriber, zmq.POLLIN)
+        end = time.time() + timeout
+        while time.time() < end:
+            if poller.poll(100):
+                msg = json.loads(self.subscriber.recv_multipart()[0])
+                messages.append(msg)
+                if msg == [topic, value]:
+                    return messages
+        self.fail('Timeout waiting for %s' % [topic, value])
+
+    def test_coalesce(self):
+        logging.debug('')
+        logging.debug('test_coalesce')
+
+        for i in range(100):
+            self.publisher.publish('comp.x', i, coalesce=True)
+            if i < 3:
+                self.publisher.publish('log_msgs', i)
+        self.publisher.publish_list([('comp.y', 42)])
+
+        messages = self.receive('comp.x', 99)
+        self.assertTrue([msg for msg in messages if msg[0] == 'log_msgs']
+                        == [['log_msgs', i] for i in range(3)])
+        self.assertTrue(len([msg for msg in messages
+                             if msg[0] == 'comp.x']) < 100)
+        self.assertTrue(self.publisher.coalesced > 0)
+        self.receive('comp.y', 42)
+
+        # Back to immediate sending.
+        self.publisher.set_max_rate(0)
+        self.publisher.publish('comp.x', 123, coalesce=True)
+        self.assertEqual(self.receive('comp.x', 123), [['comp.x', 123]])
+
+    def test_order(self):
+        logging.debug('')
+        logging.debug('test_order')
+
+        # Wait for a batch to be sent, the next batch then gets all of these.
+        self.publisher.publish('start', 0)
+        self.receive('start', 0)
+        self.publisher.publish('comp.x', 1, coalesce=True)
+        self.publisher.publish('log_msgs', 'a')
+        self.publisher.publish('comp.y', 1, coalesce=True)
+        self.publisher.publish('comp.x', 2, coalesce=True)
+        self.publisher.publish('log_msgs', 'b')
+
+        # Sent in published order, coalesced updates where last published.
+        self.assertEqual(self.receive('log_msgs', 'b'),
+                         [['log_msgs', 'a'], ['comp.y', 1], ['comp.x', 2],
+                          ['log_msgs', 'b']])
+        self.assertEqual(self.publisher.coalesced, 1)
+
+    def test_max_pending(self):
+        logging.debug('')
+        logging.debug('test_max_pending')
+
+        self.publisher.set_max_rate(0)
+        self.subscriber.close()
+        self.connect('inproc://test_max_pending', use_stream=False,
+                     max_rate=0.5, max_pending=5)
+
+        # Wait for a batch to be sent, the next is then 2 seconds away.
+        self.publisher.publish('start', 0)
+        self.receive('start', 0)
+        for i in range(20):
+            self.publisher.publish('log_msgs', i)
+            self.publisher.publish('comp.x', i, coalesce=True)
+
+        # Oldest non-coalesced messages are dropped.
+        messages = self.receive('comp.x', 19)
+        self.assertEqual([msg for msg in messages if msg[0] == 'log_msgs'],
+                         [['log_msgs', i] for i in range(15, 20)])
+        self.assertEqual(self.publisher.dropped, 15)
+        self.assertEqual(self.publisher.coalesced, 19)
+
+    def test_busy_ioloop(self):
+        logging.debug('')
+        logging.debug('test_busy_ioloop')
+
+        self.publisher.set_max_rate(0)
+        self.subscriber.close()
+        self.connect('inproc://test_busy_ioloop', use_stream=True,
+                     max_rate=20)
+
+        loop = ioloop.IOLoop.instance()
+        thread = threading.Thread(target=loop.start)
+        thread.daemon = True
+        thread.start()
+        try:
+            # Like a model run by the GUI's IOLoop thread.
+            busy = threading.Event()
+            loop.add_callback(lambda: busy.set() or time.sleep(3))
+            busy.wait(5)
+            start = time.time()
+            self.publisher.publish('comp.x', 1, coalesce=True)
+            self.receive('comp.x', 1)
+            self.assertTrue(time.time() - start < 2)
+
+            # Back to immediate sending.
+            self.publisher.set_max_rate(0)
+            self.publisher.publish('comp.x', 2, coalesce=True)
+            self.assertEqual(self.receive('comp.x', 2), [['comp.x', 2]])
+        finally:
+            loop.add_callback(loop.stop)
+            thread.join(5)
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -14,11 +14,14 @@ import shutil
 import socket
 import sys
 import tempfile
+import threading
+import time
 import unittest
 
 from openmdao.main.api import Assembly, Component
 from openmdao.main.mp_util import read_server_config
 from openmdao.main.objserverfactory import connect, start_server
+from openmdao.main.rbac import check_role, get_credentials, RoleError
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import ResourceAllocator, LocalAllocator, \
                                    ClusterAllocator, RESOURCE_LIMITS
@@ -36,6 +39,71 @@ class ExtCode(Component):
                      desc='Resources required to run this component.')
 
 
+class _Close(object):
+    """ Stands in for a proxy's finalizer. """
+
+    def cancel(self):
+        pass
+
+
+class _Server(object):
+    """ Just something to be 'deployed'. """
+
+    def __init__(self, name):
+        self.name = name
+        self.pid = 0
+        self.host = 'localhost'
+        self._close = _Close()
+
+
+class _Factory(object):
+    """ Stands in for an ObjServerFactory. """
+
+    def __init__(self):
+        self.created = 0
+        self.released = []
+
+    def create(self, typname, name='', allowed_users=None):
+        self.created += 1
+        return _Server(name)
+
+    def release(self, server):
+        self.released.append(server)
+
+
+class _Allocator(ResourceAllocator):
+    """ Deploys dummy servers. """
+
+    def __init__(self, name, estimate, limit):
+        super(_Allocator, self).__init__(name)
+        self.estimate = estimate
+        self.limit = limit
+        self.estimates = 0
+        self.deployed = []
+        self.delay = 0.1
+        self.deploying = 0
+        self.max_deploying = 0
+
+    def max_servers(self, resource_desc):
+        return (self.limit, {})
+
+    def time_estimate(self, resource_desc):
+        self.estimates += 1
+        return (self.estimate, {'hostnames': [self.name]})
+
+    def deploy(self, name, resource_desc, criteria):
+        self.deploying += 1
+        self.max_deploying = max(self.max_deploying, self.deploying)
+        time.sleep(self.delay)  # Give concurrent requests a chance to interfere.
+        server = _Server(name)
+        self.deployed.append(server)
+        self.deploying -= 1
+        return server
+
+    def release(self, server):
+        self.deployed.remove(server)
+
+
 class TestCase(unittest.TestCase):
     """ Test resource allocation. """
 
@@ -132,6 +200,176 @@ class TestCase(unittest.TestCase):
             self.local.max_servers({'python_version': '2.999'})
         self.assertEqual(n_servers, 0)
 
+    def test_allocate_many(self):
+        logging.debug('')
+        logging.debug('test_allocate_many')
+
+        RAM.remove_allocator('LocalHost')
+        busy = _Allocator('Busy', -1, 4)
+        slow = _Allocator('Slow', 10, 2)
+        fast = _Allocator('Fast', 5, 3)
+        for allocator in (busy, slow, fast):
+            RAM.add_allocator(allocator)
+
+        # Fast is filled first, then Slow; Busy is never used.
+        servers = RAM.allocate_many({}, 4)
+        self.assertEqual(len(servers), 4)
+        self.assertEqual(len(fast.deployed), 3)
+        self.assertEqual(len(slow.deployed), 1)
+        self.assertEqual(len(busy.deployed), 0)
+        names = set([info['name'] for server, info in servers])
+        self.assertEqual(len(names), 4)
+
+        # Deploy threads don't keep our credentials.
+        credentials = get_credentials()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                self.assertFalse(getattr(thread, 'credentials', None)
+                                 is credentials)
+
+        # Only remaining capacity is used.
+        servers.extend(RAM.allocate_many({}, 4))
+        self.assertEqual(len(servers), 5)
+        self.assertEqual(len(slow.deployed), 2)
+
+        # Nothing is deployed beyond capacity.
+        self.assertEqual(RAM.allocate_many({}, 2), [])
+        self.assertEqual(len(fast.deployed), 3)
+        self.assertEqual(len(slow.deployed), 2)
+
+        # Concurrent requests don't oversubscribe.
+        for server, info in servers:
+            RAM.release(server)
+        servers = []
+        threads = [threading.Thread(target=lambda:
+                                    servers.extend(RAM.allocate_many({}, 3)))
+                   for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(servers), 5)
+        self.assertEqual(len(fast.deployed), 3)
+        self.assertEqual(len(slow.deployed), 2)
+
+        for server, info in servers:
+            RAM.release(server)
+        self.assertEqual(len(fast.deployed) + len(slow.deployed), 0)
+
+        # Nothing compatible.
+        for allocator in (busy, slow, fast):
+            allocator.estimate = -2
+        self.assertEqual(RAM.allocate_many({}, 2), [])
+
+    def test_allocate_concurrent(self):
+        logging.debug('')
+        logging.debug('test_allocate_concurrent')
+
+        RAM.remove_allocator('LocalHost')
+        slow = _Allocator('Slow', 10, 2)
+        fast = _Allocator('Fast', 5, 3)
+        for allocator in (slow, fast):
+            allocator.delay = 0.5
+            RAM.add_allocator(allocator)
+
+        # Deploys overlap, but capacity reserved for them isn't exceeded.
+        servers = []
+        threads = [threading.Thread(target=lambda:
+                                    servers.append(RAM.allocate({})))
+                   for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(servers), 5)
+        self.assertEqual(len(fast.deployed), 3)
+        self.assertEqual(len(slow.deployed), 2)
+        self.assertEqual(fast.max_deploying, 3)
+        self.assertEqual(slow.max_deploying, 2)
+        self.assertEqual(RAM._get_instance()._reserved, {})
+
+        for server, info in servers:
+            RAM.release(server)
+
+    def test_spares(self):
+        logging.debug('')
+        logging.debug('test_spares')
+
+        def wait_for_spares(allocator, count):
+            for i in range(50):
+                if allocator.get_pool_stats()['spares'] == count:
+                    return
+                time.sleep(0.1)
+            self.fail('Timeout waiting for %d spares' % count)
+
+        allocator = LocalAllocator('Spares')
+        allocator.factory = _Factory()
+        allocator.spares = 2
+
+        # First deploy is a cold start, then spares are started.
+        server = allocator.deploy('s1', {}, {})
+        self.assertEqual(server.name, 's1')
+        wait_for_spares(allocator, 2)
+
+        # Next deploy uses a spare and the pool is refilled.
+        server = allocator.deploy('s2', {}, {})
+        self.assertTrue(server.name.startswith('Spares_spare_'))
+        wait_for_spares(allocator, 2)
+        self.assertEqual(allocator.factory.created, 4)
+        stats = allocator.get_pool_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['cold_starts'], 1)
+
+        # Idle spares expire.
+        allocator.spare_timeout = 0
+        server = allocator.deploy('s3', {}, {})
+        self.assertEqual(server.name, 's3')
+        stats = allocator.get_pool_stats()
+        self.assertEqual(stats['expired'], 2)
+        self.assertEqual(stats['cold_starts'], 2)
+        self.assertEqual(len(allocator.factory.released), 2)
+
+        allocator.spare_timeout = 600
+        wait_for_spares(allocator, 2)
+        self.assertTrue(allocator._expiry_timer is not None)
+        allocator.release_spares()
+        self.assertEqual(allocator.get_pool_stats()['spares'], 0)
+        self.assertEqual(len(allocator.factory.released), 4)
+        self.assertEqual(allocator._expiry_timer, None)
+
+        # Spare threads don't keep our credentials.
+        credentials = get_credentials()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                self.assertFalse(getattr(thread, 'credentials', None)
+                                 is credentials)
+
+        # Only the owner may change the number of spares.
+        check_role('owner', allocator.configure_spares)
+        assert_raises(self, "check_role('user', allocator.configure_spares)",
+                      globals(), locals(), RoleError,
+                      "No access for role 'user'")
+
+    def test_load_ttl(self):
+        logging.debug('')
+        logging.debug('test_load_ttl')
+
+        if sys.platform == 'win32':
+            logging.debug('    no os.getloadavg(), skipping')
+            return
+
+        # Load averages are sampled once per load_ttl.
+        self.local.load_ttl = 1000.
+        estimate, criteria = self.local.time_estimate({})
+        loadavgs = criteria['loadavgs']
+        for i in range(3):
+            estimate, criteria = self.local.time_estimate({})
+            self.assertTrue(criteria['loadavgs'] is loadavgs)
+
+        self.local.load_ttl = 0.
+        estimate, criteria = self.local.time_estimate({})
+        self.assertFalse(criteria['loadavgs'] is loadavgs)
+
     def test_hostnames(self):
         logging.debug('')
         logging.debug('test_hostnames')
@@ -175,6 +413,7 @@ class TestCase(unittest.TestCase):
                                     job_category='MPI',
                                     min_cpus=256,
                                     max_cpus=512,
+                                    runtime_hint=12.5,
                                     email=['user1@host1', 'user2@host2'],
                                     email_on_started=True,
                                     email_on_terminated=True,
@@ -203,6 +442,9 @@ class TestCase(unittest.TestCase):
         code = "RAM.validate_resources(dict(min_cpus=-2))"
         assert_raises(self, code, globals(), locals(), ValueError,
                       "Invalid resource value for 'min_cpus': -2")
+        code = "RAM.validate_resources(dict(runtime_hint=0.))"
+        assert_raises(self, code, globals(), locals(), ValueError,
+                      "Invalid resource value for 'runtime_hint': 0.0")
 
         # Must be sequence.
         code = "RAM.validate_resources(dict(args='hello'))"
@@ -0,0 +1,186 @@
+"""
+Test Component snapshot and restore.
+"""
+
+import logging
+import sys
+import unittest
+import nose
+
+import numpy
+
+from openmdao.main.api import Assembly, Component, VariableTree, set_as_top
+from openmdao.main.datatypes.api import Array, Float, List, Str, VarTree
+
+
+class Tree(VariableTree):
+
+    a = Float(1.)
+    b = Array(numpy.zeros(2))
+
+
+class Comp(Component):
+
+    x = Float(1., iotype='in')
+    arr = Array(numpy.zeros(3), iotype='in')
+    tree = VarTree(Tree(), iotype='in')
+    names = List(Str, iotype='in')
+    y = Float(iotype='out')
+    out = Array(numpy.zeros(3), iotype='out')
+
+    def execute(self):
+        self.y = self.x * 2. + self.tree.a
+        self.out = self.arr * 2.
+
+
+class A(Component):
+
+    x = Float(1., iotype='in')
+    z = Float(2., iotype='in')
+
+
+class B(Component):
+
+    x = Float(1., iotype='in')
+
+
+def build():
+    """ Return assembly with a chain of three components. """
+    top = set_as_top(Assembly())
+    for name in ('c0', 'c1', 'c2'):
+        top.add(name, Comp())
+        top.driver.workflow.add(name)
+    top.connect('c0.y', 'c1.x')
+    top.connect('c1.y', 'c2.x')
+    top.create_passthrough('c0.x')
+    top.create_passthrough('c2.y')
+    return top
+
+
+class TestCase(unittest.TestCase):
+    """ Test Component snapshot and restore. """
+
+    def test_restore(self):
+        logging.debug('')
+        logging.debug('test_restore')
+
+        top = build()
+        top.x = 2.
+        top.c0.arr = numpy.array([1., 2., 3.])
+        top.c1.tree.b = numpy.array([4., 5.])
+        top.run()
+        self.assertEqual(top.y, 23.)
+
+        arr = top.c0.arr
+        snapshot = top.snapshot()
+        valids = [dict(comp._valid_dict) for comp in (top, top.c0, top.c2)]
+
+        top.x = 5.
+        top.c0.arr[0] = 100.
+        top.c1.tree.a = 7.
+        top.c1.tree.b[1] = 6.
+        top.c1.names = ['a', 'b']
+        self.assertFalse(top.c2.get_valid(['y'])[0])
+
+        top.restore(snapshot)
+        self.assertEqual(top.x, 2.)
+        self.assertEqual(top.c0.x, 2.)
+        self.assertEqual(list(top.c0.arr), [1., 2., 3.])
+        self.assertTrue(top.c0.arr is arr)  # Updated in place.
+        self.assertEqual(top.c1.tree.a, 1.)
+        self.assertEqual(list(top.c1.tree.b), [4., 5.])
+        self.assertEqual(top.c1.names, [])
+        self.assertEqual(top.y, 23.)
+        self.assertEqual([comp._valid_dict for comp in (top, top.c0, top.c2)],
+                         valids)
+        self.assertTrue(top.c2.is_valid())
+
+        # Model still responds to changes.
+        top.x = 3.
+        top.run()
+        self.assertEqual(top.y, 31.)
+
+    def test_replica(self):
+        logging.debug('')
+        logging.debug('test_replica')
+
+        top = build()
+        top.x = 4.
+        top.run()
+        self.assertEqual(top.y, 39.)
+
+        replica = build()
+        replica.restore(top.snapshot())
+        self.assertEqual(replica.y, 39.)
+        self.assertEqual(replica.c1.x, 9.)
+        self.assertEqual(replica._valid_dict, top._valid_dict)
+        self.assertTrue(replica.c2.is_valid())
+
+        # Restoring into a different configuration is an error.
+        replica.remove('c2')
+        try:
+            replica.restore(top.snapshot())
+        except ValueError as exc:
+            self.assertEqual(str(exc), ": snapshot component 'c2' not found")
+        else:
+            self.fail('Expected ValueError')
+
+        # Component snapshot.
+        comp = Comp()
+        comp.x = 3.
+        comp.run()
+        snapshot = comp.snapshot()
+        comp.x = 4.
+        comp.restore(snapshot)
+        self.assertEqual(comp.x, 3.)
+        self.assertEqual(comp.y, 7.)
+        self.assertTrue(comp.is_valid())
+
+    def test_mismatch(self):
+        logging.debug('')
+        logging.debug('test_mismatch')
+
+        a = A()
+        a.x = 3.
+        b = B()
+        try:
+            b.restore(a.snapshot())
+        except ValueError as exc:
+            self.assertEqual(str(exc),
+                             ": snapshot of class A can't be restored into B")
+        else:
+            self.fail('Expected ValueError')
+        self.assertEqual(b.x, 1.)
+
+        # Same class, different variables.
+        snapshot = a.snapshot()
+        a.add('w', Float(iotype='in'))
+        try:
+            a.restore(snapshot)
+        except ValueError as exc:
+            self.assertEqual(str(exc), ": snapshot variables don't match:"
+                                       " ['w'] not in snapshot")
+        else:
+            self.fail('Expected ValueError')
+
+        # Nothing is restored if any component doesn't match.
+        top = build()
+        top.x = 4.
+        top.run()
+        snapshot = top.snapshot()
+        top.x = 5.
+        top.c2.add('w', Float(iotype='in'))
+        try:
+            top.restore(snapshot)
+        except ValueError as exc:
+            self.assertEqual(str(exc), "c2 (1-3): snapshot variables don't"
+                                       " match: ['w'] not in snapshot")
+        else:
+            self.fail('Expected ValueError')
+        self.assertEqual(top.x, 5.)
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
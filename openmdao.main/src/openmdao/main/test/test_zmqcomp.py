@@ -0,0 +1,225 @@
+"""
+Test ZeroMQ message framing and format negotiation.
+"""
+
+import logging
+import sys
+import traceback
+import unittest
+import nose
+
+import numpy
+
+try:
+    import zmq
+except ImportError:
+    zmq = None
+else:
+    from openmdao.main.zmqcomp import ZmqCompWrapper, FORMATS, \
+                                      MIN_FRAME_NBYTES, BINARY_MAGIC, \
+                                      encode_frames, decode_frames, \
+                                      encode, decode
+    from openmdao.main.zmqrpc import ZMQ_RPC
+
+
+class Echo(object):
+    """ Target of requests. """
+
+    def echo(self, *args):
+        return list(args)
+
+
+class FakeSocket(object):
+    """ Passes frames sent to `server` and returns its reply. """
+
+    def __init__(self, server):
+        self.server = server
+        self.requests = []
+        self._reply = None
+
+    def connect(self, url):
+        pass
+
+    def send_multipart(self, frames, copy=True):
+        self.requests.append(frames)
+        self._reply = self.server(frames)
+
+    def recv_multipart(self):
+        return self._reply
+
+
+class FakeContext(object):
+    """ Returns a :class:`FakeSocket` for `server`. """
+
+    def __init__(self, server):
+        self.sock = FakeSocket(server)
+
+    def socket(self, kind):
+        return self.sock
+
+
+class Replier(object):
+    """ Calls a :class:`ZmqCompWrapper` and captures its reply. """
+
+    def __init__(self, comp):
+        # Avoid real sockets, just exercise the request handling.
+        self.wrapper = ZmqCompWrapper.__new__(ZmqCompWrapper)
+        self.wrapper._comp = comp
+        self.wrapper._decoder = None
+        self.wrapper._encoder = None
+        self.wrapper._repstream = self
+        self._reply = None
+
+    def send_multipart(self, frames, copy=True):
+        self._reply = frames
+
+    def __call__(self, frames):
+        self.wrapper.handle_req(frames)
+        return self._reply
+
+
+def old_server(frames):
+    """ Server which predates format negotiation. """
+    parts = decode(frames[0])
+    try:
+        ret = getattr(Echo(), parts[0])(*parts[1], **parts[2])
+    except Exception:
+        ret = traceback.format_exc()
+    return [encode(ret)]
+
+
+class TestCase(unittest.TestCase):
+    """ Test ZeroMQ message framing and format negotiation. """
+
+    def setUp(self):
+        if zmq is None:
+            raise nose.SkipTest('zmq not available')
+
+    def check_equal(self, value, expected):
+        """ Compare (possibly nested) values, including arrays. """
+        if isinstance(expected, numpy.ndarray):
+            self.assertTrue(isinstance(value, numpy.ndarray))
+            self.assertEqual(value.dtype, expected.dtype)
+            self.assertEqual(value.shape, expected.shape)
+            self.assertTrue(numpy.all(value == expected))
+        elif isinstance(expected, (list, tuple)):
+            self.assertEqual(type(value), type(expected))
+            self.assertEqual(len(value), len(expected))
+            for val, exp in zip(value, expected):
+                self.check_equal(val, exp)
+        elif isinstance(expected, dict):
+            self.assertEqual(sorted(value.keys()), sorted(expected.keys()))
+            for key in expected:
+                self.check_equal(value[key], expected[key])
+        else:
+            self.assertEqual(value, expected)
+
+    def test_frames(self):
+        logging.debug('')
+        logging.debug('test_frames')
+
+        big = MIN_FRAME_NBYTES // 8
+        msg = ['set', (1, 2.5, 'str', u'uni', None, True),
+               {'small': numpy.arange(5.),
+                'float': numpy.linspace(0., 1., big),
+                'int': numpy.arange(big*2, dtype=numpy.int32),
+                'complex': numpy.ones(big, dtype=numpy.complex128) * 1j,
+                'matrix': numpy.arange(big*2.).reshape((2, big)),
+                'column': numpy.arange(big*2.).reshape((big, 2))[:, 1],
+                'objects': numpy.array([1, 'a', None] * big, dtype=object)}]
+
+        for fmt in ('binary', 'pickle'):
+            frames = encode_frames(msg, fmt)
+            value, decoded_fmt = decode_frames(frames)
+            self.assertEqual(decoded_fmt, fmt)
+            self.check_equal(value, msg)
+            for array in value[2].values():
+                self.assertTrue(array.flags.writeable)
+
+        # Large numeric arrays are sent as separate frames.
+        frames = encode_frames(msg, 'binary')
+        self.assertEqual(frames[0], BINARY_MAGIC)
+        self.assertEqual(len(frames), 2+5)
+        self.assertEqual(len(encode_frames(msg, 'pickle')), 1)
+
+        # Structured arrays keep their fields.
+        records = numpy.zeros(big, dtype=[('x', numpy.float64),
+                                          ('n', numpy.int32),
+                                          ('name', 'S8'),
+                                          ('xy', numpy.float32, (2,))])
+        records['x'] = numpy.linspace(0., 1., big)
+        records['n'] = numpy.arange(big)
+        records['name'] = 'rec'
+        records['xy'][:, 1] = 2.
+        aligned = numpy.zeros(big, dtype=numpy.dtype([('b', numpy.int8),
+                                                      ('d', numpy.float64)],
+                                                     align=True))
+        aligned['d'] = 1.5
+        frames = encode_frames([records, aligned], 'binary')
+        self.assertEqual(len(frames), 2+2)
+        value = decode_frames(frames)[0]
+        self.check_equal(value, [records, aligned])
+        self.assertEqual(value[0].dtype.names, ('x', 'n', 'name', 'xy'))
+
+        # Scalars and small arrays stay in the header.
+        frames = encode_frames([42, numpy.arange(3)], 'binary')
+        self.assertEqual(len(frames), 2)
+        self.check_equal(decode_frames(frames)[0], [42, numpy.arange(3)])
+
+        # JSON sends arrays as lists.
+        frames = encode_frames(['x', numpy.arange(3.), 1.5], 'json')
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(decode_frames(frames), ([u'x', [0., 1., 2.], 1.5],
+                                                 'json'))
+
+        try:
+            encode_frames(msg, 'xml')
+        except ValueError as exc:
+            self.assertEqual(str(exc), "unknown message format 'xml'")
+        else:
+            self.fail('Expected ValueError')
+
+    def test_negotiation(self):
+        logging.debug('')
+        logging.debug('test_negotiation')
+
+        array = numpy.arange(MIN_FRAME_NBYTES // 4.)
+
+        # Current server, uses the first supported format.
+        context = FakeContext(Replier(Echo()))
+        proxy = ZMQ_RPC('inproc://test', context, formats=('xml', 'binary'))
+        self.check_equal(proxy.echo(1, array), [1, array])
+        self.assertEqual(proxy.format, 'binary')
+        self.assertEqual(context.sock.requests[-1][0], BINARY_MAGIC)
+        self.assertEqual(decode_frames(context.sock.requests[0])[0][0],
+                         '__formats__')
+
+        proxy = ZMQ_RPC('inproc://test', context, formats=('json',))
+        self.assertEqual(proxy.echo(1, 'a'), [1, 'a'])
+        self.assertEqual(proxy.format, 'json')
+
+        # No formats requested, no negotiation.
+        context = FakeContext(Replier(Echo()))
+        proxy = ZMQ_RPC('inproc://test', context, formats=())
+        self.assertEqual(proxy.format, 'pickle')
+        self.assertEqual(context.sock.requests, [])
+
+        # Old server replies to the formats request with a traceback,
+        # so fall back to pickle.
+        context = FakeContext(old_server)
+        proxy = ZMQ_RPC('inproc://test', context)
+        self.check_equal(proxy.echo(1, array), [1, array])
+        self.assertEqual(proxy.format, 'pickle')
+        self.assertEqual(len(context.sock.requests[-1]), 1)
+
+        # Server doesn't support any requested format.
+        context = FakeContext(Replier(Echo()))
+        proxy = ZMQ_RPC('inproc://test', context, formats=('xml',))
+        self.assertEqual(proxy.echo(2), [2])
+        self.assertEqual(proxy.format, 'pickle')
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -0,0 +1,107 @@
+"""
+Measure latency and array throughput of the ZeroMQ component interface
+(:class:`ZmqCompWrapper` served, :class:`ZMQ_RPC` client) for each
+message format.
+
+Usage: python zmqperf.py [max_megabytes]
+
+Latency is measured using a small request and reply. Throughput is measured
+by setting and then getting arrays from 1 KB to `max_megabytes`
+(default 256). Results are written to ``zmqperf.csv``.
+"""
+
+import sys
+import time
+
+from multiprocessing import Process
+
+import numpy
+import zmq
+
+from openmdao.main.api import Component, set_as_top
+from openmdao.main.datatypes.api import Array
+from openmdao.main.zmqcomp import ZmqCompWrapper
+from openmdao.main.zmqrpc import ZMQ_RPC
+
+URL = 'tcp://127.0.0.1:5599'
+FORMATS = ('json', 'pickle', 'binary')
+
+
+class Echo(Component):
+    """ Just holds an array. """
+
+    x = Array(iotype='in')
+
+
+def server():
+    """ Serve an :class:`Echo` until terminated. """
+    ZmqCompWrapper.serve(set_as_top(Echo()), rep_url=URL,
+                         pub_url='inproc://_zmqperf_pub_')
+
+
+def run_latency(proxy, reps):
+    """ Return seconds per small request. """
+    proxy.set('x', numpy.zeros(1))
+    start = time.time()
+    for i in range(reps):
+        proxy.get('x')
+    return (time.time() - start) / reps
+
+
+def run_test(proxy, arr, reps):
+    """ Return seconds per set and get of `arr`. """
+    start = time.time()
+    for i in range(reps):
+        proxy.set('x', arr)
+        proxy.get('x')
+    return (time.time() - start) / reps
+
+
+def main():
+    """ Run latency and throughput tests for each format. """
+    max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+
+    proc = Process(target=server)
+    proc.start()
+
+    context = zmq.Context()
+    proxies = [ZMQ_RPC(URL, context, formats=(fmt,)) for fmt in FORMATS]
+    results = []
+    try:
+        for fmt, proxy in zip(FORMATS, proxies):
+            if proxy.format != fmt:
+                print '%s: not supported by server' % fmt
+            et = run_latency(proxy, 1000)
+            print '%s: latency %g usec' % (fmt, et * 1e6)
+
+        nbytes = 1 << 10
+        while nbytes <= (max_mb << 20):
+            arr = numpy.ones(nbytes / 8)
+            reps = max(1, min(100, (64 << 20) / nbytes))
+            row = [nbytes]
+            for fmt, proxy in zip(FORMATS, proxies):
+                et = run_test(proxy, arr, reps)
+                thruput = 2 * nbytes / et  # Data goes both ways.
+                print '%s: %d bytes, %g sec, thruput %g MB/s' \
+                      % (fmt, nbytes, et, thruput / (1 << 20))
+                row.append(thruput)
+            results.append(row)
+            nbytes *= 4
+    finally:
+        for proxy in proxies:
+            proxy.close()
+        proc.terminate()
+        proc.join()
+
+    # Write out results in X, Y1, Y2, ... format.
+    with open('zmqperf.csv', 'w') as out:
+        out.write('Bytes,%s\n' % ','.join([fmt.capitalize() for fmt in FORMATS]))
+        for row in results:
+            out.write('%d' % row[0])
+            for value in row[1:]:
+                out.write(', %g' % value)
+            out.write('\n')
+
+
+if __name__ == '__main__':
+    main()
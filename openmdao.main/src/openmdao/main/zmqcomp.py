@@ -3,6 +3,7 @@ import os
 import traceback
 import cPickle as pickle
 import StringIO
+import cStringIO
 
 import time
 import threading
@@ -10,13 +11,33 @@ import logging
 
 import optparse
 
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+import numpy
 import zmq
 from zmq.eventloop import ioloop, zmqstream
 
 from openmdao.main.api import set_as_top
 from openmdao.main.container import deep_getattr
+from openmdao.main.variable import json_default
 from openmdao.util.debug import DEBUG, debug
 
+# Message formats, in order of preference.
+FORMATS = ('binary', 'pickle', 'json')
+
+# First frame of a 'binary' format message.
+BINARY_MAGIC = 'OMDAO-BIN1'
+
+# Arrays smaller than this are pickled in the header frame
+# (below this size zmqperf.py shows no benefit from separate frames).
+MIN_FRAME_NBYTES = 65536
+
+# Request for the list of formats supported by the server.
+FORMATS_REQUEST = '__formats__'
+
 
 def msg_split(frames):
     """Take a list of message frames and split it into routing frames and payload
@@ -44,17 +65,74 @@ def decode(msg):
     return pickle.loads(msg)
 
 
+def encode_frames(msg, fmt='pickle'):
+    """Return a list of message frames for `msg` in format `fmt`.
+
+    The 'binary' format is ``[BINARY_MAGIC, header, buffer1, ...]``, where
+    `header` is `msg` pickled with each numeric array of at least
+    `MIN_FRAME_NBYTES` replaced by a reference to a following raw buffer
+    frame. The buffers are the array data, so they may be sent without
+    copying. 'pickle' and 'json' formats are a single frame.
+    """
+    if fmt == 'binary':
+        buffers = []
+        def persistent_id(obj):
+            if type(obj) is numpy.ndarray and not obj.dtype.hasobject \
+               and obj.nbytes >= MIN_FRAME_NBYTES:
+                buffers.append(numpy.ascontiguousarray(obj))
+                # `str` loses the fields of structured arrays, and `descr`
+                # turns any alignment padding into fields, so pickle those.
+                if obj.dtype.fields:
+                    dtype = obj.dtype
+                else:
+                    dtype = obj.dtype.str
+                return (len(buffers)-1, dtype, obj.shape)
+            return None
+        out = cStringIO.StringIO()
+        pickler = pickle.Pickler(out, -1)
+        pickler.persistent_id = persistent_id
+        pickler.dump(msg)
+        # Zero-copy sending is only worthwhile if there are buffers,
+        # so senders should use ``copy=len(frames) < 3``.
+        return [BINARY_MAGIC, out.getvalue()] + buffers
+    elif fmt == 'pickle':
+        return [encode(msg)]
+    elif fmt == 'json':
+        return [json.dumps(msg, default=_json_default)]
+    raise ValueError('unknown message format %r' % fmt)
+
+def decode_frames(frames):
+    """Decode a message produced by :meth:`encode_frames`.
+    Returns ``(msg, fmt)``.
+    """
+    if frames[0] == BINARY_MAGIC:
+        buffers = frames[2:]
+        def persistent_load(pid):
+            index, dtype, shape = pid
+            # Copy so the array is writable.
+            dtype = numpy.dtype(dtype)
+            return numpy.frombuffer(buffers[index], dtype).reshape(shape).copy()
+        unpickler = pickle.Unpickler(cStringIO.StringIO(frames[1]))
+        unpickler.persistent_load = persistent_load
+        return (unpickler.load(), 'binary')
+    elif frames[0][:1] == '\x80':  # Pickle protocol 2 or later.
+        return (decode(frames[0]), 'pickle')
+    return (json.loads(frames[0]), 'json')
+
+def _json_default(obj):
+    """Encodes arrays as lists, other unknown objects via `json_default`."""
+    if isinstance(obj, numpy.ndarray):
+        return obj.tolist()
+    return json_default(obj)
+
+
 class ZmqCompWrapper(object):
     def __init__(self, context, comp, rep_url=None, decoder=None, encoder=None):
         self._context = context
         self._comp = comp
         
-        if decoder is None:
-            decoder = decode
+        # If None, use the format of the request (see encode_frames).
         self._decoder = decoder
-        
-        if encoder is None:
-            encoder = encode
         self._encoder = encoder
         
         if rep_url is None:
@@ -66,26 +144,42 @@ class ZmqCompWrapper(object):
         self._repstream.on_recv(self.handle_req)
         
     def handle_req(self, msg):
-        parts = self._decoder(msg[0])
+        if self._decoder is None:
+            parts, fmt = decode_frames(msg)
+        else:
+            parts, fmt = self._decoder(msg[0]), 'pickle'
         if debug: 
             DEBUG('received %s' % parts)
-        try:
-            funct = deep_getattr(self._comp, parts[0])
-            ret = funct(*parts[1], **parts[2])
-        except Exception:
-            ret = traceback.format_exc()
-            logging.exception('handle_req %s %s %s',
-                              parts[0], parts[1], parts[2])
+        if parts[0] == FORMATS_REQUEST:
+            ret = list(FORMATS)
+        else:
+            try:
+                funct = deep_getattr(self._comp, parts[0])
+                ret = funct(*parts[1], **parts[2])
+            except Exception:
+                ret = traceback.format_exc()
+                logging.exception('handle_req %s %s %s',
+                                  parts[0], parts[1], parts[2])
         if debug:
             DEBUG('returning %s' % ret)
         try:
-            self._repstream.send_multipart([self._encoder(ret)])
+            try:
+                if self._encoder is None:
+                    frames = encode_frames(ret, fmt)
+                else:
+                    frames = [self._encoder(ret)]
+            except Exception:
+                # Still need to reply, send the problem instead.
+                ret = traceback.format_exc()
+                frames = encode_frames(ret, fmt) if self._encoder is None \
+                                                else [self._encoder(ret)]
+            self._repstream.send_multipart(frames, copy=len(frames) < 3)
         except Exception:
             print "Error handling request: %s: %s" % (msg, traceback.format_exc())
         
     @staticmethod
     def serve(top, context=None, wspub=None, wscmd=None, port=8888,
-              rep_url='tcp://*:5555', pub_url='inproc://_pub_'):
+              rep_url='tcp://*:5555', pub_url='inproc://_pub_', pub_rate=0):
 
         if context is None:
             context = zmq.Context()
@@ -95,7 +189,7 @@ class ZmqCompWrapper(object):
         
         # initialize the publisher
         from openmdao.main.publisher import Publisher
-        Publisher.init(context, pub_url)
+        Publisher.init(context, pub_url, max_rate=pub_rate)
             
         if wspub or wscmd:
             from openmdao.main.zmqws import CmdWebSocketHandler, PubWebSocketHandler
@@ -128,6 +222,9 @@ def main(args=None):
                       help="module path to class of top level component")
     parser.add_option("-p", "--publish", action="append", type="string", dest='published', 
                       help="specify a variable to publish", default=[])
+    parser.add_option("--pubrate", action="store", type="float", dest='pubrate', 
+                      help="max published batches per second (0 sends immediately)",
+                      default=0.)
     parser.add_option("--wspub", action="store", type="string", dest='wspub', 
                       help="route to pub websocket")
     parser.add_option("--wscmd", action="store", type="string", dest='wscmd', 
@@ -158,7 +255,8 @@ def main(args=None):
     top.register_published_vars(options.published)
     
     ZmqCompWrapper.serve(top, rep_url=options.repurl, pub_url=options.puburl,
-                         wspub=options.wspub, wscmd=options.wscmd)
+                         wspub=options.wspub, wscmd=options.wscmd,
+                         pub_rate=options.pubrate)
     
 
 if __name__ == '__main__':
@@ -5,10 +5,19 @@ import optparse
 import pprint
 from functools import partial
 
-from zmqcomp import encode, decode
+from zmqcomp import decode_frames, encode_frames, FORMATS_REQUEST
 
 class ZMQ_RPC(object):
-    def __init__(self, url, context=None):
+    """Proxy for a :class:`ZmqCompWrapper` at `url`.
+
+    The message format is negotiated with the server on the first request,
+    using the first of `formats` the server supports. If the server predates
+    format negotiation, or `formats` is empty, 'pickle' is used.
+    """
+
+    def __init__(self, url, context=None, formats=('binary', 'pickle')):
+        self._formats = formats
+        self._format = None
         if url.startswith('ws'):
             import websocket
             # use websockets
@@ -27,9 +36,25 @@ class ZMQ_RPC(object):
         setattr(self, name, f)
         return f
 
+    @property
+    def format(self):
+        """Message format in use, negotiating it if necessary."""
+        if self._format is None:
+            self._format = 'pickle'
+            if self._formats:
+                # Old servers will reply with a traceback string.
+                supported = self.invoke(FORMATS_REQUEST)
+                if isinstance(supported, list):
+                    for fmt in self._formats:
+                        if fmt in supported:
+                            self._format = fmt
+                            break
+        return self._format
+
     def invoke(self, fname, *args, **kwargs):
-        self._cmdsock.send(encode([fname, args, kwargs]))
-        return decode(self._cmdsock.recv_multipart()[0])
+        frames = encode_frames([fname, args, kwargs], self.format)
+        self._cmdsock.send_multipart(frames, copy=len(frames) < 3)
+        return decode_frames(self._cmdsock.recv_multipart())[0]
 
     def close(self):
         self._cmdsock.close()
@@ -226,6 +226,23 @@ class PythonSourceFileAnalyser(ast.NodeVisitor):
             else:
                 self.localnames[al.asname] = '.'.join([module, al.name])
 
+    def visit_Call(self, node):
+        """This executes every time a function call is parsed. A
+        ``lazy_import(__name__, {module: names})`` call in a lazy api module
+        is treated like "from module import name" statements.
+        """
+        if isinstance(node.func, (ast.Name, ast.Attribute)) and \
+           _to_str(node.func) in ('lazy_import',
+                                  'openmdao.util.lazyimport.lazy_import') and \
+           len(node.args) == 2 and isinstance(node.args[1], ast.Dict):
+            for key, value in zip(node.args[1].keys, node.args[1].values):
+                if isinstance(key, ast.Str) and \
+                   isinstance(value, (ast.Tuple, ast.List)):
+                    for elt in value.elts:
+                        if isinstance(elt, ast.Str):
+                            self.localnames[elt.s] = '.'.join([key.s, elt.s])
+        self.generic_visit(node)
+
     def update_graph(self, graph):
         """Update the inheritance/implements graph."""
         for classname, classinfo in self.classes.items():
@@ -15,7 +15,7 @@ from openmdao.util.eggobserver import EggObserver
 from openmdao.util.eggsaver import SAVE_CPICKLE, SAVE_PICKLE
 
 __all__ = ('load', 'load_from_eggfile', 'load_from_eggpkg',
-           'check_requirements')
+           'extract_eggfile', 'check_requirements')
 
 
 def load_from_eggfile(filename, entry_group, entry_name, logger=None,
@@ -137,8 +137,27 @@ def _load_from_distribution(dist, entry_group, entry_name, instance_name,
         raise exc
 
 
-def _dist_from_eggfile(filename, logger, observer):
-    """ Create distribution by unpacking egg file. """
+def extract_eggfile(filename, logger=None, observer=None):
+    """
+    Extracts files in egg to a subdirectory matching the saved object name.
+    Returns the name of that subdirectory.
+
+    filename: string
+        Name of egg file.
+
+    logger: Logger
+        Used for recording progress, etc.
+
+    observer: callable
+        Called via an :class:`EggObserver`.
+    """
+    logger = logger or NullLogger()
+    observer = EggObserver(observer, logger)
+    return _extract_files(filename, logger, observer)
+
+
+def _extract_files(filename, logger, observer):
+    """ Extract files in egg, returning the egg's top-level name. """
     if not os.path.exists(filename):
         msg = "'%s' not found." % filename
         observer.exception(msg)
@@ -198,6 +217,13 @@ def _dist_from_eggfile(filename, logger, observer):
     finally:
         archive.close()
 
+    return name
+
+
+def _dist_from_eggfile(filename, logger, observer):
+    """ Create distribution by unpacking egg file. """
+    name = _extract_files(filename, logger, observer)
+
     # Create distribution from extracted files.
     location = os.getcwd()
     egg_info = os.path.join(location, name, 'EGG-INFO')
@@ -1,13 +1,29 @@
 import fnmatch
 import glob
+import hashlib
 import os
 import sys
+import threading
 import zipfile
+import zlib
+
+from collections import OrderedDict
 
 from openmdao.util.log import NullLogger
+from openmdao.util.wrkpool import WorkerPool
+
+# Size of chunks for transfers involving a remote server.
+CHUNK_SIZE = 1 << 20
 
+# Cache of local file hashes, keyed by (path, chunk_size).
+# Least recently used entries are evicted beyond _HASH_CACHE_SIZE.
+_HASH_CACHE = OrderedDict()
+_HASH_CACHE_SIZE = 256
+_HASH_LOCK = threading.Lock()
 
-def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
+
+def filexfer(src_server, src_path, dst_server, dst_path, mode='',
+             pipeline=4, compress=False, check_hash=True):
     """
     Transfer a file from one place to another.
 
@@ -16,6 +32,15 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
     respective object must support :meth:`open`, :meth:`stat`, and
     :meth:`chmod`.
 
+    For binary transfers involving a remote server which also supports
+    :meth:`file_hashes`, :meth:`read_chunk`, :meth:`write_chunk`,
+    :meth:`truncate`, and :meth:`rename` (like :class:`ObjServer`), the
+    transfer is done in chunks, with several chunks in flight at once. Each
+    chunk is verified against the source's hash when written. Data is written
+    to `dst_path` + '.part', which is renamed when complete. If a previous
+    transfer was interrupted, the leading chunks of the '.part' file which
+    match the source are kept and the transfer resumes from there.
+
     After the copy has completed, permission bits from :meth:`stat` are set
     via :meth:`chmod`.
 
@@ -33,7 +58,32 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
 
     mode: string
         Mode settings for :func:`open`, not including 'r' or 'w'.
+
+    pipeline: int
+        Maximum number of chunks in flight for a chunked transfer.
+
+    compress: bool
+        If True, chunks are compressed for a chunked transfer.
+
+    check_hash: bool
+        If True, a chunked transfer is skipped if `dst_path` already has
+        the same content as `src_path`.
     """
+    src_ops = _LOCAL if src_server is None else src_server
+    dst_ops = _LOCAL if dst_server is None else dst_server
+
+    if 'b' in mode and (src_server is not None or dst_server is not None) \
+       and _supports_chunks(src_ops) and _supports_chunks(dst_ops):
+        _chunked_xfer(src_ops, src_path, dst_ops, dst_path,
+                      pipeline, compress, check_hash)
+    else:
+        _stream_xfer(src_server, src_path, dst_server, dst_path, mode)
+
+    dst_ops.chmod(dst_path, src_ops.stat(src_path).st_mode)
+
+
+def _stream_xfer(src_server, src_path, dst_server, dst_path, mode):
+    """ Copy file sequentially via :meth:`open`. """
     if src_server is None:
         src_file = open(src_path, 'r'+mode)
     else:
@@ -60,14 +110,216 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
     finally:
         src_file.close()
 
-    if src_server is None:
-        mode = os.stat(src_path).st_mode
-    else:
-        mode = src_server.stat(src_path).st_mode
-    if dst_server is None:
-        os.chmod(dst_path, mode)
-    else:
-        dst_server.chmod(dst_path, mode)
+
+def _supports_chunks(ops):
+    """ Returns True if `ops` supports chunked transfers. """
+    for name in ('file_hashes', 'read_chunk', 'write_chunk', 'truncate',
+                 'rename'):
+        if not hasattr(ops, name):
+            return False
+    return True
+
+
+def _chunked_xfer(src_ops, src_path, dst_ops, dst_path,
+                  pipeline, compress, check_hash):
+    """ Copy file in pipelined, verified chunks. """
+    src_hash, src_chunks = src_ops.file_hashes(src_path, CHUNK_SIZE)
+
+    if check_hash:
+        dst_info = dst_ops.file_hashes(dst_path, CHUNK_SIZE)
+        if dst_info is not None and dst_info[0] == src_hash:
+            return  # Already there.
+
+    # Resume after leading chunks which have been verified.
+    part_path = dst_path + '.part'
+    part_info = dst_ops.file_hashes(part_path, CHUNK_SIZE)
+    start = 0
+    if part_info is not None:
+        for part_hash, chunk_hash in zip(part_info[1], src_chunks):
+            if part_hash != chunk_hash:
+                break
+            start += 1
+    dst_ops.truncate(part_path, start * CHUNK_SIZE)
+
+    credentials = getattr(threading.current_thread(), 'credentials', None)
+    pending = []
+    try:
+        for index in range(start, len(src_chunks)):
+            if len(pending) >= max(pipeline, 1):
+                pending.pop(0).result()
+            pending.append(WorkerPool.submit(_copy_chunk, credentials,
+                                             src_ops, src_path,
+                                             dst_ops, part_path,
+                                             index * CHUNK_SIZE,
+                                             src_chunks[index], compress))
+        for future in pending:
+            future.result()
+    except Exception:
+        for future in pending:
+            future.cancel()
+        raise
+
+    dst_ops.rename(part_path, dst_path)
+
+
+def _copy_chunk(credentials, src_ops, src_path, dst_ops, dst_path,
+                offset, digest, compress):
+    """ Copy one chunk, executed by a pool worker. """
+    if credentials is None:
+        data = src_ops.read_chunk(src_path, offset, CHUNK_SIZE, compress)
+        dst_ops.write_chunk(dst_path, offset, data, compress, digest)
+        return
+
+    # Proxy calls from this thread use the caller's credentials,
+    # but the pool thread must not keep them for its next task.
+    thread = threading.current_thread()
+    saved = getattr(thread, 'credentials', None)
+    thread.credentials = credentials
+    try:
+        data = src_ops.read_chunk(src_path, offset, CHUNK_SIZE, compress)
+        dst_ops.write_chunk(dst_path, offset, data, compress, digest)
+    finally:
+        if saved is None:
+            del thread.credentials
+        else:
+            thread.credentials = saved
+
+
+def file_hashes(path, chunk_size=CHUNK_SIZE):
+    """
+    Returns ``(digest, chunk_digests)`` of SHA1 hex digests for the file at
+    `path` and for each `chunk_size` chunk of it, or None if `path` does
+    not exist. Results for recently used files are cached until the
+    file's size or modification time changes.
+
+    path: string
+        Path to file.
+
+    chunk_size: int
+        Size of chunks.
+    """
+    key = (os.path.abspath(path), chunk_size)
+    try:
+        info = os.stat(path)
+    except OSError:
+        with _HASH_LOCK:
+            _HASH_CACHE.pop(key, None)
+        return None
+    stamp = (info.st_size, info.st_mtime)
+    with _HASH_LOCK:
+        cached = _HASH_CACHE.pop(key, None)
+        if cached is not None and cached[0] == stamp:
+            _HASH_CACHE[key] = cached  # Now most recently used.
+            return cached[1]
+
+    sha = hashlib.sha1()
+    chunk_digests = []
+    with open(path, 'rb') as inp:
+        data = inp.read(chunk_size)
+        while data:
+            sha.update(data)
+            chunk_digests.append(hashlib.sha1(data).hexdigest())
+            data = inp.read(chunk_size)
+    result = (sha.hexdigest(), chunk_digests)
+    with _HASH_LOCK:
+        _HASH_CACHE[key] = (stamp, result)
+        while len(_HASH_CACHE) > _HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+    return result
+
+
+def read_chunk(path, offset, size, compress=False):
+    """
+    Returns `size` bytes (or less at end of file) at `offset` of `path`.
+
+    path: string
+        Path to file.
+
+    offset: int
+        Offset of data in file.
+
+    size: int
+        Number of bytes to read.
+
+    compress: bool
+        If True, data is returned compressed by :mod:`zlib`.
+    """
+    with open(path, 'rb') as inp:
+        inp.seek(offset)
+        data = inp.read(size)
+    return zlib.compress(data, 1) if compress else data
+
+
+def write_chunk(path, offset, data, compress=False, digest=None):
+    """
+    Write `data` at `offset` of existing file `path`.
+
+    path: string
+        Path to file.
+
+    offset: int
+        Offset of data in file.
+
+    data: string
+        Data to write.
+
+    compress: bool
+        If True, `data` was compressed by :mod:`zlib`.
+
+    digest: string
+        If specified, SHA1 hex digest which `data` must match.
+    """
+    if compress:
+        data = zlib.decompress(data)
+    if digest is not None and hashlib.sha1(data).hexdigest() != digest:
+        raise RuntimeError('chunk at %d of %r failed hash check'
+                           % (offset, path))
+    with open(path, 'r+b') as out:
+        out.seek(offset)
+        out.write(data)
+
+
+def truncate(path, size):
+    """
+    Truncate `path` to `size` bytes, creating it if necessary.
+
+    path: string
+        Path to file.
+
+    size: int
+        New size of file.
+    """
+    with open(path, 'ab') as out:
+        out.truncate(size)
+
+
+def rename(src_path, dst_path):
+    """
+    Rename `src_path` to `dst_path`, replacing any existing `dst_path`.
+
+    src_path: string
+        Path to existing file.
+
+    dst_path: string
+        New path.
+    """
+    if sys.platform == 'win32' and os.path.exists(dst_path):
+        os.remove(dst_path)
+    os.rename(src_path, dst_path)
+
+
+class _LocalOps(object):
+    """ Local equivalent of server file operations used by :func:`filexfer`. """
+
+    chmod = staticmethod(os.chmod)
+    stat = staticmethod(os.stat)
+    file_hashes = staticmethod(file_hashes)
+    read_chunk = staticmethod(read_chunk)
+    write_chunk = staticmethod(write_chunk)
+    truncate = staticmethod(truncate)
+    rename = staticmethod(rename)
+
+_LOCAL = _LocalOps()
 
 
 def pack_zipfile(patterns, filename, logger=None):
@@ -0,0 +1,77 @@
+"""
+Support for 'api' modules whose attributes are imported on first access, so
+that importing the api module doesn't import everything it provides.
+
+Usage, at the end of an api module::
+
+    from openmdao.util.lazyimport import lazy_import
+
+    lazy_import(__name__, {
+        'openmdao.main.component': ('Component', 'SimulationRoot'),
+        ...
+    })
+"""
+
+import importlib
+import sys
+
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """A module whose attributes are imported from their defining module
+    on first access. It replaces the original module in :data:`sys.modules`.
+
+    module: module
+        The original module, whose existing attributes are copied.
+
+    attributes: dict
+        Maps attribute name to the name of the module which defines it.
+    """
+
+    def __init__(self, module, attributes):
+        super(LazyModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Python 2 clears a module's globals when it is deleted, so keep
+        # the original alive.
+        self.__dict__['_lazy_module'] = module
+        self.__dict__['_lazy_attributes'] = dict(attributes)
+        if '__all__' not in self.__dict__:
+            self.__all__ = sorted(attributes)
+
+    def __getattr__(self, name):
+        try:
+            modname = self.__dict__['_lazy_attributes'][name]
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '%s'"
+                                 % name)
+        value = getattr(importlib.import_module(modname), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__).union(self._lazy_attributes))
+
+    def __repr__(self):
+        return '<lazy module %r from %r>' % (self.__name__,
+                                             self.__dict__.get('__file__'))
+
+
+def lazy_import(name, modules):
+    """Replace module `name` in :data:`sys.modules` with a
+    :class:`LazyModule` which imports the attributes in `modules` on
+    first access. Returns the new module.
+
+    name: string
+        Name of the module to replace, typically ``__name__``.
+
+    modules: dict
+        Maps module name to the names of the attributes it defines.
+    """
+    attributes = {}
+    for modname, names in modules.items():
+        for attr in names:
+            attributes[attr] = modname
+    module = LazyModule(sys.modules[name], attributes)
+    sys.modules[name] = module
+    return module
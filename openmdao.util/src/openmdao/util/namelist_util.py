@@ -3,13 +3,15 @@ Utilities for reading and writing Fortran namelists.
 """
 
 import logging
+import re
 
 # pylint: disable-msg=E0611,F0401
 import ordereddict
 
 try:
-    from numpy import ndarray, array, append, vstack, zeros, \
-         int32, int64, float32, float64
+    from numpy import ndarray, array, append, vstack, zeros, where, floor, \
+         fromstring, int32, int64, float32, float64
+    from numpy import bool_ as numpy_bool
 except ImportError as err:
     logging.warn("In %s: %r", __file__, err)
 
@@ -33,25 +35,95 @@ def _floatfmt(val):
     else:
         return "%.16g"
 
-def _intfmt(val):
-    """ Returns the output format for an integer """
-    
-    return "%d"
+def _format_value(val):
+    """ Returns a single list or scalar value formatted for a namelist. """
 
-def _strfmt(val):
-    """ Returns the output format for a string """
-    
-    return "'%s'"
-    
-def _boolfmt(val):
-    """ Returns the output format for a boolean """
-    
-    if val == True:
-        return 'T%.0s'
+    if isinstance(val, (bool, numpy_bool)):
+        return 'T' if val else 'F'
+    elif isinstance(val, (int, long, int32, int64)):
+        return "%d" % val
+    elif isinstance(val, (float, float32, float64)):
+        return _floatfmt(val) % val
     else:
-        return 'F%.0s'
-    
-    
+        return "'%s'" % val
+
+def _format_array(value):
+    """ Returns a list of formatted strings, one per element of the given
+    ndarray. The format is chosen once per array from its dtype rather than
+    once per element, and the integral-float test is vectorized."""
+
+    kind = value.dtype.kind
+    flat = value.ravel()
+
+    if kind == 'b':
+        return where(flat, 'T', 'F').tolist()
+    elif kind in 'iu':
+        return ["%d" % val for val in flat.tolist()]
+    elif kind == 'f':
+        integral = (flat == floor(flat)).tolist()
+        return [("%.1f" if isint else "%.16g") % val
+                for val, isint in zip(flat.tolist(), integral)]
+    else:
+        return ["'%s'" % val for val in flat.tolist()]
+
+# Fast path for the common card forms. Anything these patterns don't
+# recognize falls through to the full pyparsing grammar.
+_INT_RE = r'[+-]?\d+'
+_FLOAT_RE = r'[+-]?(?:\d+\.\d*|\.\d+|\d+(?=[eEdD]))(?:[eEdD][+-]?\d+)?'
+_NUM_RE = r'(?:%s|%s)' % (_FLOAT_RE, _INT_RE)
+_NUMLIST_RE = r'%s(?:\s*,\s*%s)*' % (_NUM_RE, _NUM_RE)
+_BOOL_VALUES = {'T' : True, 'TRUE' : True, 'True' : True, 'true' : True,
+                '.TRUE.' : True, '.T.' : True,
+                'F' : False, 'FALSE' : False, 'False' : False, 'false' : False,
+                '.FALSE.' : False, '.F.' : False}
+
+_int_match = re.compile(r'\s*%s\s*$' % _INT_RE).match
+_numlist_card_match = re.compile(r'([A-Za-z0-9]+)\s*=\s*(%s)\s*,?\s*/?$'
+                                 % _NUMLIST_RE).match
+_numlist_match = re.compile(r'(%s)\s*,?\s*/?$' % _NUMLIST_RE).match
+_word_card_match = re.compile(r"([A-Za-z0-9]+)\s*=\s*"
+                              r"(?:'([^']*)'|\"([^\"]*)\"|([A-Za-z.]+))"
+                              r"\s*,?\s*/?$").match
+
+def _parse_numbers(text):
+    """ Converts a comma-delimited string of numbers that has already been
+    validated by the fast-path regex. A single number is returned as an
+    int or float; several are returned as an ndarray."""
+
+    tokens = text.split(',')
+    is_int = all(_int_match(token) for token in tokens)
+
+    if len(tokens) == 1:
+        if is_int:
+            return int(text)
+        return float(text.replace('D', 'E').replace('d', 'E'))
+
+    if is_int:
+        return fromstring(text, dtype=int, sep=',')
+    return fromstring(text.replace('D', 'E').replace('d', 'E'),
+                      dtype=float64, sep=',')
+
+def _match_fast_card(line):
+    """ Returns a (name, value) tuple if the line is a single card in one of
+    the common forms (numbers, a quoted string, or a boolean); otherwise
+    returns None and the line must go through the full grammar."""
+
+    match = _numlist_card_match(line)
+    if match:
+        return match.group(1), _parse_numbers(match.group(2))
+
+    match = _word_card_match(line)
+    if match:
+        name, sval, dval, bval = match.groups()
+        if sval is not None:
+            return name, sval
+        elif dval is not None:
+            return name, dval
+        elif bval in _BOOL_VALUES:
+            return name, _BOOL_VALUES[bval]
+
+    return None
+
 def _process_card_info(card):
     """ Function to extract info from a card as returned from PyParsing a
     namelist file. """
@@ -108,6 +180,68 @@ class ToBool(TokenConverter):
             raise RuntimeError('Unexpected error while trying to identify a'
                                ' Boolean value in the namelist.')
 
+class _NamelistGrammar(object):
+    """PyParsing grammar for the namelist card forms that the regex fast path
+    doesn't handle. Building this is expensive, so a single instance is
+    created when the module is imported and shared by all parsers."""
+    
+    def __init__(self):
+        
+        # Lots of numerical tokens for recognizing various kinds of numbers
+        digits = Word(nums)
+        dot = "."
+        sign = oneOf("+ -")
+        ee = CaselessLiteral('E') | CaselessLiteral('D')
+    
+        num_int = ToInteger(Combine( Optional(sign) + digits ))
+        
+        num_float = ToFloat(Combine( Optional(sign) + 
+                            ((digits + dot + Optional(digits)) |
+                             (dot + digits)) +
+                             Optional(ee + Optional(sign) + digits)
+                            ))
+        
+        # special case for a float written like "3e5"
+        mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
+        
+        # I don't suppose we need these, but just in case (plus it's easy)
+        nan = ToFloat(oneOf("NaN Inf -Inf"))
+        
+        numval = num_float | mixed_exp | num_int | nan
+        strval =  QuotedString(quoteChar='"') | QuotedString(quoteChar="'")
+        b_list = "T TRUE True true F FALSE False false .TRUE. .FALSE. .T. .F."
+        boolval = ToBool(oneOf(b_list))
+        fieldval = Word(alphanums)
+        
+        # Tokens for parsing a line of data
+        numstr_token = numval + ZeroOrMore(Suppress(',') + numval) \
+                   | strval
+        data_token = numstr_token | boolval
+        index_token = Suppress('(') + num_int + Suppress(')')
+        
+        card_token = Group(fieldval("name") + \
+                           Optional(index_token("index")) + \
+                           Suppress('=') + \
+                           Optional(num_int("dimension") + Suppress('*')) + \
+                           data_token("value") + \
+                           Optional(Suppress('*') + num_int("dimension")))
+        self.multi_card = (card_token + ZeroOrMore(Suppress(',') + card_token))
+        self.array_continuation = numstr_token.setResultsName("value")
+        self.array2D = fieldval("name") + Suppress("(") + \
+                       Suppress(num_int) + Suppress(',') + \
+                       num_int("index") + Suppress(')') + \
+                       Suppress('=') + numval + \
+                       ZeroOrMore(Suppress(',') + numval)
+        
+        # Tokens for parsing the group head and tail
+        self.group_end = Literal("/") | Literal("$END") | Literal("$end")
+        self.group_name = (Literal("$") | Literal("&")) + \
+                          Word(alphanums).setResultsName("name") + \
+                          Optional(self.multi_card) + \
+                          Optional(self.group_end)
+        
+_GRAMMAR = _NamelistGrammar()
+
 @stub_if_missing_deps('numpy')
 class Namelist(object):
     """Utility to ease the task of constructing a formatted output file."""
@@ -223,87 +357,50 @@ class Namelist(object):
                 
             for card in self.cards[i]:
                 
+                value = card.value
+                
                 if card.is_comment:
-                    line = "  %s\n" % (card.value)
-                    
-                elif isinstance(card.value, bool):
-                    fstring = "  %s = " + _boolfmt(card.value) + "\n"
-                    line = fstring % (card.name, card.value)
+                    line = "  %s\n" % (value)
                     
-                elif isinstance(card.value, int):
-                    fstring = "  %s = " + _intfmt(card.value) + "\n"
-                    line = fstring % (card.name, card.value)
-                    
-                elif isinstance(card.value, float):
-                    fstring = "  %s = " + _floatfmt(card.value) + "\n"
-                    line =  fstring % (card.name, card.value)
-                    
-                elif isinstance(card.value, str):
-                    fstring = "  %s = " + _strfmt(card.value) + "\n"
-                    line =  fstring % (card.name, card.value)
+                elif isinstance(value, (bool, int, float, str)):
+                    line = "  %s = %s\n" % (card.name, _format_value(value))
                     
                 # Lists are mainly supported for the Enum Array
-                elif isinstance(card.value, list):
-                    line = "  %s = " % (card.name)
-                    sep = ""
-                    for val in card.value:
-                        
-                        # We can have integer, real, or string lists
-                        if isinstance(val, bool):
-                            fmt = _boolfmt
-                        elif isinstance(val, (int, int32, int64)):
-                            fmt = _intfmt
-                        elif isinstance(val, (float, float32, float64)):
-                            fmt = _floatfmt
-                        else:
-                            fmt = _strfmt
-                    
-                        fstring = sep + fmt(val)
-                        line += fstring % val
-                        sep = self.delimiter
-                        
-                    line += "\n"
+                elif isinstance(value, list):
+                    line = "  %s = %s\n" % (card.name, self.delimiter.join(
+                                             [_format_value(val) 
+                                              for val in value]))
 
-                elif isinstance(card.value, (ndarray)):
-                    
-                    # We can have integer, real, or string arrays
-                    if card.value.dtype == bool:
-                        fmt = _boolfmt
-                    elif card.value.dtype in (int, int32, int64):
-                        fmt = _intfmt
-                    elif card.value.dtype in (float, float32, float64):
-                        fmt = _floatfmt
-                    else:
-                        fmt = _strfmt
+                elif isinstance(value, (ndarray)):
                     
                     # We don't need to output 0D arrays
-                    if len(card.value) == 0:
+                    if len(value) == 0:
                         continue
                     
-                    elif len(card.value.shape) == 1:
-                        line = "  %s = " % (card.name)
-                        sep = ""
-                        for val in card.value:
-                            fstring = "%s" + fmt(val)
-                            line += fstring % (sep, val)
-                            sep = self.delimiter
-                        line += "\n"
+                    elif len(value.shape) == 1:
+                        line = "  %s = %s\n" % (card.name, 
+                                  self.delimiter.join(_format_array(value)))
                             
-                    elif len(card.value.shape) == 2:
+                    elif len(value.shape) == 2:
                         
-                        line = "  "
-                        for row in range(0, card.value.shape[0]):
-                            line += card.name + "(1," + str(row+1) + ") ="
-                            for col in range(0, card.value.shape[1]):
-                                val = card.value[row, col]
-                                fstring = " " + fmt(val) + "%s"
-                                line += fstring % (val, self.delimiter)
-                            line += "\n"
+                        # Format the whole array at once, then lay it out
+                        # one row per line.
+                        ncol = value.shape[1]
+                        vals = _format_array(value)
+                        rows = []
+                        for row in range(0, value.shape[0]):
+                            fields = vals[row*ncol:(row+1)*ncol]
+                            rows.append("%s(1,%d) =%s\n" % 
+                                        (card.name, row+1, 
+                                         ''.join([" %s%s" % (val, 
+                                                             self.delimiter)
+                                                  for val in fields])))
+                        line = "  " + ''.join(rows)
                         
                     else:
                         raise RuntimeError("Don't know how to handle array" + \
                                            " of %s dimensions" \
-                                           % len(card.value.shape))
+                                           % len(value.shape))
                     
                 else:
                     raise RuntimeError("Error generating input file. Don't" + \
@@ -328,64 +425,10 @@ class Namelist(object):
         method to extract the variables from this data structure."""
         
         infile = open(self.filename, 'r')
-        data = infile.readlines()
+        data = infile.read().splitlines()
         infile.close()
         
-        # Lots of numerical tokens for recognizing various kinds of numbers
-        digits = Word(nums)
-        dot = "."
-        sign = oneOf("+ -")
-        ee = CaselessLiteral('E') | CaselessLiteral('D')
-    
-        num_int = ToInteger(Combine( Optional(sign) + digits ))
-        
-        num_float = ToFloat(Combine( Optional(sign) + 
-                            ((digits + dot + Optional(digits)) |
-                             (dot + digits)) +
-                             Optional(ee + Optional(sign) + digits)
-                            ))
-        
-        # special case for a float written like "3e5"
-        mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
-        
-        # I don't suppose we need these, but just in case (plus it's easy)
-        nan = ToFloat(oneOf("NaN Inf -Inf"))
-        
-        numval = num_float | mixed_exp | num_int | nan
-        strval =  QuotedString(quoteChar='"') | QuotedString(quoteChar="'")
-        b_list = "T TRUE True true F FALSE False false .TRUE. .FALSE. .T. .F."
-        boolval = ToBool(oneOf(b_list))
-        fieldval = Word(alphanums)
-        
-        # Tokens for parsing a line of data
-        numstr_token = numval + ZeroOrMore(Suppress(',') + numval) \
-                   | strval
-        data_token = numstr_token | boolval
-        index_token = Suppress('(') + num_int + Suppress(')')
-        
-        card_token = Group(fieldval("name") + \
-                           Optional(index_token("index")) + \
-                           Suppress('=') + \
-                           Optional(num_int("dimension") + Suppress('*')) + \
-                           data_token("value") + \
-                           Optional(Suppress('*') + num_int("dimension")))
-        multi_card_token = (card_token + ZeroOrMore(Suppress(',') + card_token))
-        array_continuation_token = numstr_token.setResultsName("value")
-        array2D_token = fieldval("name") + Suppress("(") + \
-                        Suppress(num_int) + Suppress(',') + \
-                        num_int("index") + Suppress(')') + \
-                        Suppress('=') + numval + \
-                        ZeroOrMore(Suppress(',') + numval)
-        
-        # Tokens for parsing the group head and tail
-        group_end_token = Literal("/") | Literal("$END") | Literal("$end")
-        group_name_token = (Literal("$") | Literal("&")) + \
-                           Word(alphanums).setResultsName("name") + \
-                           Optional(multi_card_token) + \
-                           Optional(group_end_token)
-        
-        # Comment Token
-        comment_token = Literal("!")
+        grammar = _GRAMMAR
         
         # Loop through each line and parse.
         
@@ -400,53 +443,79 @@ class Namelist(object):
                 
             if current_group:
                 
+                deck = self.cards[-1]
+                
+                # Only try the fast-path regexes on data lines.
+                fast_card = numlist = None
+                if '!' not in line and line not in ('/', '$END', '$end'):
+                    fast_card = _match_fast_card(line)
+                    if fast_card is None and '=' not in line:
+                        numlist = _numlist_match(line)
+                
                 # Skip comment cards
-                if comment_token.searchString(line):
+                if '!' in line:
                     pass
                 
+                # Fast path: a lone group terminator
+                elif line in ('/', '$END', '$end'):
+                    current_group = None
+                
+                # Fast path: name = number(s), 'string' or bool
+                elif fast_card:
+                    deck.append(Card(*fast_card))
+                
+                # Fast path: numeric continuation of the previous array
+                elif numlist:
+                    element = _parse_numbers(numlist.group(1))
+                    
+                    if isinstance(deck[-1].value, ndarray):
+                        new_value = append(deck[-1].value, element)
+                    else:
+                        new_value = append(array(deck[-1].value), element)
+                    
+                    deck[-1].value = new_value
+                
                 # Process orindary cards
-                elif multi_card_token.searchString(line):
-                    cards = multi_card_token.parseString(line)
-
-                    for card in cards:
+                elif grammar.multi_card.searchString(line):
+                    for card in grammar.multi_card.parseString(line):
                         name, value = _process_card_info(card)
-                        self.cards[-1].append(Card(name, value))
+                        deck.append(Card(name, value))
                         
                 # Catch 2D arrays like -> X(1,1) = 3,4,5
-                elif array2D_token.searchString(line):
-                    card = array2D_token.parseString(line)
+                elif grammar.array2D.searchString(line):
+                    card = grammar.array2D.parseString(line)
                     
                     name = card[0]
                     index = card[1]
                     value = array(card[2:])
                     
                     if index > 1:
-                        old_value = self.cards[-1][-1].value
+                        old_value = deck[-1].value
                         new_value = vstack((old_value, value))
-                        self.cards[-1][-1].value = new_value
+                        deck[-1].value = new_value
                     else:
-                        self.cards[-1].append(Card(name, value))
+                        deck.append(Card(name, value))
                     
                 # Arrays can be continued on subsequent lines
                 # The value of the most recent card must be turned into an
                 # array and appended
-                elif array_continuation_token.searchString(line):
-                    card = array_continuation_token.parseString(line)
+                elif grammar.array_continuation.searchString(line):
+                    card = grammar.array_continuation.parseString(line)
                     
                     if len(card) > 1:
                         element = array(card[0:])
                     else:
                         element = card.value
                         
-                    if isinstance(self.cards[-1][-1].value, ndarray):
-                        new_value = append(self.cards[-1][-1].value, element)
+                    if isinstance(deck[-1].value, ndarray):
+                        new_value = append(deck[-1].value, element)
                     else:
-                        new_value = array([self.cards[-1][-1].value, element])
+                        new_value = array([deck[-1].value, element])
                     
-                    self.cards[-1][-1].value = new_value
+                    deck[-1].value = new_value
                     
                 # Lastly, look for the group footer
-                elif group_end_token.searchString(line):
+                elif grammar.group_end.searchString(line):
                     current_group = None
                     
                 # Everything else must be a pure comment
@@ -457,13 +526,12 @@ class Namelist(object):
                 if line[-1] == '/':
                     current_group = None
                     
-                #print self.cards[-1][-1].name, self.cards[-1][-1].value
             else:
-                group_name = group_name_token.searchString(line)
+                group_name = grammar.group_name.searchString(line)
                 
                 # Group Header
                 if group_name:
-                    group_name = group_name_token.parseString(line)
+                    group_name = grammar.group_name.parseString(line)
                     current_group = group_name.name
                     self.add_group(current_group)
                     
@@ -474,7 +542,7 @@ class Namelist(object):
                         
                         for card in cards:
                             # Sometimes an end card is on the same line.
-                            if group_end_token.searchString(card):
+                            if grammar.group_end.searchString(card):
                                 current_group = None
                             else:
                                 name, value = _process_card_info(card)
@@ -0,0 +1,529 @@
+"""
+A bounded pool for running shell commands concurrently on the local host.
+Each command runs in its own scratch directory which is populated with the
+command's input files before it starts. Requested output files are moved
+back when it completes and the scratch directory is then removed.
+"""
+
+import collections
+import contextlib
+import glob
+import logging
+import os.path
+import shutil
+import tempfile
+import threading
+import time
+
+from openmdao.util.shellproc import ShellProc, DEV_NULL
+from openmdao.util.wrkpool import WorkerPool
+
+try:
+    _CLK_TCK = os.sysconf('SC_CLK_TCK')  # For /proc times.
+except (AttributeError, ValueError):  #pragma no cover
+    _CLK_TCK = 100
+
+
+class RunStats(object):
+    """
+    Resource usage of a single command execution.
+
+    wall_time: float (seconds)
+        Elapsed time from process start to completion.
+
+    cpu_time: float (seconds)
+        User plus system time of the process (and its waited-for children),
+        as last sampled before the process exited.
+        Zero where ``/proc`` isn't available.
+
+    peak_rss: int (KB)
+        Peak resident set size of the process, as last sampled before the
+        process exited. Zero where ``/proc`` isn't available.
+    """
+
+    def __init__(self, wall_time=0., cpu_time=0., peak_rss=0):
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_rss = peak_rss
+
+    def __str__(self):
+        return 'wall %.2f sec, cpu %.2f sec, peak RSS %d KB' \
+               % (self.wall_time, self.cpu_time, self.peak_rss)
+
+
+class DirectoryLock(object):
+    """
+    Serializes threads which depend on the current directory, which is
+    process-wide. For example copies of a model running in threads of one
+    process (:meth:`Component.run` changes directory). The lock is
+    re-entrant. The current directory when first acquired is restored on
+    release, and :meth:`released` lets a thread wait for something
+    that doesn't need the current directory (like a command run in a
+    :class:`ProcessPool`) while other threads proceed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner = None
+        self._count = 0
+        self._orig_dir = None
+
+    def acquire(self):
+        """ Acquire the lock, blocking until available. """
+        me = threading.current_thread()
+        if self._owner is me:
+            self._count += 1
+            return
+        self._lock.acquire()
+        self._owner = me
+        self._count = 1
+        self._orig_dir = os.getcwd()
+
+    def release(self):
+        """ Release the lock, restoring the original current directory
+        if this is the outermost release. """
+        if self._owner is not threading.current_thread():
+            raise RuntimeError('DirectoryLock not held by this thread')
+        self._count -= 1
+        if self._count == 0:
+            orig_dir = self._orig_dir
+            self._owner = None
+            self._orig_dir = None
+            try:
+                os.chdir(orig_dir)
+            finally:
+                self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def held(self):
+        """ Return True if the lock is held by the current thread. """
+        return self._owner is threading.current_thread()
+
+    @contextlib.contextmanager
+    def released(self):
+        """
+        Context manager which temporarily releases the lock if held by the
+        current thread. On return the lock is re-acquired and the thread's
+        current directory is restored.
+        """
+        if not self.held():
+            yield
+            return
+        count = self._count
+        cwd = os.getcwd()
+        orig_dir = self._orig_dir
+        self._count = 1
+        self.release()
+        try:
+            yield
+        finally:
+            self.acquire()
+            self._count = count
+            self._orig_dir = orig_dir
+            os.chdir(cwd)
+
+
+# Held by threads running local copies of a model.
+cwd_lock = DirectoryLock()
+
+
+class SandboxJob(object):
+    """
+    Handle for a command submitted to a :class:`ProcessPool`.
+    Use :meth:`wait` to obtain the result.
+    """
+
+    def __init__(self, args, inputs, outputs, stdin, stdout, stderr,
+                 env, poll_delay, timeout, directory, logger):
+        self.args = args
+        self.inputs = inputs
+        self.outputs = outputs
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.env = env
+        self.poll_delay = poll_delay
+        self.timeout = timeout
+        self.directory = directory
+        self.logger = logger
+
+        self.return_code = None
+        self.error_msg = ''
+        self.stats = None
+        self.sandbox = None
+
+        self._exc = None
+        self._stop = False
+        self._pool = None
+        self._process = None
+        self._done = threading.Event()
+
+    def done(self):
+        """ Return True if the job has completed. """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the job to complete.
+        Returns ``(return_code, error_msg)``. If the job failed with an
+        exception (for instance while populating the scratch directory),
+        then that exception is raised here.
+
+        timeout: float (seconds)
+            Maximum time to wait. None implies an infinite wait.
+
+        If the current thread holds :data:`cwd_lock`, it is released while
+        waiting.
+        """
+        with cwd_lock.released():
+            # Event.wait() with no timeout can't be interrupted on some
+            # platforms.
+            if timeout is None:
+                while not self._done.wait(1):
+                    pass
+            elif not self._done.wait(timeout):
+                raise RuntimeError('Timed out waiting for %s' % (self.args,))
+
+        if self._exc is not None:
+            raise self._exc
+        return (self.return_code, self.error_msg)
+
+    def terminate(self):
+        """ Stop the job, whether it's running or waiting to run. """
+        self._stop = True
+        if self._pool is not None:
+            self._pool._cancel(self)
+        process = self._process
+        if process is not None:
+            try:
+                process.terminate()
+            except OSError:  # Already finished.
+                pass
+
+
+class ProcessPool(object):
+    """
+    Pool of local process 'slots'. At most `max_workers` commands run at once;
+    others are queued until a slot is free. Only running commands occupy a
+    :class:`WorkerPool` thread.
+
+    max_workers: int
+        Maximum number of concurrent processes.
+        If None, the number of CPUs on this host.
+
+    root: string
+        Directory in which scratch directories are created. If None, the
+        submitting directory is used, which keeps the scratch directories on
+        the same filesystem as the input files so they can be hard-linked.
+    """
+
+    _lock = threading.Lock()
+    _pool = None  # Singleton.
+
+    def __init__(self, max_workers=None, root=None):
+        if max_workers is None:
+            try:
+                import multiprocessing
+                max_workers = multiprocessing.cpu_count()
+            except (ImportError, NotImplementedError):  #pragma no cover
+                max_workers = 1
+        if max_workers < 1:
+            raise ValueError('max_workers must be >= 1, got %r' % max_workers)
+        self.max_workers = max_workers
+        self.root = root
+        self._pending = collections.deque()
+        self._stats_lock = threading.Lock()
+        self.completed = 0
+        self.active = 0
+
+    @staticmethod
+    def get_instance():
+        """ Return singleton instance. """
+        with ProcessPool._lock:
+            if ProcessPool._pool is None:
+                ProcessPool._pool = ProcessPool()
+            return ProcessPool._pool
+
+    @staticmethod
+    def configure(max_workers=None, root=None):
+        """
+        Replace the singleton instance with one having the given settings.
+        Jobs already submitted to the previous instance are not affected.
+
+        max_workers: int
+            Maximum number of concurrent processes.
+
+        root: string
+            Directory in which scratch directories are created.
+        """
+        with ProcessPool._lock:
+            ProcessPool._pool = ProcessPool(max_workers, root)
+            return ProcessPool._pool
+
+    def submit(self, args, inputs=None, outputs=None, stdin=None, stdout=None,
+               stderr=None, env=None, poll_delay=0., timeout=0.,
+               directory=None, logger=None):
+        """
+        Queue a command for execution in a scratch directory.
+        Returns a :class:`SandboxJob`.
+
+        args: string or list
+            Command to execute, as for :class:`ShellProc`.
+
+        inputs: list of (pattern, link) tuples
+            Files to place in the scratch directory before the command runs.
+            Patterns are :mod:`glob` patterns relative to `directory`.
+            If `link` is True, a hard link is used where possible,
+            otherwise the file is copied.
+
+        outputs: list of string
+            :mod:`glob` patterns (relative to the scratch directory)
+            of files to move back to `directory` after the command runs.
+
+        stdin, stdout, stderr: string, file, or int
+            As for :class:`ShellProc`. Relative filenames are placed in the
+            scratch directory. Named `stdout` and `stderr` files are moved
+            back with the outputs.
+
+        env: dict
+            Environment variables for the command.
+
+        poll_delay: float (seconds)
+            Time to delay between polling for command completion.
+            A value of zero uses an internal default.
+
+        timeout: float (seconds)
+            Maximum time to wait for command completion.
+            A value of zero implies an infinite maximum wait.
+
+        directory: string
+            Directory the inputs are taken from and the outputs are returned
+            to. If None, the current directory.
+
+        logger: :class:`logging.Logger`
+            Used for progress messages.
+        """
+        job = SandboxJob(args, inputs or [], outputs or [], stdin, stdout,
+                         stderr, env, poll_delay, timeout,
+                         os.path.abspath(directory or os.getcwd()),
+                         logger or logging.getLogger())
+        job._pool = self
+        with self._stats_lock:
+            self._pending.append(job)
+        self._dispatch()
+        return job
+
+    def run(self, *args, **kwargs):
+        """
+        :meth:`submit` a command and wait for it to complete.
+        Returns the completed :class:`SandboxJob`.
+        """
+        job = self.submit(*args, **kwargs)
+        job.wait()
+        return job
+
+    def _dispatch(self):
+        """ Start queued jobs while there are free slots. """
+        with self._stats_lock:
+            jobs = []
+            while self._pending and self.active < self.max_workers:
+                jobs.append(self._pending.popleft())
+                self.active += 1
+        for job in jobs:
+            WorkerPool.submit(self._run, job)
+
+    def _cancel(self, job):
+        """ Remove `job` from the queue if it hasn't started. """
+        with self._stats_lock:
+            try:
+                self._pending.remove(job)
+            except ValueError:  # Already started.
+                return
+        job._done.set()
+
+    def _run(self, job):
+        """ Runs `job` in a slot, then starts the next queued job. """
+        try:
+            if not job._stop:
+                self._execute(job)
+        except Exception as exc:
+            job._exc = exc
+        finally:
+            with self._stats_lock:
+                self.active -= 1
+                self.completed += 1
+            job._done.set()
+            self._dispatch()
+
+    def _execute(self, job):
+        """ Populate scratch directory, run command, and retrieve results. """
+        root = self.root or job.directory
+        job.sandbox = tempfile.mkdtemp(prefix='sandbox_', dir=root)
+        try:
+            for pattern, link in job.inputs:
+                populate(job.directory, job.sandbox, pattern, link)
+
+            if isinstance(job.stdin, basestring) and job.stdin != DEV_NULL:
+                populate(job.directory, job.sandbox, job.stdin, True)
+
+            stdin = _sandbox_path(job.sandbox, job.stdin)
+            stdout = _sandbox_path(job.sandbox, job.stdout)
+            stderr = _sandbox_path(job.sandbox, job.stderr)
+
+            if job._stop:
+                return
+            job.logger.info('executing %s in %s...', job.args, job.sandbox)
+            job.return_code, job.error_msg, job.stats = \
+                _run_process(job, stdin, stdout, stderr)
+            job.logger.info('%s: %s', job.args, job.stats)
+
+            patterns = list(job.outputs)
+            for stream in (job.stdout, job.stderr):
+                if isinstance(stream, basestring) and stream != DEV_NULL \
+                   and not os.path.isabs(stream):
+                    patterns.append(stream)
+            for pattern in patterns:
+                _retrieve(job.sandbox, job.directory, pattern)
+        finally:
+            shutil.rmtree(job.sandbox, ignore_errors=True)
+
+
+def _sandbox_path(sandbox, stream):
+    """ Return `stream` relocated to `sandbox` if it's a relative filename. """
+    if isinstance(stream, basestring) and stream != DEV_NULL \
+       and not os.path.isabs(stream):
+        return os.path.join(sandbox, stream)
+    return stream
+
+
+def populate(src_dir, dst_dir, pattern, link):
+    """
+    Link or copy files matching `pattern` from `src_dir` to `dst_dir`.
+    Absolute patterns are ignored, they don't need relocating.
+
+    src_dir: string
+        Directory to copy from.
+
+    dst_dir: string
+        Directory to copy to.
+
+    pattern: string
+        :mod:`glob` pattern relative to `src_dir`.
+
+    link: bool
+        If True, use a hard link where possible rather than a copy.
+    """
+    if os.path.isabs(pattern):
+        return  # Command will reference it directly.
+    for src_path in glob.glob(os.path.join(src_dir, pattern)):
+        rel_path = os.path.relpath(src_path, src_dir)
+        dst_path = os.path.join(dst_dir, rel_path)
+        dst_parent = os.path.dirname(dst_path)
+        if not os.path.exists(dst_parent):
+            os.makedirs(dst_parent)
+        if os.path.isdir(src_path):
+            shutil.copytree(src_path, dst_path)
+            continue
+        if link and hasattr(os, 'link'):
+            try:
+                os.link(src_path, dst_path)
+                continue
+            except OSError:  # Cross-device or unsupported filesystem.
+                pass
+        shutil.copy2(src_path, dst_path)
+
+
+def _retrieve(src_dir, dst_dir, pattern):
+    """ Move files matching `pattern` from `src_dir` to `dst_dir`. """
+    if os.path.isabs(pattern):
+        return
+    for src_path in glob.glob(os.path.join(src_dir, pattern)):
+        rel_path = os.path.relpath(src_path, src_dir)
+        dst_path = os.path.join(dst_dir, rel_path)
+        dst_parent = os.path.dirname(dst_path)
+        if not os.path.exists(dst_parent):
+            os.makedirs(dst_parent)
+        if os.path.exists(dst_path):
+            if os.path.isdir(dst_path):
+                shutil.rmtree(dst_path)
+            else:
+                os.remove(dst_path)
+        shutil.move(src_path, dst_path)
+
+
+def _run_process(job, stdin, stdout, stderr):
+    """
+    Run `job`'s command in its sandbox and wait for completion.
+    Returns ``(return_code, error_msg, stats)``.
+    """
+    start_time = time.time()
+    process = ShellProc(job.args, stdin, stdout, stderr, job.env,
+                        cwd=job.sandbox)
+    job._process = process
+
+    stats = RunStats()
+    try:
+        return_code = _wait(process, job.poll_delay, job.timeout, stats)
+    finally:
+        process.close_files()
+        job._process = None
+    stats.wall_time = time.time() - start_time
+
+    if return_code is None:
+        error_msg = 'Timed out'
+    else:
+        error_msg = process.error_message(return_code)
+    return (return_code, error_msg, stats)
+
+
+def _wait(process, poll_delay, timeout, stats):
+    """
+    Like :meth:`ShellProc.wait`, but samples the process's resource usage
+    into `stats` while polling. If `timeout` expires the process is
+    terminated (killed if it ignores that) and None is returned.
+    Otherwise the process's return code is returned.
+    """
+    if poll_delay <= 0:
+        poll_delay = max(0.1, timeout/100.)
+        poll_delay = min(10., poll_delay)
+    start = time.time()
+    terminated = None
+    while True:
+        _sample_usage(process.pid, stats)
+        return_code = process.poll()
+        if return_code is not None:
+            break
+        now = time.time()
+        if terminated is None:
+            if timeout > 0 and now-start > timeout:
+                process.terminate()
+                terminated = now
+        elif now-terminated > 10:  # Ignoring SIGTERM.
+            process.kill()
+        time.sleep(poll_delay)
+    return None if terminated else return_code
+
+
+def _sample_usage(pid, stats):
+    """ Update `stats` from ``/proc/<pid>`` if available. """
+    try:
+        with open('/proc/%d/stat' % pid, 'r') as inp:
+            # Fields after the parenthesized command name.
+            fields = inp.read().rsplit(')', 1)[1].split()
+        with open('/proc/%d/status' % pid, 'r') as inp:
+            status = inp.readlines()
+    except (IOError, IndexError):  # Not available, or already exited.
+        return
+    # utime, stime, cutime, cstime.
+    ticks = sum([int(field) for field in fields[11:15]])
+    stats.cpu_time = ticks / float(_CLK_TCK)
+    for line in status:
+        if line.startswith('VmHWM:'):
+            stats.peak_rss = int(line.split()[1])
+            break
@@ -0,0 +1,276 @@
+"""
+A content-addressed, size-bounded on-disk cache of command results.
+
+Entries are keyed by a hash of the command, its environment, and the
+contents of its input files. Each entry holds copies of the output files
+and the command's return code. When the cache exceeds its maximum size the
+least recently used entries are removed.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os.path
+import shutil
+import tempfile
+import threading
+import time
+
+_META = 'meta.json'
+_FILES = 'files'
+_CHUNK = 1 << 20
+
+
+class ResultCache(object):
+    """
+    Content-addressed cache of command results stored in `directory`.
+    Several processes may share a cache directory. Entries are written
+    to a temporary directory and then renamed into place, so readers never
+    see a partial entry.
+
+    directory: string
+        Directory used for storage. Created if necessary.
+
+    max_bytes: int
+        Maximum total size of stored files. Least recently used entries
+        are evicted to stay below this.
+    """
+
+    _lock = threading.Lock()
+    _caches = {}  # Shared instances keyed by directory.
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = os.path.abspath(directory)
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.time_saved = 0.
+
+        self._lock = threading.Lock()
+        self._sizes = {}   # Maps key to stored bytes.
+        self._access = {}  # Maps key to last access time.
+        self._total = 0
+        self._last_access = 0.
+        for key in os.listdir(self.directory):
+            meta_path = os.path.join(self.directory, key, _META)
+            if key.startswith('.') or not os.path.exists(meta_path):
+                continue
+            try:
+                with open(meta_path, 'r') as inp:
+                    meta = json.load(inp)
+            except (IOError, ValueError):
+                continue
+            self._sizes[key] = meta['nbytes']
+            self._access[key] = os.path.getmtime(meta_path)
+            self._total += meta['nbytes']
+
+    @staticmethod
+    def get_instance(directory, max_bytes=1 << 30):
+        """
+        Return the cache for `directory`, creating it if necessary.
+        If the cache already exists, its maximum size is updated.
+
+        directory: string
+            Directory used for storage.
+
+        max_bytes: int
+            Maximum total size of stored files.
+        """
+        directory = os.path.abspath(directory)
+        with ResultCache._lock:
+            cache = ResultCache._caches.get(directory)
+            if cache is None:
+                cache = ResultCache(directory, max_bytes)
+                ResultCache._caches[directory] = cache
+            else:
+                cache.max_bytes = max_bytes
+            return cache
+
+    @staticmethod
+    def compute_key(command, env, inputs, outputs, directory=None):
+        """
+        Return hex digest identifying a command execution.
+
+        command: list or string
+            The command to be executed.
+
+        env: dict
+            Environment variables for the command.
+
+        inputs: list of string
+            :mod:`glob` patterns for input files.
+            Their names and contents are included in the key.
+
+        outputs: list of string
+            Patterns for output files. Only the patterns are included in
+            the key, so an entry always holds the requested outputs.
+
+        directory: string
+            Directory `inputs` are relative to.
+            If None, the current directory.
+        """
+        directory = directory or os.getcwd()
+        sha = hashlib.sha1()
+        sha.update(repr(command))
+        sha.update(repr(sorted((env or {}).items())))
+        sha.update(repr(sorted(outputs)))
+
+        paths = set()
+        for pattern in inputs:
+            paths.update(glob.glob(os.path.join(directory, pattern)))
+        for path in sorted(paths):
+            if os.path.isdir(path):
+                continue
+            sha.update(os.path.relpath(path, directory))
+            with open(path, 'rb') as inp:
+                data = inp.read(_CHUNK)
+                while data:
+                    sha.update(data)
+                    data = inp.read(_CHUNK)
+        return sha.hexdigest()
+
+    def lookup(self, key, directory=None):
+        """
+        If an entry for `key` exists, copy its files to `directory` and
+        return its return code. Otherwise return None.
+
+        key: string
+            Key from :meth:`compute_key`.
+
+        directory: string
+            Destination for the stored files. If None, the current directory.
+        """
+        directory = directory or os.getcwd()
+        entry = os.path.join(self.directory, key)
+        meta_path = os.path.join(entry, _META)
+        try:
+            with open(meta_path, 'r') as inp:
+                meta = json.load(inp)
+            files = os.path.join(entry, _FILES)
+            for rel_path in meta['files']:
+                dst_path = os.path.join(directory, rel_path)
+                dst_parent = os.path.dirname(dst_path)
+                if not os.path.exists(dst_parent):
+                    os.makedirs(dst_parent)
+                shutil.copy2(os.path.join(files, rel_path), dst_path)
+            os.utime(meta_path, None)
+        except (IOError, OSError, ValueError):
+            # Missing, evicted by another process, or corrupt.
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += meta['nbytes']
+            self.time_saved += meta['elapsed']
+            self._access[key] = self._now()
+            if key not in self._sizes:
+                self._sizes[key] = meta['nbytes']
+                self._total += meta['nbytes']
+        return meta['return_code']
+
+    def store(self, key, outputs, return_code, elapsed=0., directory=None):
+        """
+        Save files matching `outputs` and `return_code` under `key`.
+
+        key: string
+            Key from :meth:`compute_key`.
+
+        outputs: list of string
+            :mod:`glob` patterns for output files.
+
+        return_code: int
+            Return code from the command.
+
+        elapsed: float (seconds)
+            Time taken by the command, used to report time saved.
+
+        directory: string
+            Directory `outputs` are relative to.
+            If None, the current directory.
+        """
+        directory = directory or os.getcwd()
+        entry = os.path.join(self.directory, key)
+        if os.path.exists(entry):
+            return
+
+        tmp = tempfile.mkdtemp(prefix='.tmp_', dir=self.directory)
+        try:
+            files = os.path.join(tmp, _FILES)
+            os.mkdir(files)
+            rel_paths = []
+            nbytes = 0
+            for pattern in outputs:
+                for src_path in glob.glob(os.path.join(directory, pattern)):
+                    if os.path.isdir(src_path):
+                        continue
+                    rel_path = os.path.relpath(src_path, directory)
+                    dst_path = os.path.join(files, rel_path)
+                    dst_parent = os.path.dirname(dst_path)
+                    if not os.path.exists(dst_parent):
+                        os.makedirs(dst_parent)
+                    shutil.copy2(src_path, dst_path)
+                    rel_paths.append(rel_path)
+                    nbytes += os.path.getsize(dst_path)
+
+            if nbytes > self.max_bytes:
+                logging.debug('ResultCache: %d byte entry too large', nbytes)
+                return
+
+            meta = dict(files=rel_paths, nbytes=nbytes, elapsed=elapsed,
+                        return_code=return_code)
+            with open(os.path.join(tmp, _META), 'w') as out:
+                json.dump(meta, out)
+            try:
+                os.rename(tmp, entry)
+            except OSError:  # Another process stored it first.
+                return
+            tmp = None
+        finally:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        with self._lock:
+            self._sizes[key] = nbytes
+            self._access[key] = self._now()
+            self._total += nbytes
+            self._evict()
+
+    def _now(self):
+        """ Return access time, strictly increasing within this instance. """
+        now = max(time.time(), self._last_access + 1e-6)
+        self._last_access = now
+        return now
+
+    def _evict(self):
+        """ Remove least recently used entries until within `max_bytes`. """
+        while self._total > self.max_bytes and self._sizes:
+            key = min(self._access, key=self._access.get)
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            self._total -= self._sizes.pop(key)
+            del self._access[key]
+
+    @property
+    def nbytes(self):
+        """ Total size of entries known to this instance. """
+        return self._total
+
+    def clear(self):
+        """ Remove all entries and reset statistics. """
+        with self._lock:
+            for key in self._sizes.keys():
+                shutil.rmtree(os.path.join(self.directory, key),
+                              ignore_errors=True)
+            self._sizes = {}
+            self._access = {}
+            self._total = 0
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+            self.time_saved = 0.
+
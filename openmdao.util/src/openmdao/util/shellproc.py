@@ -41,10 +41,15 @@ class ShellProc(subprocess.Popen):
 
     env: dict
         Environment variables for the command.
+
+    cwd: string
+        Directory to run the command in. If None, the current directory.
+        Relative `stdin`, `stdout`, and `stderr` filenames are *not*
+        relative to this directory.
     """
 
     def __init__(self, args, stdin=None, stdout=None, stderr=None, env=None,
-                 universal_newlines=False):
+                 universal_newlines=False, cwd=None):
         environ = os.environ.copy()
         if env:
             environ.update(env)
@@ -74,7 +79,8 @@ class ShellProc(subprocess.Popen):
             subprocess.Popen.__init__(self, args, stdin=self._inp,
                                       stdout=self._out, stderr=self._err,
                                       shell=shell, env=environ,
-                                      universal_newlines=universal_newlines)
+                                      universal_newlines=universal_newlines,
+                                      cwd=cwd)
         except Exception:
             self.close_files()
             raise
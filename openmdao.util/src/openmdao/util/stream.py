@@ -64,6 +64,7 @@ class Stream(object):
             else:
                 if sys.byteorder == 'big':
                     self.need_byteswap = True
+            byteorder = '>' if self.big_endian else '<'
         else:
             # Ensure sanity.
             self.big_endian = False
@@ -72,6 +73,13 @@ class Stream(object):
             self.unformatted = False
             self.recordmark_8 = False
             self.need_byteswap = False
+            byteorder = '='
+
+        # Data types as stored in the file.
+        dtype = numpy.int64 if self.integer_8 else numpy.int32
+        self.int_dtype = numpy.dtype(dtype).newbyteorder(byteorder)
+        dtype = numpy.float32 if self.single_precision else numpy.float64
+        self.float_dtype = numpy.dtype(dtype).newbyteorder(byteorder)
 
     def close(self):
         """ Close underlying file. """
@@ -127,7 +135,7 @@ class Stream(object):
                                    % (reclen2, reclen))
         return int(data)
 
-    def read_ints(self, shape, order='C', full_record=False):
+    def read_ints(self, shape, order='C', full_record=False, out=None):
         """
         Returns integers as a :mod:`numpy` array of `shape`.
 
@@ -141,34 +149,15 @@ class Stream(object):
         full_record: bool
             If True, then read surrounding recordmarks.
             Only meaningful if `unformatted`.
-        """
-        reshape = False
-        count = 1
-        try:
-            for size in shape:
-                count *= size
-            reshape = True
-        except TypeError:
-            count = shape
-
-        if full_record and self.unformatted:
-            reclen = self.read_recordmark()
-            if reclen != self.reclen_ints(count):
-                raise RuntimeError('unexpected recordlength %d' % reclen)
-
-        sep = '' if self.binary else ' '
-        dtype = numpy.int64 if self.integer_8 else numpy.int32
-        data = numpy.fromfile(self.file, dtype=dtype, count=count, sep=sep)
-        if self.need_byteswap:
-            data.byteswap(True)
-
-        if full_record and self.unformatted:
-            reclen2 = self.read_recordmark()
-            if reclen2 != reclen:
-                raise RuntimeError('mismatched recordlength %d vs. %d'
-                                   % (reclen2, reclen))
 
-        return data.reshape(shape, order=order) if reshape else data
+        out: :class:`numpy.ndarray`
+            If specified, data is read into this array (which may be a
+            :class:`numpy.memmap`) and it is returned. `shape` is ignored.
+            When the array's dtype and memory layout match the file, binary
+            data is read directly into its buffer.
+        """
+        return self._read_array(shape, order, full_record, out,
+                                self.int_dtype, self.reclen_ints)
 
     def read_float(self, full_record=False):
         """
@@ -192,7 +181,7 @@ class Stream(object):
                                    %  (reclen2, reclen))
         return float(data)
 
-    def read_floats(self, shape, order='C', full_record=False):
+    def read_floats(self, shape, order='C', full_record=False, out=None):
         """
         Returns floats as a :mod:`numpy` array of `shape`.
 
@@ -206,7 +195,20 @@ class Stream(object):
         full_record: bool
             If True, then read surrounding recordmarks.
             Only meaningful if `unformatted`.
+
+        out: :class:`numpy.ndarray`
+            If specified, data is read into this array (which may be a
+            :class:`numpy.memmap`) and it is returned. `shape` is ignored.
+            When the array's dtype and memory layout match the file, binary
+            data is read directly into its buffer.
         """
+        return self._read_array(shape, order, full_record, out,
+                                self.float_dtype, self.reclen_floats)
+
+    def _read_array(self, shape, order, full_record, out, dtype, reclen_func):
+        """ Common code for :meth:`read_ints` and :meth:`read_floats`. """
+        if out is not None:
+            shape = out.shape
         reshape = False
         count = 1
         try:
@@ -218,22 +220,85 @@ class Stream(object):
 
         if full_record and self.unformatted:
             reclen = self.read_recordmark()
-            if reclen != self.reclen_floats(count):
+            if reclen != reclen_func(count):
                 raise RuntimeError('unexpected recordlength %d' % reclen)
 
-        sep = '' if self.binary else ' '
-        dtype = numpy.float32 if self.single_precision else numpy.float64
-        data = numpy.fromfile(self.file, dtype=dtype, count=count, sep=sep)
-        if self.need_byteswap:
-            data.byteswap(True)
+        if out is not None:
+            self._read_into(out, order, dtype)
+            data = out
+        elif self.binary:
+            data = numpy.fromfile(self.file, dtype=dtype.newbyteorder('='),
+                                  count=count)
+            if self.need_byteswap:
+                data.byteswap(True)
+        else:
+            data = numpy.fromfile(self.file, dtype=dtype, count=count, sep=' ')
 
         if full_record and self.unformatted:
             reclen2 = self.read_recordmark()
             if reclen2 != reclen:
                 raise RuntimeError('mismatched recordlength %d vs. %d'
-                                   %  (reclen2, reclen))
+                                   % (reclen2, reclen))
 
-        return data.reshape(shape, order=order) if reshape else data
+        if out is not None or not reshape:
+            return data
+        return data.reshape(shape, order=order)
+
+    def read_record(self, arrays, order='C'):
+        """
+        Reads one unformatted record containing `arrays`, in sequence.
+        Each array is filled in place (see the `out` argument of
+        :meth:`read_floats`). Integer arrays are read as ints, all others
+        as floats. The record length is checked against the total size of
+        `arrays`.
+
+        arrays: list(:class:`numpy.ndarray`)
+            Arrays to be filled.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+        """
+        dtypes = [self._file_dtype(arr) for arr in arrays]
+        expected = sum([arr.size * dtype.itemsize
+                        for arr, dtype in zip(arrays, dtypes)])
+        if self.unformatted:
+            reclen = self.read_recordmark()
+            if reclen != expected:
+                raise RuntimeError('unexpected recordlength %d' % reclen)
+
+        for arr, dtype in zip(arrays, dtypes):
+            self._read_into(arr, order, dtype)
+
+        if self.unformatted:
+            reclen2 = self.read_recordmark()
+            if reclen2 != reclen:
+                raise RuntimeError('mismatched recordlength %d vs. %d'
+                                   % (reclen2, reclen))
+
+    def _read_into(self, out, order, dtype):
+        """ Fill `out` from file data of `dtype` in `order`. """
+        view = self._ordered_view(out, order)
+        if not self.binary:
+            data = numpy.fromfile(self.file, dtype=dtype, count=out.size,
+                                  sep=' ')
+            view[...] = data.reshape(view.shape)
+        elif view.flags.c_contiguous and view.dtype.isnative and \
+             view.dtype == dtype.newbyteorder('='):
+            # Read directly into the caller's buffer.
+            nbytes = self.file.readinto(view)
+            if nbytes != view.nbytes:
+                raise RuntimeError('short read, %d vs. %d bytes'
+                                   % (nbytes, view.nbytes))
+            if self.need_byteswap:
+                view.byteswap(True)
+        else:
+            # Conversion (byteswap, cast, reorder) in a single copy.
+            data = numpy.fromfile(self.file, dtype=dtype, count=out.size)
+            if data.size != out.size:
+                raise RuntimeError('short read, %d vs. %d items'
+                                   % (data.size, out.size))
+            view[...] = data.reshape(view.shape)
 
     def read_recordmark(self):
         """ Returns value of next recordmark. """
@@ -312,20 +377,7 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
 
-            arr = data
-            if self.integer_8:
-                if data.itemsize != _SZ_LONG:
-                    arr = numpy.array(data, dtype=numpy.int64)
-            elif data.itemsize != _SZ_INT:
-                arr = numpy.array(data, dtype=numpy.int32)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            self._write_binary(data, order, self.int_dtype)
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
@@ -398,20 +450,7 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
 
-            arr = data
-            if self.single_precision:
-                if data.itemsize != _SZ_FLOAT:
-                    arr = numpy.array(data, dtype=numpy.float32)
-            elif data.itemsize != _SZ_DOUBLE:
-                arr = numpy.array(data, dtype=numpy.float64)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            self._write_binary(data, order, self.float_dtype)
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
@@ -438,44 +477,90 @@ class Stream(object):
         linecount: int
             If > zero, then at most `linecount` values are written per line.
         """
-        shape = data.shape
-        indices = [0 for i in shape]
-        _item = data.item
+        if data.size == 0:
+            return
+
+        flat = self._ordered_view(data, order).ravel()
         _write = self.file.write
+        item_sep = sep.replace('%', '%%')
+
+        if linecount <= 0:
+            _write(item_sep.join([fmt] * flat.size) % tuple(flat.tolist()))
+            _write(sep)
+            _write('\n')
+            return
+
+        # Full lines have no trailing separator.
+        line_fmt = item_sep.join([fmt] * linecount) + '\n'
+        for start in range(0, flat.size, linecount):
+            values = flat[start:start+linecount].tolist()
+            if len(values) == linecount:
+                _write(line_fmt % tuple(values))
+            else:
+                _write(item_sep.join([fmt] * len(values)) % tuple(values))
+                _write(sep)
+                _write('\n')
+
+    def write_record(self, arrays, order='C'):
+        """
+        Writes `arrays` as one record, with a single pair of surrounding
+        recordmarks if `unformatted`. Integer arrays are written as ints,
+        all others as floats. Only meaningful if `binary`.
+
+        arrays: list(:class:`numpy.ndarray`)
+            Data arrays.
 
+        order: string
+            If 'C', the data is written in row-major order.
+            If 'Fortran', the data is written in column-major order.
+        """
+        arrays = [arr if isinstance(arr, numpy.ndarray) else numpy.array(arr)
+                  for arr in arrays]
+        dtypes = [self._file_dtype(arr) for arr in arrays]
+        if self.unformatted:
+            reclen = sum([arr.size * dtype.itemsize
+                          for arr, dtype in zip(arrays, dtypes)])
+            self.write_recordmark(reclen)
+
+        for arr, dtype in zip(arrays, dtypes):
+            self._write_binary(arr, order, dtype)
+
+        if self.unformatted:
+            self.write_recordmark(reclen)
+
+    def _write_binary(self, data, order, dtype):
+        """
+        Write `data` as `dtype` in `order`. If `data` already has the
+        required type and layout then it is written directly from its buffer,
+        otherwise a single converted copy is made.
+        """
+        arr = self._ordered_view(data, order)
+        if arr.dtype != dtype or not arr.flags.c_contiguous:
+            arr = numpy.ascontiguousarray(arr, dtype=dtype)
+        if isinstance(self.file, file):
+            arr.tofile(self.file)
+        else:
+            self.file.write(arr.data)
+
+    def _file_dtype(self, arr):
+        """ Returns file data type for `arr`. """
+        if arr.dtype.kind in 'iub':
+            return self.int_dtype
+        return self.float_dtype
+
+    @staticmethod
+    def _ordered_view(data, order):
+        """
+        Returns view of `data` whose row-major order is `order` order of
+        `data`.
+        """
         if order == 'C':
-            # Row-major order.
-            sequence = range(len(shape))
-            sequence.reverse()
+            return data
         elif order == 'Fortran':
-            # Column-major order.
-            sequence = range(len(shape))
+            return data.T
         else:
             raise ValueError("order must be 'C' or 'Fortran'")
 
-        count = 0
-        while True:
-            _write(fmt % _item(*indices))
-            count += 1
-            if linecount > 0:
-                if count >= linecount:
-                    _write('\n')
-                    count = 0
-            if count:
-                _write(sep)
-
-            for i in sequence:
-                indices[i] += 1
-                if indices[i] >= shape[i]:
-                    indices[i] = 0
-                else:
-                    break
-            else:
-                break
-
-        if count:
-            _write('\n')
-
     def write_recordmark(self, length):
         """
         Writes recordmark.
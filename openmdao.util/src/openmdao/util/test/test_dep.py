@@ -37,6 +37,10 @@ class DepTestCase(unittest.TestCase):
         self.assertTrue('openmdao.main.assembly.Assembly' in 
                         psta.graph['openmdao.main.component.Component'])
         
+        # Base classes imported from a lazy api module are resolved.
+        self.assertTrue('openmdao.lib.components.mux.Mux' in
+                        psta.graph['openmdao.main.component.Component'])
+
         self.assertTrue('openmdao.main.datatypes.float.Float' in
                         psta.graph['openmdao.main.variable.Variable'])
         
@@ -54,6 +58,7 @@ class DepTestCase(unittest.TestCase):
             'DriverUsesDerivatives',
             'DistributionCaseDriver',
             'CaseIterDriverBase',
+            '_PopulationRunner', # helper for Genetic
             'PassthroughTrait',
             'PassthroughProperty',
             'OptProblem',
@@ -0,0 +1,189 @@
+"""
+Test filexfer functions.
+"""
+
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import nose
+
+from openmdao.util import filexfer
+from openmdao.util.filexfer import filexfer as xfer, CHUNK_SIZE
+
+
+class _Server(object):
+    """ Emulates a server supporting chunked transfers. """
+
+    def __init__(self):
+        self.writes = 0
+        self.credentials = set()
+
+    def open(self, path, mode='r'):
+        return open(path, mode)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def chmod(self, path, mode):
+        return os.chmod(path, mode)
+
+    def file_hashes(self, path, chunk_size):
+        return filexfer.file_hashes(path, chunk_size)
+
+    def read_chunk(self, path, offset, size, compress=False):
+        return filexfer.read_chunk(path, offset, size, compress)
+
+    def write_chunk(self, path, offset, data, compress=False, digest=None):
+        self.writes += 1
+        self.credentials.add(getattr(threading.current_thread(),
+                                     'credentials', None))
+        return filexfer.write_chunk(path, offset, data, compress, digest)
+
+    def truncate(self, path, size):
+        return filexfer.truncate(path, size)
+
+    def rename(self, src_path, dst_path):
+        return filexfer.rename(src_path, dst_path)
+
+
+class TestCase(unittest.TestCase):
+    """ Test filexfer functions. """
+
+    def setUp(self):
+        """ Invoked before each test. """
+        self.directory = tempfile.mkdtemp(prefix='test_filexfer_')
+        self.src = os.path.join(self.directory, 'src.dat')
+        self.dst = os.path.join(self.directory, 'dst.dat')
+        self.data = ''.join([chr(i % 251) for i in range(CHUNK_SIZE)]) * 3 \
+                    + 'tail'
+        with open(self.src, 'wb') as out:
+            out.write(self.data)
+
+    def tearDown(self):
+        """ Invoked after each test. """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_dst(self):
+        with open(self.dst, 'rb') as inp:
+            return inp.read()
+
+    def test_chunked(self):
+        logging.debug('')
+        logging.debug('test_chunked')
+
+        server = _Server()
+        for compress in (False, True):
+            if os.path.exists(self.dst):
+                os.remove(self.dst)
+            server.writes = 0
+            xfer(None, self.src, server, self.dst, 'b', compress=compress)
+            self.assertEqual(self.read_dst(), self.data)
+            self.assertEqual(server.writes, 4)
+            self.assertFalse(os.path.exists(self.dst+'.part'))
+
+        # Identical content isn't transferred.
+        server.writes = 0
+        xfer(None, self.src, server, self.dst, 'b')
+        self.assertEqual(server.writes, 0)
+
+        # Other direction.
+        os.remove(self.src)
+        xfer(server, self.dst, None, self.src, 'b')
+        with open(self.src, 'rb') as inp:
+            self.assertEqual(inp.read(), self.data)
+
+    def test_resume(self):
+        logging.debug('')
+        logging.debug('test_resume')
+
+        # Interrupted transfer: two good chunks and part of a bad one.
+        with open(self.dst+'.part', 'wb') as out:
+            out.write(self.data[:2*CHUNK_SIZE])
+            out.write('x' * 10)
+
+        server = _Server()
+        xfer(None, self.src, server, self.dst, 'b')
+        self.assertEqual(self.read_dst(), self.data)
+        self.assertEqual(server.writes, 2)
+
+    def test_credentials(self):
+        logging.debug('')
+        logging.debug('test_credentials')
+
+        # Chunks are written with the caller's credentials, which are not
+        # left behind on the pool threads.
+        marker = object()
+        main = threading.current_thread()
+        main.credentials = marker
+        try:
+            server = _Server()
+            xfer(None, self.src, server, self.dst, 'b')
+        finally:
+            del main.credentials
+        self.assertEqual(self.read_dst(), self.data)
+        self.assertEqual(server.credentials, set([marker]))
+        for thread in threading.enumerate():
+            self.assertFalse(getattr(thread, 'credentials', None) is marker)
+
+    def test_bad_chunk(self):
+        logging.debug('')
+        logging.debug('test_bad_chunk')
+
+        filexfer.truncate(self.dst, 0)
+        try:
+            filexfer.write_chunk(self.dst, 0, 'froboz', digest='bad')
+        except RuntimeError as exc:
+            self.assertEqual(str(exc), "chunk at 0 of %r failed hash check"
+                                       % self.dst)
+        else:
+            self.fail('Expected RuntimeError')
+
+    def test_stream(self):
+        logging.debug('')
+        logging.debug('test_stream')
+
+        # Text mode uses sequential transfer.
+        server = _Server()
+        xfer(None, self.src, server, self.dst)
+        self.assertEqual(server.writes, 0)
+        self.assertEqual(os.path.getsize(self.dst), len(self.data))
+
+    def test_hash_cache(self):
+        logging.debug('')
+        logging.debug('test_hash_cache')
+
+        saved = filexfer._HASH_CACHE_SIZE
+        filexfer._HASH_CACHE_SIZE = 2
+        filexfer._HASH_CACHE.clear()
+        try:
+            paths = []
+            for i in range(3):
+                path = os.path.join(self.directory, 'hash%d' % i)
+                with open(path, 'wb') as out:
+                    out.write('data %d' % i)
+                paths.append(path)
+
+            filexfer.file_hashes(paths[0], 4)
+            filexfer.file_hashes(paths[1], 4)
+            filexfer.file_hashes(paths[0], 4)  # Now most recently used.
+            filexfer.file_hashes(paths[2], 4)
+            self.assertEqual(sorted(filexfer._HASH_CACHE.keys()),
+                             [(paths[0], 4), (paths[2], 4)])
+
+            # Removed files are dropped.
+            os.remove(paths[0])
+            self.assertEqual(filexfer.file_hashes(paths[0], 4), None)
+            self.assertEqual(filexfer._HASH_CACHE.keys(), [(paths[2], 4)])
+        finally:
+            filexfer._HASH_CACHE_SIZE = saved
+            filexfer._HASH_CACHE.clear()
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.util.filexfer')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -0,0 +1,80 @@
+"""
+Test lazy api modules.
+"""
+
+import logging
+import subprocess
+import sys
+import unittest
+
+from openmdao.util.lazyimport import LazyModule
+
+
+class TestCase(unittest.TestCase):
+    """ Test lazy api modules. """
+
+    def test_api(self):
+        logging.debug('')
+        logging.debug('test_api')
+
+        # Run in a new interpreter so nothing has been imported yet.
+        code = """
+import sys
+import openmdao.main.api as api
+import openmdao.lib.drivers.api as drivers
+assert 'openmdao.main.component' not in sys.modules
+assert 'openmdao.lib.drivers.conmindriver' not in sys.modules
+assert 'Component' in dir(api) and 'Component' in api.__all__
+assert 'lazy_import' not in api.__all__
+
+from openmdao.main.api import Component, Assembly, set_as_top
+assert Component.__module__ == 'openmdao.main.component'
+assert 'Component' in api.__dict__
+assert 'openmdao.main.assembly' in sys.modules
+assert 'sympy' not in sys.modules
+
+from openmdao.main.sym import SymGrad
+assert SymGrad('x**2', ['x']) == ['2.0*x']
+assert 'sympy' in sys.modules
+
+try:
+    from openmdao.main.api import NoSuchThing
+except ImportError:
+    pass
+else:
+    raise AssertionError('Expected ImportError')
+"""
+        proc = subprocess.Popen([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        output = proc.communicate()[0]
+        self.assertEqual(proc.returncode, 0, output)
+
+    def test_module(self):
+        logging.debug('')
+        logging.debug('test_module')
+
+        module = type(sys)('fake_api')
+        module.x = 1
+        lazy = LazyModule(module, {'OrderedDict': 'collections',
+                                   'join': 'os.path'})
+        self.assertEqual(lazy.x, 1)
+        self.assertEqual(lazy.__all__, ['OrderedDict', 'join'])
+        self.assertFalse('join' in lazy.__dict__)
+        import os.path
+        self.assertTrue(lazy.join is os.path.join)
+        self.assertTrue('join' in lazy.__dict__)
+        try:
+            lazy.split
+        except AttributeError as exc:
+            self.assertEqual(str(exc),
+                             "'module' object has no attribute 'split'")
+        else:
+            self.fail('Expected AttributeError')
+
+
+if __name__ == '__main__':
+    import nose
+    sys.argv.append('--cover-package=openmdao.util')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -316,6 +316,40 @@ class TestCase(unittest.TestCase):
         self.assertEqual(my_comp.boolvar, True)
         self.assertEqual(my_comp.arrayvar[0], 3.5)
         
+    def test_read_common_cards(self):
+        # Cards handled without the full grammar
+
+        namelist1 = "Testing\n" + \
+                    "&OPTION\n" + \
+                    "  intvar = +12,\n" + \
+                    "  expvar1 = 3e5\n" + \
+                    "  expvar2 = 1.25d-3\n" + \
+                    "  textvar = \"Other\"\n" + \
+                    "  boolvar = .T.\n" + \
+                    "  arrayvar = 1.5, -2, 3.25D1,\n" + \
+                    "             4, 5\n" + \
+                    "  singleint = 7, 8, 9 /\n"
+
+        outfile = open(self.filename, 'w')
+        outfile.write(namelist1)
+        outfile.close()
+
+        my_comp = VarComponent()
+        sb = Namelist(my_comp)
+        sb.set_filename(self.filename)
+
+        sb.parse_file()
+
+        sb.load_model()
+
+        self.assertEqual(my_comp.intvar, 12)
+        self.assertEqual(my_comp.expvar1, 3e5)
+        self.assertEqual(my_comp.expvar2, 1.25e-3)
+        self.assertEqual(my_comp.textvar, 'Other')
+        self.assertEqual(my_comp.boolvar, True)
+        self.assertEqual(list(my_comp.arrayvar), [1.5, -2.0, 32.5, 4.0, 5.0])
+        self.assertEqual(list(my_comp.singleint), [7, 8, 9])
+
     def test_2Darray_read(self):
         
         namelist1 = "Testing\n" + \
@@ -0,0 +1,172 @@
+"""
+Test ProcessPool functions.
+"""
+
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import nose
+
+from openmdao.util.procpool import DirectoryLock, ProcessPool
+
+
+class TestCase(unittest.TestCase):
+    """ Test ProcessPool functions. """
+
+    def setUp(self):
+        """ Invoked before each test. """
+        self.directory = tempfile.mkdtemp(prefix='test_procpool_')
+        with open(os.path.join(self.directory, 'in.dat'), 'w') as out:
+            out.write('Froboz rulz!\n')
+
+    def tearDown(self):
+        """ Invoked after each test. """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_basic(self):
+        logging.debug('')
+        logging.debug('test_basic')
+
+        pool = ProcessPool(max_workers=2)
+        script = 'import shutil; shutil.copy("in.dat", "out.dat")'
+        job = pool.submit([sys.executable, '-c', script],
+                          inputs=[('in.dat', True)], outputs=['out.dat'],
+                          directory=self.directory)
+        return_code, error_msg = job.wait()
+
+        self.assertEqual(return_code, 0)
+        self.assertEqual(error_msg, '')
+        self.assertFalse(os.path.exists(job.sandbox))
+        with open(os.path.join(self.directory, 'out.dat'), 'r') as inp:
+            self.assertEqual(inp.read(), 'Froboz rulz!\n')
+        self.assertTrue(job.stats.wall_time > 0)
+        if os.path.exists('/proc/self/status'):
+            self.assertTrue(job.stats.peak_rss > 0)
+        self.assertEqual(pool.completed, 1)
+        self.assertEqual(pool.active, 0)
+
+    def test_concurrent(self):
+        logging.debug('')
+        logging.debug('test_concurrent')
+
+        pool = ProcessPool(max_workers=3)
+        args = [sys.executable, '-c', 'import time; time.sleep(1)']
+        start = time.time()
+        jobs = [pool.submit(args, directory=self.directory) for i in range(6)]
+        for job in jobs:
+            self.assertEqual(job.wait(), (0, ''))
+        et = time.time() - start
+        self.assertTrue(et >= 2, et)  # Limited to 3 at a time.
+        self.assertTrue(et < 6, et)
+        self.assertEqual(len(set([job.sandbox for job in jobs])), 6)
+
+    def test_queued(self):
+        logging.debug('')
+        logging.debug('test_queued')
+
+        pool = ProcessPool(max_workers=1)
+        args = [sys.executable, '-c', 'import time; time.sleep(1)']
+        jobs = [pool.submit(args, directory=self.directory) for i in range(3)]
+        exit_job = pool.submit([sys.executable, '-c', 'import sys; sys.exit(3)'],
+                               directory=self.directory)
+
+        # Only the running job occupies a slot, the rest are queued.
+        self.assertEqual(pool.active, 1)
+        self.assertEqual(len(pool._pending), 3)
+
+        # Terminating a queued job completes it without running it.
+        jobs[1].terminate()
+        self.assertTrue(jobs[1].done())
+        self.assertEqual(jobs[1].wait(), (None, ''))
+        self.assertEqual(jobs[1].sandbox, None)
+
+        self.assertEqual(jobs[0].wait(), (0, ''))
+        self.assertEqual(jobs[2].wait(), (0, ''))
+        return_code, error_msg = exit_job.wait()
+        self.assertEqual(return_code, 3)
+        self.assertEqual(pool.active, 0)
+        self.assertEqual(pool.completed, 3)
+
+    def test_timeout(self):
+        logging.debug('')
+        logging.debug('test_timeout')
+
+        pool = ProcessPool(max_workers=1)
+        args = [sys.executable, '-c', 'import time; time.sleep(10)']
+        job = pool.submit(args, timeout=1, directory=self.directory)
+        return_code, error_msg = job.wait()
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+
+    def test_directory_lock(self):
+        logging.debug('')
+        logging.debug('test_directory_lock')
+
+        lock = DirectoryLock()
+        orig_dir = os.getcwd()
+        other_dir = os.path.join(self.directory, 'other')
+        os.mkdir(other_dir)
+        events = []
+        released = threading.Event()
+        done = threading.Event()
+
+        def other():
+            released.wait(10)
+            with lock:
+                events.append(('other', os.getcwd()))
+                os.chdir(other_dir)
+            done.set()
+
+        thread = threading.Thread(target=other)
+        thread.daemon = True
+        thread.start()
+        try:
+            with lock:
+                with lock:  # Re-entrant.
+                    os.chdir(self.directory)
+                    with lock.released():
+                        self.assertFalse(lock.held())
+                        released.set()
+                        done.wait(10)
+                    # Re-acquired with our directory restored.
+                    self.assertTrue(lock.held())
+                    events.append(('main', os.getcwd()))
+            self.assertFalse(lock.held())
+            self.assertEqual(os.getcwd(), orig_dir)
+        finally:
+            os.chdir(orig_dir)
+        thread.join(10)
+
+        # Other thread saw the original directory, not ours.
+        self.assertEqual(events, [('other', orig_dir),
+                                  ('main', self.directory)])
+
+        try:
+            lock.release()
+        except RuntimeError as exc:
+            self.assertEqual(str(exc), 'DirectoryLock not held by this thread')
+        else:
+            self.fail('Expected RuntimeError')
+
+    def test_bad_max(self):
+        logging.debug('')
+        logging.debug('test_bad_max')
+
+        try:
+            ProcessPool(max_workers=0)
+        except ValueError as exc:
+            self.assertEqual(str(exc), 'max_workers must be >= 1, got 0')
+        else:
+            self.fail('Expected ValueError')
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.util.procpool')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
+
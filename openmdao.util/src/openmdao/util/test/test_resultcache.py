@@ -0,0 +1,110 @@
+"""
+Test ResultCache functions.
+"""
+
+import logging
+import os.path
+import shutil
+import sys
+import tempfile
+import unittest
+import nose
+
+from openmdao.util.resultcache import ResultCache
+
+
+class TestCase(unittest.TestCase):
+    """ Test ResultCache functions. """
+
+    def setUp(self):
+        """ Invoked before each test. """
+        self.work = tempfile.mkdtemp(prefix='test_resultcache_')
+        self.store = os.path.join(self.work, 'cache')
+        self.write('in.dat', 'x = 1\n')
+
+    def tearDown(self):
+        """ Invoked after each test. """
+        shutil.rmtree(self.work, ignore_errors=True)
+
+    def write(self, name, data):
+        """ Write `data` to `name` in the work directory. """
+        with open(os.path.join(self.work, name), 'w') as out:
+            out.write(data)
+
+    def read(self, name):
+        """ Return contents of `name` in the work directory. """
+        with open(os.path.join(self.work, name), 'r') as inp:
+            return inp.read()
+
+    def key(self, command=('prog',)):
+        return ResultCache.compute_key(list(command), {'A': '1'},
+                                       ['*.dat'], ['out.txt'], self.work)
+
+    def test_hit_miss(self):
+        logging.debug('')
+        logging.debug('test_hit_miss')
+
+        cache = ResultCache(self.store)
+        key = self.key()
+        self.assertEqual(cache.lookup(key, self.work), None)
+        self.assertEqual(cache.misses, 1)
+
+        self.write('out.txt', 'result\n')
+        cache.store(key, ['out.txt'], 0, 2.5, self.work)
+        os.remove(os.path.join(self.work, 'out.txt'))
+
+        self.assertEqual(cache.lookup(key, self.work), 0)
+        self.assertEqual(self.read('out.txt'), 'result\n')
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.bytes_saved, len('result\n'))
+        self.assertEqual(cache.time_saved, 2.5)
+
+        # Changed input contents or command give a different key.
+        self.write('in.dat', 'x = 2\n')
+        self.assertNotEqual(self.key(), key)
+        self.write('in.dat', 'x = 1\n')
+        self.assertEqual(self.key(), key)
+        self.assertNotEqual(self.key(('prog', '-v')), key)
+
+        # Entries are visible to a new instance.
+        cache2 = ResultCache(self.store)
+        self.assertEqual(cache2.nbytes, len('result\n'))
+        self.assertEqual(cache2.lookup(key, self.work), 0)
+
+        cache.clear()
+        self.assertEqual(cache.lookup(key, self.work), None)
+
+    def test_eviction(self):
+        logging.debug('')
+        logging.debug('test_eviction')
+
+        cache = ResultCache(self.store, max_bytes=25)
+        keys = []
+        for i in range(3):
+            self.write('in.dat', str(i))
+            self.write('out.txt', '%10d' % i)
+            keys.append(self.key())
+            cache.store(keys[-1], ['out.txt'], 0, directory=self.work)
+            if i == 1:
+                # Make the first entry most recently used.
+                self.assertEqual(cache.lookup(keys[0], self.work), 0)
+
+        self.assertEqual(cache.nbytes, 20)
+        self.assertEqual(cache.lookup(keys[1], self.work), None)
+        self.assertEqual(cache.lookup(keys[0], self.work), 0)
+        self.assertEqual(cache.lookup(keys[2], self.work), 0)
+
+    def test_shared(self):
+        logging.debug('')
+        logging.debug('test_shared')
+
+        cache = ResultCache.get_instance(self.store, 100)
+        self.assertTrue(ResultCache.get_instance(self.store, 200) is cache)
+        self.assertEqual(cache.max_bytes, 200)
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.util.resultcache')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
+
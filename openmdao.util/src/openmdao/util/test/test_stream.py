@@ -560,6 +560,99 @@ class TestCase(unittest.TestCase):
             new_data = stream.read_floats((5, 2), order='Fortran')
         numpy.testing.assert_array_equal(new_data, arr2d)
 
+    def test_read_into(self):
+        logging.debug('')
+        logging.debug('test_read_into')
+
+        arr2d = numpy.arange(10, dtype=numpy.float64).reshape((5, 2))
+
+        # Direct read into Fortran-ordered buffer.
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, unformatted=True)
+            stream.write_floats(arr2d, order='Fortran', full_record=True)
+        buf = numpy.zeros((5, 2), order='F')
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, unformatted=True)
+            new_data = stream.read_floats(None, order='Fortran',
+                                          full_record=True, out=buf)
+        self.assertTrue(new_data is buf)
+        numpy.testing.assert_array_equal(buf, arr2d)
+
+        # Read into C-ordered, single-precision buffer (converted copy).
+        buf = numpy.zeros((5, 2), dtype=numpy.float32)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, unformatted=True)
+            stream.read_floats(None, order='Fortran', full_record=True,
+                               out=buf)
+        numpy.testing.assert_array_equal(buf, arr2d)
+
+        # Byteswapped read into memmap.
+        swap_endian = sys.byteorder == 'little'
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=swap_endian)
+            stream.write_floats(arr2d)
+        mapname = self.filename+'.map'
+        try:
+            mapped = numpy.memmap(mapname, dtype=numpy.float64, mode='w+',
+                                  shape=(5, 2))
+            with open(self.filename, 'rb') as inp:
+                stream = Stream(inp, binary=True, big_endian=swap_endian)
+                stream.read_floats(None, out=mapped)
+            numpy.testing.assert_array_equal(mapped, arr2d)
+            del mapped
+        finally:
+            os.remove(mapname)
+
+        # Short read.
+        buf = numpy.zeros((6, 2))
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=swap_endian)
+            assert_raises(self, 'stream.read_floats(None, out=buf)',
+                          globals(), locals(), RuntimeError,
+                          'short read, 80 vs. 96 bytes')
+
+        # Text.
+        with open(self.filename, 'w') as out:
+            stream = Stream(out)
+            stream.write_floats(arr2d, order='Fortran', linecount=4)
+        buf = numpy.zeros((5, 2))
+        with open(self.filename, 'r') as inp:
+            stream = Stream(inp)
+            stream.read_floats(None, order='Fortran', out=buf)
+        numpy.testing.assert_array_equal(buf, arr2d)
+
+    def test_record(self):
+        logging.debug('')
+        logging.debug('test_record')
+
+        ints = numpy.arange(1, 9, dtype=numpy.int32)
+        floats = numpy.arange(1, 9, dtype=numpy.float64)
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, unformatted=True,
+                            single_precision=True)
+            stream.write_record([ints, floats])
+        with open(self.filename, 'rb') as inp:
+            self.assertEqual(inp.read(),
+                             '\x40\x00\x00\x00' + UNF_I4A[4:-4] +
+                             UNF_R4A[4:-4] + '\x40\x00\x00\x00')
+
+        new_ints = numpy.zeros(8, dtype=numpy.int32)
+        new_floats = numpy.zeros(8, dtype=numpy.float32)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, unformatted=True,
+                            single_precision=True)
+            stream.read_record([new_ints, new_floats])
+        numpy.testing.assert_array_equal(new_ints, ints)
+        numpy.testing.assert_array_equal(new_floats, floats)
+
+        new_floats = numpy.zeros(7, dtype=numpy.float32)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, unformatted=True,
+                            single_precision=True)
+            assert_raises(self, 'stream.read_record([new_ints, new_floats])',
+                          globals(), locals(), RuntimeError,
+                          'unexpected recordlength 64')
+
     def test_misc(self):
         logging.debug('')
         logging.debug('test_misc')
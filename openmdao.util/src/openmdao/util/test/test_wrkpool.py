@@ -5,11 +5,12 @@ Test WorkerPool functions.
 import logging
 import Queue
 import sys
+import threading
 import time
 import unittest
 import nose
 
-from openmdao.util.wrkpool import WorkerPool
+from openmdao.util.wrkpool import WorkerPool, CancelledError, TimeoutError
 
 
 class TestCase(unittest.TestCase):
@@ -80,6 +81,120 @@ class TestCase(unittest.TestCase):
         worker_q.put((self.add, (1,), {}, self.reply_q))
         WorkerPool.cleanup()
 
+    def test_max_workers(self):
+        logging.debug('')
+        logging.debug('test_max_workers')
+
+        WorkerPool.configure(max_workers=2)
+        try:
+            WorkerPool.reset_stats()
+            worker1 = WorkerPool.get()
+            worker2 = WorkerPool.get()
+            self.assertEqual(WorkerPool.get_stats()['active'], 2)
+            try:
+                WorkerPool.get(timeout=0.1)
+            except RuntimeError as exc:
+                self.assertEqual(str(exc), 'WorkerPool: no worker available'
+                                           ' after 0.1 seconds')
+            else:
+                self.fail('Expected RuntimeError')
+
+            # Blocked get() proceeds when a worker is released.
+            threading.Timer(0.2, WorkerPool.release, (worker1,)).start()
+            worker3 = WorkerPool.get(timeout=5)
+            self.assertTrue(worker3 is worker1)
+
+            stats = WorkerPool.get_stats()
+            self.assertEqual(stats['workers'], 2)
+            self.assertEqual(stats['started'], 2)
+            self.assertTrue(stats['max_wait'] >= 0.1)
+            WorkerPool.release(worker2)
+            WorkerPool.release(worker3)
+        finally:
+            WorkerPool.configure()
+            WorkerPool.cleanup()
+
+    def test_idle_timeout(self):
+        logging.debug('')
+        logging.debug('test_idle_timeout')
+
+        WorkerPool.configure(idle_timeout=0.1)
+        try:
+            WorkerPool.reset_stats()
+            worker_q = WorkerPool.get()
+            worker_q.put((self.add, (1,), {}, self.reply_q))
+            self.reply_q.get()
+            WorkerPool.release(worker_q)
+            time.sleep(0.5)
+            stats = WorkerPool.get_stats()
+            self.assertEqual(stats['workers'], 0)
+            self.assertEqual(stats['reaped'], 1)
+            self.assertEqual(stats['completed'], 1)
+        finally:
+            WorkerPool.configure()
+            WorkerPool.cleanup()
+
+    def test_submit(self):
+        logging.debug('')
+        logging.debug('test_submit')
+
+        done = []
+        future = WorkerPool.submit(self.add, 2)
+        future.add_done_callback(done.append)
+        self.assertEqual(future.result(5), -2)
+        self.assertEqual(self.total, 2)
+        self.assertEqual(done, [future])
+
+        future = WorkerPool.submit(self.add, None)
+        self.assertEqual(type(future.exception(5)), TypeError)
+        self.assertRaises(TypeError, future.result)
+
+        future = WorkerPool.submit(time.sleep, 1)
+        self.assertRaises(TimeoutError, future.result, 0.1)
+        self.assertFalse(future.cancel())  # Already running.
+        future.result()
+        WorkerPool.cleanup()
+
+    def test_submit_queued(self):
+        logging.debug('')
+        logging.debug('test_submit_queued')
+
+        WorkerPool.configure(max_workers=1)
+        try:
+            # submit() doesn't block when the pool is full.
+            event = threading.Event()
+            first = WorkerPool.submit(event.wait, 5)
+            queued = [WorkerPool.submit(self.add, i) for i in range(3)]
+            self.assertFalse(any(future.running() for future in queued))
+            self.assertTrue(queued[1].cancel())
+            event.set()
+            self.assertEqual([queued[0].result(5), queued[2].result(5)],
+                             [0, -2])
+            self.assertTrue(queued[1].cancelled())
+            self.assertEqual(self.total, 2)
+
+            # Nested submit and wait from a worker.
+            def nested(value):
+                return WorkerPool.submit(self.add, value).result(5)
+            self.assertEqual(WorkerPool.submit(nested, 3).result(5), -3)
+            self.assertEqual(WorkerPool.get_stats()['workers'], 1)
+        finally:
+            WorkerPool.configure()
+            WorkerPool.cleanup()
+
+    def test_cleanup(self):
+        logging.debug('')
+        logging.debug('test_cleanup')
+
+        # Workers finishing a call during cleanup don't delay it.
+        futures = [WorkerPool.submit(time.sleep, 0.2) for i in range(4)]
+        time.sleep(0.1)
+        start = time.time()
+        WorkerPool.cleanup()
+        self.assertTrue(time.time() - start < 1)
+        for future in futures:
+            future.result(5)
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.util.wrkpool')
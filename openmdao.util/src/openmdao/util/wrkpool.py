@@ -1,19 +1,34 @@
 import atexit
+import collections
 import logging
 import Queue
 import threading
+import time
 import traceback
 
+_THREAD_DATA = threading.local()  # Records pool for worker threads.
+
 
 class WorkerPool(object):
-    """ Pool of worker threads; grows as necessary. """
+    """
+    Pool of worker threads; grows as necessary, up to an optional maximum.
+    When the maximum is reached, :meth:`get` blocks until a worker is
+    released and :meth:`submit` queues the call until a worker is free.
+    Idle workers may be reaped after a timeout.
+    See :meth:`configure`.
+    """
 
     _lock = threading.Lock()
     _pool = None  # Singleton.
 
-    def __init__(self):
+    def __init__(self, max_workers=None, idle_timeout=None):
         self._idle = []     # Queues of idle workers.
         self._workers = {}  # Maps queue to worker.
+        self._pending = collections.deque()  # Submitted calls not started.
+        self._available = threading.Condition(self._lock)
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self._reset_stats()
         atexit.register(self.cleanup)
 
     @staticmethod
@@ -24,6 +39,28 @@ class WorkerPool(object):
                 WorkerPool._pool = WorkerPool()
             return WorkerPool._pool
 
+    @staticmethod
+    def configure(max_workers=None, idle_timeout=None):
+        """
+        Set pool limits. Existing workers are not affected until they are
+        released or become idle.
+
+        max_workers: int
+            Maximum number of worker threads. None implies no limit.
+
+        idle_timeout: float (seconds)
+            Workers idle for longer than this are shut down.
+            None implies idle workers are kept until :meth:`cleanup`.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError('max_workers must be >= 1, got %r' % max_workers)
+        pool = WorkerPool.get_instance()
+        with pool._lock:
+            pool.max_workers = max_workers
+            pool.idle_timeout = idle_timeout
+            pool._dispatch()
+            pool._available.notify_all()
+
     @staticmethod
     def cleanup():
         """ Cleanup resources (worker threads). """
@@ -31,21 +68,23 @@ class WorkerPool(object):
 
     def _cleanup(self):
         """ Cleanup resources (worker threads). """
+        # Workers may need the lock to finish, so don't join while holding it.
         with self._lock:
-            for queue in self._workers:
-                queue.put((None, None, None, None))
-                self._workers[queue].join(1)
-                if self._workers[queue].is_alive():
-                    logging.debug('WorkerPool: worker join timed-out.')
-                try:
-                    self._idle.remove(queue)
-                except ValueError:
-                    pass  # Never released due to some other issue...
+            workers = self._workers.items()
             self._idle = []
             self._workers = {}
+            self._available.notify_all()
+
+        for queue, worker in workers:
+            queue.put((None, None, None, None))
+        for queue, worker in workers:
+            if worker is not threading.current_thread():
+                worker.join(1)
+                if worker.is_alive():
+                    logging.debug('WorkerPool: worker join timed-out.')
 
     @staticmethod
-    def get(one_shot=False):
+    def get(one_shot=False, timeout=None):
         """
         Get a worker queue from the pool. Work requests should be of the form:
 
@@ -55,24 +94,68 @@ class WorkerPool(object):
 
         ``(queue, retval, exc, traceback)``
 
+        If the pool is at its maximum size, this blocks until a worker is
+        released.
+
         one_shot: bool
             If True, the worker will self-release after processing one request.
+
+        timeout: float (seconds)
+            Maximum time to wait for a worker. None implies an infinite wait.
+            :class:`RuntimeError` is raised if the wait times out.
         """
-        return WorkerPool.get_instance()._get(one_shot)
+        return WorkerPool.get_instance()._get(one_shot, timeout)
 
-    def _get(self, one_shot):
+    def _get(self, one_shot, timeout=None):
         """ Get a worker queue from the pool. """
+        start = time.time()
         with self._lock:
-            try:
-                return self._idle.pop()
-            except IndexError:
-                queue = Queue.Queue()
-                worker = threading.Thread(target=self._service_loop,
-                                          args=(queue, one_shot))
-                worker.daemon = True
-                worker.start()
-                self._workers[queue] = worker
-                return queue
+            while not self._idle and self.max_workers is not None \
+                  and len(self._workers) >= self.max_workers:
+                if timeout is None:
+                    self._available.wait()
+                else:
+                    remaining = timeout - (time.time() - start)
+                    if remaining <= 0:
+                        raise RuntimeError('WorkerPool: no worker available'
+                                           ' after %s seconds' % timeout)
+                    self._available.wait(remaining)
+
+            waited = time.time() - start
+            self._gets += 1
+            self._wait_time += waited
+            self._max_wait = max(self._max_wait, waited)
+            return self._checkout(one_shot)
+
+    def _checkout(self, one_shot):
+        """ Return an idle worker queue or start a new worker.
+        Lock must be held. """
+        try:
+            return self._idle.pop()
+        except IndexError:
+            queue = Queue.Queue()
+            worker = threading.Thread(target=self._service_loop,
+                                      args=(queue, one_shot))
+            worker.daemon = True
+            worker.start()
+            self._workers[queue] = worker
+            self._started += 1
+            return queue
+
+    def _full(self):
+        """ Return True if no worker is available. Lock must be held. """
+        return not self._idle and self.max_workers is not None \
+               and len(self._workers) >= self.max_workers
+
+    def _dispatch(self):
+        """ Start pending submitted calls on available workers.
+        Lock must be held. """
+        while self._pending and not self._full():
+            job = self._pending.popleft()
+            if job[0].cancelled():
+                continue
+            queue = self._checkout(False)
+            queue.put((self._run_future, (queue,) + job, {}, None))
 
     @staticmethod
     def release(queue):
@@ -87,12 +170,158 @@ class WorkerPool(object):
     def _release(self, queue):
         """ Release a worker queue back to the pool. """
         with self._lock:
-            self._idle.append(queue)
+            if queue not in self._workers:
+                return  # Already cleaned-up or reaped.
+            if queue not in self._idle:
+                self._idle.append(queue)
+            if self.max_workers is not None \
+               and len(self._workers) > self.max_workers:
+                # Limit was lowered, shrink now rather than when idle.
+                self._retire(queue)
+            self._dispatch()
+            self._available.notify()
+
+    def _retire(self, queue):
+        """ Shut down idle worker `queue`. Lock must be held. """
+        self._idle.remove(queue)
+        del self._workers[queue]
+        queue.put((None, None, None, None))
+        self._reaped += 1
+
+    @staticmethod
+    def submit(fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on a pool worker.
+        Returns a :class:`Future` for the result. If the pool is at its
+        maximum size, the call is queued until a worker is available;
+        it may be cancelled until then. If a pool worker waits for the
+        result of a call which is still queued, the call is run in that
+        worker, so nested submits don't deadlock a bounded pool.
+
+        fn: callable
+            Function to call.
+        """
+        pool = WorkerPool.get_instance()
+        future = Future()
+        future._pool = pool
+        with pool._lock:
+            pool._pending.append((future, fn, args, kwargs))
+            pool._dispatch()
+        return future
+
+    def _run_future(self, queue, future, fn, args, kwargs):
+        """ Run `fn` for `future`, then release the worker. """
+        try:
+            self._call(future, fn, args, kwargs)
+        finally:
+            self._release(queue)
+
+    def _run_inline(self, future):
+        """ Run `future` in the calling thread if it hasn't started. """
+        with self._lock:
+            for job in self._pending:
+                if job[0] is future:
+                    self._pending.remove(job)
+                    break
+            else:
+                return
+        self._call(*job)
+
+    def _call(self, future, fn, args, kwargs):
+        """ Call `fn` and set the result of `future`. """
+        if future.set_running():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                self._count(failed=True)
+                future.set_exception(exc, traceback.format_exc())
+            else:
+                self._count(failed=False)
+                future.set_result(result)
+
+    def _count(self, failed):
+        """ Update task counts. """
+        with self._lock:
+            self._completed += 1
+            if failed:
+                self._failed += 1
+
+    @staticmethod
+    def get_stats():
+        """
+        Return dictionary of pool statistics:
+
+        ============ ==================================================
+        Key          Value
+        ============ ==================================================
+        workers      Current number of worker threads
+        ------------ --------------------------------------------------
+        active       Workers currently handed out (not idle)
+        ------------ --------------------------------------------------
+        idle         Idle workers
+        ------------ --------------------------------------------------
+        started      Total worker threads started
+        ------------ --------------------------------------------------
+        reaped       Total workers shut down due to idle time or limits
+        ------------ --------------------------------------------------
+        completed    Total requests processed
+        ------------ --------------------------------------------------
+        failed       Requests which raised an exception
+        ------------ --------------------------------------------------
+        gets         Number of :meth:`get` calls satisfied
+        ------------ --------------------------------------------------
+        wait_time    Total time spent waiting in :meth:`get` (seconds)
+        ------------ --------------------------------------------------
+        max_wait     Longest wait in :meth:`get` (seconds)
+        ============ ==================================================
+        """
+        pool = WorkerPool.get_instance()
+        with pool._lock:
+            return dict(workers=len(pool._workers),
+                        active=len(pool._workers) - len(pool._idle),
+                        idle=len(pool._idle),
+                        started=pool._started,
+                        reaped=pool._reaped,
+                        completed=pool._completed,
+                        failed=pool._failed,
+                        gets=pool._gets,
+                        wait_time=pool._wait_time,
+                        max_wait=pool._max_wait)
+
+    @staticmethod
+    def reset_stats():
+        """ Reset cumulative statistics. """
+        pool = WorkerPool.get_instance()
+        with pool._lock:
+            pool._reset_stats()
+
+    def _reset_stats(self):
+        """ Reset cumulative statistics. """
+        self._started = 0
+        self._reaped = 0
+        self._completed = 0
+        self._failed = 0
+        self._gets = 0
+        self._wait_time = 0.
+        self._max_wait = 0.
 
     def _service_loop(self, request_q, one_shot):
         """ Get (callable, args, kwargs) from request_q and queue result. """
+        _THREAD_DATA.pool = self
         while True:
-            callable, args, kwargs, reply_q = request_q.get()
+            idle_timeout = self.idle_timeout
+            try:
+                if idle_timeout is None:
+                    request = request_q.get()
+                else:
+                    request = request_q.get(timeout=idle_timeout)
+            except Queue.Empty:
+                with self._lock:
+                    if request_q in self._idle:
+                        self._retire(request_q)
+                continue  # Shutdown request is queued if retired.
+
+            callable, args, kwargs, reply_q = request
             if callable is None:
                 request_q.task_done()
                 return  # Shutdown.
@@ -110,9 +339,170 @@ class WorkerPool(object):
                     return
 
             request_q.task_done()
+            if callable != self._run_future:
+                self._count(exc is not None)
             if reply_q is not None:
                 reply_q.put((request_q, retval, exc, trace))
 
             if one_shot:
                 self._release(request_q)
 
+
+class Future(object):
+    """
+    Result of an asynchronous call, similar to
+    :class:`concurrent.futures.Future`.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    CANCELLED = 'cancelled'
+    FINISHED = 'finished'
+
+    def __init__(self):
+        self._state = self.PENDING
+        self._result = None
+        self._exception = None
+        self._traceback = None
+        self._callbacks = []
+        self._condition = threading.Condition()
+        self._pool = None  # Set by WorkerPool.submit().
+
+    def cancel(self):
+        """
+        Attempt to cancel the call. Returns True if the call was cancelled,
+        False if it is already running or finished.
+        """
+        with self._condition:
+            if self._state in (self.RUNNING, self.FINISHED):
+                return False
+            if self._state == self.PENDING:
+                self._state = self.CANCELLED
+                self._condition.notify_all()
+        self._invoke_callbacks()
+        return True
+
+    def cancelled(self):
+        """ Return True if the call was cancelled. """
+        return self._state == self.CANCELLED
+
+    def running(self):
+        """ Return True if the call is currently executing. """
+        return self._state == self.RUNNING
+
+    def done(self):
+        """ Return True if the call was cancelled or finished. """
+        return self._state in (self.CANCELLED, self.FINISHED)
+
+    def result(self, timeout=None):
+        """
+        Return the value returned by the call, waiting up to `timeout`
+        seconds. Raises the call's exception if it raised one.
+
+        timeout: float (seconds)
+            Maximum time to wait. None implies an infinite wait.
+        """
+        self._wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Return the exception raised by the call (or None), waiting up to
+        `timeout` seconds.
+
+        timeout: float (seconds)
+            Maximum time to wait. None implies an infinite wait.
+        """
+        self._wait(timeout)
+        return self._exception
+
+    @property
+    def traceback(self):
+        """ Formatted traceback if the call raised an exception. """
+        return self._traceback
+
+    def add_done_callback(self, fn):
+        """
+        Call ``fn(future)`` when the call completes or is cancelled.
+        If already done, `fn` is called immediately.
+
+        fn: callable
+            Function to call.
+        """
+        with self._condition:
+            if not self.done():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _wait(self, timeout):
+        """ Wait for completion, raise exceptions for cancel or timeout. """
+        if self._pool is not None and self._state == self.PENDING and \
+           getattr(_THREAD_DATA, 'pool', None) is self._pool:
+            # Waiting in a worker for a queued call, run it here.
+            self._pool._run_inline(self)
+        with self._condition:
+            if not self.done():
+                if timeout is None:
+                    # Condition.wait() without a timeout isn't interruptible.
+                    while not self.done():
+                        self._condition.wait(1)
+                else:
+                    self._condition.wait(timeout)
+            if self._state == self.CANCELLED:
+                raise CancelledError('Future was cancelled')
+            if self._state != self.FINISHED:
+                raise TimeoutError('Future not done after %s seconds'
+                                   % timeout)
+
+    def set_running(self):
+        """
+        Mark as running. Returns False if the future was cancelled,
+        in which case the call should not be made.
+        """
+        with self._condition:
+            if self._state == self.CANCELLED:
+                return False
+            self._state = self.RUNNING
+            return True
+
+    def set_result(self, result):
+        """ Set the call's result and wake waiters. """
+        with self._condition:
+            self._result = result
+            self._state = self.FINISHED
+            self._condition.notify_all()
+        self._invoke_callbacks()
+
+    def set_exception(self, exc, trace=None):
+        """ Set the call's exception and wake waiters. """
+        with self._condition:
+            self._exception = exc
+            self._traceback = trace
+            self._state = self.FINISHED
+            self._condition.notify_all()
+        self._invoke_callbacks()
+
+    def _invoke_callbacks(self):
+        """ Call registered callbacks (once). """
+        with self._condition:
+            callbacks = self._callbacks
+            self._callbacks = []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logging.exception('Future: exception in callback %s', callback)
+
+
+class CancelledError(Exception):
+    """ Raised when the result of a cancelled :class:`Future` is requested. """
+    pass
+
+
+class TimeoutError(Exception):
+    """ Raised when a :class:`Future` doesn't complete in time. """
+    pass
+